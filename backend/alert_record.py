@@ -0,0 +1,122 @@
+"""Immutable alert records for the in-memory alert stream.
+
+``alerts_log_main`` holds up to 2,000 alerts and is read several times per
+compute cycle and per request (event evolution, portfolio enrichment, the
+recent-alerts payload). When those readers held mutable dicts they each took
+defensive copies. Records appended through ``freeze_alert`` are read-only, so
+readers can share references instead.
+
+``AlertRecord`` is a ``dict`` subclass on purpose: every consumer in the tree
+checks ``isinstance(alert, dict)``, calls ``.get`` and serializes with
+``json``/``jsonify``, and all of that keeps working unchanged. Nested dicts
+(evidence, interpretation, meta) are frozen the same way. The low-cardinality
+string fields are interned so 2,000 alerts share one ``"BTC-USD"`` and one
+``"whale_move"`` instead of carrying their own copies, and text repeated
+within one alert (``ts``/``event_ts``) is stored once.
+
+Code that needs to modify an alert takes ``dict(record)`` (or ``thaw`` for a
+deep, fully mutable copy) first; in-place writes raise ``TypeError``.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+# Top-level and evidence fields with a small value set; interned on freeze.
+_INTERN_FIELDS = frozenset(
+    {
+        "symbol",
+        "product_id",
+        "type",
+        "type_key",
+        "severity",
+        "window",
+        "direction",
+        "rule_version",
+        "trade_url",
+        "source",
+        "family",
+        "mood",
+        "mood_label",
+        "mood_bias",
+        "legacy_type",
+    }
+)
+_INTERN_MAX_LEN = 80
+
+
+def _readonly(self, *_args, **_kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; copy it with dict() first")
+
+
+class FrozenDict(dict):
+    """A dict whose contents cannot change after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through __init__, not __setitem__.
+        return (type(self), (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __hash__(self):  # dicts are unhashable; identity is enough here
+        return id(self)
+
+
+class AlertRecord(FrozenDict):
+    """A frozen, interned alert in the canonical stream contract."""
+
+    __slots__ = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain, fully mutable copy for callers that edit the result."""
+        return thaw(self)
+
+
+def _freeze_value(key: str | None, value: Any, seen: dict[str, str]) -> Any:
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({k: _freeze_value(k, v, seen) for k, v in value.items()})
+    if isinstance(value, list):
+        # Lists stay lists (callers type-check them); short items such as
+        # interpretation factor phrases repeat across alerts and are interned.
+        return [
+            sys.intern(v) if isinstance(v, str) and len(v) <= _INTERN_MAX_LEN else v
+            for v in value
+        ]
+    if isinstance(value, str):
+        if key in _INTERN_FIELDS:
+            return sys.intern(value)
+        # ts/event_ts, title/message and friends often carry equal text.
+        return seen.setdefault(value, value)
+    return value
+
+
+def freeze_alert(alert: dict[str, Any]) -> AlertRecord:
+    """Return ``alert`` as an AlertRecord (a no-op for records)."""
+    if isinstance(alert, AlertRecord):
+        return alert
+    seen: dict[str, str] = {}
+    return AlertRecord({k: _freeze_value(k, v, seen) for k, v in alert.items()})
+
+
+def thaw(value: Any) -> Any:
+    """Deep-copy frozen mappings back into plain dicts."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
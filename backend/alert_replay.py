@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""Offline replay of recorded price tape through the alert engine.
+
+Streams historical snapshots from ``price_snapshots.db`` (and, when present,
+minute volumes from ``volume_1h.sqlite``) through the same path the live loop
+uses:
+
+    mw_build_price_snapshot -> compute_alerts -> build_event_evolution
+
+The engine's cooldowns read ``time.time()``/``datetime.now()``, so the replay
+drives them from the tape timestamp instead of the wall clock; a day of tape
+therefore produces the alert cadence it would have produced live, just faster.
+
+Usage:
+    python alert_replay.py --price-db price_snapshots.db \\
+        --volume-db data/volume_1h.sqlite --json-out replay.json
+    python alert_replay.py --baseline replay.json --max-drift 0.25   # gate
+
+The report covers alerts per hour (total and by type), grouped events,
+per-detector cost and end-to-end throughput in cycles per second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import logging
+import sqlite3
+import sys
+import time as _time
+from collections import Counter, deque
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from alert_events import build_event_evolution
+from alerts_engine import AlertEngineState, ReplayTime, compute_alerts, replay_clock
+from alerts_parallel import ShardedDetectorPool
+from pipeline_timing import DetectorMetrics, PipelineTimer
+
+logger = logging.getLogger(__name__)
+
+# Same cap as the live alerts_log_main deque.
+ALERT_LOG_MAXLEN = 2000
+# Tape older than the 1h window (plus tolerance) is never needed again.
+_HISTORY_KEEP_S = 3900
+_VOLUME_WINDOW_MIN = 120
+
+
+@dataclass
+class ReplayReport:
+    cycles: int = 0
+    symbols: int = 0
+    tape_start_ts: int | None = None
+    tape_end_ts: int | None = None
+    tape_span_s: float = 0.0
+    wall_s: float = 0.0
+    cycles_per_s: float = 0.0
+    alerts_total: int = 0
+    alerts_per_hour: float = 0.0
+    alerts_per_hour_by_type: dict = field(default_factory=dict)
+    events_final: int = 0
+    stages: dict = field(default_factory=dict)
+    detectors: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _symbol_of(product_id):
+    pid = str(product_id or "").upper()
+    return pid.split("-")[0] if "-" in pid else pid
+
+
+def iter_tape(price_db, start_ts=None, end_ts=None):
+    """Yield (ts, {symbol: price}) per recorded snapshot, oldest first."""
+    conn = sqlite3.connect(f"file:{price_db}?mode=ro", uri=True)
+    try:
+        sql = "SELECT ts, product_id, price FROM price_snapshots"
+        clauses, params = [], []
+        if start_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(int(start_ts))
+        if end_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(int(end_ts))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts ASC"
+        current_ts, prices = None, {}
+        for ts, product_id, price in conn.execute(sql, params):
+            if current_ts is not None and ts != current_ts:
+                yield current_ts, prices
+                prices = {}
+            current_ts = int(ts)
+            try:
+                px = float(price)
+            except (TypeError, ValueError):
+                continue
+            if px > 0:
+                prices[_symbol_of(product_id)] = px
+        if current_ts is not None:
+            yield current_ts, prices
+    finally:
+        conn.close()
+
+
+def load_minute_volumes(volume_db, start_ts=None, end_ts=None):
+    """Return {product_id: (minute_ts_list, rows)} sorted ascending by minute."""
+    if not volume_db or not Path(volume_db).exists():
+        return {}
+    conn = sqlite3.connect(f"file:{volume_db}?mode=ro", uri=True)
+    try:
+        sql = "SELECT product_id, minute_ts, vol_base, close FROM volume_minute"
+        clauses, params = [], []
+        if start_ts is not None:
+            clauses.append("minute_ts >= ?")
+            params.append(int(start_ts) - _VOLUME_WINDOW_MIN * 60)
+        if end_ts is not None:
+            clauses.append("minute_ts <= ?")
+            params.append(int(end_ts))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY product_id, minute_ts ASC"
+        out = {}
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        for product_id, minute_ts, vol, close in rows:
+            ts_list, series = out.setdefault(product_id, ([], []))
+            ts_list.append(int(minute_ts))
+            series.append((int(minute_ts), float(vol or 0.0), close))
+        return out
+    finally:
+        conn.close()
+
+
+def _volume_inputs(minute_index, now_ts):
+    """Build (candle_volume_cache, minute_volumes) as of ``now_ts``.
+
+    Mirrors the live candle cache: complete minutes only, newest first, last
+    ~70 minutes for z-scores, and 60m vs previous 60m sums for 1h volume.
+    """
+    cache, minute_volumes = {}, {}
+    cutoff = (int(now_ts) // 60) * 60  # exclude the in-progress minute
+    for product_id, (ts_list, series) in minute_index.items():
+        hi = bisect.bisect_left(ts_list, cutoff)
+        lo = max(0, hi - _VOLUME_WINDOW_MIN)
+        window = series[lo:hi]
+        if not window:
+            continue
+        newest_first = window[::-1]
+        minute_volumes[product_id] = [
+            {
+                "ts": ts,
+                "vol": vol,
+                "quote_vol": vol * float(close or 0.0),
+                "close": close,
+            }
+            for ts, vol, close in newest_first[:70]
+        ]
+        now_rows, prev_rows = newest_first[:60], newest_first[60:120]
+        vol1h = sum(vol for _ts, vol, _c in now_rows)
+        quote1h = sum(vol * float(c or 0.0) for _ts, vol, c in now_rows)
+        vol_prev = sum(vol for _ts, vol, _c in prev_rows) if len(prev_rows) >= 60 else None
+        quote_prev = (
+            sum(vol * float(c or 0.0) for _ts, vol, c in prev_rows)
+            if len(prev_rows) >= 60
+            else None
+        )
+        cache[product_id] = {
+            "vol1h": vol1h,
+            "vol1h_prev": vol_prev,
+            "vol1h_pct_change": (
+                (vol1h - vol_prev) / vol_prev * 100.0 if vol_prev else None
+            ),
+            "quote_vol1h": quote1h,
+            "quote_vol1h_prev": quote_prev,
+            "quote_vol1h_pct_change": (
+                (quote1h - quote_prev) / quote_prev * 100.0 if quote_prev else None
+            ),
+            "ts_computed": int(now_ts),
+            "baseline_mode": "replay",
+            "baseline_minutes": len(prev_rows),
+        }
+    return cache, minute_volumes
+
+
+class _TapeHistory:
+    """Per-symbol (ts, price) history trimmed to the 1h baseline window.
+
+    Timestamps and prices live in parallel ascending lists so window lookups
+    are bisects rather than scans.
+    """
+
+    def __init__(self):
+        self._ts = {}
+        self._px = {}
+
+    def append(self, ts, prices):
+        cutoff = ts - _HISTORY_KEEP_S
+        for sym, px in prices.items():
+            ts_list = self._ts.get(sym)
+            if ts_list is None:
+                ts_list = self._ts[sym] = []
+                self._px[sym] = []
+            px_list = self._px[sym]
+            ts_list.append(ts)
+            px_list.append(px)
+            if ts_list[0] < cutoff:
+                cut = bisect.bisect_left(ts_list, cutoff)
+                del ts_list[:cut]
+                del px_list[:cut]
+
+    def window(self, now_ts, max_age_s):
+        """{symbol: [(ts, price)]} for rows no older than ``max_age_s``."""
+        out = {}
+        for sym, ts_list in self._ts.items():
+            lo = bisect.bisect_left(ts_list, now_ts - max_age_s)
+            if lo < len(ts_list):
+                out[sym] = list(zip(ts_list[lo:], self._px[sym][lo:]))
+        return out
+
+    def banner_rows(self, now_ts, prices):
+        """1h change rows in the shape mw_build_price_snapshot expects."""
+        rows = []
+        target = now_ts - 3600
+        for sym, px in prices.items():
+            ts_list = self._ts.get(sym)
+            if not ts_list:
+                continue
+            # Same tolerance as BASELINE_WINDOWS["1h"]: 3300..3900s ago.
+            lo = bisect.bisect_left(ts_list, now_ts - 3900)
+            hi = bisect.bisect_right(ts_list, now_ts - 3300)
+            if lo >= hi:
+                continue
+            i = bisect.bisect_left(ts_list, target, lo, hi)
+            best = min(
+                (j for j in (i - 1, i) if lo <= j < hi),
+                key=lambda j: abs(ts_list[j] - target),
+            )
+            base = self._px[sym][best]
+            if base <= 0:
+                continue
+            pct = (px - base) / base * 100.0
+            rows.append({"symbol": sym, "current_price": px, "pct_1h": pct})
+        return rows
+
+
+def replay(
+    price_db,
+    volume_db=None,
+    *,
+    start_ts=None,
+    end_ts=None,
+    max_cycles=None,
+    speed=0.0,
+    thresholds=None,
+    include_market_mood=False,
+    processes=0,
+):
+    """Replay the tape and return a ReplayReport.
+
+    ``speed`` paces the replay at ``speed``x real time (e.g. 60 replays an
+    hour of tape per minute); 0 runs as fast as possible. ``processes`` > 1
+    shards the symbol-local detectors across a ShardedDetectorPool.
+    """
+    from app import mw_build_price_snapshot, mw_build_volume_snapshot
+
+    report = ReplayReport()
+    stages = PipelineTimer(slow_traces=0)
+    detector_metrics = DetectorMetrics()
+    minute_index = load_minute_volumes(volume_db, start_ts, end_ts)
+    history = _TapeHistory()
+    state = AlertEngineState()
+    alert_log = deque(maxlen=ALERT_LOG_MAXLEN)
+    by_type = Counter()
+    symbols = set()
+    events = []
+    clock = ReplayTime()
+    volume_minute = None
+    minute_volumes, volume_snapshot = {}, {}
+    shard_pool = ShardedDetectorPool(processes) if processes and processes > 1 else None
+
+    wall_start = _time.perf_counter()
+    first_ts = None
+    with replay_clock(clock), (shard_pool or nullcontext()):
+        for ts, prices in iter_tape(price_db, start_ts, end_ts):
+            if max_cycles is not None and report.cycles >= max_cycles:
+                break
+            if first_ts is None:
+                first_ts = ts
+            if speed and speed > 0:
+                due = wall_start + (ts - first_ts) / float(speed)
+                delay = due - _time.perf_counter()
+                if delay > 0:
+                    _time.sleep(delay)
+            clock.now = float(ts)
+            history.append(ts, prices)
+            symbols.update(prices)
+
+            trace = stages.start_cycle()
+            price_snapshot = mw_build_price_snapshot(
+                g1m_rows=[],
+                g3m_rows=[],
+                l3m_rows=[],
+                banner_rows=history.banner_rows(ts, prices),
+                cached_prices=prices,
+                snapshot_ts_s=ts,
+                history_1m=history.window(ts, 120),
+                history_3m=history.window(ts, 300),
+            )
+            # Minute volumes only change when a new minute closes.
+            if ts // 60 != volume_minute:
+                volume_minute = ts // 60
+                candle_cache, minute_volumes = _volume_inputs(minute_index, ts)
+                volume_snapshot = mw_build_volume_snapshot(
+                    candle_volume_cache=candle_cache
+                )
+            trace.mark("price_snapshot")
+
+            alerts, state, pressure = compute_alerts(
+                price_snapshot=price_snapshot,
+                volume_snapshot=volume_snapshot,
+                minute_volumes=minute_volumes,
+                state=state,
+                thresholds=thresholds,
+                include_impulse=True,
+                include_market_mood=include_market_mood,
+                shard_pool=shard_pool,
+            )
+            trace.mark("compute_alerts")
+            detector_metrics.observe(pressure.detectors)
+
+            for alert in alerts:
+                by_type[str(alert.get("type") or alert.get("type_key") or "")] += 1
+            alert_log.extend(alerts)
+            events = build_event_evolution(list(alert_log), now_ms=ts * 1000)
+            trace.mark("event_evolution")
+            trace.finish()
+
+            report.cycles += 1
+            report.alerts_total += len(alerts)
+            report.tape_end_ts = ts
+
+    report.wall_s = round(_time.perf_counter() - wall_start, 4)
+    report.tape_start_ts = first_ts
+    report.symbols = len(symbols)
+    if first_ts is not None and report.tape_end_ts is not None:
+        report.tape_span_s = float(report.tape_end_ts - first_ts)
+    hours = report.tape_span_s / 3600.0 if report.tape_span_s > 0 else 0.0
+    if hours:
+        report.alerts_per_hour = round(report.alerts_total / hours, 3)
+        report.alerts_per_hour_by_type = {
+            typ: round(n / hours, 3) for typ, n in sorted(by_type.items())
+        }
+    if report.wall_s > 0:
+        report.cycles_per_s = round(report.cycles / report.wall_s, 3)
+    report.events_final = len(events)
+    report.stages = stages.snapshot()["stages"]
+    report.detectors = detector_metrics.snapshot()["detectors"]
+    return report
+
+
+def compare_to_baseline(report, baseline, max_drift=0.25, min_cycles_per_s=None):
+    """Return a list of human-readable gate failures (empty when passing).
+
+    Alert rates may move by at most ``max_drift`` (fractional) in total and per
+    type; throughput may not drop below ``min_cycles_per_s`` when given.
+    """
+    current = report.as_dict() if isinstance(report, ReplayReport) else dict(report)
+    failures = []
+
+    def _drifted(name, now, before):
+        before = float(before or 0.0)
+        now = float(now or 0.0)
+        if before == 0.0:
+            if now > 0.0:
+                failures.append(f"{name}: 0 -> {now:.3f}/h (new)")
+            return
+        drift = abs(now - before) / before
+        if drift > max_drift:
+            failures.append(f"{name}: {before:.3f} -> {now:.3f}/h ({drift:+.0%})")
+
+    _drifted("alerts_per_hour", current.get("alerts_per_hour"), baseline.get("alerts_per_hour"))
+    types = set(current.get("alerts_per_hour_by_type") or {}) | set(
+        baseline.get("alerts_per_hour_by_type") or {}
+    )
+    for typ in sorted(types):
+        _drifted(
+            f"type:{typ}",
+            (current.get("alerts_per_hour_by_type") or {}).get(typ),
+            (baseline.get("alerts_per_hour_by_type") or {}).get(typ),
+        )
+    if min_cycles_per_s is not None and current.get("cycles_per_s", 0) < min_cycles_per_s:
+        failures.append(
+            f"cycles_per_s {current.get('cycles_per_s')} < {min_cycles_per_s}"
+        )
+    return failures
+
+
+def _print_summary(report):
+    print(
+        f"cycles={report.cycles} symbols={report.symbols} "
+        f"tape={report.tape_span_s / 3600.0:.2f}h wall={report.wall_s:.2f}s "
+        f"throughput={report.cycles_per_s:.1f} cycles/s"
+    )
+    print(f"alerts={report.alerts_total} ({report.alerts_per_hour:.1f}/h) "
+          f"events_final={report.events_final}")
+    for typ, rate in sorted(
+        report.alerts_per_hour_by_type.items(), key=lambda kv: -kv[1]
+    ):
+        print(f"  {typ:<32} {rate:8.2f}/h")
+    print("detector cost (p95 ms / total ms):")
+    for name, row in sorted(
+        report.detectors.items(), key=lambda kv: -(kv[1].get("sum_ms") or 0)
+    ):
+        print(f"  {name:<28} {row.get('p95_ms') or 0:8.3f} {row.get('sum_ms') or 0:10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--price-db", default=str(BACKEND_DIR / "price_snapshots.db"))
+    parser.add_argument(
+        "--volume-db", default=str(BACKEND_DIR / "data" / "volume_1h.sqlite")
+    )
+    parser.add_argument("--start-ts", type=int)
+    parser.add_argument("--end-ts", type=int)
+    parser.add_argument("--max-cycles", type=int)
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Pace at N x real time (0 = as fast as possible)")
+    parser.add_argument("--market-mood", action="store_true")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Shard symbol detectors across N worker processes")
+    parser.add_argument("--json-out")
+    parser.add_argument("--baseline", help="Previous --json-out report to gate against")
+    parser.add_argument("--max-drift", type=float, default=0.25)
+    parser.add_argument("--min-cycles-per-sec", type=float)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    report = replay(
+        args.price_db,
+        args.volume_db,
+        start_ts=args.start_ts,
+        end_ts=args.end_ts,
+        max_cycles=args.max_cycles,
+        speed=args.speed,
+        include_market_mood=args.market_mood,
+        processes=args.processes,
+    )
+    _print_summary(report)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report.as_dict(), indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        failures = compare_to_baseline(
+            report,
+            baseline,
+            max_drift=args.max_drift,
+            min_cycles_per_s=args.min_cycles_per_sec,
+        )
+        for line in failures:
+            print(f"GATE FAIL {line}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""In-memory candidate index over stored user alert rules.
+
+The periodic scanner used to reload every evaluable rule and run
+``evaluate_rule`` on all of them, whether or not their symbol had moved. This
+index answers the narrower question "which rules could change state at this
+price?" so a price tick touches only those:
+
+``price_cross``   per symbol, four sorted boundary arrays — armed ``above`` /
+                  ``below`` targets and the re-arm levels of disarmed rules.
+                  A new price finds every crossed boundary with one bisect.
+``percent_move``  grouped by ``(symbol, window)``: one past-price lookup gives
+                  the rolling move, then sorted thresholds per direction are
+                  bisected the same way.
+
+Rules with an unconfirmed trigger (``pending_since_ts``) are always
+candidates for their symbol, so the sustained-crossing guard sees the
+condition go away exactly as it does in a full scan.
+
+The index is a filter, not a second source of truth. Entries carry only what
+the bisect needs; the runner loads the candidate rows from the database and
+runs the unchanged ``evaluate_rule`` on them. A missed entry would mean a
+missed alert, so the boundary formulas mirror ``alert_evaluator`` exactly.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable
+
+from alert_evaluator import (
+    DEFAULT_PERCENT_REARM_RATIO,
+    DEFAULT_RESET_PCT,
+    EVALUABLE_STATUSES,
+    WINDOW_SECONDS,
+)
+
+__all__ = ["RuleIndex", "RULE_INDEX"]
+
+
+def _num(value: Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return None
+    if f != f or f in (float("inf"), float("-inf")):
+        return None
+    return f
+
+
+class _SortedBook:
+    """Parallel (value, rule_id) arrays kept sorted by value."""
+
+    __slots__ = ("values", "ids")
+
+    def __init__(self):
+        self.values: list[float] = []
+        self.ids: list[str] = []
+
+    def add(self, value: float, rule_id: str) -> None:
+        i = bisect_right(self.values, value)
+        self.values.insert(i, value)
+        self.ids.insert(i, rule_id)
+
+    def discard(self, value: float, rule_id: str) -> None:
+        lo = bisect_left(self.values, value)
+        hi = bisect_right(self.values, value)
+        for i in range(lo, hi):
+            if self.ids[i] == rule_id:
+                del self.values[i]
+                del self.ids[i]
+                return
+
+    def below(self, value: float) -> list[str]:
+        """Ids with key < value."""
+        return self.ids[: bisect_left(self.values, value)]
+
+    def at_or_below(self, value: float) -> list[str]:
+        return self.ids[: bisect_right(self.values, value)]
+
+    def above(self, value: float) -> list[str]:
+        """Ids with key > value."""
+        return self.ids[bisect_right(self.values, value) :]
+
+    def at_or_above(self, value: float) -> list[str]:
+        return self.ids[bisect_left(self.values, value) :]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _entry(rule: dict[str, Any]) -> tuple | None:
+    """(book_key, side, value) placing the rule, or None if it never can fire."""
+    symbol = str(rule.get("symbol") or "").upper()
+    params = rule.get("params") if isinstance(rule.get("params"), dict) else {}
+    ttype = str(rule.get("trigger_type") or "").strip().lower()
+    direction = str(params.get("direction") or "").lower()
+    armed = bool(rule.get("armed", True))
+    if not symbol:
+        return None
+
+    if ttype == "price_cross":
+        boundary = _num(params.get("threshold"))
+        if boundary is None or boundary <= 0 or direction not in {"above", "below"}:
+            return None
+        if armed:
+            return (symbol, f"{direction}_armed", boundary)
+        reset_pct = _num(rule.get("reset_pct"))
+        if reset_pct is None or reset_pct < 0:
+            reset_pct = DEFAULT_RESET_PCT
+        if direction == "above":
+            return (symbol, "rearm_down", boundary * (1.0 - reset_pct / 100.0))
+        return (symbol, "rearm_up", boundary * (1.0 + reset_pct / 100.0))
+
+    if ttype == "percent_move":
+        threshold = _num(params.get("threshold"))
+        window = str(params.get("window") or "").lower()
+        if threshold is None or threshold <= 0 or window not in WINDOW_SECONDS:
+            return None
+        if direction not in {"up", "down", "either"}:
+            return None
+        if armed:
+            return ((symbol, window), f"{direction}_armed", threshold)
+        ratio = _num(rule.get("percent_rearm_ratio"))
+        if ratio is None or not (0 < ratio < 1):
+            ratio = DEFAULT_PERCENT_REARM_RATIO
+        return ((symbol, window), f"{direction}_rearm", threshold * ratio)
+
+    return None
+
+
+class RuleIndex:
+    """Thread-safe candidate index; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # rule_id -> (symbol, book_key, side, value, pending)
+        self._placed: dict[str, tuple] = {}
+        self._books: dict[Any, dict[str, _SortedBook]] = {}
+        self._windows: dict[str, set[str]] = {}
+        self._pending: dict[str, set[str]] = {}
+
+    # ─── maintenance ─────────────────────────────────────────────────────────
+
+    def load(self, rules: Iterable[dict[str, Any]]) -> None:
+        """Replace the whole index (startup and periodic resync)."""
+        with self._lock:
+            self._placed.clear()
+            self._books.clear()
+            self._windows.clear()
+            self._pending.clear()
+            for rule in rules or []:
+                self._add_locked(rule)
+
+    def upsert(self, rule: dict[str, Any]) -> None:
+        """Re-place one rule after it was created or its state changed."""
+        with self._lock:
+            self._remove_locked(str(rule.get("id") or ""))
+            self._add_locked(rule)
+
+    def remove(self, rule_id: str) -> None:
+        with self._lock:
+            self._remove_locked(str(rule_id or ""))
+
+    def _add_locked(self, rule: dict[str, Any]) -> None:
+        rule_id = str(rule.get("id") or "")
+        status = str(rule.get("status") or "active").strip().lower()
+        if not rule_id or status not in EVALUABLE_STATUSES:
+            return
+        placed = _entry(rule)
+        if placed is None:
+            return
+        book_key, side, value = placed
+        symbol = book_key[0] if isinstance(book_key, tuple) else book_key
+        pending = rule.get("pending_since_ts") is not None
+        self._books.setdefault(book_key, {}).setdefault(side, _SortedBook()).add(
+            value, rule_id
+        )
+        if isinstance(book_key, tuple):
+            self._windows.setdefault(symbol, set()).add(book_key[1])
+        if pending:
+            self._pending.setdefault(symbol, set()).add(rule_id)
+        self._placed[rule_id] = (symbol, book_key, side, value, pending)
+
+    def _remove_locked(self, rule_id: str) -> None:
+        placed = self._placed.pop(rule_id, None)
+        if placed is None:
+            return
+        symbol, book_key, side, value, pending = placed
+        sides = self._books.get(book_key) or {}
+        book = sides.get(side)
+        if book is not None:
+            book.discard(value, rule_id)
+            if not book:
+                del sides[side]
+        if not sides:
+            self._books.pop(book_key, None)
+            if isinstance(book_key, tuple):
+                windows = self._windows.get(symbol)
+                if windows is not None:
+                    windows.discard(book_key[1])
+                    if not windows:
+                        del self._windows[symbol]
+        if pending:
+            ids = self._pending.get(symbol)
+            if ids is not None:
+                ids.discard(rule_id)
+                if not ids:
+                    del self._pending[symbol]
+
+    # ─── queries ─────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._placed)
+
+    def has_symbol(self, symbol: str) -> bool:
+        sym = str(symbol or "").upper()
+        return sym in self._books or sym in self._windows or sym in self._pending
+
+    def symbols(self) -> set[str]:
+        with self._lock:
+            out = {k for k in self._books if not isinstance(k, tuple)}
+            out.update(self._windows)
+            out.update(self._pending)
+        return out
+
+    def candidates(
+        self,
+        symbol: str,
+        price: float,
+        past_price: Callable[[str], float | None] | None = None,
+    ) -> list[str]:
+        """Rule ids whose state could change at ``price``.
+
+        ``past_price(window)`` returns the comparison price for percent_move
+        groups (or None when history is unusable). It is only called for
+        windows that actually have rules on this symbol.
+        """
+        sym = str(symbol or "").upper()
+        price_f = _num(price)
+        if price_f is None or price_f <= 0:
+            return []
+        out: list[str] = []
+        with self._lock:
+            cross = self._books.get(sym) or {}
+            if cross:
+                # Mirrors _evaluate_price_cross: strict crossing to fire,
+                # inclusive retreat to re-arm.
+                book = cross.get("above_armed")
+                if book:
+                    out += book.below(price_f)
+                book = cross.get("below_armed")
+                if book:
+                    out += book.above(price_f)
+                book = cross.get("rearm_down")
+                if book:
+                    out += book.at_or_above(price_f)
+                book = cross.get("rearm_up")
+                if book:
+                    out += book.at_or_below(price_f)
+            windows = sorted(self._windows.get(sym) or ())
+            pending = list(self._pending.get(sym) or ())
+
+        for window in windows:
+            past = past_price(window) if past_price is not None else None
+            past = _num(past)
+            if past is None or past <= 0:
+                continue
+            move_pct = ((price_f - past) / past) * 100.0
+            magnitudes = {"up": move_pct, "down": -move_pct, "either": abs(move_pct)}
+            with self._lock:
+                sides = self._books.get((sym, window)) or {}
+                for direction, magnitude in magnitudes.items():
+                    book = sides.get(f"{direction}_armed")
+                    if book:
+                        out += book.at_or_below(magnitude)
+                    book = sides.get(f"{direction}_rearm")
+                    if book:
+                        out += book.above(magnitude)
+
+        if pending:
+            seen = set(out)
+            out += [rule_id for rule_id in pending if rule_id not in seen]
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rules": len(self._placed),
+                "symbols": len(
+                    {k for k in self._books if not isinstance(k, tuple)}
+                    | set(self._windows)
+                ),
+                "percent_groups": sum(1 for k in self._books if isinstance(k, tuple)),
+                "pending": sum(len(v) for v in self._pending.values()),
+            }
+
+
+RULE_INDEX = RuleIndex()
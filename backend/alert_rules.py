@@ -42,6 +42,7 @@ __all__ = [
     "create_rule",
     "list_rules",
     "list_evaluable_rules",
+    "get_rules_by_ids",
     "get_rule",
     "update_rule",
     "delete_rule",
@@ -49,6 +50,7 @@ __all__ = [
     "record_event",
     "apply_decision",
     "set_rule_pending",
+    "RuleStateBatch",
     "list_events",
     "build_recommendations",
     "list_recommendations",
@@ -453,7 +455,7 @@ def list_rules(user_id: int, *, status: str | None = None) -> list[dict[str, Any
         conn.close()
 
 
-def list_evaluable_rules(*, limit: int = 500) -> list[dict[str, Any]]:
+def list_evaluable_rules(*, limit: int | None = 500) -> list[dict[str, Any]]:
     """Every rule the background runner should evaluate, across all users.
 
     This is the one deliberately cross-user *read* in the module: the scan loop
@@ -463,6 +465,8 @@ def list_evaluable_rules(*, limit: int = 500) -> list[dict[str, Any]]:
 
     ``cooling_down`` is included on purpose: that is the only state from which
     a recurring rule can observe its reset boundary and re-arm.
+
+    ``limit=None`` returns every such rule; the rule index loads them all.
     """
     conn = _connect()
     try:
@@ -474,13 +478,46 @@ def list_evaluable_rules(*, limit: int = 500) -> list[dict[str, Any]]:
             ORDER BY symbol ASC, id ASC
             LIMIT ?
             """,
-            (_ts(_now()), max(1, min(int(limit), 5_000))),
+            (_ts(_now()), -1 if limit is None else max(1, min(int(limit), 5_000))),
         ).fetchall()
         return [_serialize_rule(r) for r in rows]
     finally:
         conn.close()
 
 
+def get_rules_by_ids(rule_ids) -> list[dict[str, Any]]:
+    """Evaluable rules with the given ids, across all users.
+
+    The same system read as ``list_evaluable_rules``, narrowed to the
+    candidates the rule index picked for a price tick. Unknown, paused or
+    expired ids are simply absent from the result.
+    """
+    ids = list(dict.fromkeys(str(i) for i in rule_ids or () if i))
+    if not ids:
+        return []
+    out: list[dict[str, Any]] = []
+    conn = _connect()
+    try:
+        now_ts = _ts(_now())
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            marks = ",".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT * FROM alert_rules
+                WHERE id IN ({marks})
+                  AND status IN ('active','cooling_down')
+                  AND (expires_ts IS NULL OR expires_ts > ?)
+                ORDER BY symbol ASC, id ASC
+                """,
+                (*chunk, now_ts),
+            ).fetchall()
+            out.extend(_serialize_rule(r) for r in rows)
+        return out
+    finally:
+        conn.close()
+
+
 def get_rule(user_id: int, rule_id: str) -> dict[str, Any] | None:
     """Always scoped by user_id — a rule id alone never grants access."""
     conn = _connect()
@@ -572,6 +609,90 @@ def delete_rule(user_id: int, rule_id: str) -> bool:
 # ─── events ──────────────────────────────────────────────────────────────────
 
 
+_PENDING_SQL = (
+    "UPDATE alert_rules SET pending_since_ts = ? WHERE id = ? AND user_id = ?"
+)
+
+_EVENT_INSERT_SQL = """
+    INSERT {conflict}INTO alert_events_user (
+        id, rule_id, user_id, symbol, event_type, observed_value,
+        boundary_value, comparison_value, window_label, triggered_at,
+        triggered_ts, explanation, fingerprint, status, delivery_status
+    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+def _pending_args(rule: dict[str, Any], pending_ts: float | None) -> tuple:
+    return (
+        int(pending_ts) if pending_ts is not None else None,
+        rule["id"],
+        rule["user_id"],
+    )
+
+
+def _event_args(rule: dict[str, Any], decision, now: datetime) -> tuple:
+    fingerprint = build_fingerprint(
+        rule["id"],
+        rule.get("arm_cycle", 0),
+        decision.event_type,
+        decision.boundary_value,
+    )
+    return (
+        f"evt_{uuid.uuid4().hex[:16]}",
+        rule["id"],
+        rule["user_id"],
+        rule["symbol"],
+        decision.event_type,
+        decision.observed_value,
+        decision.boundary_value,
+        decision.comparison_value,
+        decision.window_label,
+        _iso(now),
+        _ts(now),
+        decision.explanation,
+        fingerprint,
+        "triggered",
+        "pending",
+    )
+
+
+def _decision_update(
+    rule: dict[str, Any], decision, now: datetime
+) -> tuple[str, list[Any]]:
+    """The rule UPDATE for one evaluated decision, as (sql, args)."""
+    sets = ["last_evaluated_at = ?"]
+    args: list[Any] = [_iso(now)]
+
+    if decision.should_fire:
+        sets += ["last_triggered_at = ?", "last_triggered_ts = ?"]
+        args += [_iso(now), _ts(now)]
+        # A confirmed trigger consumes its pending state.
+        sets.append("pending_since_ts = ?")
+        args.append(None)
+        # A one-time rule is finished; a recurring rule cools down.
+        new_status = (
+            "triggered"
+            if str(rule.get("repeat_mode")).lower() == "once"
+            else "cooling_down"
+        )
+        sets.append("status = ?")
+        args.append(new_status)
+
+    if decision.armed_changed:
+        sets.append("armed = ?")
+        args.append(1 if decision.next_armed else 0)
+        if decision.next_armed:
+            # Re-arming opens a new cycle, allowing a genuinely new event.
+            sets.append("arm_cycle = ?")
+            args.append(rule.get("arm_cycle", 0) + 1)
+            if str(rule.get("status")) == "cooling_down":
+                sets.append("status = ?")
+                args.append("active")
+
+    args += [rule["id"], rule["user_id"]]
+    return f"UPDATE alert_rules SET {', '.join(sets)} WHERE id = ? AND user_id = ?", args
+
+
 def set_rule_pending(rule: dict[str, Any], pending_ts: float | None) -> None:
     """Record (or clear) an unconfirmed trigger for the sustained-crossing guard.
 
@@ -582,14 +703,7 @@ def set_rule_pending(rule: dict[str, Any], pending_ts: float | None) -> None:
     """
     conn = _connect()
     try:
-        conn.execute(
-            "UPDATE alert_rules SET pending_since_ts = ? WHERE id = ? AND user_id = ?",
-            (
-                int(pending_ts) if pending_ts is not None else None,
-                rule["id"],
-                rule["user_id"],
-            ),
-        )
+        conn.execute(_PENDING_SQL, _pending_args(rule, pending_ts))
         conn.commit()
     finally:
         conn.close()
@@ -601,44 +715,13 @@ def record_event(rule: dict[str, Any], decision, *, now: datetime | None = None)
     The UNIQUE fingerprint makes duplicate suppression a storage guarantee, so
     a restart mid-cycle cannot produce a second event for the same firing.
     """
-    now = now or _now()
-    fingerprint = build_fingerprint(
-        rule["id"],
-        rule.get("arm_cycle", 0),
-        decision.event_type,
-        decision.boundary_value,
-    )
+    row_args = _event_args(rule, decision, now or _now())
     conn = _connect()
     try:
-        conn.execute(
-            """
-            INSERT INTO alert_events_user (
-                id, rule_id, user_id, symbol, event_type, observed_value,
-                boundary_value, comparison_value, window_label, triggered_at,
-                triggered_ts, explanation, fingerprint, status, delivery_status
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                f"evt_{uuid.uuid4().hex[:16]}",
-                rule["id"],
-                rule["user_id"],
-                rule["symbol"],
-                decision.event_type,
-                decision.observed_value,
-                decision.boundary_value,
-                decision.comparison_value,
-                decision.window_label,
-                _iso(now),
-                _ts(now),
-                decision.explanation,
-                fingerprint,
-                "triggered",
-                "pending",
-            ),
-        )
+        conn.execute(_EVENT_INSERT_SQL.format(conflict=""), row_args)
         conn.commit()
         row = conn.execute(
-            "SELECT * FROM alert_events_user WHERE fingerprint = ?", (fingerprint,)
+            "SELECT * FROM alert_events_user WHERE fingerprint = ?", (row_args[12],)
         ).fetchone()
         return _serialize_event(row) if row else None
     except sqlite3.IntegrityError:
@@ -654,42 +737,10 @@ def apply_decision(rule: dict[str, Any], decision, *, now: datetime | None = Non
     """
     now = now or _now()
     event = None
+    sql, args = _decision_update(rule, decision, now)
     conn = _connect()
     try:
-        sets = ["last_evaluated_at = ?"]
-        args: list[Any] = [_iso(now)]
-
-        if decision.should_fire:
-            sets += ["last_triggered_at = ?", "last_triggered_ts = ?"]
-            args += [_iso(now), _ts(now)]
-            # A confirmed trigger consumes its pending state.
-            sets.append("pending_since_ts = ?")
-            args.append(None)
-            # A one-time rule is finished; a recurring rule cools down.
-            new_status = (
-                "triggered"
-                if str(rule.get("repeat_mode")).lower() == "once"
-                else "cooling_down"
-            )
-            sets.append("status = ?")
-            args.append(new_status)
-
-        if decision.armed_changed:
-            sets.append("armed = ?")
-            args.append(1 if decision.next_armed else 0)
-            if decision.next_armed:
-                # Re-arming opens a new cycle, allowing a genuinely new event.
-                sets.append("arm_cycle = ?")
-                args.append(rule.get("arm_cycle", 0) + 1)
-                if str(rule.get("status")) == "cooling_down":
-                    sets.append("status = ?")
-                    args.append("active")
-
-        args += [rule["id"], rule["user_id"]]
-        conn.execute(
-            f"UPDATE alert_rules SET {', '.join(sets)} WHERE id = ? AND user_id = ?",
-            args,
-        )
+        conn.execute(sql, args)
         conn.commit()
     finally:
         conn.close()
@@ -699,6 +750,82 @@ def apply_decision(rule: dict[str, Any], decision, *, now: datetime | None = Non
     return event
 
 
+class RuleStateBatch:
+    """Rule-state writes and events from one runner cycle, committed together.
+
+    ``set_pending`` and ``apply`` queue exactly what ``set_rule_pending`` and
+    ``apply_decision`` would write; ``flush`` sends them over one connection
+    in one transaction with ``executemany`` (updates grouped by statement
+    shape). Events go in with ``INSERT OR IGNORE`` so the UNIQUE fingerprint
+    still drops a second event for the same arm cycle; ``flush`` reports which
+    ones were actually inserted.
+    """
+
+    def __init__(self):
+        self._pending: list[tuple] = []
+        self._updates: dict[str, list[list[Any]]] = {}
+        self._events: list[tuple[dict[str, Any], tuple]] = []
+
+    def __len__(self) -> int:
+        return (
+            len(self._pending)
+            + sum(len(rows) for rows in self._updates.values())
+            + len(self._events)
+        )
+
+    def set_pending(self, rule: dict[str, Any], pending_ts: float | None) -> None:
+        self._pending.append(_pending_args(rule, pending_ts))
+
+    def apply(self, rule: dict[str, Any], decision, *, now: datetime | None = None):
+        now = now or _now()
+        sql, args = _decision_update(rule, decision, now)
+        self._updates.setdefault(sql, []).append(args)
+        if decision.should_fire:
+            self._events.append((rule, _event_args(rule, decision, now)))
+
+    def flush(self) -> list[tuple[dict[str, Any], dict[str, Any] | None]]:
+        """Commit everything queued. Returns ``(rule, event_or_None)`` per fire.
+
+        All-or-nothing: on error the transaction is rolled back, the queue is
+        kept, and the exception propagates to the caller.
+        """
+        if not len(self):
+            return []
+        conn = _connect()
+        try:
+            if self._pending:
+                conn.executemany(_PENDING_SQL, self._pending)
+            for sql, rows in self._updates.items():
+                conn.executemany(sql, rows)
+            if self._events:
+                conn.executemany(
+                    _EVENT_INSERT_SQL.format(conflict="OR IGNORE "),
+                    [row for _rule, row in self._events],
+                )
+            conn.commit()
+
+            ids = [row[0] for _rule, row in self._events]
+            inserted: dict[str, dict[str, Any]] = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                marks = ",".join("?" for _ in chunk)
+                for row in conn.execute(
+                    f"SELECT * FROM alert_events_user WHERE id IN ({marks})", chunk
+                ).fetchall():
+                    inserted[row["id"]] = _serialize_event(row)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        out = [(rule, inserted.get(row[0])) for rule, row in self._events]
+        self._pending.clear()
+        self._updates.clear()
+        self._events.clear()
+        return out
+
+
 def list_events(user_id: int, *, limit: int = 50, symbol: str | None = None):
     conn = _connect()
     try:
@@ -16,6 +16,7 @@ from typing import Any
 from flask import Blueprint, jsonify, request
 
 import alert_rules
+from alert_rule_index import RULE_INDEX
 from alert_rules import RuleError
 from watchlist import get_authenticated_user
 
@@ -60,6 +61,16 @@ def _envelope(payload: dict[str, Any]) -> dict[str, Any]:
 # ─── rules ───────────────────────────────────────────────────────────────────
 
 
+def _reindex(rule: dict[str, Any] | None) -> None:
+    """Keep the scanner's rule index in step with a write; never fails a request."""
+    if not rule:
+        return
+    try:
+        RULE_INDEX.upsert(rule)
+    except Exception:
+        logger.exception("[alert-rules] index update failed for %s", rule.get("id"))
+
+
 @alert_rules_bp.route("/api/alert-rules", methods=["GET"])
 def list_alert_rules():
     user_id = _current_user_id()
@@ -106,6 +117,7 @@ def create_alert_rule():
         logger.exception("[alert-rules] create failed")
         return jsonify({"error": "Could not create that alert."}), 500
 
+    _reindex(rule)
     return jsonify(_envelope({"rule": rule})), 201
 
 
@@ -152,6 +164,7 @@ def update_alert_rule(rule_id):
 
     if not rule:
         return jsonify({"error": "Alert not found."}), 404
+    _reindex(rule)
     return jsonify(_envelope({"rule": rule}))
 
 
@@ -175,6 +188,7 @@ def _set_status(rule_id: str, status: str):
         return jsonify({"error": str(exc)}), 400
     if not rule:
         return jsonify({"error": "Alert not found."}), 404
+    _reindex(rule)
     return jsonify(_envelope({"rule": rule}))
 
 
@@ -185,6 +199,7 @@ def delete_alert_rule(rule_id):
         return _unauthorized()
     if not alert_rules.delete_rule(user_id, rule_id):
         return jsonify({"error": "Alert not found."}), 404
+    RULE_INDEX.remove(rule_id)
     return jsonify(_envelope({"deleted": True, "id": rule_id}))
 
 
@@ -239,6 +254,7 @@ def accept_alert_recommendation(rec_id):
     except Exception:
         logger.exception("[alert-rules] accept failed")
         return jsonify({"error": "Could not enable that suggestion."}), 500
+    _reindex(rule)
     return jsonify(_envelope({"rule": rule})), 201
 
 
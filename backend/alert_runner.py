@@ -1,7 +1,8 @@
 """Background evaluation of stored user alert rules.
 
 One cycle = load evaluable rules, resolve the market data each one needs, call
-the pure ``evaluate_rule``, and persist the outcome through ``apply_decision``.
+the pure ``evaluate_rule``, and persist every outcome of the cycle in one
+``RuleStateBatch`` transaction.
 Events land only in ``alert_events_user``, scoped to the rule's owner. Nothing
 here reads or writes the legacy market-wide feed.
 
@@ -13,6 +14,10 @@ with plain dicts — no network, no app import, no real clock:
 
 Failure isolation is per rule: one bad rule, symbol, or user increments an
 error counter and the cycle continues.
+
+``run_indexed_evaluation`` is the tick-driven variant: an ``alert_rule_index``
+picks the rules whose state can change at the new prices, only those are
+loaded and evaluated, and every rule whose stored state changed is re-indexed.
 """
 
 from __future__ import annotations
@@ -30,6 +35,7 @@ logger = logging.getLogger(__name__)
 __all__ = [
     "CycleStats",
     "run_evaluation_cycle",
+    "run_indexed_evaluation",
     "history_drift_tolerance",
     "DEFAULT_SUSTAIN_SECONDS",
 ]
@@ -151,12 +157,14 @@ def _evaluate_one(
     now: float,
     stats: CycleStats,
     sustain_seconds: float,
-) -> None:
+    batch: alert_rules.RuleStateBatch,
+) -> bool:
+    """Evaluate one rule and queue its writes; True when its state will change."""
     symbol = str(rule.get("symbol") or "").upper()
     price = _resolve_price(prices, symbol)
     if price is None:
         stats.skip("no_price")
-        return
+        return False
 
     obs: dict[str, Any] = {"price": price, "price_ts": snapshot_ts}
 
@@ -164,7 +172,7 @@ def _evaluate_one(
         past = _past_price_for(rule, history_lookup, cache, now)
         if past is None:
             stats.skip("no_comparison_price")
-            return
+            return False
         obs["past_price"] = past
 
     decision = evaluate_rule(rule, obs, now_ts=now)
@@ -178,21 +186,21 @@ def _evaluate_one(
     if decision.should_fire:
         # Sustained-crossing guard: a condition must survive to a later cycle.
         if pending_since is None:
-            alert_rules.set_rule_pending(rule, now)
+            batch.set_pending(rule, now)
             stats.pending += 1
             logger.debug(
                 "[alert-runner] rule %s condition pending confirmation (%s)",
                 rule["id"],
                 symbol,
             )
-            return
+            return True
         if (now - float(pending_since)) < sustain_seconds:
             stats.skip("awaiting_confirmation")
-            return
+            return False
         # Confirmed on a second consecutive cycle — fall through and fire.
     elif pending_since is not None:
         # The condition went away before confirming: a spike, not a move.
-        alert_rules.set_rule_pending(rule, None)
+        batch.set_pending(rule, None)
         stats.unconfirmed += 1
         logger.info(
             "[alert-runner] rule %s condition vanished before confirmation (%s); "
@@ -205,11 +213,27 @@ def _evaluate_one(
     # cycle would be pure amplification; last_evaluated_at therefore reflects
     # the last state-changing evaluation.
     if not (decision.should_fire or decision.armed_changed):
-        return
+        return pending_since is not None
 
-    event = alert_rules.apply_decision(rule, decision)
+    batch.apply(rule, decision)
+    if not decision.should_fire and decision.armed_changed and decision.next_armed:
+        stats.rearmed += 1
+    return True
 
-    if decision.should_fire:
+
+def _flush(batch: alert_rules.RuleStateBatch, stats: CycleStats) -> bool:
+    """Commit a cycle's queued writes in one transaction. False on failure.
+
+    A failed flush writes nothing, so every rule keeps its stored state and
+    the next cycle re-evaluates it from there.
+    """
+    try:
+        results = batch.flush()
+    except Exception:
+        stats.errors += 1
+        logger.exception("[alert-runner] could not persist %d rule writes", len(batch))
+        return False
+    for rule, event in results:
         if event:
             stats.fired += 1
             logger.info(
@@ -217,14 +241,13 @@ def _evaluate_one(
                 event["id"],
                 rule["id"],
                 rule["user_id"],
-                symbol,
-                decision.event_type,
+                rule.get("symbol"),
+                event["event_type"],
             )
         else:
             # Fingerprint collision: this arm cycle already produced an event.
             stats.skip("duplicate_event")
-    elif decision.armed_changed and decision.next_armed:
-        stats.rearmed += 1
+    return True
 
 
 def run_evaluation_cycle(
@@ -281,6 +304,7 @@ def run_evaluation_cycle(
 
     stats.rules_loaded = len(rules)
     cache: dict[tuple[str, str], float | None] = {}
+    batch = alert_rules.RuleStateBatch()
 
     for rule in rules:
         try:
@@ -293,6 +317,7 @@ def run_evaluation_cycle(
                 now,
                 stats,
                 sustain_seconds,
+                batch,
             )
         except Exception:
             stats.errors += 1
@@ -303,9 +328,130 @@ def run_evaluation_cycle(
             )
             continue
 
+    _flush(batch, stats)
+
     stats.duration_ms = (time.perf_counter() - started) * 1000
     if stats.fired or stats.errors or stats.rearmed or stats.unconfirmed:
         logger.info("[alert-runner] cycle %s", stats.as_dict())
     else:
         logger.debug("[alert-runner] cycle %s", stats.as_dict())
     return stats
+
+
+def run_indexed_evaluation(
+    index,
+    prices: dict[str, Any],
+    snapshot_ts: int,
+    *,
+    history_lookup: Callable[[str, int], tuple[int, float] | None],
+    now_ts: float | None = None,
+    symbols=None,
+    past_cache: dict[tuple[str, str], float | None] | None = None,
+    sustain_seconds: float = DEFAULT_SUSTAIN_SECONDS,
+) -> CycleStats:
+    """Evaluate only the rules ``index`` selects at ``prices``. Never raises.
+
+    ``prices`` maps product ids (or bare symbols) to prices; ``symbols``
+    restricts the pass to the symbols that just ticked. ``past_cache`` may be
+    kept by the caller across calls so rolling-window lookups are not repeated
+    on every tick; entries are per ``(product_id, window)``, as in a full cycle.
+    Rules whose state changed are re-fetched and upserted into ``index``.
+    """
+    stats = CycleStats()
+    started = time.perf_counter()
+    now = time.time() if now_ts is None else float(now_ts)
+    cache = {} if past_cache is None else past_cache
+
+    if not isinstance(prices, dict) or not prices:
+        stats.skip("no_price_snapshot")
+        stats.duration_ms = (time.perf_counter() - started) * 1000
+        return stats
+    age = now - float(snapshot_ts or 0)
+    if age > MAX_PRICE_AGE_SECONDS:
+        stats.skip("stale_snapshot")
+        stats.duration_ms = (time.perf_counter() - started) * 1000
+        return stats
+
+    if symbols is None:
+        wanted = index.symbols()
+    else:
+        wanted = {str(s or "").upper() for s in symbols}
+
+    candidate_ids: list[str] = []
+    for symbol in sorted(wanted):
+        price = _resolve_price(prices, symbol)
+        if price is None:
+            continue
+
+        def past_price(window, _symbol=symbol):
+            probe = {"symbol": _symbol, "params": {"window": window}}
+            return _past_price_for(probe, history_lookup, cache, now)
+
+        try:
+            candidate_ids.extend(index.candidates(symbol, price, past_price))
+        except Exception:
+            stats.errors += 1
+            logger.exception("[alert-runner] index lookup failed for %s", symbol)
+
+    if not candidate_ids:
+        stats.duration_ms = (time.perf_counter() - started) * 1000
+        return stats
+
+    try:
+        rules = alert_rules.get_rules_by_ids(candidate_ids)
+    except Exception:
+        logger.exception("[alert-runner] could not load candidate rules")
+        stats.errors += 1
+        stats.duration_ms = (time.perf_counter() - started) * 1000
+        return stats
+
+    stats.rules_loaded = len(rules)
+    loaded = {rule["id"] for rule in rules}
+    changed: list[str] = []
+    batch = alert_rules.RuleStateBatch()
+    for rule in rules:
+        try:
+            if _evaluate_one(
+                rule,
+                prices,
+                snapshot_ts,
+                history_lookup,
+                cache,
+                now,
+                stats,
+                sustain_seconds,
+                batch,
+            ):
+                changed.append(rule["id"])
+        except Exception:
+            stats.errors += 1
+            logger.exception(
+                "[alert-runner] rule %s (user %s) failed; continuing",
+                rule.get("id"),
+                rule.get("user_id"),
+            )
+
+    # Candidates that no longer load were paused, deleted or expired behind
+    # the index's back; drop them so they stop costing a query per tick.
+    for rule_id in set(candidate_ids) - loaded:
+        index.remove(rule_id)
+    if changed and _flush(batch, stats):
+        try:
+            fresh = {r["id"]: r for r in alert_rules.get_rules_by_ids(changed)}
+        except Exception:
+            logger.exception("[alert-runner] could not re-index changed rules")
+            stats.errors += 1
+            fresh = None
+        if fresh is not None:
+            for rule_id in changed:
+                if rule_id in fresh:
+                    index.upsert(fresh[rule_id])
+                else:
+                    index.remove(rule_id)
+
+    stats.duration_ms = (time.perf_counter() - started) * 1000
+    if stats.fired or stats.errors or stats.rearmed or stats.unconfirmed:
+        logger.info("[alert-runner] indexed pass %s", stats.as_dict())
+    else:
+        logger.debug("[alert-runner] indexed pass %s", stats.as_dict())
+    return stats
@@ -42,9 +42,11 @@ Storage:
 from __future__ import annotations
 
 import time
+import time as _time
 import uuid
 import math
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
@@ -351,6 +353,38 @@ class MarketPressure:
     score01: float = 0.5
     components: dict[str, float] = field(default_factory=dict)
     ts: int = 0
+    # Per-detector cost for the compute_alerts() call that produced this value.
+    detectors: dict[str, DetectorStats] = field(default_factory=dict)
+
+
+@dataclass
+class DetectorStats:
+    """Cost and yield of one detector (or shaping pass) in a compute cycle."""
+
+    elapsed_ms: float = 0.0
+    scanned: int = 0  # symbols/rows the detector iterated
+    candidates: int = 0  # alerts it produced before shaping
+    survived: int = 0  # of those, alerts left after _shape/_prune
+
+
+def _run_detector(
+    stats: dict[str, DetectorStats],
+    origin: dict[int, str],
+    name: str,
+    scanned: int,
+    fn: Any,
+    *args: Any,
+) -> list[dict]:
+    t0 = time.perf_counter()
+    out = fn(*args) or []
+    stats[name] = DetectorStats(
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+        scanned=int(scanned),
+        candidates=len(out),
+    )
+    for alert in out:
+        origin[id(alert)] = name
+    return out
 
 
 def _clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
@@ -2050,14 +2084,31 @@ def _detect_coin_exhaustion_alerts(
     return alerts
 
 
+def _universe_median_pct_3m(price_snapshot: dict[str, dict]) -> float:
+    returns_3m = [
+        r
+        for r in (
+            _to_float_or_none((pdata or {}).get("pct_3m"))
+            for pdata in (price_snapshot or {}).values()
+        )
+        if r is not None
+    ]
+    return _median(returns_3m)
+
+
 def _detect_coin_mood_alerts(
     price_snapshot: dict[str, dict],
     volume_snapshot: dict[str, dict],
     pressure: MarketPressure,
     state: AlertEngineState,
     thresholds: dict,
+    median_pct_3m: float | None = None,
 ) -> list[dict]:
-    """Detect coin-scoped mood alerts using market context, never MARKET symbol."""
+    """Detect coin-scoped mood alerts using market context, never MARKET symbol.
+
+    ``median_pct_3m`` lets a caller that scans only a slice of the universe
+    (see alerts_parallel) supply the full-universe median.
+    """
     alerts: list[dict] = []
     t = thresholds
 
@@ -2078,15 +2129,8 @@ def _detect_coin_mood_alerts(
     mpi_delta_60s = _pressure_delta_seconds(state, 60)
 
     ratio_ref = float(t.get("pressure_vol_ratio_ref", 5.0) or 5.0)
-    returns_3m = [
-        r
-        for r in (
-            _to_float_or_none((pdata or {}).get("pct_3m"))
-            for pdata in (price_snapshot or {}).values()
-        )
-        if r is not None
-    ]
-    median_pct_3m = _median(returns_3m)
+    if median_pct_3m is None:
+        median_pct_3m = _universe_median_pct_3m(price_snapshot)
     if not price_snapshot:
         return alerts
 
@@ -2652,6 +2696,124 @@ def _prune_alerts(
     return out
 
 
+# ---------------------------------------------------------------------------
+# Engine clock (offline replay)
+# ---------------------------------------------------------------------------
+
+
+class ReplayTime:
+    """Stand-in for the ``time`` module whose ``time()`` returns ``now``."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = float(now)
+
+    def time(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+
+@contextmanager
+def replay_clock(clock):
+    """Point this module's wall clock at ``clock.now`` for the duration.
+
+    Cooldowns read ``time.time()``/``datetime.now()``; alert_replay and the
+    shard workers of a replay drive them from the tape timestamp instead.
+    """
+    global time, datetime
+
+    class _ReplayDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.now, tz)
+
+    saved = (time, datetime)
+    time, datetime = clock, _ReplayDatetime
+    try:
+        yield clock
+    finally:
+        time, datetime = saved
+
+
+# ---------------------------------------------------------------------------
+# Symbol-local detectors (shardable)
+# ---------------------------------------------------------------------------
+
+# Detectors whose alerts and state depend only on the symbol being scanned
+# (plus read-only market context), in the order compute_alerts runs them.
+# alerts_parallel shards these across processes. Persistence is deliberately
+# absent: its rank evidence spans the whole universe.
+SHARDABLE_DETECTORS = (
+    "coin_reversal",
+    "coin_fakeout",
+    "coin_trend_break",
+    "coin_exhaustion",
+    "coin_volatility_expansion",
+    "coin_liquidity_shock",
+    "coin_squeeze_break",
+    "coin_mood",
+)
+
+
+def run_symbol_detectors(
+    price_snapshot: dict[str, dict],
+    volume_snapshot: dict[str, dict],
+    minute_volumes: dict[str, list],
+    pressure: MarketPressure,
+    state: AlertEngineState,
+    t: dict,
+    median_pct_3m: float | None = None,
+) -> tuple[dict[str, list[dict]], dict[str, DetectorStats]]:
+    """Run SHARDABLE_DETECTORS over (a slice of) the universe.
+
+    Returns ``({name: alerts}, {name: DetectorStats})`` in detector order.
+    """
+    stats: dict[str, DetectorStats] = {}
+    origin: dict[int, str] = {}
+    n_price = len(price_snapshot or {})
+    out: dict[str, list[dict]] = {}
+    out["coin_reversal"] = _run_detector(
+        stats, origin, "coin_reversal", n_price,
+        _detect_coin_reversal_alerts, price_snapshot, state, t,
+    )
+    out["coin_fakeout"] = _run_detector(
+        stats, origin, "coin_fakeout", n_price,
+        _detect_coin_fakeout_alerts, price_snapshot, state, t,
+    )
+    out["coin_trend_break"] = _run_detector(
+        stats, origin, "coin_trend_break", n_price,
+        _detect_coin_trend_break_alerts, price_snapshot, volume_snapshot, state, t,
+    )
+    fakeout_symbols = {
+        str((a or {}).get("symbol") or "").upper() for a in out["coin_fakeout"]
+    }
+    out["coin_exhaustion"] = _run_detector(
+        stats, origin, "coin_exhaustion", n_price,
+        _detect_coin_exhaustion_alerts,
+        price_snapshot, volume_snapshot, state, t, fakeout_symbols,
+    )
+    out["coin_volatility_expansion"] = _run_detector(
+        stats, origin, "coin_volatility_expansion", len(state.coin_return_hist),
+        _detect_coin_volatility_expansion_alerts, price_snapshot, state, t,
+    )
+    out["coin_liquidity_shock"] = _run_detector(
+        stats, origin, "coin_liquidity_shock", len(minute_volumes or {}),
+        _detect_coin_liquidity_shock_alerts,
+        price_snapshot, volume_snapshot, minute_volumes, state, t,
+    )
+    out["coin_squeeze_break"] = _run_detector(
+        stats, origin, "coin_squeeze_break", n_price,
+        _detect_coin_squeeze_break_alerts, price_snapshot, state, t,
+    )
+    out["coin_mood"] = _run_detector(
+        stats, origin, "coin_mood", n_price,
+        _detect_coin_mood_alerts,
+        price_snapshot, volume_snapshot, pressure, state, t, median_pct_3m,
+    )
+    return out, stats
+
+
 # ---------------------------------------------------------------------------
 # Main entry point — pure function
 # ---------------------------------------------------------------------------
@@ -2666,6 +2828,7 @@ def compute_alerts(
     thresholds: dict | None = None,
     include_impulse: bool = True,
     include_market_mood: bool = False,
+    shard_pool: Any = None,
 ) -> tuple[list[dict], AlertEngineState, MarketPressure]:
     """Compute all alerts from current inputs.
 
@@ -2674,28 +2837,71 @@ def compute_alerts(
             Use False in production while SWR builders still emit impulse alerts.
         include_market_mood: If True, allow rare standalone MARKET sirens
             (confluence + persistence + cooldown).
+        shard_pool: Optional alerts_parallel.ShardedDetectorPool. When given,
+            SHARDABLE_DETECTORS run on symbol shards in worker processes; the
+            merged candidates match the serial path.
 
     Returns:
-        (alerts, updated_state, market_pressure)
+        (alerts, updated_state, market_pressure). ``market_pressure.detectors``
+        carries per-detector DetectorStats for this call.
     """
     t = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
     _warm_return_hist(state, price_snapshot, t)
 
     all_alerts: list[dict] = []
+    stats: dict[str, DetectorStats] = {}
+    origin: dict[int, str] = {}
+    n_price = len(price_snapshot or {})
+    n_volume = len(volume_snapshot or {})
 
     # 1. Impulse alerts — enabled by default; call-sites may disable via include_impulse=False
     if include_impulse:
-        all_alerts.extend(_detect_impulse_alerts(price_snapshot, state, t))
+        all_alerts.extend(
+            _run_detector(
+                stats,
+                origin,
+                "impulse",
+                n_price,
+                _detect_impulse_alerts,
+                price_snapshot,
+                state,
+                t,
+            )
+        )
 
     # 2. Whale alerts (aggregated flow spike)
     all_alerts.extend(
-        _detect_whale_alerts(price_snapshot, volume_snapshot, minute_volumes, state, t)
+        _run_detector(
+            stats,
+            origin,
+            "whale",
+            n_volume,
+            _detect_whale_alerts,
+            price_snapshot,
+            volume_snapshot,
+            minute_volumes,
+            state,
+            t,
+        )
     )
 
     # 3. Stealth alerts (loud volume, quiet price)
-    all_alerts.extend(_detect_stealth_alerts(price_snapshot, volume_snapshot, state, t))
+    all_alerts.extend(
+        _run_detector(
+            stats,
+            origin,
+            "stealth",
+            n_volume,
+            _detect_stealth_alerts,
+            price_snapshot,
+            volume_snapshot,
+            state,
+            t,
+        )
+    )
 
     # 4. Market pressure + FOMO/FEAR
+    t0 = time.perf_counter()
     pressure = compute_market_pressure(
         price_snapshot=price_snapshot,
         volume_snapshot=volume_snapshot,
@@ -2703,49 +2909,79 @@ def compute_alerts(
         state=state,
     )
     _record_pressure_index(state, pressure.index)
-
-    # 5. Coin-structure alerts (reversal/fakeout/trend-break/exhaustion/persistence)
-    reversal_alerts = _detect_coin_reversal_alerts(price_snapshot, state, t)
-    fakeout_alerts = _detect_coin_fakeout_alerts(price_snapshot, state, t)
-    trend_break_alerts = _detect_coin_trend_break_alerts(
-        price_snapshot, volume_snapshot, state, t
-    )
-    fakeout_symbols = {
-        str((a or {}).get("symbol") or "").upper() for a in fakeout_alerts
-    }
-    exhaustion_alerts = _detect_coin_exhaustion_alerts(
-        price_snapshot, volume_snapshot, state, t, fakeout_symbols
+    stats["market_pressure"] = DetectorStats(
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0, scanned=n_price
     )
-    persistence_alerts = _detect_coin_persistence_alerts(price_snapshot, state, t)
-    all_alerts.extend(reversal_alerts)
-    all_alerts.extend(fakeout_alerts)
-    all_alerts.extend(trend_break_alerts)
-    all_alerts.extend(exhaustion_alerts)
-    all_alerts.extend(persistence_alerts)
-
-    # 6. Coin wake-up alerts (volatility expansion / liquidity shock / squeeze-break)
-    all_alerts.extend(
-        _detect_coin_volatility_expansion_alerts(price_snapshot, state, t)
-    )
-    all_alerts.extend(
-        _detect_coin_liquidity_shock_alerts(
-            price_snapshot, volume_snapshot, minute_volumes, state, t
+
+    # 5-7. Symbol-local coin detectors, sharded across processes when a pool
+    # is given. Persistence reads only its own streaks (and its rank evidence
+    # spans the universe), so it runs here unsharded and its alerts are
+    # spliced back into serial order.
+    if shard_pool is not None:
+        by_name, symbol_stats = shard_pool.run(
+            price_snapshot, volume_snapshot, minute_volumes, pressure, state, t
+        )
+    else:
+        by_name, symbol_stats = run_symbol_detectors(
+            price_snapshot, volume_snapshot, minute_volumes, pressure, state, t
         )
+    by_name["coin_persistence"] = _run_detector(
+        symbol_stats,
+        origin,
+        "coin_persistence",
+        n_price,
+        _detect_coin_persistence_alerts,
+        price_snapshot,
+        state,
+        t,
     )
-    all_alerts.extend(_detect_coin_squeeze_break_alerts(price_snapshot, state, t))
+    for name in (
+        "coin_reversal",
+        "coin_fakeout",
+        "coin_trend_break",
+        "coin_exhaustion",
+        "coin_persistence",
+        "coin_volatility_expansion",
+        "coin_liquidity_shock",
+        "coin_squeeze_break",
+        "coin_mood",
+    ):
+        if name in symbol_stats:
+            stats[name] = symbol_stats[name]
+        for alert in by_name.get(name) or []:
+            origin[id(alert)] = name
+            all_alerts.append(alert)
 
-    # 7. Coin-scoped mood alerts (market-aware context, never MARKET symbol)
+    # 8. Divergence alerts (timeframe disagreement + market pressure context)
     all_alerts.extend(
-        _detect_coin_mood_alerts(price_snapshot, volume_snapshot, pressure, state, t)
+        _run_detector(
+            stats,
+            origin,
+            "divergence",
+            n_price,
+            _detect_divergence_alerts,
+            price_snapshot,
+            pressure,
+            state,
+            t,
+        )
     )
 
-    # 8. Divergence alerts (timeframe disagreement + market pressure context)
-    all_alerts.extend(_detect_divergence_alerts(price_snapshot, pressure, state, t))
-
     # 9. Optional standalone market sirens (disabled by default).
     if include_market_mood:
-        all_alerts.extend(_detect_market_siren_alerts(pressure, fg_value, state, t))
-
+        all_alerts.extend(
+            _run_detector(
+                stats,
+                origin,
+                "market_siren",
+                1,
+                _detect_market_siren_alerts,
+                pressure,
+                fg_value,
+                state,
+                t,
+            )
+        )
     # Attach market mood context to all coin alerts for richer coin-popup display.
     _attach_coin_mood_context(all_alerts, pressure)
 
@@ -2767,13 +3003,35 @@ def compute_alerts(
     ]
 
     # Family-level shaping pass (cooldowns + soft cap) before final ranking cap.
+    n_in = len(all_alerts)
+    t0 = time.perf_counter()
     all_alerts = _shape_alert_stream(all_alerts, state, t)
+    stats["shape_alert_stream"] = DetectorStats(
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+        scanned=n_in,
+        candidates=len(all_alerts),
+    )
 
     # Final shaping: keep it lively, not spammy.
+    n_in = len(all_alerts)
+    t0 = time.perf_counter()
     all_alerts = _prune_alerts(
         all_alerts,
         max_total=int(t.get("alerts_max_total", 24)),
         max_per_symbol=int(t.get("alerts_max_per_symbol", 2)),
     )
+    stats["prune_alerts"] = DetectorStats(
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+        scanned=n_in,
+        candidates=len(all_alerts),
+    )
+
+    # Shaping passes keep alert dicts by identity, so survivors map straight
+    # back to the detector that produced them.
+    for alert in all_alerts:
+        name = origin.get(id(alert))
+        if name is not None:
+            stats[name].survived += 1
+    pressure.detectors = stats
 
     return all_alerts, state, pressure
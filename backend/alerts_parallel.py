@@ -0,0 +1,249 @@
+"""Run alerts_engine's symbol-local detectors across a process pool.
+
+Most coin detectors in ``compute_alerts`` only look at one symbol at a time
+(plus read-only market context), so the universe can be split into shards by
+base symbol and scanned in worker processes:
+
+    pool = ShardedDetectorPool(processes=4)
+    alerts, state, pressure = compute_alerts(..., shard_pool=pool)
+
+Each worker gets its shard of the snapshots and the matching slice of
+``AlertEngineState``; it returns its alerts and the state fields the detectors
+write. The parent merges the slices back and re-orders alerts into the order
+the serial path would have produced them (price_snapshot / return-history /
+minute-volume iteration order), so stream shaping and pruning see the same
+sequence either way. Alert ids keep their random uuid suffix, exactly as in a
+serial run.
+
+When the engine clock has been replaced (alert_replay drives it from tape
+time), the parent's current engine time is shipped with each shard so
+cooldowns in the workers follow the same clock.
+
+If the pool breaks (worker crash, pickling error) the shards run in-process
+for that call and the pool is rebuilt on the next one.
+"""
+
+import logging
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import alerts_engine
+from alerts_engine import (
+    SHARDABLE_DETECTORS,
+    AlertEngineState,
+    DetectorStats,
+    _universe_median_pct_3m,
+    run_symbol_detectors,
+)
+
+logger = logging.getLogger(__name__)
+
+# Per-symbol state the shardable detectors read and/or write.
+_SHARDED_FIELDS = (
+    "coin_return_hist",
+    "coin_trend_ema_fast",
+    "coin_trend_ema_slow",
+    "coin_trend_last_diff",
+    "coin_trend_last_sample_minute",
+    "coin_last_vol_ratio",
+)
+# The subset a worker can change and must hand back.
+_WRITTEN_FIELDS = (
+    "last_fired",
+    "coin_trend_ema_fast",
+    "coin_trend_ema_slow",
+    "coin_trend_last_diff",
+    "coin_trend_last_sample_minute",
+    "coin_last_vol_ratio",
+)
+
+
+def _base(symbol):
+    sym = str(symbol or "").upper()
+    return sym[:-4] if sym.endswith("-USD") else sym
+
+
+def shard_of(symbol, shards):
+    """Stable shard index for a symbol (same in every process)."""
+    return zlib.crc32(_base(symbol).encode("utf-8")) % shards
+
+
+def _cooldown_symbol(key):
+    # Cooldown keys are "<type>::<SYMBOL>[::window[::bucket]]".
+    parts = str(key).split("::")
+    return parts[1] if len(parts) > 1 else ""
+
+
+def _split(mapping, shards, key_fn=lambda k: k):
+    out = [{} for _ in range(shards)]
+    for key, value in (mapping or {}).items():
+        out[shard_of(key_fn(key), shards)][key] = value
+    return out
+
+
+def _state_slice(state, shards):
+    """One AlertEngineState per shard holding only that shard's symbols."""
+    slices = [AlertEngineState() for _ in range(shards)]
+    for i, fired in enumerate(_split(state.last_fired, shards, _cooldown_symbol)):
+        slices[i].last_fired = fired
+    for field_name in _SHARDED_FIELDS:
+        for i, part in enumerate(_split(getattr(state, field_name), shards)):
+            setattr(slices[i], field_name, part)
+    # coin_exhaustion reads the streaks coin_persistence keeps in the parent
+    # process; read-only, so they are never handed back.
+    streaks = _split(state.coin_persistence_streaks, shards)
+    for st, part in zip(slices, streaks):
+        st.coin_persistence_streaks = part
+        # coin_mood compares against the recent market index; read-only.
+        st.market_pressure_index_hist = list(state.market_pressure_index_hist)
+    return slices
+
+
+def _merge_state(state, index, shards, written):
+    """Fold shard ``index``'s written fields back into the parent state."""
+    for field_name, part in written.items():
+        target = getattr(state, field_name)
+        key_fn = _cooldown_symbol if field_name == "last_fired" else (lambda k: k)
+        for key in [k for k in target if k not in part]:
+            if shard_of(key_fn(key), shards) == index:
+                del target[key]
+        target.update(part)
+
+
+def _engine_clock_override():
+    """Engine time when its clock has been swapped out (replay), else None."""
+    clock = alerts_engine.time
+    return None if clock is time else float(clock.time())
+
+
+def _shard_worker(payload):
+    """Worker entry point: run the symbol detectors over one shard."""
+    (
+        price_snapshot,
+        volume_snapshot,
+        minute_volumes,
+        pressure,
+        state,
+        thresholds,
+        median_pct_3m,
+        now,
+    ) = payload
+    if now is not None:
+        with alerts_engine.replay_clock(alerts_engine.ReplayTime(now)):
+            return _shard_worker(payload[:-1] + (None,))
+    by_name, stats = run_symbol_detectors(
+        price_snapshot,
+        volume_snapshot,
+        minute_volumes,
+        pressure,
+        state,
+        thresholds,
+        median_pct_3m,
+    )
+    written = {name: getattr(state, name) for name in _WRITTEN_FIELDS}
+    return by_name, stats, written
+
+
+def _serial_positions(price_snapshot, state, minute_volumes):
+    """Symbol -> position in the sequence each detector iterates serially."""
+
+    def positions(keys):
+        out = {}
+        for i, key in enumerate(keys):
+            out.setdefault(str(key).upper(), i)
+            out.setdefault(_base(key), i)
+        return out
+
+    by_price = positions(price_snapshot or {})
+    return {
+        "coin_volatility_expansion": positions(state.coin_return_hist),
+        "coin_liquidity_shock": positions(minute_volumes or {}),
+        None: by_price,
+    }
+
+
+class ShardedDetectorPool:
+    """Process pool that evaluates SHARDABLE_DETECTORS per symbol shard."""
+
+    def __init__(self, processes=4, start_method="spawn"):
+        self.processes = max(1, int(processes))
+        self.start_method = start_method
+        self._executor = None
+        self.fallbacks = 0
+
+    def _pool(self):
+        if self._executor is None:
+            ctx = multiprocessing.get_context(self.start_method)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=ctx
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, price_snapshot, volume_snapshot, minute_volumes, pressure, state, thresholds):
+        """Scan all shards and merge into ``state``.
+
+        Returns ``({detector: alerts}, {detector: DetectorStats})`` with alerts
+        in serial order. Stats sum counts across shards; elapsed_ms is the
+        slowest shard, i.e. the wall time the parent waited on that detector.
+        """
+        shards = self.processes
+        median = _universe_median_pct_3m(price_snapshot)
+        prices = _split(price_snapshot, shards)
+        volumes = _split(volume_snapshot, shards)
+        minutes = _split(minute_volumes, shards)
+        states = _state_slice(state, shards)
+        now = _engine_clock_override()
+        payloads = [
+            (prices[i], volumes[i], minutes[i], pressure, states[i], thresholds, median, now)
+            for i in range(shards)
+        ]
+
+        try:
+            results = list(self._pool().map(_shard_worker, payloads))
+        except Exception:
+            logger.exception("alert detector pool failed; running shards in-process")
+            self.fallbacks += 1
+            executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            started = time.perf_counter()
+            results = [_shard_worker(p) for p in payloads]
+            logger.info(
+                "in-process shard fallback took %.1f ms",
+                (time.perf_counter() - started) * 1000.0,
+            )
+
+        by_name = {name: [] for name in SHARDABLE_DETECTORS}
+        stats = {name: DetectorStats() for name in SHARDABLE_DETECTORS}
+        for i, (shard_alerts, shard_stats, written) in enumerate(results):
+            _merge_state(state, i, shards, written)
+            for name in SHARDABLE_DETECTORS:
+                by_name[name].extend(shard_alerts.get(name) or [])
+                st = shard_stats.get(name)
+                if st is None:
+                    continue
+                agg = stats[name]
+                agg.elapsed_ms = max(agg.elapsed_ms, st.elapsed_ms)
+                agg.scanned += st.scanned
+                agg.candidates += st.candidates
+
+        order = _serial_positions(price_snapshot, state, minute_volumes)
+        for name, alerts in by_name.items():
+            pos = order.get(name, order[None])
+            alerts.sort(
+                key=lambda a: pos.get(str((a or {}).get("symbol") or "").upper(), len(pos))
+            )
+        return by_name, stats
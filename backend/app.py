@@ -30,8 +30,10 @@ from urllib.parse import urlparse
 
 try:
     from coinbase_ws import get_feed as coinbase_ws_get_feed
+    from coinbase_ws import peek_feed as coinbase_ws_peek_feed
 except Exception:  # keep the REST-only path working if the module is absent
     coinbase_ws_get_feed = None
+    coinbase_ws_peek_feed = None
 
 try:
     from price_db import (
@@ -97,8 +99,11 @@ except ImportError as e:
         return []
 
 
+from watchlist import _DB_POOL as _watchlist_db_pool
 from watchlist import watchlist_bp, watchlist_db
 from portfolio_mode import portfolio_bp
+from portfolio_mode import LIVE_PRICE_MAX_AGE_S as PORTFOLIO_LIVE_PRICE_MAX_AGE_S
+from portfolio_mode import set_live_price_source as set_portfolio_live_price_source
 
 try:
     from position_intel import enrich_portfolio
@@ -204,6 +209,10 @@ from signal_context import build_signal_context
 from signal_outcomes import store as signal_outcome_store
 from board_outcomes import store as board_outcome_store
 from live_ranking import LIVE_RANKING_MODEL_VERSION, build_live_rankings
+from alert_record import freeze_alert, thaw
+from alerts_parallel import ShardedDetectorPool
+from pipeline_timing import DETECTOR_METRICS, PIPELINE_TIMER
+from sqlite_pool import SQL_METRICS
 
 try:
     from coin_intel_external import fetch_coin_intel
@@ -271,6 +280,18 @@ try:
 except ImportError:
     COINBASE_PRODUCTS_URL = "https://api.exchange.coinbase.com/products"
 
+try:
+    from candle_store import CANDLES, CandleFetchError
+    from coinbase_rest import COINBASE
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.candle_store import CANDLES, CandleFetchError
+    from backend.coinbase_rest import COINBASE
+
+try:
+    from sentiment.handoff import HandoffReader
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.sentiment.handoff import HandoffReader
+
 ERROR_NO_DATA = "No data available"
 
 # Cached Coinbase product ids (to verify a product exists before linking)
@@ -336,7 +357,7 @@ def _load_product_ids(timeout=10):
         ):
             return PRODUCT_IDS, PRODUCT_IDS_BY_BASE
 
-        resp = requests.get(COINBASE_PRODUCTS_URL, timeout=timeout)
+        resp = COINBASE.get(COINBASE_PRODUCTS_URL, priority="charts", timeout=timeout)
         resp.raise_for_status()
         data = resp.json()
 
@@ -1198,14 +1219,11 @@ def _gather_board_data_for_symbols(symbols: set) -> dict:
     return {k: v for k, v in board.items() if v}
 
 
-# Descriptive-levels candle cache: raw OHLC per product, TTL-refreshed on demand.
-# Candles (not computed levels) are cached because the HTTP fetch is the cost;
-# levels are recomputed each request against the holding's live price.
-_LEVELS_CANDLE_CACHE: dict = {}
-_LEVELS_CANDLE_LOCK = threading.Lock()
+# Descriptive levels read the incremental 1h indicator state (indicator_stream),
+# fed from the shared candle store; levels are recomputed each request against
+# the holding's live price. The state may be up to _LEVELS_CANDLE_TTL_S old.
 _LEVELS_CANDLE_TTL_S = float(os.environ.get("MW_LEVELS_CANDLE_TTL_S", "300"))
 _LEVELS_GRANULARITY_S = 3600  # 1h candles
-_LEVELS_CANDLE_COUNT = 50  # ~50h swing window
 _LEVELS_FETCH_PER_REQUEST = int(os.environ.get("MW_LEVELS_FETCH_PER_REQUEST", "30"))
 _LEVELS_FETCH_WORKERS = 6
 
@@ -1244,68 +1262,60 @@ def _gather_positioning_for_symbols(symbols: set, change_by_symbol: dict) -> dic
 
 
 def _gather_levels_for_symbols(symbols: set, price_by_symbol: dict) -> dict:
-    """Return {SYMBOL: levels_dict} for held symbols, computed from cached candles.
-
-    Fetches missing/stale candles on demand with bounded concurrency, capped per
-    request so a large portfolio warms the cache progressively rather than firing
-    dozens of calls at once. Symbols still cold this request simply get no levels
-    yet (the card renders without them).
+    """Return {SYMBOL: levels_dict} for held symbols from incremental indicator state.
+
+    Symbols refreshed within _LEVELS_CANDLE_TTL_S are an O(1) read. Stale ones
+    apply the bars closed since their last refresh; at most
+    _LEVELS_FETCH_PER_REQUEST of them may fetch the candle tail upstream (with
+    bounded concurrency), the rest catch up from stored candles only so a large
+    portfolio warms progressively. Symbols with nothing stored yet simply get no
+    levels (the card renders without them).
     """
     try:
-        from position_levels import compute_levels
+        # indicator_stream pulls in NumPy/pandas; keep them off the import path
+        # of app so the board boots without them.
+        from indicator_stream import INDICATOR_STREAMS
+        from position_levels import levels_from_indicators
     except Exception:
         return {}
 
-    now = time.time()
-    fresh_candles: dict = {}
-    to_fetch: list[str] = []
+    rows: dict = {}
+    stale: list[str] = []
+    for sym in symbols:
+        if INDICATOR_STREAMS.is_fresh(sym, _LEVELS_GRANULARITY_S, _LEVELS_CANDLE_TTL_S):
+            rows[sym] = INDICATOR_STREAMS.row(sym, _LEVELS_GRANULARITY_S)
+        else:
+            stale.append(sym)
 
-    with _LEVELS_CANDLE_LOCK:
-        for sym in symbols:
-            product_id = f"{sym}-USD"
-            cached = _LEVELS_CANDLE_CACHE.get(product_id)
-            if cached and (now - cached.get("ts", 0)) < _LEVELS_CANDLE_TTL_S:
-                fresh_candles[sym] = cached.get("candles")
-            else:
-                to_fetch.append(sym)
+    def _refresh(sym, fetch=True):
+        try:
+            return INDICATOR_STREAMS.refresh(
+                sym,
+                _LEVELS_GRANULARITY_S,
+                fetch=fetch,
+                max_age_s=_LEVELS_CANDLE_TTL_S,
+            )
+        except Exception:
+            return None
 
     # Cap new network work per request; the rest warm up on later refreshes.
-    to_fetch = to_fetch[:_LEVELS_FETCH_PER_REQUEST]
-
+    to_fetch = stale[:_LEVELS_FETCH_PER_REQUEST]
     if to_fetch:
         from concurrent.futures import ThreadPoolExecutor
 
-        def _fetch(sym):
-            candles = _fetch_coinbase_candles(
-                f"{sym}-USD",
-                granularity=_LEVELS_GRANULARITY_S,
-                count=_LEVELS_CANDLE_COUNT,
-            )
-            return sym, candles
-
         with ThreadPoolExecutor(max_workers=_LEVELS_FETCH_WORKERS) as pool:
-            for sym, candles in pool.map(_fetch, to_fetch):
-                if candles:
-                    with _LEVELS_CANDLE_LOCK:
-                        _LEVELS_CANDLE_CACHE[f"{sym}-USD"] = {
-                            "candles": candles,
-                            "ts": time.time(),
-                        }
-                    fresh_candles[sym] = candles
+            rows.update(zip(to_fetch, pool.map(_refresh, to_fetch)))
+    for sym in stale[_LEVELS_FETCH_PER_REQUEST:]:
+        rows[sym] = _refresh(sym, fetch=False)
 
-    levels: dict = {}
-    for sym, candles in fresh_candles.items():
-        try:
-            computed = compute_levels(
-                candles,
-                price_by_symbol.get(sym),
-                granularity_seconds=_LEVELS_GRANULARITY_S,
-            )
-        except Exception:
-            computed = None
-        if computed:
-            levels[sym] = computed
-    return levels
+    try:
+        return levels_from_indicators(
+            rows,
+            price_by_symbol,
+            granularity_seconds=_LEVELS_GRANULARITY_S,
+        )
+    except Exception:
+        return {}
 
 
 @app.route("/api/portfolio/intel", methods=["GET"])
@@ -1335,7 +1345,8 @@ def portfolio_with_intel():
 
     force = str(request.args.get("refresh") or "").lower() in {"1", "true", "yes"}
     try:
-        snapshot = get_portfolio_service().snapshot(force=force)
+        # The manual overlay and enrichment below edit the snapshot in place.
+        snapshot = get_portfolio_service().snapshot(force=force, mutable=True)
     except PortfolioModeError as exc:
         return jsonify({"error": str(exc)}), 503
 
@@ -1388,15 +1399,9 @@ def portfolio_with_intel():
         logging.debug("[Portfolio] positioning gather skipped", exc_info=True)
         positioning_data = {}
 
-    event_source = [
-        _ensure_alert_contract(dict(item))
-        for item in list(alerts_log_main)
-        if isinstance(item, dict)
-    ]
-    signals = build_event_evolution(event_source)
-    active_alerts = [
-        dict(item) for item in list(alerts_log_main) if isinstance(item, dict)
-    ]
+    # Stream records already satisfy the alert contract and are read-only.
+    active_alerts = list(alerts_log_main)
+    signals = build_event_evolution(active_alerts)
 
     enriched = enrich_portfolio(
         snapshot,
@@ -2080,6 +2085,37 @@ def metrics():
         pass
     if swr_caches:
         out["swr_caches"] = swr_caches
+    # Subsystem stats: snapshot pipeline stage timings and slowest cycles,
+    # alert detectors, member DB, candle store, Coinbase REST and indicators.
+    # Each section is guarded on its own, so a failing collector reports
+    # `<name>_error` instead of blanking the sections after it.
+    def _indicators():
+        from indicator_engine import INDICATORS
+
+        return INDICATORS.stats()
+
+    def _indicator_streams():
+        from indicator_stream import INDICATOR_STREAMS
+
+        return INDICATOR_STREAMS.stats()
+
+    sections = {
+        "pipeline": lambda: PIPELINE_TIMER.snapshot(),
+        "alert_detectors": lambda: DETECTOR_METRICS.snapshot(),
+        "member_db": lambda: {
+            **SQL_METRICS.snapshot(),
+            "pool": _watchlist_db_pool.stats(),
+        },
+        "candles": lambda: CANDLES.stats(),
+        "coinbase_rest": lambda: COINBASE.stats(),
+        "indicators": _indicators,
+        "indicator_streams": _indicator_streams,
+    }
+    for name, collect in sections.items():
+        try:
+            out[name] = collect()
+        except Exception as e:
+            out[f"{name}_error"] = str(e)
     # Validate minimally (will raise if schema mismatch during development)
     try:
         validated = MetricsResponse(**out).model_dump()
@@ -2251,11 +2287,36 @@ def api_sentiment_market():
     return jsonify({"ok": False, "message": "Removed. Use /api/sentiment/latest"}), 410
 
 
+# The sentiment service pushes every generation to a local handoff file, so
+# the routes below serve a fresh one with a stat() and no upstream call. The
+# HTTP proxy covers deployments where the file isn't shared (service on
+# another host, or SENTIMENT_HANDOFF=0 on the service) and a handoff that has
+# gone stale; a stale handoff is served only when the proxy fails too.
+_SENTIMENT_HANDOFF = HandoffReader()
+SENTIMENT_HANDOFF_MAX_AGE_S = float(os.getenv("SENTIMENT_HANDOFF_MAX_AGE_S", "120"))
+
 _LATEST_PROXY_CACHE = None
 _LATEST_PROXY_TS = None
 _LATEST_PROXY_URL = None
 
 
+def _sentiment_handoff():
+    """Latest pushed generation as ``(payload, generation, age_s, fresh)``."""
+    envelope = _SENTIMENT_HANDOFF.latest()
+    if not envelope:
+        return None
+    try:
+        age = max(0.0, time.time() - float(envelope.get("published_at") or 0))
+    except (TypeError, ValueError):
+        return None
+    return (
+        envelope["payload"],
+        envelope.get("generation"),
+        age,
+        age <= SENTIMENT_HANDOFF_MAX_AGE_S,
+    )
+
+
 def _build_proxy_meta(
     used_url: str | None, latency_ms: float, cache_ts=None, stale=False
 ):
@@ -2328,6 +2389,33 @@ def api_sentiment_latest():
     if symbol:
         params["symbol"] = symbol
 
+    def _from_handoff(payload, generation, age, fresh):
+        out = _strip_emoji_payload(dict(payload))
+        if not fresh and out.get("data_status") != "offline":
+            out["data_status"] = "stale"
+        out["scope"] = out.get("scope") or "market_wide"
+        out["requested_symbol"] = symbol or None
+        out["requested_symbols"] = requested_symbols
+        out["proxy_meta"] = {
+            "upstream_url": None,
+            "upstream_latency_ms": 0,
+            "proxy_ts": time.time(),
+            "stale": not fresh,
+            "stale_age_seconds": int(age),
+            "source": "handoff",
+            "generation": generation,
+        }
+        out["sentiment_meta"] = _sentiment_meta_from_proxy_payload(
+            out,
+            pipeline_running=fresh,
+            fallback_age_seconds=None if fresh else int(age),
+        )
+        return jsonify(out)
+
+    handoff = _sentiment_handoff()
+    if handoff and handoff[3]:
+        return _from_handoff(*handoff)
+
     start = time.time()
     payload, used_url, err_info = _proxy_pipeline_request(
         "/sentiment/latest", params=params, timeout=1.0
@@ -2352,6 +2440,11 @@ def api_sentiment_latest():
         )
         return jsonify(out)
 
+    if handoff and (
+        not _LATEST_PROXY_TS or time.time() - handoff[2] > _LATEST_PROXY_TS
+    ):
+        return _from_handoff(*handoff)
+
     if _LATEST_PROXY_CACHE and _LATEST_PROXY_TS:
         proxy_meta = _build_proxy_meta(
             _LATEST_PROXY_URL, latency_ms, cache_ts=_LATEST_PROXY_TS, stale=True
@@ -3037,6 +3130,10 @@ def _get_sentiment_snapshot():
     if os.environ.get("MW_ENABLE_EXTERNAL_SENTIMENT", "0") != "1":
         return _get_local_sentiment_payload()
 
+    handoff = _sentiment_handoff()
+    if handoff and handoff[3]:
+        return _sentiment_snapshot_from_handoff(*handoff)
+
     # If poller hasn't started yet, kick it off in background (non-blocking).
     try:
         thread_ref = globals().get("_MW_SENTIMENT_THREAD")
@@ -3069,6 +3166,10 @@ def _get_sentiment_snapshot():
         sources = _SENTIMENT_LAST_SOURCES
 
     now = time.time()
+    if handoff and not (sentiment and last_ok and last_ok > now - handoff[2]):
+        # The poller hasn't got anything newer from the service than the
+        # stale push, so that is still the best answer.
+        return _sentiment_snapshot_from_handoff(*handoff)
     stale_seconds = int(now - last_ok) if last_ok is not None else None
     # Pipeline considered running if we had a successful poll within 2x poll interval
     max_stale_for_running = max(60.0, SENTIMENT_PIPELINE_POLL_S * 2.5)
@@ -3092,6 +3193,24 @@ def _get_sentiment_snapshot():
     return _strip_emoji_payload(sentiment or {}), _strip_emoji_payload(meta)
 
 
+def _sentiment_snapshot_from_handoff(payload, generation, age, fresh):
+    ok, err, cleaned = _validate_sentiment_payload(payload)
+    published = time.time() - age
+    meta = {
+        "ok": ok and fresh,
+        "pipelineRunning": fresh,
+        "staleSeconds": int(age),
+        "lastOkTs": _sentiment_iso(published) if ok else None,
+        "lastTryTs": _sentiment_iso(published),
+        "generation": generation,
+    }
+    if err:
+        meta["error"] = err
+    if ok and isinstance(cleaned.get("sources"), list):
+        meta["sources"] = cleaned["sources"]
+    return (cleaned or {}), _strip_emoji_payload(meta)
+
+
 def _proxy_pipeline_request(
     path: str, params: dict | None = None, timeout: float = 5.0
 ):
@@ -3842,6 +3961,14 @@ def metrics_prom():
             lines.append("# price_fetch_metrics_error_detail " + _detail)
         except Exception:
             pass
+    # Snapshot pipeline stage + alert detector histograms (independent of
+    # the price_fetch import above)
+    try:
+        lines.extend(PIPELINE_TIMER.prometheus_lines())
+        lines.extend(DETECTOR_METRICS.prometheus_lines())
+        lines.extend(SQL_METRICS.prometheus_lines())
+    except Exception:
+        pass
     body = "\n".join(lines) + "\n"
     return app.response_class(body, mimetype="text/plain; version=0.0.4")
 
@@ -4682,6 +4809,43 @@ last_current_prices = {
 }
 # Track last-seen timestamps for symbols to bias 1m universe toward fresh baselines.
 _PRICE_LAST_SEEN_TS = {}
+
+
+def _portfolio_live_prices():
+    """Holding prices for Portfolio Mode: WS tape first, then the board snapshot.
+
+    Never starts the WS feed or fetches; Portfolio Mode only asks Coinbase's
+    product API for symbols neither source has priced recently.
+    """
+    out = {}
+    board = last_current_prices.get("data")
+    board_ts = float(last_current_prices.get("timestamp") or 0)
+    if isinstance(board, dict) and board_ts > 0:
+        age = max(0.0, time.time() - board_ts)
+        for symbol, price in board.items():
+            out[str(symbol).upper()] = {
+                "price": price,
+                "age_seconds": age,
+                "source": "board",
+                "change_24h_pct": None,
+            }
+    feed = coinbase_ws_peek_feed() if coinbase_ws_peek_feed is not None else None
+    if feed is not None:
+        for symbol, (price, age, open_24h) in feed.price_ages(
+            PORTFOLIO_LIVE_PRICE_MAX_AGE_S
+        ).items():
+            out[symbol] = {
+                "price": price,
+                "age_seconds": age,
+                "source": "live_tape",
+                "change_24h_pct": (
+                    (price / open_24h - 1.0) * 100.0 if open_24h else None
+                ),
+            }
+    return out
+
+
+set_portfolio_live_price_source(_portfolio_live_prices)
 # Persistence state for 1-min display logic
 one_minute_persistence = {
     "entries": {},  # symbol -> {'entered_at': ts, 'enter_gain': pct}
@@ -4720,41 +4884,28 @@ _CANDLE_MINUTE_VOLUMES = {}  # populated alongside _CANDLE_VOLUME_CACHE
 MAX_CANDLE_SYMBOLS = 60  # Cap to avoid rate limits
 
 
-def _fetch_coinbase_candles(product_id, granularity=60, count=70):
-    """Fetch candles from Coinbase API.
+def _fetch_coinbase_candles(product_id, granularity=60, count=70, **kwargs):
+    """Latest candles for a product from the shared candle store.
 
     Args:
         product_id: e.g. "BTC-USD"
         granularity: seconds per candle (60 = 1min)
-        count: number of candles to fetch
+        count: number of candles to return
+        **kwargs: ``fetch``/``max_age_s``/``priority``, passed to
+            ``CandleStore.latest``
 
     Returns:
-        List of candles [[timestamp, low, high, open, close, volume], ...]
+        List of candles [[timestamp, low, high, open, close, volume], ...],
+        newest first, or None when nothing is available.
     """
     try:
-        url = f"https://api.exchange.coinbase.com/products/{product_id}/candles"
-        params = {"granularity": granularity}
-
-        # Don't use start/end to get latest candles
-        resp = requests.get(url, params=params, timeout=5)
-
-        if resp.status_code == 429:
-            logging.warning(f"[Candles] Rate limited for {product_id}")
-            return None
-
-        if not resp.ok:
-            logging.debug(f"[Candles] HTTP {resp.status_code} for {product_id}")
-            return None
-
-        data = resp.json()
-        if not isinstance(data, list):
-            return None
-
-        # Return most recent candles (API returns them in desc order by timestamp)
-        return data[:count]
-    except Exception as e:
+        return CANDLES.latest(product_id, granularity, count, **kwargs) or None
+    except CandleFetchError as e:
         logging.debug(f"[Candles] Fetch error for {product_id}: {e}")
         return None
+    except Exception as e:
+        logging.debug(f"[Candles] Store error for {product_id}: {e}")
+        return None
 
 
 _BACKFILL_1H_LOCK = threading.Lock()
@@ -4776,7 +4927,9 @@ def _backfill_1h_baseline_from_candles(product_ids, *, max_products=200):
     by_ts: dict[int, list[tuple[str, float]]] = {}
     fetched = 0
     for idx, pid in enumerate(list(product_ids)[:max_products]):
-        candles = _fetch_coinbase_candles(pid, granularity=60, count=75)
+        candles = _fetch_coinbase_candles(
+            pid, granularity=60, count=75, priority="backfill"
+        )
         if candles:
             for candle in candles:
                 try:
@@ -4864,7 +5017,9 @@ def _compute_1h_volume_from_candles(product_id):
     Returns base-volume and quote-notional current/previous hour values.
     """
     # Need 120+ candles: 60 for current hour, 60 for previous hour (pct change)
-    candles = _fetch_coinbase_candles(product_id, granularity=60, count=130)
+    candles = _fetch_coinbase_candles(
+        product_id, granularity=60, count=130, priority="volume"
+    )
 
     if not candles or len(candles) < 60:
         return None, None, None, None, None, None, None, 0
@@ -5473,8 +5628,8 @@ def _canonicalize_market_mood_alert(alert_like: dict) -> None:
         return
 
     ev = alert_like.get("evidence")
-    if not isinstance(ev, dict):
-        ev = {}
+    # Copy: the evidence may belong to a frozen stream record.
+    ev = dict(ev) if isinstance(ev, dict) else {}
     if "mood" not in ev:
         ev["mood"] = mood
     if "legacy_type" not in ev:
@@ -5713,7 +5868,8 @@ def _append_alerts_deduped(stream: deque, new_alerts: list[dict]) -> int:
         if sym in {"MARKET", "MARKET-USD"}:
             continue
         if _should_accept_stream_alert(a, now_s):
-            stream.append(a)
+            # Stored read-only so readers can share records without copying.
+            stream.append(freeze_alert(a))
             accepted += 1
     return accepted
 
@@ -6456,7 +6612,8 @@ def _normalize_alert(raw: dict) -> dict:
         type_key = "fomo_alert"
         alert_type = "fomo_alert"
 
-    evidence = raw.get("evidence") if isinstance(raw.get("evidence"), dict) else {}
+    # Plain copy: this is the API edge, and stream evidence is read-only.
+    evidence = thaw(raw.get("evidence")) if isinstance(raw.get("evidence"), dict) else {}
     if type_key == "fomo_alert" and "mood" not in evidence:
         raw_direction = str(raw.get("direction") or "").lower()
         evidence["mood"] = "fear" if raw_direction == "fear" else "euphoria"
@@ -6853,8 +7010,8 @@ def get_coinbase_prices():
             1.0, min(ticker_timeout, float(CONFIG.get("API_TIMEOUT", 10)))
         )
 
-        products_response = requests.get(
-            COINBASE_PRODUCTS_URL, timeout=products_timeout
+        products_response = COINBASE.get(
+            COINBASE_PRODUCTS_URL, priority="price", timeout=products_timeout
         )
         if products_response.status_code == 200:
             products = products_response.json()
@@ -7018,7 +7175,9 @@ def get_coinbase_prices():
                     try:
                         # Keep per-request timeout small; overall duration is bounded
                         # by `PRICE_FETCH_DEADLINE_SECONDS` in the caller.
-                        r = requests.get(url, timeout=ticker_timeout)
+                        r = COINBASE.get(
+                            url, priority="price", timeout=ticker_timeout
+                        )
                         last_code = r.status_code
 
                         if r.status_code == 200:
@@ -7644,8 +7803,8 @@ def get_24h_top_movers():
 def get_coinbase_24h_top_movers():
     """Fetch 24h top movers from Coinbase (optimized)."""
     try:
-        products_response = requests.get(
-            COINBASE_PRODUCTS_URL, timeout=CONFIG["API_TIMEOUT"]
+        products_response = COINBASE.get(
+            COINBASE_PRODUCTS_URL, priority="volume", timeout=CONFIG["API_TIMEOUT"]
         )
         if products_response.status_code != 200:
             return []
@@ -7665,7 +7824,7 @@ def get_coinbase_24h_top_movers():
                 stats_url = (
                     f"https://api.exchange.coinbase.com/products/{product['id']}/stats"
                 )
-                stats_response = requests.get(stats_url, timeout=3)
+                stats_response = COINBASE.get(stats_url, priority="volume", timeout=3)
                 if stats_response.status_code != 200:
                     return None
 
@@ -7673,7 +7832,9 @@ def get_coinbase_24h_top_movers():
                 ticker_url = (
                     f"https://api.exchange.coinbase.com/products/{product['id']}/ticker"
                 )
-                ticker_response = requests.get(ticker_url, timeout=2)
+                ticker_response = COINBASE.get(
+                    ticker_url, priority="volume", timeout=2
+                )
                 if ticker_response.status_code != 200:
                     return None
 
@@ -7982,11 +8143,10 @@ def get_crypto_data(current_prices=None, *, force_refresh: bool = False):
 
 
 def get_historical_chart_data(symbol, days=7):
-    """Fetch historical price data for charts from Coinbase"""
+    """Historical price data for charts, read through the shared candle store"""
     try:
-        # Convert days to start and end timestamps
-        end_time = datetime.now()
-        start_time = end_time - timedelta(days=days)
+        end_ts = int(time.time())
+        start_ts = end_ts - int(days * 86400)
 
         # Determine granularity based on days
         # Coinbase Pro API granularities: 60, 300, 900, 3600, 21600, 86400
@@ -7997,50 +8157,21 @@ def get_historical_chart_data(symbol, days=7):
         else:  # More than 7 days, use 1-day granularity
             granularity = 86400
 
-        url = f"https://api.exchange.coinbase.com/products/{symbol}/candles"
-        params = {
-            "start": start_time.isoformat(),
-            "end": end_time.isoformat(),
-            "granularity": granularity,
-        }
-
-        response = requests.get(url, params=params, timeout=CONFIG["API_TIMEOUT"])
-
-        if response.status_code == 200:
-            data = response.json()
-            chart_data = []
-            for entry in data:
-                timestamp = entry[0] * 1000  # Convert to milliseconds
-                price = entry[4]  # Close price
-                volume = entry[5]
-
-                chart_data.append(
-                    {
-                        "timestamp": timestamp,
-                        "datetime": datetime.fromtimestamp(
-                            timestamp / 1000
-                        ).isoformat(),
-                        "price": round(price, 6),
-                        "volume": round(volume, 2),
-                    }
-                )
-
-            # Sort by timestamp in ascending order (Coinbase returns in descending)
-            chart_data.sort(key=lambda x: x["timestamp"])
-
-            logging.info(
-                f"Successfully fetched {len(chart_data)} chart points for {symbol} from Coinbase"
-            )
-            return chart_data
-
-        else:
-            logging.error(
-                f"Coinbase chart API Error for {symbol}: {response.status_code} - {response.text}"
+        chart_data = []
+        for entry in CANDLES.range(symbol, granularity, start_ts, end_ts):
+            timestamp = entry[0] * 1000  # Convert to milliseconds
+            chart_data.append(
+                {
+                    "timestamp": timestamp,
+                    "datetime": datetime.fromtimestamp(timestamp / 1000).isoformat(),
+                    "price": round(entry[4], 6),  # Close price
+                    "volume": round(entry[5], 2),
+                }
             )
-            return []
+        return chart_data
 
-    except requests.RequestException as e:
-        logging.error(f"Network error fetching chart data for {symbol}: {e}")
+    except CandleFetchError as e:
+        logging.error(f"Coinbase chart API Error for {symbol}: {e}")
         return []
     except Exception as e:
         logging.error(f"Error fetching chart data for {symbol}: {e}")
@@ -11521,12 +11652,9 @@ def get_alerts_contract():
         recent = recent_capped
         # Event Evolution keeps raw Pulse detections while grouping related
         # observations into one per-symbol signal with a transition history.
-        event_source = [
-            _ensure_alert_contract(dict(item))
-            for item in list(alerts_log_main)
-            if isinstance(item, dict)
-        ]
-        signals = _enrich_signal_events(build_event_evolution(event_source))[:limit]
+        signals = _enrich_signal_events(
+            build_event_evolution(list(alerts_log_main))
+        )[:limit]
         # Request path: cached holdings only (never a network call here).
         notify = notification_candidates(
             signals, priority_symbols=_notification_priority_symbols(fetch=False)
@@ -12796,11 +12924,19 @@ def get_popular_charts():
 @app.route("/api/market-overview")
 def get_market_overview():
     """Return real CoinGecko global and Fear & Greed data when available."""
-    payload, _used_url, err_info = _proxy_pipeline_request(
-        "/sentiment/latest", timeout=2.0
-    )
-    if err_info:
-        return _pipeline_error_response(err_info, "Market overview is unavailable")
+    handoff = _sentiment_handoff()
+    if handoff and handoff[3]:
+        payload = handoff[0]
+    else:
+        payload, _used_url, err_info = _proxy_pipeline_request(
+            "/sentiment/latest", timeout=2.0
+        )
+        if err_info and handoff:
+            payload = handoff[0]
+            if payload.get("data_status") != "offline":
+                payload = {**payload, "data_status": "stale"}
+        elif err_info:
+            return _pipeline_error_response(err_info, "Market overview is unavailable")
 
     data = payload if isinstance(payload, dict) else {}
     pulse = (
@@ -13094,6 +13230,16 @@ _MW_LAST_HEAVY_SNAPSHOT_AT = 0.0
 # Alert engine state + canonical snapshot adapters
 # ---------------------------------------------------------------------------
 _ALERT_ENGINE_STATE = AlertEngineState()
+# Symbol-local detectors can be sharded across worker processes on multi-core
+# hosts (MW_ALERT_DETECTOR_PROCESSES=4). Off by default: below a few hundred
+# symbols the pickling round-trip costs more than it saves.
+_ALERT_DETECTOR_POOL = None
+try:
+    _alert_detector_processes = int(os.getenv("MW_ALERT_DETECTOR_PROCESSES", "0") or 0)
+except ValueError:
+    _alert_detector_processes = 0
+if _alert_detector_processes > 1:
+    _ALERT_DETECTOR_POOL = ShardedDetectorPool(processes=_alert_detector_processes)
 _SIGNAL_CONTEXT_LOCK = threading.Lock()
 _SIGNAL_CONTEXT_BY_SYMBOL = {}
 
@@ -13328,6 +13474,9 @@ def mw_build_volume_snapshot(candle_volume_cache=None):
 
 def _compute_snapshots_from_cache():
     """Recompute snapshots using existing cached prices (fast, no network calls)."""
+    # Per-stage wall time for /metrics.prom and /api/metrics. Each mark()
+    # attributes the time since the previous mark to the named stage.
+    trace = PIPELINE_TIMER.start_cycle()
     try:
         # Throttle heavy snapshot work (volume banners/candles). The compute loop
         # runs frequently (e.g. every ~8s); keeping this function lightweight is
@@ -13351,6 +13500,7 @@ def _compute_snapshots_from_cache():
             if cached_prices
             else None
         )
+        trace.mark("recompute_3m")
 
         # Recompute 1m data using cached prices
         if CONFIG.get("ENABLE_1MIN", True) and cached_prices:
@@ -13358,6 +13508,7 @@ def _compute_snapshots_from_cache():
                 _ = get_crypto_data_1min(current_prices=cached_prices)
             except Exception as e:
                 logging.debug(f"Snapshot 1m recompute skipped: {e}")
+        trace.mark("recompute_1m")
 
         # Build component snapshots
         try:
@@ -13391,6 +13542,7 @@ def _compute_snapshots_from_cache():
         g1m = _mark_partial(g1m)
         g3m = _mark_partial(g3m)
         l3m = _mark_partial(l3m)
+        trace.mark("swr_tables")
 
         # Banner snapshots (lightweight)
         b1h_price_rows = []  # initialized outside try for alert engine access
@@ -13495,6 +13647,7 @@ def _compute_snapshots_from_cache():
             }
         except Exception:
             banner_1h_price = None
+        trace.mark("banner_1h_price")
 
         banner_1h_volume = None
         if do_heavy:
@@ -13638,6 +13791,7 @@ def _compute_snapshots_from_cache():
                 }
         except Exception:
             pass
+        trace.mark("volume_banners")
 
         # Update snapshots.
         # IMPORTANT: avoid overwriting existing snapshots with None because that
@@ -13705,6 +13859,7 @@ def _compute_snapshots_from_cache():
                 _MARKET_HEAT_HISTORY.append(heat)
         except Exception as e:
             logging.debug(f"Market heat compute skip: {e}")
+        trace.mark("market_heat")
 
         # --- Alert Engine: build canonical snapshots + compute_alerts() ---
         price_snapshot = {}
@@ -13726,6 +13881,7 @@ def _compute_snapshots_from_cache():
                 cached_prices=last_current_prices.get("data"),
                 snapshot_ts_s=last_current_prices.get("timestamp"),
             )
+            trace.mark("price_snapshot")
 
             # Supporting context only: market-relative movement, sampled spot
             # buying/selling, and current spread. These labels enrich a living
@@ -13743,6 +13899,7 @@ def _compute_snapshots_from_cache():
             with _SIGNAL_CONTEXT_LOCK:
                 _SIGNAL_CONTEXT_BY_SYMBOL.clear()
                 _SIGNAL_CONTEXT_BY_SYMBOL.update(signal_context)
+            trace.mark("signal_context")
 
             # Build canonical volume snapshot from candle cache
             with _CANDLE_VOLUME_CACHE_LOCK:
@@ -13765,6 +13922,7 @@ def _compute_snapshots_from_cache():
             include_market_mood = str(
                 os.getenv("MW_MARKET_SIRENS", "0") or "0"
             ).strip().lower() in {"1", "true", "yes", "on"}
+            trace.mark("volume_snapshot")
 
             # Run the canonical engine with impulse alerts enabled. The older
             # SWR impulse emitters remain disabled below.
@@ -13776,10 +13934,14 @@ def _compute_snapshots_from_cache():
                 fg_value=fg_val,
                 include_impulse=True,
                 include_market_mood=include_market_mood,
+                shard_pool=_ALERT_DETECTOR_POOL,
             )
+            trace.mark("compute_alerts")
+            DETECTOR_METRICS.observe(engine_pressure.detectors)
 
             # Enrich with interpretation before storage (pure, non-mutating)
             engine_alerts = [add_interpretation(a) for a in engine_alerts]
+            trace.mark("interpretation")
 
             # Append engine alerts through the shared stream-level dedupe gate
             _append_alerts_deduped(alerts_log_main, engine_alerts)
@@ -13787,19 +13949,19 @@ def _compute_snapshots_from_cache():
             # Delivery consumes grouped event transitions, never the raw
             # detector batch. The dispatcher is disabled unless explicitly
             # configured and runs outside the scanner thread.
-            delivery_events = build_event_evolution(
-                [dict(item) for item in list(alerts_log_main) if isinstance(item, dict)]
-            )
+            delivery_events = build_event_evolution(list(alerts_log_main))
             delivery_events = _enrich_signal_events(
                 delivery_events,
                 include_history=False,
             )
+            trace.mark("event_evolution")
             signal_outcome_store.observe(
                 delivery_events,
                 last_current_prices.get("data") or {},
                 now_ts=int(time.time()),
             )
             delivery_events = _enrich_signal_events(delivery_events)
+            trace.mark("signal_outcomes")
             alert_delivery_dispatcher.dispatch_async(
                 notification_candidates(
                     delivery_events,
@@ -13808,6 +13970,7 @@ def _compute_snapshots_from_cache():
                     priority_symbols=_notification_priority_symbols(fetch=True),
                 )
             )
+            trace.mark("delivery")
 
             # Store market pressure for the UI
             updates["market_pressure"] = {
@@ -13842,6 +14005,7 @@ def _compute_snapshots_from_cache():
             )
         except Exception as e:
             logging.error(f"Alert engine error (non-fatal): {e}")
+        trace.mark("market_pressure")
 
         # --- All alert families now owned by the engine (Phase 6) ---
         # SWR impulse emitters disabled. Engine handles impulse (moonshot/crater/
@@ -13859,6 +14023,7 @@ def _compute_snapshots_from_cache():
             }
         except Exception:
             pass
+        trace.mark("alerts_snapshot")
 
         # Rank the complete cached-price universe from the same canonical tape
         # used by the detector engine. This is local computation only—no per-coin
@@ -13878,6 +14043,7 @@ def _compute_snapshots_from_cache():
             }
         except Exception as exc:
             logging.warning("Live ranking compute skipped: %s", exc)
+        trace.mark("live_rankings")
 
         # Measure what happens after a coin enters the exact top-eight cohorts
         # published by the dashboard.  Membership transitions and 5/15/30/60m
@@ -13911,14 +14077,18 @@ def _compute_snapshots_from_cache():
             }
         except Exception as exc:
             logging.warning("Board outcome measurement skipped: %s", exc)
+        trace.mark("board_outcomes")
 
         _mw_set_component_snapshots(**updates)
+        trace.mark("publish")
         if do_heavy:
             _MW_LAST_HEAVY_SNAPSHOT_AT = now_s
         logging.debug("Snapshot recomputed from cached prices")
 
     except Exception as e:
         logging.error(f"Error in snapshot recompute: {e}")
+    finally:
+        trace.finish(budget_s=CONFIG.get("SNAPSHOT_COMPUTE_INTERVAL"))
 
 
 def _fetch_prices_and_update_history():
@@ -14148,10 +14318,39 @@ def _alert_rules_history_lookup(product_id, target_ts):
         return None
 
 
-def _alert_rules_evaluator_loop():
-    interval = max(5, int(os.environ.get("MW_ALERT_RULES_SCAN_SECONDS", "30")))
-    logging.info(f"Alert rule scanner started (every {interval}s)")
+# Latest WS tick per indexed symbol, drained by the scanner thread. Only the
+# newest price matters, so a burst of ticks for one symbol collapses to one.
+_MW_ALERT_RULES_TICKS = {}
+_MW_ALERT_RULES_TICKS_LOCK = threading.Lock()
+_MW_ALERT_RULES_TICK_EVENT = threading.Event()
+
+
+def _alert_rules_on_tick(symbol, price):
+    """coinbase_ws listener; runs on the socket thread, so it only queues."""
+    from alert_rule_index import RULE_INDEX
 
+    if not RULE_INDEX.has_symbol(symbol):
+        return
+    with _MW_ALERT_RULES_TICKS_LOCK:
+        _MW_ALERT_RULES_TICKS[symbol] = price
+    _MW_ALERT_RULES_TICK_EVENT.set()
+
+
+def _alert_rules_drain_ticks():
+    with _MW_ALERT_RULES_TICKS_LOCK:
+        ticks = dict(_MW_ALERT_RULES_TICKS)
+        _MW_ALERT_RULES_TICKS.clear()
+        _MW_ALERT_RULES_TICK_EVENT.clear()
+    out = {}
+    for symbol, price in ticks.items():
+        try:
+            out[symbol] = float(price)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _alert_rules_full_scan_loop(interval):
     try:
         from alert_runner import run_evaluation_cycle
     except Exception:
@@ -14179,6 +14378,103 @@ def _alert_rules_evaluator_loop():
         time.sleep(interval)
 
 
+def _alert_rules_evaluator_loop():
+    interval = max(5, int(os.environ.get("MW_ALERT_RULES_SCAN_SECONDS", "30")))
+    if os.environ.get("MW_ALERT_RULES_INDEXED", "1") != "1":
+        logging.info(f"Alert rule scanner started (full scan every {interval}s)")
+        _alert_rules_full_scan_loop(interval)
+        return
+
+    # Tick-driven: WS ticks for symbols with rules wake the loop and only the
+    # rules whose boundaries the new price crossed are loaded and evaluated.
+    # Ticks or not, the loop also makes an indexed pass over the board's
+    # current prices every `interval`, which covers REST-only symbols and
+    # confirms pending triggers on quiet symbols.
+    resync_s = max(
+        interval, int(os.environ.get("MW_ALERT_RULES_RESYNC_SECONDS", "600"))
+    )
+    try:
+        from alert_rule_index import RULE_INDEX
+        from alert_rules import list_evaluable_rules
+        from alert_runner import run_indexed_evaluation
+    except Exception:
+        logging.exception("Alert rule scanner unavailable; thread exiting")
+        return
+
+    def resync():
+        # Catches expiry and any write that bypassed the API hooks.
+        RULE_INDEX.load(list_evaluable_rules(limit=None))
+
+    try:
+        resync()
+    except Exception:
+        logging.exception("Alert rule index load failed; retrying at next resync")
+    last_resync = time.monotonic()
+    past_cache = {}
+    past_cache_at = time.monotonic()
+    last_sweep = time.monotonic()
+
+    if coinbase_ws_get_feed is not None:
+        try:
+            feed = coinbase_ws_get_feed()
+            if feed is not None:
+                feed.add_listener(_alert_rules_on_tick)
+        except Exception as exc:
+            logging.warning(f"Alert rule scanner: no WS ticks ({exc})")
+    logging.info(
+        f"Alert rule scanner started (tick-driven, {len(RULE_INDEX)} rules indexed, "
+        f"sweep every {interval}s)"
+    )
+
+    while True:
+        ticked = _MW_ALERT_RULES_TICK_EVENT.wait(interval)
+        try:
+            mono = time.monotonic()
+            if mono - last_resync >= resync_s:
+                resync()
+                last_resync = mono
+            # Rolling-window comparison prices move slowly relative to the
+            # history drift tolerance (>= 5 min); refresh them once a sweep.
+            if mono - past_cache_at >= interval:
+                past_cache.clear()
+                past_cache_at = mono
+            if not _MW_ALERT_RULES_CYCLE_LOCK.acquire(blocking=False):
+                continue
+            try:
+                if ticked:
+                    ticks = _alert_rules_drain_ticks()
+                    if ticks:
+                        now = time.time()
+                        run_indexed_evaluation(
+                            RULE_INDEX,
+                            ticks,
+                            int(now),
+                            history_lookup=_alert_rules_history_lookup,
+                            now_ts=now,
+                            symbols=ticks.keys(),
+                            past_cache=past_cache,
+                        )
+                # A liquid symbol can tick every second, so the wait may never
+                # time out; the sweep runs on its own clock.
+                if mono - last_sweep >= interval:
+                    last_sweep = mono
+                    snapshot = _alert_rules_price_source()
+                    if snapshot:
+                        prices, snapshot_ts = snapshot
+                        run_indexed_evaluation(
+                            RULE_INDEX,
+                            prices,
+                            snapshot_ts,
+                            history_lookup=_alert_rules_history_lookup,
+                            past_cache=past_cache,
+                        )
+            finally:
+                _MW_ALERT_RULES_CYCLE_LOCK.release()
+        except Exception:
+            logging.exception("Alert rule evaluation pass failed")
+            time.sleep(1)
+
+
 def _maybe_start_alert_rules_scanner():
     global _MW_ALERT_RULES_THREAD
     if os.environ.get("MW_ALERT_RULES_SCAN_ENABLED", "1") != "1":
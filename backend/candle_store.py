@@ -0,0 +1,454 @@
+"""One SQLite-backed Coinbase candle store shared by every chart and analysis path.
+
+Chart-read, the position levels, ``/api/chart``, ``/api/technical-analysis``
+and the 1h-volume collectors used to fetch candles independently. Each one
+had its own ad-hoc cache, or none, so a single popup could fetch the same
+product's 1m candles three times. They all read through ``CANDLES`` now:
+
+    rows = CANDLES.latest("BTC-USD", 60, 130)               # newest first
+    rows = CANDLES.range("BTC-USD", 3600, start_ts, end_ts)
+
+Rows keep the Coinbase shape ``[ts, low, high, open, close, volume]`` and are
+keyed by ``(product_id, granularity, ts)``. Alongside the rows, the store
+remembers which interval it has already fetched for each product and
+granularity (the coverage). It has to: Coinbase omits minutes with no trades,
+so gaps in the rows say nothing about what was already fetched.
+
+- Only the missing head or tail of a request goes upstream. The newest stored
+  bar is fetched again because it may still be in progress. A tail fetched
+  less than ``CANDLE_TAIL_TTL_S`` ago is reused.
+- 5m/15m/1h bars are rolled up from stored 1m bars when the 1m coverage spans
+  the whole request, so the volume collectors' minute data serves those
+  charts too.
+- Concurrent callers for the same product and granularity share one upstream
+  call (single-flight).
+- If an upstream call fails, the stored rows are still served. The error
+  (``RateLimitError`` on HTTP 429) is raised only when nothing is stored for
+  the request.
+
+``stats()`` reports upstream calls, rows fetched, derived and cache-served
+reads, and single-flight waits.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from coinbase_rest import COINBASE
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.coinbase_rest import COINBASE
+
+logger = logging.getLogger(__name__)
+
+COINBASE_CANDLES_URL = "https://api.exchange.coinbase.com/products/{product_id}/candles"
+DB_PATH = Path(
+    os.environ.get("MW_CANDLE_DB")
+    or Path(__file__).resolve().parent / "data" / "candles.sqlite"
+)
+CANDLE_TAIL_TTL_S = float(os.environ.get("MW_CANDLE_TAIL_TTL_S", "30"))
+CANDLE_RETENTION_BARS = int(os.environ.get("MW_CANDLE_RETENTION_BARS", "3000"))
+FETCH_TIMEOUT_S = float(os.environ.get("MW_CANDLE_FETCH_TIMEOUT_S", "8"))
+SINGLE_FLIGHT_WAIT_S = FETCH_TIMEOUT_S * 2
+
+GRANULARITIES = (60, 300, 900, 3600, 21600, 86400)
+DERIVABLE_FROM_1M = (300, 900, 3600)
+MAX_CANDLES_PER_CALL = 300  # Coinbase Exchange limit
+
+
+class CandleFetchError(Exception):
+    """Upstream candle request failed and nothing was stored to serve."""
+
+
+class RateLimitError(CandleFetchError):
+    """Raised when Coinbase returns HTTP 429."""
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def fetch_coinbase_candles(
+    product_id, granularity, start_ts, end_ts, *, priority="charts"
+):
+    """One Coinbase Exchange candles call; rows in upstream (newest-first) order."""
+    resp = COINBASE.get(
+        COINBASE_CANDLES_URL.format(product_id=product_id),
+        priority=priority,
+        params={
+            "granularity": granularity,
+            "start": _iso(start_ts),
+            "end": _iso(end_ts),
+        },
+        timeout=FETCH_TIMEOUT_S,
+    )
+    if resp.status_code == 429:
+        raise RateLimitError(f"429 for {product_id}")
+    if not resp.ok:
+        raise CandleFetchError(f"HTTP {resp.status_code} for {product_id}")
+    data = resp.json()
+    if not isinstance(data, list):
+        raise CandleFetchError(f"Unexpected candle payload for {product_id}")
+    return data
+
+
+def _rollup(rows, granularity):
+    """Aggregate ascending 1m rows into ``granularity`` bars (ascending)."""
+    bars = []
+    for ts, low, high, open_, close, volume in rows:
+        bucket = ts - ts % granularity
+        if bars and bars[-1][0] == bucket:
+            bar = bars[-1]
+            bar[1] = min(bar[1], low)
+            bar[2] = max(bar[2], high)
+            bar[4] = close
+            bar[5] += volume
+        else:
+            bars.append([bucket, low, high, open_, close, volume])
+    return bars
+
+
+class CandleStore:
+    def __init__(self, path=None, fetcher=None, *, tail_ttl_s=None):
+        self._path = Path(path) if path else None
+        self._fetcher = fetcher or fetch_coinbase_candles
+        self.tail_ttl_s = CANDLE_TAIL_TTL_S if tail_ttl_s is None else tail_ttl_s
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._cooldown = {}  # (product_id, granularity) -> retry after (epoch s)
+        self._coverage = None  # (product_id, granularity) -> [start, end]
+        self._stats = {
+            "upstream_calls": 0,
+            "upstream_errors": 0,
+            "rate_limited": 0,
+            "rows_fetched": 0,
+            "reads": 0,
+            "served_from_store": 0,
+            "derived_from_1m": 0,
+            "single_flight_waits": 0,
+            "stale_served": 0,
+        }
+
+    # ─── SQLite ───────────────────────────────────────────────────────
+
+    @property
+    def path(self):
+        return self._path or DB_PATH
+
+    def _conn(self):
+        path = self.path
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.path == path:
+            return conn
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candles (
+              product_id TEXT NOT NULL,
+              granularity INTEGER NOT NULL,
+              ts INTEGER NOT NULL,
+              low REAL NOT NULL,
+              high REAL NOT NULL,
+              open REAL NOT NULL,
+              close REAL NOT NULL,
+              volume REAL NOT NULL,
+              PRIMARY KEY (product_id, granularity, ts)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS candle_coverage (
+              product_id TEXT NOT NULL,
+              granularity INTEGER NOT NULL,
+              start_ts INTEGER NOT NULL,
+              end_ts INTEGER NOT NULL,
+              PRIMARY KEY (product_id, granularity)
+            );
+            """
+        )
+        self._local.conn = conn
+        self._local.path = path
+        return conn
+
+    def _coverage_for(self, key):
+        if self._coverage is None:
+            rows = self._conn().execute(
+                "SELECT product_id, granularity, start_ts, end_ts FROM candle_coverage"
+            )
+            self._coverage = {(p, g): [s, e] for p, g, s, e in rows}
+        return self._coverage.get(key)
+
+    def _select(self, product_id, granularity, start_ts, end_ts):
+        return [
+            list(row)
+            for row in self._conn().execute(
+                """
+                SELECT ts, low, high, open, close, volume FROM candles
+                WHERE product_id = ? AND granularity = ? AND ts BETWEEN ? AND ?
+                ORDER BY ts
+                """,
+                (product_id, granularity, int(start_ts), int(end_ts)),
+            )
+        ]
+
+    def _store(self, product_id, granularity, rows, covered):
+        conn = self._conn()
+        values = []
+        for row in rows:
+            try:
+                ts, low, high, open_, close, volume = row[:6]
+                values.append(
+                    (
+                        product_id,
+                        granularity,
+                        int(ts),
+                        float(low),
+                        float(high),
+                        float(open_),
+                        float(close),
+                        float(volume),
+                    )
+                )
+            except (TypeError, ValueError):
+                continue
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO candles
+                  (product_id, granularity, ts, low, high, open, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(product_id, granularity, ts) DO UPDATE SET
+                  low=excluded.low, high=excluded.high, open=excluded.open,
+                  close=excluded.close, volume=excluded.volume
+                """,
+                values,
+            )
+            conn.execute(
+                """
+                INSERT INTO candle_coverage (product_id, granularity, start_ts, end_ts)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(product_id, granularity) DO UPDATE SET
+                  start_ts=excluded.start_ts, end_ts=excluded.end_ts
+                """,
+                (product_id, granularity, covered[0], covered[1]),
+            )
+            conn.execute(
+                "DELETE FROM candles WHERE product_id = ? AND granularity = ? "
+                "AND ts < ?",
+                (product_id, granularity, covered[0]),
+            )
+        return len(values)
+
+    # ─── Fetch planning ───────────────────────────────────────────────
+
+    def _plan(self, key, start_ts, end_ts, now, max_age_s=None):
+        """Windows still to fetch for ``key`` and the coverage afterwards."""
+        granularity = key[1]
+        oldest = int(now) - CANDLE_RETENTION_BARS * granularity
+        oldest -= oldest % granularity
+        start_ts = max(start_ts, oldest)
+        if now < self._cooldown.get(key, 0):
+            return [], None
+        covered = self._coverage_for(key)
+        if covered is None or start_ts > covered[1]:
+            return [(start_ts, end_ts)], [start_ts, end_ts]
+        windows = []
+        new = [max(covered[0], oldest), covered[1]]  # retention trims the head
+        if start_ts < new[0]:
+            windows.append((start_ts, new[0]))
+            new[0] = start_ts
+        ttl = self._tail_ttl(granularity, max_age_s)
+        if end_ts > covered[1] and end_ts - covered[1] >= ttl:
+            last_bar = covered[1] - covered[1] % granularity
+            windows.append((last_bar, end_ts))
+            new[1] = end_ts
+        return windows, new
+
+    def _tail_ttl(self, granularity, max_age_s):
+        if max_age_s is not None:
+            return max_age_s
+        return min(granularity, self.tail_ttl_s)
+
+    def _fetch(self, product_id, granularity, windows, priority):
+        rows = []
+        for start_ts, end_ts in windows:
+            span = MAX_CANDLES_PER_CALL * granularity
+            chunk_start = start_ts
+            while chunk_start <= end_ts:
+                chunk_end = min(end_ts, chunk_start + span - granularity)
+                with self._lock:
+                    self._stats["upstream_calls"] += 1
+                rows.extend(
+                    self._fetcher(
+                        product_id,
+                        granularity,
+                        chunk_start,
+                        chunk_end,
+                        priority=priority,
+                    )
+                )
+                chunk_start = chunk_end + granularity
+        return rows
+
+    def _ensure(self, key, start_ts, end_ts, now, max_age_s, priority):
+        """Bring ``[start_ts, end_ts]`` into the store; None or the fetch error."""
+        product_id, granularity = key
+        while True:
+            with self._lock:
+                windows, covered = self._plan(key, start_ts, end_ts, now, max_age_s)
+                if not windows:
+                    self._stats["served_from_store"] += 1
+                    return None
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+                self._stats["single_flight_waits"] += 1
+            event.wait(SINGLE_FLIGHT_WAIT_S)
+        try:
+            rows = self._fetch(product_id, granularity, windows, priority)
+            stored = self._store(product_id, granularity, rows, covered)
+            with self._lock:
+                self._coverage[key] = covered
+                self._stats["rows_fetched"] += stored
+            return None
+        except Exception as exc:
+            with self._lock:
+                # Don't let every popup re-hit a failing or rate-limited
+                # product; stored rows are served until the cooldown ends.
+                self._cooldown[key] = time.time() + max(self.tail_ttl_s, 1.0)
+                self._stats["upstream_errors"] += 1
+                if isinstance(exc, RateLimitError):
+                    self._stats["rate_limited"] += 1
+            logger.debug(
+                "[candles] %s/%s fetch failed: %s", product_id, granularity, exc
+            )
+            return exc
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _derivable(self, product_id, granularity, start_ts, end_ts, max_age_s):
+        if granularity not in DERIVABLE_FROM_1M:
+            return False
+        with self._lock:
+            covered = self._coverage_for((product_id, 60))
+        if not covered:
+            return False
+        fresh = end_ts - covered[1] < self._tail_ttl(60, max_age_s)
+        return fresh and covered[0] <= start_ts
+
+    def _window(self, granularity, count):
+        now = int(time.time())
+        return now - now % granularity - (int(count) - 1) * granularity, now
+
+    # ─── Reads ────────────────────────────────────────────────────────
+
+    def range(
+        self,
+        product_id,
+        granularity,
+        start_ts,
+        end_ts=None,
+        *,
+        fetch=True,
+        max_age_s=None,
+        priority="charts",
+    ):
+        """Candles with ``start_ts <= ts <= end_ts``, oldest first.
+
+        ``max_age_s`` lets callers that don't need the live bar accept an
+        older tail than ``CANDLE_TAIL_TTL_S``; ``fetch=False`` reads only
+        what is stored. ``priority`` is the caller's Coinbase rate-budget
+        class (see ``coinbase_rest``).
+        """
+        granularity = int(granularity)
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"unsupported granularity {granularity}")
+        now = time.time()
+        end_ts = int(now if end_ts is None else min(end_ts, now))
+        start_ts = int(start_ts) - int(start_ts) % granularity
+        with self._lock:
+            self._stats["reads"] += 1
+
+        if self._derivable(product_id, granularity, start_ts, end_ts, max_age_s):
+            with self._lock:
+                self._stats["derived_from_1m"] += 1
+            return _rollup(self._select(product_id, 60, start_ts, end_ts), granularity)
+
+        error = None
+        if fetch:
+            error = self._ensure(
+                (product_id, granularity), start_ts, end_ts, now, max_age_s, priority
+            )
+        rows = self._select(product_id, granularity, start_ts, end_ts)
+        if error is not None and rows:
+            with self._lock:
+                self._stats["stale_served"] += 1
+        if error is not None and not rows:
+            raise error
+        return rows
+
+    def latest(
+        self,
+        product_id,
+        granularity,
+        count,
+        *,
+        fetch=True,
+        max_age_s=None,
+        priority="charts",
+    ):
+        """The newest ``count`` candles, newest first (Coinbase order)."""
+        granularity = int(granularity)
+        start_ts, end_ts = self._window(granularity, count)
+        rows = self.range(
+            product_id,
+            granularity,
+            start_ts,
+            end_ts,
+            fetch=fetch,
+            max_age_s=max_age_s,
+            priority=priority,
+        )
+        return rows[::-1][: int(count)]
+
+    def covered_until(self, product_id, granularity, start_ts, *, max_age_s=None):
+        """End of the fetched interval ``range()`` reads these bars from, or None.
+
+        A stored bar ``ts`` is final once this reaches ``ts + granularity``;
+        before that it may be a snapshot of the bar while it was forming.
+        """
+        granularity = int(granularity)
+        start_ts = int(start_ts) - int(start_ts) % granularity
+        source = (product_id, granularity)
+        if self._derivable(product_id, granularity, start_ts, time.time(), max_age_s):
+            source = (product_id, 60)
+        with self._lock:
+            covered = self._coverage_for(source)
+        return covered[1] if covered else None
+
+    def needs_fetch(self, product_id, granularity, count, *, max_age_s=None):
+        """Whether ``latest()`` with these arguments would call upstream."""
+        granularity = int(granularity)
+        start_ts, end_ts = self._window(granularity, count)
+        if self._derivable(product_id, granularity, start_ts, end_ts, max_age_s):
+            return False
+        with self._lock:
+            windows, _covered = self._plan(
+                (product_id, granularity), start_ts, end_ts, end_ts, max_age_s
+            )
+        return bool(windows)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+CANDLES = CandleStore()
@@ -11,6 +11,11 @@ from __future__ import annotations
 
 from typing import Any
 
+try:
+    from indicator_engine import INDICATORS, series_key
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.indicator_engine import INDICATORS, series_key
+
 __all__ = ["analyze_candles"]
 
 
@@ -174,6 +179,56 @@ def _range_position(rows: list[tuple]) -> dict:
     return {"pct": round(pct, 1), "zone": zone}
 
 
+def _read_indicators(
+    ind: dict[str, float | None],
+) -> tuple[dict, list, list, dict, dict]:
+    """Trend, zones, volume and range position from a cached indicator row.
+
+    Same rules as the per-row helpers above, applied to the batched engine's
+    vectors so a symbol already computed for the portfolio isn't rescanned.
+    """
+    slope = ind["trend_slope_pct"]
+    if slope is None:
+        trend = {"label": "sideways", "slope_pct": 0.0}
+    else:
+        label = "up" if slope > 2.0 else "down" if slope < -2.0 else "sideways"
+        trend = {"label": label, "slope_pct": round(slope, 2)}
+
+    lo, hi = _price_fmt(ind["support"]), _price_fmt(ind["support_zone_hi"])
+    if lo >= hi:
+        hi = _price_fmt(lo * 1.005)
+    lower_area = [lo, hi]
+    lo, hi = _price_fmt(ind["resistance_zone_lo"]), _price_fmt(ind["resistance"])
+    if lo >= hi:
+        lo = _price_fmt(hi * 0.995)
+    upper_area = [lo, hi]
+
+    ratio = ind["volume_ratio_recent"]
+    if ratio is None:
+        volume = {"label": "normal", "ratio": 1.0}
+    else:
+        label = "high" if ratio > 1.5 else "low" if ratio < 0.6 else "normal"
+        volume = {"label": label, "ratio": round(ratio, 2)}
+
+    support, resistance = ind["support"], ind["resistance"]
+    span = resistance - support
+    if span <= 0:
+        pct = 50.0
+    else:
+        pct = max(0.0, min(100.0, ((ind["last_close"] - support) / span) * 100.0))
+    if pct <= 15:
+        zone = "near_support"
+    elif pct < 40:
+        zone = "lower_range"
+    elif pct <= 60:
+        zone = "mid_range"
+    elif pct < 85:
+        zone = "upper_range"
+    else:
+        zone = "near_resistance"
+    return trend, lower_area, upper_area, volume, {"pct": round(pct, 1), "zone": zone}
+
+
 def _score_confidence(
     trend_label: str,
     volume_label: str,
@@ -432,17 +487,15 @@ def analyze_candles(
     Returns ``None`` when there are not enough candles to produce an honest read.
     Caller is responsible for fetching candles; this module does no network I/O.
     """
-    rows = _normalize_candles(raw_candles)
-    if len(rows) < 5:
+    sym = str(symbol or "").upper().strip()
+    granularity_s = int(_hours_per_candle(timeframe) * 3600)
+    ind = INDICATORS.get(series_key(sym, granularity_s, raw_candles), raw_candles)
+    if not ind or (ind.get("count") or 0) < 5:
         return None
 
-    sym = str(symbol or "").upper().strip()
-    trend = _calculate_trend(rows)
-    lower_area = _find_support_zone(rows)
-    upper_area = _find_resistance_zone(rows)
-    volume = _compare_volume(rows)
-    rpos = _range_position(rows)
-    confidence = _score_confidence(trend["label"], volume["label"], len(rows))
+    candle_count = int(ind["count"])
+    trend, lower_area, upper_area, volume, rpos = _read_indicators(ind)
+    confidence = _score_confidence(trend["label"], volume["label"], candle_count)
     ctx = _normalize_event_context(event_context)
     ctx_note = _event_context_note(ctx)
     ctx_price = None
@@ -485,6 +538,6 @@ def analyze_candles(
         "confidence": confidence,
         "watch_next": _watch_next(trend["label"], lower_area, upper_area, ctx_price),
         "not_financial_advice": True,
-        "candle_count": len(rows),
-        "window_hours": round(len(rows) * _hours_per_candle(timeframe), 1),
+        "candle_count": candle_count,
+        "window_hours": round(candle_count * _hours_per_candle(timeframe), 1),
     }
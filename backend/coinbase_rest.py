@@ -0,0 +1,213 @@
+"""Process-wide Coinbase Exchange REST client with one shared rate budget.
+
+The price loop, the 24h movers, the 1h-volume collector, the candle store,
+and the product catalogue all call the public api.exchange.coinbase.com
+endpoints. Before this client, each one called bare ``requests.get`` with
+its own timeout and retry policy, and none of them knew what the others were
+spending. The volume updater and the price loop could together exceed the
+public limit and set off a burst of 429s.
+
+Everything now goes through ``COINBASE.get(url, priority=...)``:
+
+- One pooled keep-alive ``requests.Session``.
+- One token bucket sized to the public limit (``COINBASE_PUBLIC_RPS``
+  sustained, ``COINBASE_PUBLIC_BURST`` burst).
+- Priority classes ``price`` > ``volume`` > ``charts`` > ``backfill``. A
+  waiting request blocks every lower class. Lower classes also leave a few
+  tokens in reserve, so a chart popup or a backfill sweep can't drain the
+  budget the next price tick needs.
+- A 429 pauses every class (``Retry-After`` when present) and empties the
+  bucket.
+- A request that can't get a token within its class's ``max_wait`` raises
+  ``RateBudgetExceeded``. That exception is a ``RequestException``, so
+  callers' existing network-error handling covers it.
+
+``stats()`` reports per-class requests, 429s, errors, rejections, and token
+wait times.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+logger = logging.getLogger(__name__)
+
+COINBASE_EXCHANGE_URL = "https://api.exchange.coinbase.com"
+PUBLIC_RPS = float(os.environ.get("COINBASE_PUBLIC_RPS", "10"))
+PUBLIC_BURST = float(os.environ.get("COINBASE_PUBLIC_BURST", "15"))
+POOL_SIZE = int(os.environ.get("COINBASE_REST_POOL_SIZE", "16"))
+DEFAULT_TIMEOUT_S = float(os.environ.get("COINBASE_REST_TIMEOUT_S", "8"))
+DEFAULT_PAUSE_S = 1.0
+MAX_PAUSE_S = 30.0
+
+# Highest priority first: (name, tokens left in reserve, default max wait s)
+PRIORITIES = (
+    ("price", 0, 2.0),
+    ("volume", 1, 5.0),
+    ("charts", 2, 5.0),
+    ("backfill", 4, 30.0),
+)
+_RANK = {name: rank for rank, (name, _reserve, _wait) in enumerate(PRIORITIES)}
+
+
+class RateBudgetExceeded(RequestException):
+    """No token became available within the request's ``max_wait``."""
+
+
+class CoinbaseRESTClient:
+    def __init__(
+        self,
+        *,
+        rate_per_s=PUBLIC_RPS,
+        burst=PUBLIC_BURST,
+        pool_size=POOL_SIZE,
+        session=None,
+    ):
+        self.rate_per_s = max(0.1, float(rate_per_s))
+        self.burst = max(1.0, float(burst))
+        self._session = session or self._make_session(pool_size)
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = [0] * len(PRIORITIES)
+        self._stats = {
+            name: {
+                "requests": 0,
+                "rate_limited": 0,
+                "errors": 0,
+                "rejected": 0,
+                "wait_ms_total": 0.0,
+                "wait_ms_max": 0.0,
+            }
+            for name, _reserve, _wait in PRIORITIES
+        }
+
+    @staticmethod
+    def _make_session(pool_size):
+        session = requests.Session()
+        # No urllib3 retries: a 429 retried blindly is exactly the storm the
+        # shared budget exists to prevent. Callers keep their own retries.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    # ─── token bucket ─────────────────────────────────────────────────────
+
+    def _refill(self, now):
+        elapsed = now - self._refilled_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_s)
+            self._refilled_at = now
+
+    def _acquire(self, rank, max_wait):
+        reserve = min(PRIORITIES[rank][1], self.burst - 1)
+        started = time.monotonic()
+        deadline = started + max_wait
+        with self._cond:
+            self._waiting[rank] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    ahead = any(self._waiting[:rank])
+                    if (
+                        now >= self._paused_until
+                        and not ahead
+                        and self._tokens - reserve >= 1
+                    ):
+                        self._tokens -= 1
+                        return now - started
+                    if now >= deadline:
+                        raise RateBudgetExceeded(
+                            f"no Coinbase rate budget for {PRIORITIES[rank][0]} "
+                            f"within {max_wait:.1f}s"
+                        )
+                    shortfall = (1 + reserve - self._tokens) / self.rate_per_s
+                    pause = self._paused_until - now
+                    self._cond.wait(min(deadline - now, max(shortfall, pause, 0.005)))
+            finally:
+                self._waiting[rank] -= 1
+                self._cond.notify_all()
+
+    def _pause(self, response):
+        try:
+            pause = float(response.headers.get("Retry-After") or DEFAULT_PAUSE_S)
+        except (TypeError, ValueError):
+            pause = DEFAULT_PAUSE_S
+        pause = min(MAX_PAUSE_S, max(pause, 0.0))
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0.0
+            self._cond.notify_all()
+        logger.warning("coinbase REST 429; pausing all classes for %.1fs", pause)
+
+    # ─── requests ─────────────────────────────────────────────────────────
+
+    def get(self, url, *, priority="charts", params=None, timeout=None, max_wait=None):
+        """GET ``url`` (absolute, or a path under the Exchange API) in budget."""
+        rank = _RANK[priority]
+        row = self._stats[priority]
+        if max_wait is None:
+            max_wait = PRIORITIES[rank][2]
+        if url.startswith("/"):
+            url = COINBASE_EXCHANGE_URL + url
+        try:
+            waited = self._acquire(rank, max_wait)
+        except RateBudgetExceeded:
+            with self._cond:
+                row["rejected"] += 1
+            raise
+        with self._cond:
+            row["requests"] += 1
+            row["wait_ms_total"] += waited * 1000.0
+            row["wait_ms_max"] = max(row["wait_ms_max"], waited * 1000.0)
+        try:
+            response = self._session.get(
+                url,
+                params=params,
+                timeout=DEFAULT_TIMEOUT_S if timeout is None else timeout,
+            )
+        except RequestException:
+            with self._cond:
+                row["errors"] += 1
+            raise
+        if response.status_code == 429:
+            with self._cond:
+                row["rate_limited"] += 1
+            self._pause(response)
+        elif response.status_code >= 400:
+            with self._cond:
+                row["errors"] += 1
+        return response
+
+    def stats(self):
+        with self._cond:
+            self._refill(time.monotonic())
+            classes = {}
+            for name, row in self._stats.items():
+                classes[name] = {
+                    **{k: v for k, v in row.items() if not k.startswith("wait_ms")},
+                    "avg_wait_ms": (
+                        round(row["wait_ms_total"] / row["requests"], 1)
+                        if row["requests"]
+                        else None
+                    ),
+                    "max_wait_ms": round(row["wait_ms_max"], 1),
+                }
+            return {
+                "rate_per_s": self.rate_per_s,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "paused_s": round(max(0.0, self._paused_until - time.monotonic()), 2),
+                "classes": classes,
+            }
+
+
+COINBASE = CoinbaseRESTClient()
@@ -35,6 +35,7 @@ class TickerStore:
         self._lock = threading.Lock()
         self._prices = {}
         self._quotes = {}
+        self._opens = {}
         self._trades = defaultdict(lambda: deque(maxlen=5000))
 
     def update(self, symbol, price, ts=None):
@@ -60,6 +61,21 @@ class TickerStore:
                 sym: price for sym, (price, ts) in self._prices.items() if ts >= cutoff
             }
 
+    def price_ages(self, max_age_s, now=None):
+        """Return {symbol: (price, age_s, open_24h)} for entries younger than max_age_s.
+
+        ``open_24h`` comes from the last ticker message and is None until one
+        carrying it has been seen.
+        """
+        now = now if now is not None else time.monotonic()
+        cutoff = now - max_age_s
+        with self._lock:
+            return {
+                sym: (price, max(0.0, now - ts), self._opens.get(sym))
+                for sym, (price, ts) in self._prices.items()
+                if ts >= cutoff
+            }
+
     def update_market(self, symbol, message, ts=None):
         """Store BBO plus an approximate recent aggressive-trade sample."""
         if not symbol or not isinstance(message, dict):
@@ -82,6 +98,10 @@ class TickerStore:
             ask_size = float(message.get("best_ask_size"))
         except (TypeError, ValueError):
             ask_size = None
+        try:
+            open_24h = float(message.get("open_24h"))
+        except (TypeError, ValueError):
+            open_24h = None
         side = str(message.get("side") or "").lower()
         try:
             size = float(message.get("last_size"))
@@ -90,6 +110,8 @@ class TickerStore:
 
         key = str(symbol).upper()
         with self._lock:
+            if open_24h and open_24h > 0:
+                self._opens[key] = open_24h
             if bid and ask and bid > 0 and ask > bid:
                 self._quotes[key] = {
                     "bid": bid,
@@ -173,7 +195,10 @@ class CoinbaseTickerFeed:
 
     - ``set_products(ids)`` declares the product universe to track; the feed
       diff-subscribes on the live socket (no reconnect needed).
-    - ``fresh_prices(max_age_s)`` returns recently ticked symbol prices.
+    - ``fresh_prices(max_age_s)`` returns recently ticked symbol prices;
+      ``price_ages(max_age_s)`` adds each price's age and 24h open.
+    - ``add_listener(fn)`` calls ``fn(symbol, price)`` on every ticker message,
+      on the socket thread; listeners must be quick and must not block.
     - Reconnects with exponential backoff and resubscribes automatically.
     """
 
@@ -191,6 +216,7 @@ class CoinbaseTickerFeed:
         self._connected = threading.Event()
         self._msg_count = 0
         self._reconnects = 0
+        self._listeners = []
 
     # -- public API ---------------------------------------------------------
 
@@ -213,9 +239,20 @@ class CoinbaseTickerFeed:
             self._desired = wanted
         self._sync_subscriptions()
 
+    def add_listener(self, fn):
+        """Register ``fn(symbol, price)`` for every ticker message."""
+        if fn not in self._listeners:
+            self._listeners = self._listeners + [fn]
+
+    def remove_listener(self, fn):
+        self._listeners = [f for f in self._listeners if f is not fn]
+
     def fresh_prices(self, max_age_s):
         return self.store.fresh_prices(max_age_s)
 
+    def price_ages(self, max_age_s):
+        return self.store.price_ages(max_age_s)
+
     def market_snapshot(self, max_age_s=15, flow_window_s=60):
         return self.store.market_snapshot(max_age_s, flow_window_s)
 
@@ -299,6 +336,11 @@ class CoinbaseTickerFeed:
             symbol = product_id.split("-", 1)[0]
             self.store.update(symbol, msg.get("price"))
             self.store.update_market(symbol, msg)
+            for listener in self._listeners:
+                try:
+                    listener(symbol.upper(), msg.get("price"))
+                except Exception:
+                    logger.exception("coinbase-ws: ticker listener failed")
         elif msg_type == "error":
             logger.warning("coinbase-ws: server error: %s", msg.get("message"))
 
@@ -353,6 +395,11 @@ def ws_enabled():
     return os.environ.get("ENABLE_COINBASE_WS", "1") == "1"
 
 
+def peek_feed():
+    """The running feed, or None. Never starts one."""
+    return _feed
+
+
 def get_feed():
     """Singleton feed, started lazily on first call. None when disabled."""
     if not ws_enabled():
@@ -0,0 +1,296 @@
+"""Batched NumPy technical indicators over a symbols × bars matrix.
+
+``technical_analysis``, ``chart_reader`` and ``position_levels`` used to loop
+over Python lists one symbol at a time. Their numbers now come from one
+``compute()`` call on a right-aligned matrix. Each row is one symbol's
+ascending candles, padded on the left with NaN, so the newest bar of every
+row sits in the last column. The formulas match the per-symbol code they
+replace:
+
+- RSI: simple averages over the first ``period`` deltas, as in
+  ``TechnicalAnalysis.calculate_rsi``.
+- MACD: pandas ``ewm(span)`` lines.
+- Bollinger: mean ± k·std of the last ``period`` closes.
+- ATR: mean true range of the last 14 bars.
+- Chart-read trend, support/resistance zones, recent-volume ratio and
+  range inputs.
+- Levels momentum and last-bar-vs-median volume ratio.
+
+``INDICATORS`` caches one result row per ``(symbol, granularity, bar
+count)``. It is keyed by a cheap candle signature: the bar count plus the
+first and last raw candle. Feeding it candles that haven't changed is a
+dictionary lookup. When new bars arrive, only the changed series are
+recomputed, and ``compute_many`` recomputes all of them in a single batch.
+
+Candle shape (Coinbase Exchange): ``[time, low, high, open, close, volume]``,
+in either order.
+"""
+
+from __future__ import annotations
+
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "INDICATORS",
+    "IndicatorCache",
+    "compute",
+    "normalize",
+    "series_key",
+    "stack",
+]
+
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_PERIOD, BB_STD = 20, 2
+ATR_PERIOD = 14
+CACHE_MAX_ENTRIES = 4096
+
+
+def normalize(raw: Iterable[Any]) -> np.ndarray:
+    """Parse candles into an ascending ``(bars, 6)`` float array.
+
+    Rows with unparseable fields or a non-positive low/high/close are
+    dropped, exactly as the per-symbol parsers did.
+    """
+    rows = []
+    for candle in raw or []:
+        if not candle or len(candle) < 6:
+            continue
+        try:
+            row = [float(candle[i]) for i in range(6)]
+        except (TypeError, ValueError):
+            continue
+        if row[2] <= 0 or row[1] <= 0 or row[4] <= 0:
+            continue
+        rows.append(row)
+    if not rows:
+        return np.empty((0, 6))
+    arr = np.asarray(rows, dtype=float)
+    return arr[np.argsort(arr[:, 0], kind="stable")]
+
+
+def stack(series: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Right-align normalized series into a ``(symbols, bars, 6)`` matrix."""
+    counts = np.array([len(s) for s in series], dtype=int)
+    width = int(counts.max()) if len(counts) else 0
+    matrix = np.full((len(series), width, 6), np.nan)
+    for i, rows in enumerate(series):
+        if len(rows):
+            matrix[i, width - len(rows) :] = rows
+    return matrix, counts
+
+
+def _window_sum(cum: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """Per-row sum of columns ``[start, stop)`` from a 0-prefixed cumsum."""
+    rows = np.arange(cum.shape[0])
+    return cum[rows, stop] - cum[rows, start]
+
+
+def _nth(sorted_vals: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Per-row element ``idx`` of an already sorted matrix (NaN when invalid)."""
+    out = np.full(sorted_vals.shape[0], np.nan)
+    ok = (idx >= 0) & (idx < sorted_vals.shape[1])
+    out[ok] = sorted_vals[np.nonzero(ok)[0], idx[ok]]
+    return out
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=np.isfinite(den) & (den != 0))
+    return out
+
+
+def compute(matrix: np.ndarray, counts: np.ndarray) -> dict[str, np.ndarray]:
+    """Every indicator for every row of a stacked matrix, as per-row vectors."""
+    n_rows, width = matrix.shape[0], matrix.shape[1]
+    if n_rows == 0 or width == 0:
+        return {}
+    low, high, close, volume = (matrix[:, :, k] for k in (1, 2, 4, 5))
+    start = width - counts  # first valid column of each row
+    rows = np.arange(n_rows)
+    out: dict[str, np.ndarray] = {"count": counts.astype(float)}
+
+    out["last_ts"] = matrix[:, -1, 0]
+    out["last_close"] = close[:, -1]
+    prev_close = close[:, -2] if width >= 2 else np.full(n_rows, np.nan)
+    out["momentum_pct"] = _safe_div(close[:, -1] - prev_close, prev_close) * 100.0
+
+    # Range: full recent high/low.
+    out["support"] = np.nanmin(low, axis=1)
+    out["resistance"] = np.nanmax(high, axis=1)
+
+    # Chart-read zones: lowest / highest ~20% of bars (min 3).
+    zone_n = np.maximum(3, counts // 5)
+    low_sorted = np.sort(low, axis=1)  # NaN sorts last
+    high_sorted = np.sort(high, axis=1)
+    out["support_zone_hi"] = _nth(low_sorted, np.minimum(zone_n, counts) - 1)
+    out["resistance_zone_lo"] = _nth(high_sorted, counts - np.minimum(zone_n, counts))
+
+    # Chart-read trend: average close of the second half vs the first half.
+    close0 = np.nan_to_num(close)
+    cum = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(close0, axis=1)], axis=1)
+    half = counts // 2
+    first_avg = _safe_div(_window_sum(cum, start, start + half), half)
+    second_sum = _window_sum(cum, start + half, start + counts)
+    second_avg = _safe_div(second_sum, counts - half)
+    slope = _safe_div(second_avg - first_avg, np.where(first_avg > 0, first_avg, 0))
+    out["trend_slope_pct"] = np.where(counts >= 4, slope * 100.0, np.nan)
+
+    # Chart-read volume: last 5 bars vs the rest (or all but the last).
+    vol0 = np.nan_to_num(volume)
+    vcum = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(vol0, axis=1)], axis=1)
+    end = np.full(n_rows, width)
+    recent_n = np.minimum(5, counts)
+    recent_avg = _safe_div(_window_sum(vcum, end - recent_n, end), recent_n)
+    base_stop = np.where(counts > 5, end - 5, end - 1)
+    base_avg = _safe_div(_window_sum(vcum, start, base_stop), base_stop - start)
+    ratio = _safe_div(recent_avg, np.where(base_avg > 0, base_avg, 0))
+    out["volume_ratio_recent"] = np.where(counts >= 4, ratio, np.nan)
+    out["volume_mean"] = _safe_div(vcum[:, -1], counts)
+    out["volume_recent_mean"] = recent_avg
+
+    # Levels volume: last bar vs the median of the prior bars.
+    prior_median = np.full(n_rows, np.nan)
+    if width >= 2:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+            prior_median = np.nanmedian(volume[:, :-1], axis=1)
+    baseline = np.where(prior_median > 0, prior_median, 0)
+    last_vs_median = _safe_div(volume[:, -1], baseline)
+    out["volume_ratio_last"] = np.where(counts >= 4, last_vs_median, np.nan)
+
+    # ATR: mean of the last ATR_PERIOD true ranges.
+    if width >= 2:
+        prev = close[:, :-1]
+        h, lo = high[:, 1:], low[:, 1:]
+        tr = np.maximum(h - lo, np.maximum(np.abs(h - prev), np.abs(lo - prev)))
+        window = tr[:, -ATR_PERIOD:]
+        valid = np.isfinite(window)
+        atr = _safe_div(np.where(valid, window, 0).sum(axis=1), valid.sum(axis=1))
+    else:
+        atr = np.full(n_rows, np.nan)
+    out["atr"] = atr
+
+    # RSI over the first RSI_PERIOD deltas of each series.
+    idx = start[:, None] + np.arange(RSI_PERIOD + 1)[None, :]
+    has_rsi = counts >= RSI_PERIOD + 1
+    idx = np.where(has_rsi[:, None], idx, width - 1)
+    deltas = np.diff(close[rows[:, None], idx], axis=1)
+    avg_gain = np.where(deltas > 0, deltas, 0).mean(axis=1)
+    avg_loss = np.where(deltas < 0, -deltas, 0).mean(axis=1)
+    rsi = np.where(
+        avg_loss == 0,
+        100.0,
+        100.0 - 100.0 / (1.0 + _safe_div(avg_gain, avg_loss)),
+    )
+    out["rsi"] = np.where(has_rsi, rsi, np.nan)
+
+    # MACD: pandas EWM lines, column-wise across the whole universe at once.
+    frame = pd.DataFrame(close.T)
+    macd_line = (
+        frame.ewm(span=MACD_FAST).mean() - frame.ewm(span=MACD_SLOW).mean()
+    )
+    signal_line = macd_line.ewm(span=MACD_SIGNAL).mean()
+    has_macd = counts >= MACD_SLOW + MACD_SIGNAL
+    out["macd"] = np.where(has_macd, macd_line.iloc[-1].to_numpy(), np.nan)
+    out["macd_signal"] = np.where(has_macd, signal_line.iloc[-1].to_numpy(), np.nan)
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+
+    # Bollinger: mean ± BB_STD·std (population) of the last BB_PERIOD closes.
+    tail = close[:, -BB_PERIOD:]
+    has_bb = counts >= BB_PERIOD
+    with np.errstate(all="ignore"):
+        mid = tail.mean(axis=1)
+        std = tail.std(axis=1)
+    out["bb_middle"] = np.where(has_bb, mid, np.nan)
+    out["bb_upper"] = np.where(has_bb, mid + std * BB_STD, np.nan)
+    out["bb_lower"] = np.where(has_bb, mid - std * BB_STD, np.nan)
+    return out
+
+
+def _row(result: dict[str, np.ndarray], i: int) -> dict[str, float | None]:
+    row: dict[str, float | None] = {}
+    for name, values in result.items():
+        value = float(values[i])
+        row[name] = value if np.isfinite(value) else None
+    return row
+
+
+def series_key(symbol: str, granularity_s: int, raw: list[Any]) -> tuple:
+    """Cache key shared by every caller that reads the same candle window.
+
+    ``/api/chart-read`` and ``/api/portfolio/intel`` both read 50 × 1h bars,
+    so they land on the same entry.
+    """
+    base = str(symbol or "").upper().strip()
+    if base.endswith("-USD"):
+        base = base[:-4]
+    return (base, int(granularity_s), len(raw or []))
+
+
+def _signature(raw: list[Any]) -> tuple:
+    try:
+        return (len(raw), tuple(raw[0]), tuple(raw[-1])) if raw else (0,)
+    except TypeError:
+        return (len(raw), repr(raw[0]), repr(raw[-1]))
+
+
+class IndicatorCache:
+    """Latest indicator row per series, recomputed only when its candles change."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[tuple, dict]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "batches": 0, "rows_computed": 0}
+
+    def compute_many(
+        self, series: dict[Hashable, list[Any]]
+    ) -> dict[Hashable, dict[str, float | None]]:
+        """Indicator rows for ``{key: raw_candles}``; stale keys in one batch."""
+        out: dict[Hashable, dict[str, float | None]] = {}
+        stale: list[tuple[Hashable, tuple, np.ndarray]] = []
+        with self._lock:
+            for key, raw in series.items():
+                sig = _signature(raw)
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == sig:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    out[key] = cached[1]
+                else:
+                    self._stats["misses"] += 1
+                    stale.append((key, sig, raw))
+
+        parsed = [(key, sig, normalize(raw)) for key, sig, raw in stale]
+        parsed = [item for item in parsed if len(item[2])]
+        if parsed:
+            matrix, counts = stack([rows for _key, _sig, rows in parsed])
+            result = compute(matrix, counts)
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["rows_computed"] += len(parsed)
+                for i, (key, sig, _rows) in enumerate(parsed):
+                    row = _row(result, i)
+                    out[key] = row
+                    self._entries[key] = (sig, row)
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return out
+
+    def get(self, key: Hashable, raw: list[Any]) -> dict[str, float | None] | None:
+        return self.compute_many({key: raw}).get(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+INDICATORS = IndicatorCache()
@@ -0,0 +1,536 @@
+"""Per-symbol indicator state that advances one closed candle at a time.
+
+``/api/technical-analysis`` and the portfolio levels used to pull a full
+window of candles on every call and recompute everything from scratch, even
+though only the newest bar had changed. ``INDICATOR_STREAMS`` keeps running
+state per ``(symbol, granularity)`` instead:
+
+- Wilder-smoothed RSI averages.
+- MACD fast/slow/signal EMAs.
+- Rolling Bollinger sums (Σx, Σx²) and a rolling true-range sum for ATR.
+- Monotonic deques tracking the swing low/high of the levels window.
+- A volume window for the volume-trend ratios.
+
+``refresh()`` asks the shared candle store for bars after the last one
+applied, so the only upstream traffic is the store's tail fetch. It advances
+the state once per newly closed bar, and only once the store fetched that bar
+after its close; a bar stored while forming is refetched (or, without
+fetching, left pending). The bar still forming only updates the reported
+price. Reads return the row computed at the last advance, so they
+cost O(1).
+
+State is checkpointed to ``MW_INDICATOR_STATE_PATH`` (temp file + rename),
+at most every ``MW_INDICATOR_CHECKPOINT_S``, so a restart resumes from the
+last applied bar instead of re-warming. A series whose checkpoint is older
+than the warm-up window is rebuilt from scratch.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from statistics import median
+from typing import Any
+
+try:
+    from candle_store import CANDLES, CandleFetchError
+    from indicator_engine import (
+        ATR_PERIOD,
+        BB_PERIOD,
+        BB_STD,
+        MACD_FAST,
+        MACD_SIGNAL,
+        MACD_SLOW,
+        RSI_PERIOD,
+    )
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.candle_store import CANDLES, CandleFetchError
+    from backend.indicator_engine import (
+        ATR_PERIOD,
+        BB_PERIOD,
+        BB_STD,
+        MACD_FAST,
+        MACD_SIGNAL,
+        MACD_SLOW,
+        RSI_PERIOD,
+    )
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = Path(
+    os.environ.get("MW_INDICATOR_STATE_PATH")
+    or Path(__file__).resolve().parent / "data" / "indicator_state.json"
+)
+WARMUP_BARS = int(os.environ.get("MW_INDICATOR_WARMUP_BARS", "200"))
+CHECKPOINT_INTERVAL_S = float(os.environ.get("MW_INDICATOR_CHECKPOINT_S", "60"))
+LEVELS_WINDOW = 50  # swing window used by position_levels (~50h on 1h bars)
+VOLUME_WINDOW = 72  # technical-analysis volume profile window
+RECENT_VOLUME_BARS = 5
+
+# Stored alongside the checkpoint; state saved with other windows is dropped.
+_PARAMS = [
+    RSI_PERIOD,
+    MACD_FAST,
+    MACD_SLOW,
+    MACD_SIGNAL,
+    BB_PERIOD,
+    ATR_PERIOD,
+    LEVELS_WINDOW,
+    VOLUME_WINDOW,
+]
+
+
+def _ema(previous: float | None, value: float, span: int) -> float:
+    if previous is None:
+        return value
+    return previous + (2.0 / (span + 1.0)) * (value - previous)
+
+
+class IndicatorState:
+    """Running indicators for one series; ``advance()`` applies one closed bar."""
+
+    def __init__(self):
+        self.bars = 0
+        self.last_ts: int | None = None
+        self.last_close: float | None = None
+        self.prev_close: float | None = None
+        self.rsi_seed: list[float] = []
+        self.avg_gain: float | None = None
+        self.avg_loss: float | None = None
+        self.ema_fast: float | None = None
+        self.ema_slow: float | None = None
+        self.ema_signal: float | None = None
+        self.closes: deque[float] = deque()  # Bollinger window
+        self.trs: deque[float] = deque()
+        self.lows: deque[tuple[int, float]] = deque()
+        self.highs: deque[tuple[int, float]] = deque()
+        self.volumes: deque[float] = deque()
+        self._resync()
+
+    def _resync(self) -> None:
+        """Rebuild running sums and monotonic deques from the windows."""
+        self.bb_sum = math.fsum(self.closes)
+        self.bb_sumsq = math.fsum(c * c for c in self.closes)
+        self.tr_sum = math.fsum(self.trs)
+        self.volume_sum = math.fsum(self.volumes)
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+        for ts, low in self.lows:
+            self._push_min(ts, low)
+        for ts, high in self.highs:
+            self._push_max(ts, high)
+        self.row = self._compute_row() if self.bars else {}
+
+    def _push_min(self, ts: int, low: float) -> None:
+        while self._min and self._min[-1][1] >= low:
+            self._min.pop()
+        self._min.append((ts, low))
+
+    def _push_max(self, ts: int, high: float) -> None:
+        while self._max and self._max[-1][1] <= high:
+            self._max.pop()
+        self._max.append((ts, high))
+
+    def advance(self, candle: list[Any]) -> bool:
+        """Apply one closed ``[ts, low, high, open, close, volume]`` bar."""
+        try:
+            ts = int(candle[0])
+            low, high, close, volume = (float(candle[i]) for i in (1, 2, 4, 5))
+        except (TypeError, ValueError, IndexError):
+            return False
+        if low <= 0 or high <= 0 or close <= 0:
+            return False
+        if self.last_ts is not None and ts <= self.last_ts:
+            return False
+
+        previous = self.last_close
+        if previous is not None:
+            delta = close - previous
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if self.avg_gain is None:
+                self.rsi_seed.append(delta)
+                if len(self.rsi_seed) == RSI_PERIOD:
+                    seed, self.rsi_seed = self.rsi_seed, []
+                    self.avg_gain = sum(max(d, 0.0) for d in seed) / RSI_PERIOD
+                    self.avg_loss = sum(max(-d, 0.0) for d in seed) / RSI_PERIOD
+            else:
+                self.avg_gain = (self.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self.avg_loss = (self.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+
+            tr = max(high - low, abs(high - previous), abs(low - previous))
+            self.trs.append(tr)
+            self.tr_sum += tr
+            if len(self.trs) > ATR_PERIOD:
+                self.tr_sum -= self.trs.popleft()
+
+        self.ema_fast = _ema(self.ema_fast, close, MACD_FAST)
+        self.ema_slow = _ema(self.ema_slow, close, MACD_SLOW)
+        macd = self.ema_fast - self.ema_slow
+        self.ema_signal = _ema(self.ema_signal, macd, MACD_SIGNAL)
+
+        self.closes.append(close)
+        self.bb_sum += close
+        self.bb_sumsq += close * close
+        if len(self.closes) > BB_PERIOD:
+            old = self.closes.popleft()
+            self.bb_sum -= old
+            self.bb_sumsq -= old * old
+
+        self.lows.append((ts, low))
+        self.highs.append((ts, high))
+        self._push_min(ts, low)
+        self._push_max(ts, high)
+        if len(self.lows) > LEVELS_WINDOW:
+            oldest_ts = self.lows.popleft()[0]
+            self.highs.popleft()
+            if self._min[0][0] <= oldest_ts:
+                self._min.popleft()
+            if self._max[0][0] <= oldest_ts:
+                self._max.popleft()
+
+        self.volumes.append(volume)
+        self.volume_sum += volume
+        if len(self.volumes) > VOLUME_WINDOW:
+            self.volume_sum -= self.volumes.popleft()
+
+        self.prev_close, self.last_close, self.last_ts = previous, close, ts
+        self.bars += 1
+        self.row = self._compute_row()
+        return True
+
+    def _compute_row(self) -> dict[str, float | None]:
+        """Indicator row in ``indicator_engine`` key names."""
+        rsi = None
+        if self.avg_gain is not None:
+            if self.avg_loss == 0:
+                rsi = 100.0
+            else:
+                rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+        macd = signal = hist = None
+        if self.bars >= MACD_SLOW + MACD_SIGNAL:
+            macd = self.ema_fast - self.ema_slow
+            signal = self.ema_signal
+            hist = macd - signal
+
+        bb_upper = bb_middle = bb_lower = None
+        if len(self.closes) >= BB_PERIOD:
+            n = len(self.closes)
+            bb_middle = self.bb_sum / n
+            std = math.sqrt(max(0.0, self.bb_sumsq / n - bb_middle * bb_middle))
+            bb_upper = bb_middle + std * BB_STD
+            bb_lower = bb_middle - std * BB_STD
+
+        momentum = None
+        if self.prev_close:
+            momentum = (self.last_close - self.prev_close) / self.prev_close * 100.0
+
+        level_volumes = list(self.volumes)[-LEVELS_WINDOW:]
+        volume_ratio_last = None
+        if len(level_volumes) >= 4:
+            baseline = median(level_volumes[:-1])
+            if baseline > 0:
+                volume_ratio_last = level_volumes[-1] / baseline
+
+        recent = list(self.volumes)[-RECENT_VOLUME_BARS:]
+        if len(recent) < RECENT_VOLUME_BARS:
+            recent = recent[-1:]
+        return {
+            "count": float(len(self.lows)),
+            "bars": float(self.bars),
+            "last_ts": float(self.last_ts),
+            "last_close": self.last_close,
+            "momentum_pct": momentum,
+            "support": self._min[0][1],
+            "resistance": self._max[0][1],
+            "atr": self.tr_sum / len(self.trs) if self.trs else None,
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": signal,
+            "macd_hist": hist,
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower,
+            "volume_ratio_last": volume_ratio_last,
+            "volume_count": float(len(self.volumes)),
+            "volume_mean": self.volume_sum / len(self.volumes),
+            "volume_recent_mean": sum(recent) / len(recent),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bars": self.bars,
+            "last_ts": self.last_ts,
+            "last_close": self.last_close,
+            "prev_close": self.prev_close,
+            "rsi_seed": self.rsi_seed,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "ema_signal": self.ema_signal,
+            "closes": list(self.closes),
+            "trs": list(self.trs),
+            "lows": [list(item) for item in self.lows],
+            "highs": [list(item) for item in self.highs],
+            "volumes": list(self.volumes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IndicatorState":
+        state = cls()
+        for name in (
+            "bars",
+            "last_ts",
+            "last_close",
+            "prev_close",
+            "avg_gain",
+            "avg_loss",
+            "ema_fast",
+            "ema_slow",
+            "ema_signal",
+        ):
+            setattr(state, name, data[name])
+        state.rsi_seed = list(data["rsi_seed"])
+        state.closes = deque(data["closes"])
+        state.trs = deque(data["trs"])
+        state.lows = deque((int(ts), v) for ts, v in data["lows"])
+        state.highs = deque((int(ts), v) for ts, v in data["highs"])
+        state.volumes = deque(data["volumes"])
+        state._resync()
+        return state
+
+
+class IndicatorStreams:
+    """Indicator state per ``(symbol, granularity)``, fed from the candle store."""
+
+    def __init__(
+        self,
+        path=None,
+        candles=None,
+        *,
+        warmup_bars=WARMUP_BARS,
+        checkpoint_interval_s=CHECKPOINT_INTERVAL_S,
+    ):
+        self._path = Path(path) if path else None
+        self._candles = candles or CANDLES
+        self.warmup_bars = int(warmup_bars)
+        self.checkpoint_interval_s = float(checkpoint_interval_s)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._states: dict[tuple[str, int], IndicatorState] = {}
+        self._prices: dict[tuple[str, int], float] = {}
+        self._refreshed: dict[tuple[str, int], float] = {}
+        self._loaded = False
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._stats = {
+            "refreshes": 0,
+            "bars_applied": 0,
+            "rewarms": 0,
+            "fetch_errors": 0,
+            "checkpoints": 0,
+            "restored_series": 0,
+        }
+
+    @property
+    def path(self) -> Path:
+        return self._path or STATE_PATH
+
+    @staticmethod
+    def _key(symbol: str, granularity: int) -> tuple[str, int]:
+        base = str(symbol or "").upper().strip()
+        if base.endswith("-USD"):
+            base = base[:-4]
+        return base, int(granularity)
+
+    # ─── reads ────────────────────────────────────────────────────────────
+
+    def row(self, symbol: str, granularity: int = 3600) -> dict[str, Any] | None:
+        """Latest indicator row plus ``price`` (the newest bar's close), O(1)."""
+        key = self._key(symbol, granularity)
+        self._load()
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or not state.bars:
+                return None
+            return {**state.row, "price": self._prices.get(key, state.last_close)}
+
+    def is_fresh(self, symbol: str, granularity: int, max_age_s: float) -> bool:
+        """Whether a fetching ``refresh()`` ran within ``max_age_s``."""
+        key = self._key(symbol, granularity)
+        with self._lock:
+            refreshed = self._refreshed.get(key)
+        return refreshed is not None and time.monotonic() - refreshed <= max_age_s
+
+    # ─── updates ──────────────────────────────────────────────────────────
+
+    def refresh(
+        self,
+        symbol: str,
+        granularity: int = 3600,
+        *,
+        fetch: bool = True,
+        max_age_s: float | None = None,
+        priority: str = "charts",
+    ) -> dict[str, Any] | None:
+        """Apply every bar closed since the last refresh, then return ``row()``."""
+        key = self._key(symbol, granularity)
+        base, granularity = key
+        self._load()
+        now = int(time.time())
+        closed_before = now - now % granularity  # bars starting earlier are closed
+        warm_start = closed_before - self.warmup_bars * granularity
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and (state.last_ts or 0) < warm_start:
+                del self._states[key]  # too far behind to catch up; rebuild
+                state = None
+                self._stats["rewarms"] += 1
+        start = state.last_ts + granularity if state is not None else warm_start
+
+        rows, settled = self._read(base, granularity, start, fetch, max_age_s, priority)
+        if fetch and any(
+            candle[0] < closed_before and candle[0] + granularity > settled
+            for candle in rows
+        ):
+            # A bar stored while still forming has closed since; refetch the
+            # tail so its final close and volume are what gets applied.
+            rows, settled = self._read(base, granularity, start, fetch, 0, priority)
+
+        with self._lock:
+            # Another refresh may have applied some of these bars already;
+            # advance() skips anything at or before the last applied bar.
+            state = self._states.get(key) or IndicatorState()
+            applied = 0
+            price = None
+            for candle in rows:
+                if candle[0] < closed_before and candle[0] + granularity <= settled:
+                    applied += state.advance(candle)
+                    price = None
+                else:
+                    # Forming, or closed but only stored as a forming snapshot;
+                    # the latter stays pending until a fetching refresh.
+                    price = float(candle[4])
+            if state.bars:
+                self._states[key] = state
+            if price is not None:
+                self._prices[key] = price
+            elif rows and state.bars:
+                self._prices[key] = state.last_close
+            if fetch:
+                self._refreshed[key] = time.monotonic()
+            self._stats["refreshes"] += 1
+            self._stats["bars_applied"] += applied
+            self._dirty = self._dirty or applied > 0
+        self._maybe_checkpoint()
+        return self.row(symbol, granularity)
+
+    def _read(self, base, granularity, start, fetch, max_age_s, priority):
+        """Stored bars from ``start`` and the end of the store's fetched span."""
+        product_id = f"{base}-USD"
+        try:
+            rows = self._candles.range(
+                product_id,
+                granularity,
+                start,
+                fetch=fetch,
+                max_age_s=max_age_s,
+                priority=priority,
+            )
+        except (CandleFetchError, ValueError) as exc:
+            logger.debug("indicator refresh for %s failed: %s", base, exc)
+            rows = []
+            with self._lock:
+                self._stats["fetch_errors"] += 1
+        settled = self._candles.covered_until(
+            product_id, granularity, start, max_age_s=max_age_s
+        )
+        return rows, -math.inf if settled is None else settled
+
+    # ─── checkpoint ───────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._save_lock:
+            if self._loaded:
+                return
+            restored = {}
+            try:
+                data = json.loads(self.path.read_text("utf-8"))
+                if data.get("params") == _PARAMS:
+                    for name, body in (data.get("states") or {}).items():
+                        base, _, gran = name.rpartition(":")
+                        restored[(base, int(gran))] = IndicatorState.from_dict(body)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, KeyError, AttributeError) as exc:
+                logger.warning("indicator checkpoint unreadable, re-warming: %s", exc)
+                restored = {}
+            with self._lock:
+                for key, state in restored.items():
+                    self._states.setdefault(key, state)
+                self._stats["restored_series"] = len(restored)
+            self._loaded = True
+
+    def _maybe_checkpoint(self) -> None:
+        if self._dirty and (
+            time.monotonic() - self._saved_at >= self.checkpoint_interval_s
+        ):
+            self.checkpoint()
+
+    def checkpoint(self) -> bool:
+        """Write every series' state to disk; False when nothing changed."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                states = {
+                    f"{base}:{gran}": state.to_dict()
+                    for (base, gran), state in self._states.items()
+                }
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            path = self.path
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                body = json.dumps(
+                    {"params": _PARAMS, "saved_at": time.time(), "states": states},
+                    separators=(",", ":"),
+                )
+                fd, tmp = tempfile.mkstemp(prefix=".indicators-", dir=str(path.parent))
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                        fh.write(body)
+                    os.replace(tmp, path)
+                except BaseException:
+                    with contextlib.suppress(OSError):
+                        os.unlink(tmp)
+                    raise
+            except OSError as exc:
+                logger.warning("indicator checkpoint failed: %s", exc)
+                with self._lock:
+                    self._dirty = True
+                return False
+            with self._lock:
+                self._stats["checkpoints"] += 1
+            return True
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "series": len(self._states)}
+
+
+INDICATOR_STREAMS = IndicatorStreams()
+
+__all__ = ["INDICATOR_STREAMS", "IndicatorState", "IndicatorStreams"]
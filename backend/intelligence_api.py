@@ -153,23 +153,28 @@ def intelligence_reports():
         )
 
     out: Dict[str, dict] = {}
+    pending: List[str] = []
 
     for sym in symbols:
         cached, freshness = get_cached_report(rds, sym, policy)
 
         if cached:
-            # If stale, serve it and trigger a refresh in background
+            # If stale, serve it and refresh it in background
             cached["freshness"] = freshness
             out[sym] = cached
             if freshness == "stale":
-                refresher.trigger_refresh(sym)
+                pending.append(sym)
             continue
 
-        # Cache miss: return building stub, trigger refresh
+        # Cache miss: return building stub, refresh in background
         stub = building_stub(sym, policy)
         stub["model"]["device"] = engine.device
         out[sym] = stub
-        refresher.trigger_refresh(sym)
+        pending.append(sym)
+
+    # One shared source-fetch cycle for the whole watchlist, not one per symbol
+    if pending:
+        refresher.trigger_refresh_many(pending)
 
     return ok(out)
 
@@ -0,0 +1,207 @@
+"""Process-wide, lazily loaded sentiment models.
+
+``SentimentAnalyzer`` used to load VADER and a transformer in ``__init__``.
+``sentiment_intelligence`` loaded its own FinBERT, and every consumer that
+built an analyzer paid for the startup and kept another copy of the
+weights. ``MODELS`` now owns them:
+
+- Each model is loaded on first use, once per process, and handed to every
+  consumer that asks for the same key. A failed load is remembered as
+  ``None`` so callers degrade instead of retrying on every text.
+- On CPU, ``SENTIMENT_QUANTIZE=1`` applies dynamic int8 quantization to the
+  transformer's ``Linear`` layers (qnnpack on ARM). The quantization mode is
+  part of the key, so fp32 and int8 copies never get mixed up.
+
+``stats()`` reports the process resident memory and, per model, its load
+time, resident-memory growth during the load and weight size.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import platform
+import threading
+import time
+from typing import Any, Callable
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover - psutil is a declared dependency
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_QUANTIZE = os.environ.get("SENTIMENT_QUANTIZE", "0") == "1"
+TRANSFORMER_MODELS = (
+    "ProsusAI/finbert",  # Financial BERT model
+    "cardiffnlp/twitter-roberta-base-sentiment-latest",
+)
+
+_MB = 1024 * 1024
+
+
+def resident_bytes() -> int | None:
+    """Current resident set size of this process, if it can be read."""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def weight_bytes(obj: Any) -> int | None:
+    """Tensor bytes held by a torch model, or by the models in a tuple.
+
+    Wrappers such as pipelines report ``None``: their weights are already
+    counted under the classifier they were built from.
+    """
+    models = obj if isinstance(obj, tuple) else (obj,)
+    state_dicts = [
+        m.state_dict for m in models if callable(getattr(m, "state_dict", None))
+    ]
+    if not state_dicts:
+        return None
+    total = 0
+    pending = [value for state_dict in state_dicts for value in state_dict().values()]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (tuple, list)):  # packed int8 Linear params
+            pending.extend(value)
+        elif hasattr(value, "element_size") and hasattr(value, "numel"):
+            total += value.numel() * value.element_size()
+    return total
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._models: dict[str, Any] = {}
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """The model for ``key``, loading it with ``loader`` on first use."""
+        if key in self._models:
+            return self._models[key]
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._models:
+                return self._models[key]
+            rss_before = resident_bytes()
+            started = time.perf_counter()
+            error = None
+            try:
+                model = loader()
+            except Exception as exc:
+                logger.error(f"Failed to load sentiment model {key}: {exc}")
+                model, error = None, str(exc)
+            load_ms = (time.perf_counter() - started) * 1000.0
+            rss_after = resident_bytes()
+            weights = weight_bytes(model) if model is not None else None
+            with self._lock:
+                self._stats[key] = {
+                    "loaded": model is not None,
+                    "load_ms": round(load_ms, 1),
+                    "rss_delta_mb": (
+                        round((rss_after - rss_before) / _MB, 1)
+                        if rss_before is not None and rss_after is not None
+                        else None
+                    ),
+                    "weights_mb": round(weights / _MB, 1) if weights else None,
+                    "error": error,
+                }
+                self._models[key] = model
+            return model
+
+    def key_for(self, model: Any) -> str | None:
+        """The key ``model`` was loaded under, if it came from this registry."""
+        if model is None:
+            return None
+        with self._lock:
+            return next((k for k, m in self._models.items() if m is model), None)
+
+    def stats(self) -> dict[str, Any]:
+        rss = resident_bytes()
+        with self._lock:
+            return {
+                "rss_mb": round(rss / _MB, 1) if rss is not None else None,
+                "models": {key: dict(row) for key, row in sorted(self._stats.items())},
+            }
+
+
+MODELS = ModelRegistry()
+
+
+def _quantize(model):
+    import torch
+
+    machine = platform.machine().lower()
+    engines = torch.backends.quantized.supported_engines
+    if machine.startswith(("arm", "aarch64")) and "qnnpack" in engines:
+        torch.backends.quantized.engine = "qnnpack"
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def load_sequence_classifier(
+    name: str, *, device: Any = "cpu", quantize: bool | None = None
+) -> tuple[Any, Any] | None:
+    """Shared ``(tokenizer, model)`` for a HuggingFace classifier, or ``None``.
+
+    Quantization only applies on CPU; it defaults to ``SENTIMENT_QUANTIZE``.
+    """
+    device = str(device)
+    quantize = SENTIMENT_QUANTIZE if quantize is None else quantize
+    quantize = quantize and device == "cpu"
+
+    def load():
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        model = AutoModelForSequenceClassification.from_pretrained(name)
+        model = model.to(device).eval()
+        if quantize:
+            model = _quantize(model)
+        return tokenizer, model
+
+    key = f"classifier:{name}:{device}:{'int8' if quantize else 'fp32'}"
+    return MODELS.get(key, load)
+
+
+def sentiment_pipeline(*, quantize: bool | None = None) -> Any:
+    """Shared ``sentiment-analysis`` pipeline over the first model that loads."""
+    import torch
+
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    quantize = SENTIMENT_QUANTIZE if quantize is None else quantize
+
+    def load():
+        from transformers import pipeline
+
+        for name in TRANSFORMER_MODELS:
+            loaded = load_sequence_classifier(name, device=device, quantize=quantize)
+            if loaded is not None:
+                tokenizer, model = loaded
+                return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+        raise RuntimeError("no transformer sentiment model could be loaded")
+
+    mode = "int8" if quantize and device == "cpu" else "fp32"
+    return MODELS.get(f"pipeline:sentiment:{device}:{mode}", load)
+
+
+__all__ = [
+    "MODELS",
+    "ModelRegistry",
+    "load_sequence_classifier",
+    "resident_bytes",
+    "sentiment_pipeline",
+    "weight_bytes",
+]
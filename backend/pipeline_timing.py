@@ -0,0 +1,311 @@
+"""Per-stage wall-time instrumentation for the snapshot compute pipeline.
+
+``_compute_snapshots_from_cache`` runs a long, fixed sequence of stages
+(recompute, SWR tables, banners, heat, alert engine, delivery, rankings...).
+This module gives it a cheap span API so each cycle records how long every
+stage took:
+
+    trace = PIPELINE_TIMER.start_cycle()
+    ...stage work...
+    trace.mark("swr_tables")          # time since the previous mark
+    with trace.span("compute_alerts"):  # time of exactly this block
+        ...
+    trace.finish(budget_s=8)
+
+Per stage we keep cumulative Prometheus-style histogram buckets plus a rolling
+window of recent samples (for p50/p95/max in JSON). The slowest cycles from
+the recent window are retained as structured traces so a cadence overrun on
+the home server can be pinned to the stage that caused it.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Bucket upper edges in milliseconds (non-cumulative counts are stored; the
+# Prometheus emitter accumulates them).
+STAGE_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_WINDOW = int(os.environ.get("MW_PIPELINE_TIMING_WINDOW", "120"))
+_SLOW_TRACES = int(os.environ.get("MW_PIPELINE_SLOW_TRACES", "5"))
+
+CYCLE_STAGE = "cycle_total"
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class _StageHistogram:
+    """Cumulative bucket counters plus a rolling window of recent samples."""
+
+    __slots__ = ("buckets", "overflow", "sum_ms", "count", "recent")
+
+    def __init__(self, window):
+        self.buckets = [0] * len(STAGE_BUCKETS_MS)
+        self.overflow = 0
+        self.sum_ms = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, ms):
+        self.count += 1
+        self.sum_ms += ms
+        self.recent.append(ms)
+        for i, edge in enumerate(STAGE_BUCKETS_MS):
+            if ms <= edge:
+                self.buckets[i] += 1
+                return
+        self.overflow += 1
+
+    def summary(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "last_ms": round(self.recent[-1], 3) if self.recent else None,
+            "p50_ms": round(_percentile(recent, 0.50), 3) if recent else None,
+            "p95_ms": round(_percentile(recent, 0.95), 3) if recent else None,
+            "max_ms": round(recent[-1], 3) if recent else None,
+            "window": len(recent),
+        }
+
+
+class CycleTrace:
+    """Stage timings for one compute cycle; not shared across threads."""
+
+    def __init__(self, timer, clock=time.perf_counter):
+        self._timer = timer
+        self._clock = clock
+        self.started_at = time.time()
+        self._t0 = clock()
+        self._cursor = self._t0
+        self.stages = []  # [(stage, ms)] in execution order
+        self.total_ms = None
+
+    def mark(self, stage):
+        """Attribute the time since the previous mark/span to ``stage``."""
+        now = self._clock()
+        self.stages.append((stage, (now - self._cursor) * 1000.0))
+        self._cursor = now
+
+    @contextmanager
+    def span(self, stage):
+        """Time exactly the enclosed block as ``stage``."""
+        start = self._clock()
+        try:
+            yield self
+        finally:
+            now = self._clock()
+            self.stages.append((stage, (now - start) * 1000.0))
+            self._cursor = now
+
+    def finish(self, budget_s=None):
+        """Close the cycle and hand it to the owning timer (idempotent)."""
+        if self.total_ms is not None:
+            return self
+        self.total_ms = (self._clock() - self._t0) * 1000.0
+        self._timer._record(self, budget_s)
+        return self
+
+    def as_dict(self):
+        return {
+            "started_at": round(self.started_at, 3),
+            "total_ms": round(self.total_ms or 0.0, 3),
+            "stages": [
+                {"stage": stage, "ms": round(ms, 3)} for stage, ms in self.stages
+            ],
+        }
+
+
+class PipelineTimer:
+    """Thread-safe aggregate of CycleTrace results."""
+
+    def __init__(self, window=_WINDOW, slow_traces=_SLOW_TRACES):
+        self._lock = threading.Lock()
+        self._window = max(1, int(window))
+        self._slow_traces = max(0, int(slow_traces))
+        self._stages = {}
+        self._recent_cycles = deque(maxlen=self._window)
+        self.cycles = 0
+        self.overruns = 0
+        self.last_budget_s = None
+
+    def start_cycle(self):
+        return CycleTrace(self)
+
+    def _record(self, trace, budget_s):
+        with self._lock:
+            self.cycles += 1
+            if budget_s:
+                self.last_budget_s = float(budget_s)
+                if trace.total_ms > float(budget_s) * 1000.0:
+                    self.overruns += 1
+            for stage, ms in trace.stages:
+                self._hist(stage).observe(ms)
+            self._hist(CYCLE_STAGE).observe(trace.total_ms)
+            if self._slow_traces:
+                self._recent_cycles.append(trace)
+
+    def record_stages(self, stages, budget_s=None):
+        """Record an already-timed cycle given as [(stage, ms)]."""
+        trace = CycleTrace(self)
+        trace.stages = list(stages)
+        trace.total_ms = sum(ms for _stage, ms in trace.stages)
+        self._record(trace, budget_s)
+        return trace
+
+    def _hist(self, stage):
+        hist = self._stages.get(stage)
+        if hist is None:
+            hist = self._stages[stage] = _StageHistogram(self._window)
+        return hist
+
+    def slowest(self, n=None):
+        """Return the slowest cycles from the recent window, slowest first."""
+        n = self._slow_traces if n is None else int(n)
+        with self._lock:
+            traces = list(self._recent_cycles)
+        traces.sort(key=lambda tr: tr.total_ms or 0.0, reverse=True)
+        return [tr.as_dict() for tr in traces[:n]]
+
+    def snapshot(self):
+        """JSON-friendly summary for /api/metrics."""
+        with self._lock:
+            stages = {name: hist.summary() for name, hist in self._stages.items()}
+            out = {
+                "cycles": self.cycles,
+                "overruns": self.overruns,
+                "budget_s": self.last_budget_s,
+                "stages": stages,
+            }
+        out["slowest_cycles"] = self.slowest()
+        return out
+
+    def histogram_lines(self, prefix, label="stage", help_txt="Wall time per stage"):
+        """Cumulative histogram exposition, one label set per stage."""
+        with self._lock:
+            stages = [
+                (name, list(h.buckets), h.overflow, h.sum_ms, h.count)
+                for name, h in sorted(self._stages.items())
+            ]
+        lines = [f"# HELP {prefix} {help_txt}", f"# TYPE {prefix} histogram"]
+        for name, buckets, overflow, sum_ms, count in stages:
+            running = 0
+            for edge, n in zip(STAGE_BUCKETS_MS, buckets):
+                running += n
+                lines.append(
+                    f'{prefix}_bucket{{{label}="{name}",le="{edge / 1000.0:.3f}"}} {running}'
+                )
+            lines.append(f'{prefix}_bucket{{{label}="{name}",le="+Inf"}} {running + overflow}')
+            lines.append(f'{prefix}_sum{{{label}="{name}"}} {sum_ms / 1000.0:.6f}')
+            lines.append(f'{prefix}_count{{{label}="{name}"}} {count}')
+        return lines
+
+    def prometheus_lines(self):
+        """Stage histograms plus cycle/overrun counters for /metrics.prom."""
+        lines = self.histogram_lines(
+            "pipeline_stage_duration_seconds",
+            help_txt="Wall time per snapshot pipeline stage",
+        )
+        with self._lock:
+            cycles, overruns = self.cycles, self.overruns
+        lines.append("# HELP pipeline_cycles_total Snapshot compute cycles recorded")
+        lines.append("# TYPE pipeline_cycles_total counter")
+        lines.append(f"pipeline_cycles_total {cycles}")
+        lines.append(
+            "# HELP pipeline_cycle_overruns_total Cycles that exceeded the compute interval"
+        )
+        lines.append("# TYPE pipeline_cycle_overruns_total counter")
+        lines.append(f"pipeline_cycle_overruns_total {overruns}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._recent_cycles.clear()
+            self.cycles = 0
+            self.overruns = 0
+            self.last_budget_s = None
+
+
+class DetectorMetrics:
+    """Aggregates alerts_engine DetectorStats across compute_alerts() calls.
+
+    Elapsed time goes into the same bucketed histograms as pipeline stages;
+    scanned/candidate/survivor counts are kept as running totals plus the
+    value from the latest call.
+    """
+
+    def __init__(self, window=_WINDOW):
+        self._lock = threading.Lock()
+        self._timer = PipelineTimer(window=window, slow_traces=0)
+        self._counts = {}
+
+    def observe(self, detectors):
+        """Record one call's ``{name: DetectorStats}`` mapping."""
+        if not detectors:
+            return
+        stages = []
+        with self._lock:
+            for name, st in detectors.items():
+                stages.append((name, float(getattr(st, "elapsed_ms", 0.0) or 0.0)))
+                row = self._counts.setdefault(
+                    name,
+                    {"candidates_total": 0, "survived_total": 0},
+                )
+                row["scanned_last"] = int(getattr(st, "scanned", 0) or 0)
+                row["candidates_last"] = int(getattr(st, "candidates", 0) or 0)
+                row["survived_last"] = int(getattr(st, "survived", 0) or 0)
+                row["candidates_total"] += row["candidates_last"]
+                row["survived_total"] += row["survived_last"]
+        self._timer.record_stages(stages)
+
+    def snapshot(self):
+        timing = self._timer.snapshot()["stages"]
+        with self._lock:
+            counts = {name: dict(row) for name, row in self._counts.items()}
+        out = {}
+        for name, row in counts.items():
+            out[name] = {**row, **(timing.get(name) or {})}
+        return {
+            "calls": self._timer.cycles,
+            "total": timing.get(CYCLE_STAGE),
+            "detectors": out,
+        }
+
+    def prometheus_lines(self):
+        lines = self._timer.histogram_lines(
+            "alert_detector_duration_seconds",
+            label="detector",
+            help_txt="Wall time per alerts_engine detector call",
+        )
+        with self._lock:
+            counts = sorted((name, dict(row)) for name, row in self._counts.items())
+        for metric, key, kind, help_txt in (
+            ("alert_detector_symbols_scanned", "scanned_last", "gauge",
+             "Symbols scanned by the detector in the latest call"),
+            ("alert_detector_candidates_total", "candidates_total", "counter",
+             "Alert candidates produced by the detector"),
+            ("alert_detector_survived_total", "survived_total", "counter",
+             "Detector candidates surviving stream shaping and pruning"),
+        ):
+            lines.append(f"# HELP {metric} {help_txt}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, row in counts:
+                lines.append(f'{metric}{{detector="{name}"}} {row.get(key, 0)}')
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+        self._timer.reset()
+
+
+PIPELINE_TIMER = PipelineTimer()
+DETECTOR_METRICS = DetectorMetrics()
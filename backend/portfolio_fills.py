@@ -0,0 +1,182 @@
+"""Local fill history for Portfolio Mode cost basis.
+
+Coinbase fills are immutable once reported, so there is no reason to download
+an account's whole trading history on every portfolio refresh. Fills are kept
+in the member database beside a per-account sync cursor:
+
+``newest_ts``          highest ``sequence_timestamp`` seen; the next refresh
+                       asks Coinbase only for fills at or after it.
+``oldest_ts``          lowest timestamp stored; while ``history_complete`` is
+                       false, each refresh backfills one batch of pages older
+                       than this until Coinbase reports the end of history.
+``gap_start_ts`` /     fills between these may be missing: a refresh that fell
+``gap_end_ts``         too far behind stores the newest pages first, then
+                       backfills down to the old cursor one batch at a time.
+
+Rows are keyed by ``(account_key, fill_id)`` so the overlap at the cursor
+boundary is dropped by the primary key rather than by timestamp arithmetic.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterable
+
+try:
+    from watchlist import _db_connect
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.watchlist import _db_connect
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolio_fills (
+    account_key TEXT NOT NULL,
+    fill_id TEXT NOT NULL,
+    sequence_ts TEXT NOT NULL,
+    fill_json TEXT NOT NULL,
+    PRIMARY KEY (account_key, fill_id)
+);
+CREATE TABLE IF NOT EXISTS portfolio_fill_sync (
+    account_key TEXT PRIMARY KEY,
+    newest_ts TEXT,
+    oldest_ts TEXT,
+    history_complete INTEGER NOT NULL DEFAULT 0,
+    synced_at TEXT NOT NULL,
+    gap_start_ts TEXT,
+    gap_end_ts TEXT
+);
+"""
+
+_schema_ready = False
+
+
+def ensure_fill_schema() -> None:
+    global _schema_ready
+    if _schema_ready:
+        return
+    conn = _db_connect()
+    try:
+        conn.executescript(_SCHEMA)
+        # Additive migration for sync rows created before gap tracking.
+        cols = {
+            r["name"]
+            for r in conn.execute("PRAGMA table_info(portfolio_fill_sync)").fetchall()
+        }
+        for col in ("gap_start_ts", "gap_end_ts"):
+            if col not in cols:
+                conn.execute(f"ALTER TABLE portfolio_fill_sync ADD COLUMN {col} TEXT")
+        conn.commit()
+    finally:
+        conn.close()
+    _schema_ready = True
+
+
+def fill_timestamp(fill: dict[str, Any]) -> str:
+    return str(fill.get("sequence_timestamp") or fill.get("trade_time") or "")
+
+
+def fill_id(fill: dict[str, Any]) -> str:
+    """Coinbase's entry id, or a content hash for fills that lack one."""
+    entry = fill.get("entry_id") or fill.get("trade_id")
+    if entry:
+        return str(entry)
+    raw = json.dumps(fill, sort_keys=True, default=str)
+    return "h:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def sync_state(account_key: str) -> dict[str, Any] | None:
+    ensure_fill_schema()
+    conn = _db_connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM portfolio_fill_sync WHERE account_key = ?", (account_key,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {
+        "newest_ts": row["newest_ts"],
+        "oldest_ts": row["oldest_ts"],
+        "history_complete": bool(row["history_complete"]),
+        "synced_at": row["synced_at"],
+        "gap_start_ts": row["gap_start_ts"],
+        "gap_end_ts": row["gap_end_ts"],
+    }
+
+
+def load_fills(account_key: str) -> list[dict[str, Any]]:
+    ensure_fill_schema()
+    conn = _db_connect()
+    try:
+        rows = conn.execute(
+            "SELECT fill_json FROM portfolio_fills WHERE account_key = ?"
+            " ORDER BY sequence_ts ASC, fill_id ASC",
+            (account_key,),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [json.loads(row["fill_json"]) for row in rows]
+
+
+def save_fills(
+    account_key: str,
+    fills: Iterable[dict[str, Any]],
+    *,
+    history_complete: bool,
+    synced_at: str,
+    gap: tuple[str, str] | None = None,
+) -> int:
+    """Store new fills and advance the cursor in one transaction.
+
+    Returns the number of fills that were not already stored. ``gap`` is the
+    ``(start_ts, end_ts)`` range still to backfill, or None once it is closed.
+    """
+    ensure_fill_schema()
+    rows = [
+        (account_key, fill_id(f), fill_timestamp(f), json.dumps(f, sort_keys=True))
+        for f in fills
+        if isinstance(f, dict)
+    ]
+    conn = _db_connect()
+    try:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO portfolio_fills"
+            " (account_key, fill_id, sequence_ts, fill_json) VALUES (?,?,?,?)",
+            rows,
+        )
+        inserted = conn.total_changes - before
+        bounds = conn.execute(
+            "SELECT MAX(sequence_ts), MIN(sequence_ts) FROM portfolio_fills"
+            " WHERE account_key = ? AND sequence_ts != ''",
+            (account_key,),
+        ).fetchone()
+        conn.execute(
+            """
+            INSERT INTO portfolio_fill_sync
+                (account_key, newest_ts, oldest_ts, history_complete, synced_at,
+                 gap_start_ts, gap_end_ts)
+            VALUES (?,?,?,?,?,?,?)
+            ON CONFLICT(account_key) DO UPDATE SET
+                newest_ts = excluded.newest_ts,
+                oldest_ts = excluded.oldest_ts,
+                history_complete = excluded.history_complete,
+                synced_at = excluded.synced_at,
+                gap_start_ts = excluded.gap_start_ts,
+                gap_end_ts = excluded.gap_end_ts
+            """,
+            (
+                account_key,
+                bounds[0],
+                bounds[1],
+                1 if history_complete else 0,
+                synced_at,
+                gap[0] if gap else None,
+                gap[1] if gap else None,
+            ),
+        )
+        conn.commit()
+        return inserted
+    finally:
+        conn.close()
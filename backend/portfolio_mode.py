@@ -6,6 +6,7 @@ permissions before loading balances and refuses keys that can trade or transfer.
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -14,9 +15,10 @@ import logging
 import os
 import threading
 import time
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Blueprint, jsonify, request
 
 try:
@@ -24,6 +26,11 @@ try:
 except ImportError:  # package-style imports used by pytest from the repo root
     from backend.watchlist import get_authenticated_user
 
+try:
+    import portfolio_fills
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend import portfolio_fills
+
 
 portfolio_bp = Blueprint("portfolio_mode", __name__)
 
@@ -31,6 +38,14 @@ COINBASE_HOST = "api.coinbase.com"
 COINBASE_BASE_URL = f"https://{COINBASE_HOST}"
 OPEN_ORDER_STATUSES = {"PENDING", "OPEN", "QUEUED", "CANCEL_QUEUED", "EDIT_QUEUED"}
 USD_EQUIVALENTS = {"USD", "USDC"}
+# Holding prices older than this are re-fetched from the product API.
+LIVE_PRICE_MAX_AGE_S = float(os.environ.get("PORTFOLIO_LIVE_PRICE_MAX_AGE_S", "60"))
+# Wall-clock budget for every Coinbase request of one snapshot load.
+FETCH_DEADLINE_S = float(os.environ.get("PORTFOLIO_FETCH_DEADLINE_S", "12"))
+FETCH_WORKERS = int(os.environ.get("PORTFOLIO_FETCH_WORKERS", "8"))
+RATE_LIMIT_RETRIES = int(os.environ.get("PORTFOLIO_RATE_LIMIT_RETRIES", "2"))
+# Fraction of the cache TTL after which a read starts a background refresh.
+REFRESH_AHEAD_RATIO = float(os.environ.get("PORTFOLIO_REFRESH_AHEAD_RATIO", "0.8"))
 
 
 def _decimal(value: Any) -> Decimal:
@@ -114,9 +129,21 @@ class CoinbaseAdvancedTradeClient:
         self.api_key_name = str(api_key_name or "").strip()
         self.api_key_secret = _normalize_secret(api_key_secret)
         self.oauth_access_token = str(oauth_access_token or "").strip()
-        self.http = http_session or requests.Session()
+        if http_session is None:
+            # Keep-alive pool wide enough for PortfolioService's parallel fetches.
+            http_session = requests.Session()
+            http_session.mount(
+                "https://", HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS)
+            )
+        self.http = http_session
         self.timeout = timeout
         self.auth_method = "oauth" if self.oauth_access_token else "jwt"
+        self._deadline: float | None = None
+        self._paused_until = 0.0
+        self._calls_lock = threading.Lock()
+        # endpoint -> [requests, total_ms, max_ms]
+        self._calls: dict[str, list[float]] = {}
+        self._rate_limited = 0
 
     @classmethod
     def from_environment(cls) -> "CoinbaseAdvancedTradeClient":
@@ -147,27 +174,111 @@ class CoinbaseAdvancedTradeClient:
             )
         )
 
-    def get(self, path: str, *, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        try:
-            if self.auth_method == "oauth":
-                auth_header = f"Bearer {self.oauth_access_token}"
-            else:
-                auth_header = f"Bearer {self._jwt('GET', path)}"
-
-            response = self.http.get(
-                f"{COINBASE_BASE_URL}{path}",
-                params=params or None,
-                headers={
-                    "Authorization": auth_header,
-                    "Accept": "application/json",
-                    "Cache-Control": "no-cache",
+    def set_deadline(self, deadline: float | None) -> None:
+        """Monotonic time by which all requests of the current load must finish.
+
+        Shared by every thread using this client; requests shorten their
+        timeout to fit and fail fast once it has passed.
+        """
+        self._deadline = deadline
+
+    def call_stats(self, *, reset: bool = False) -> dict[str, Any]:
+        """Per-endpoint request count and latency since the last reset."""
+        with self._calls_lock:
+            stats = {
+                "requests": int(sum(row[0] for row in self._calls.values())),
+                "rate_limited": self._rate_limited,
+                "endpoints": {
+                    name: {
+                        "count": int(row[0]),
+                        "total_ms": round(row[1], 1),
+                        "max_ms": round(row[2], 1),
+                    }
+                    for name, row in sorted(self._calls.items())
                 },
-                timeout=self.timeout,
-            )
-        except PortfolioModeError:
-            raise
-        except requests.RequestException as exc:
-            raise CoinbaseRequestError("Coinbase did not respond in time.") from exc
+            }
+            if reset:
+                self._calls = {}
+                self._rate_limited = 0
+        return stats
+
+    def _record_call(self, path: str, started: float) -> None:
+        ms = (time.perf_counter() - started) * 1000.0
+        name = path.removeprefix("/api/v3/brokerage/")
+        if name.startswith("products/"):
+            name = "products/{product_id}"
+        with self._calls_lock:
+            row = self._calls.setdefault(name, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += ms
+            row[2] = max(row[2], ms)
+
+    def _request_timeout(self) -> float:
+        now = time.monotonic()
+        pause = self._paused_until - now
+        if pause > 0:
+            # Another thread hit a 429: hold this request until it lifts.
+            if self._deadline is not None and now + pause >= self._deadline:
+                raise CoinbaseRequestError(
+                    "Coinbase temporarily rate-limited Portfolio Mode."
+                )
+            time.sleep(pause)
+            now = time.monotonic()
+        if self._deadline is None:
+            return self.timeout
+        remaining = self._deadline - now
+        if remaining <= 0:
+            raise CoinbaseRequestError("Coinbase did not respond in time.")
+        return min(self.timeout, remaining)
+
+    def _back_off(self, response: Any, attempt: int) -> bool:
+        """Pause all requests for Retry-After; False if that overruns the deadline."""
+        try:
+            delay = float(response.headers.get("Retry-After") or 0)
+        except (AttributeError, TypeError, ValueError):
+            delay = 0.0
+        if delay <= 0:
+            delay = 0.5 * (2**attempt)
+        now = time.monotonic()
+        with self._calls_lock:
+            self._rate_limited += 1
+        if self._deadline is not None and now + delay >= self._deadline:
+            return False
+        self._paused_until = max(self._paused_until, now + delay)
+        return True
+
+    def get(self, path: str, *, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            timeout = self._request_timeout()
+            started = time.perf_counter()
+            try:
+                if self.auth_method == "oauth":
+                    auth_header = f"Bearer {self.oauth_access_token}"
+                else:
+                    auth_header = f"Bearer {self._jwt('GET', path)}"
+
+                response = self.http.get(
+                    f"{COINBASE_BASE_URL}{path}",
+                    params=params or None,
+                    headers={
+                        "Authorization": auth_header,
+                        "Accept": "application/json",
+                        "Cache-Control": "no-cache",
+                    },
+                    timeout=timeout,
+                )
+            except PortfolioModeError:
+                raise
+            except requests.RequestException as exc:
+                raise CoinbaseRequestError("Coinbase did not respond in time.") from exc
+            finally:
+                self._record_call(path, started)
+            if (
+                response.status_code != 429
+                or attempt == RATE_LIMIT_RETRIES
+                or not self._back_off(response, attempt)
+            ):
+                break
 
         if response.status_code >= 400:
             if response.status_code in (401, 403):
@@ -193,12 +304,14 @@ class CoinbaseAdvancedTradeClient:
         *,
         limit: int,
         max_pages: int = 5,
+        params: dict[str, Any] | None = None,
     ) -> PageResult:
         cursor = ""
         items: list[dict[str, Any]] = []
         complete = True
+        base_params = dict(params or {})
         for page_index in range(max_pages):
-            params: dict[str, Any] = {"limit": limit}
+            params = {**base_params, "limit": limit}
             if cursor:
                 params["cursor"] = cursor
             payload = self.get(path, params=params)
@@ -229,10 +342,27 @@ class CoinbaseAdvancedTradeClient:
         return self._pages("/api/v3/brokerage/accounts", "accounts", limit=250)
 
     def list_fills(self) -> PageResult:
+        return self.list_fills_between()
+
+    def list_fills_between(
+        self,
+        *,
+        start: str | None = None,
+        end: str | None = None,
+        max_pages: int = 5,
+    ) -> PageResult:
+        """Fills with ``start <= sequence_timestamp <= end`` (either optional)."""
+        params: dict[str, Any] = {}
+        if start:
+            params["start_sequence_timestamp"] = start
+        if end:
+            params["end_sequence_timestamp"] = end
         return self._pages(
             "/api/v3/brokerage/orders/historical/fills",
             "fills",
             limit=1000,
+            max_pages=max_pages,
+            params=params,
         )
 
     def list_orders(self) -> PageResult:
@@ -245,6 +375,21 @@ class CoinbaseAdvancedTradeClient:
     def get_product(self, product_id: str) -> dict[str, Any]:
         return self.get(f"/api/v3/brokerage/products/{product_id}")
 
+    def list_products(self, product_ids: Iterable[str]) -> list[dict[str, Any]]:
+        """Many products per request (``product_ids`` repeated in the query)."""
+        ids = list(dict.fromkeys(product_ids))
+        products: list[dict[str, Any]] = []
+        for offset in range(0, len(ids), 100):
+            chunk = ids[offset : offset + 100]
+            payload = self.get(
+                "/api/v3/brokerage/products",
+                params={"product_ids": chunk, "limit": len(chunk)},
+            )
+            items = payload.get("products")
+            if isinstance(items, list):
+                products.extend(item for item in items if isinstance(item, dict))
+        return products
+
 
 def _fill_base_quantity(fill: dict[str, Any]) -> Decimal:
     size = _decimal(fill.get("size"))
@@ -254,49 +399,46 @@ def _fill_base_quantity(fill: dict[str, Any]) -> Decimal:
     return size
 
 
-def reconstruct_cost_basis(
-    currency: str,
-    current_quantity: Decimal,
-    fills: Iterable[dict[str, Any]],
-    *,
-    history_complete: bool = True,
-) -> dict[str, Any]:
-    """Reconstruct weighted cost only for quantity covered by USD fills.
+def _fill_usd_base(fill: dict[str, Any]) -> str | None:
+    """Base currency of a fill against USD/USDC, else None."""
+    parts = str(fill.get("product_id") or "").upper().split("-")
+    if len(parts) < 2 or parts[1] not in USD_EQUIVALENTS:
+        return None
+    return parts[0]
 
-    Any current quantity above fill-covered inventory is explicitly unknown.
-    """
 
-    relevant: list[dict[str, Any]] = []
-    for fill in fills:
-        product_id = str(fill.get("product_id") or "").upper()
-        parts = product_id.split("-")
-        if len(parts) < 2 or parts[0] != currency or parts[1] not in USD_EQUIVALENTS:
-            continue
-        relevant.append(fill)
-    relevant.sort(
-        key=lambda item: str(
-            item.get("trade_time") or item.get("sequence_timestamp") or ""
-        )
-    )
+def _fill_time(fill: dict[str, Any]) -> str:
+    return str(fill.get("trade_time") or fill.get("sequence_timestamp") or "")
 
-    covered_quantity = Decimal("0")
-    covered_cost = Decimal("0")
-    for fill in relevant:
-        quantity = _fill_base_quantity(fill)
-        price = _decimal(fill.get("price"))
-        commission = _decimal(fill.get("commission"))
-        if quantity <= 0 or price <= 0:
-            continue
-        side = str(fill.get("side") or "").upper()
-        if side == "BUY":
-            covered_quantity += quantity
-            covered_cost += (quantity * price) + commission
-        elif side == "SELL" and covered_quantity > 0:
-            removed = min(quantity, covered_quantity)
-            average = covered_cost / covered_quantity
-            covered_quantity -= removed
-            covered_cost = max(Decimal("0"), covered_cost - (average * removed))
 
+def _apply_fill(
+    covered_quantity: Decimal, covered_cost: Decimal, fill: dict[str, Any]
+) -> tuple[Decimal, Decimal]:
+    """Average-cost inventory after one fill."""
+    quantity = _fill_base_quantity(fill)
+    price = _decimal(fill.get("price"))
+    commission = _decimal(fill.get("commission"))
+    if quantity <= 0 or price <= 0:
+        return covered_quantity, covered_cost
+    side = str(fill.get("side") or "").upper()
+    if side == "BUY":
+        covered_quantity += quantity
+        covered_cost += (quantity * price) + commission
+    elif side == "SELL" and covered_quantity > 0:
+        removed = min(quantity, covered_quantity)
+        average = covered_cost / covered_quantity
+        covered_quantity -= removed
+        covered_cost = max(Decimal("0"), covered_cost - (average * removed))
+    return covered_quantity, covered_cost
+
+
+def _cost_basis_payload(
+    current_quantity: Decimal,
+    covered_quantity: Decimal,
+    covered_cost: Decimal,
+    fill_count: int,
+    history_complete: bool,
+) -> dict[str, Any]:
     tolerance = max(Decimal("0.00000001"), current_quantity * Decimal("0.005"))
     unknown_quantity = max(Decimal("0"), current_quantity - covered_quantity)
     known_quantity = min(current_quantity, covered_quantity)
@@ -318,12 +460,201 @@ def reconstruct_cost_basis(
         "known_quantity": _float(known_quantity),
         "unknown_quantity": _float(unknown_quantity),
         "known_cost_usd": _float(known_cost) if known_cost is not None else None,
-        "fill_count": len(relevant),
+        "fill_count": fill_count,
         "history_complete": bool(history_complete),
         "source": "coinbase_advanced_trade_fills",
     }
 
 
+def reconstruct_cost_basis(
+    currency: str,
+    current_quantity: Decimal,
+    fills: Iterable[dict[str, Any]],
+    *,
+    history_complete: bool = True,
+) -> dict[str, Any]:
+    """Reconstruct weighted cost only for quantity covered by USD fills.
+
+    Any current quantity above fill-covered inventory is explicitly unknown.
+    """
+
+    relevant = [fill for fill in fills if _fill_usd_base(fill) == currency]
+    relevant.sort(key=_fill_time)
+
+    covered_quantity = Decimal("0")
+    covered_cost = Decimal("0")
+    for fill in relevant:
+        covered_quantity, covered_cost = _apply_fill(
+            covered_quantity, covered_cost, fill
+        )
+    return _cost_basis_payload(
+        current_quantity,
+        covered_quantity,
+        covered_cost,
+        len(relevant),
+        history_complete,
+    )
+
+
+class FillLedger:
+    """USD fills grouped by base currency, with running average cost per currency.
+
+    ``reconstruct_cost_basis`` rescans every fill for every held currency. The
+    ledger groups fills once and folds each new fill into its currency's
+    running inventory, so a refresh that brings three new fills costs three
+    updates. A fill older than the newest one already applied (backfill, late
+    report) marks just that currency for an in-order rebuild.
+    """
+
+    def __init__(self):
+        self._seen: set[str] = set()
+        self._fills: dict[str, list[tuple[str, str, dict[str, Any]]]] = {}
+        # currency -> [covered_quantity, covered_cost, fill_count, last_key]
+        self._running: dict[str, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, fills: Iterable[dict[str, Any]]) -> int:
+        """Fold in fills not seen before; returns how many were new."""
+        added = 0
+        stale: set[str] = set()
+        for fill in fills:
+            if not isinstance(fill, dict):
+                continue
+            fid = portfolio_fills.fill_id(fill)
+            if fid in self._seen:
+                continue
+            self._seen.add(fid)
+            added += 1
+            base = _fill_usd_base(fill)
+            if base is None:
+                continue
+            key = (_fill_time(fill), fid)
+            self._fills.setdefault(base, []).append((key[0], key[1], fill))
+            running = self._running.setdefault(
+                base, [Decimal("0"), Decimal("0"), 0, ("", "")]
+            )
+            if base in stale or key < running[3]:
+                stale.add(base)
+                continue
+            running[0], running[1] = _apply_fill(running[0], running[1], fill)
+            running[2] += 1
+            running[3] = key
+        for base in stale:
+            self._rebuild(base)
+        return added
+
+    def _rebuild(self, base: str) -> None:
+        bucket = self._fills.get(base) or []
+        bucket.sort(key=lambda row: (row[0], row[1]))
+        quantity, cost = Decimal("0"), Decimal("0")
+        for _ts, _fid, fill in bucket:
+            quantity, cost = _apply_fill(quantity, cost, fill)
+        last = (bucket[-1][0], bucket[-1][1]) if bucket else ("", "")
+        self._running[base] = [quantity, cost, len(bucket), last]
+
+    def cost_basis(
+        self, currency: str, current_quantity: Decimal, *, history_complete: bool
+    ) -> dict[str, Any]:
+        quantity, cost, count, _last = self._running.get(
+            currency, [Decimal("0"), Decimal("0"), 0, None]
+        )
+        return _cost_basis_payload(
+            current_quantity, quantity, cost, count, history_complete
+        )
+
+
+# account_key -> FillLedger, rebuilt from the local fill store after a restart.
+# _LEDGERS_LOCK only guards the per-account lock table; each sync pages under
+# its own account's lock so a slow account never blocks the others.
+_LEDGERS: dict[str, FillLedger] = {}
+_LEDGER_LOCKS: dict[str, threading.Lock] = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def sync_fill_ledger(
+    client: Any, account_key: str
+) -> tuple[FillLedger, bool, dict[str, Any]]:
+    """Bring the account's ledger up to date with as few fill pages as possible.
+
+    First sync pulls the usual 5 pages and stores them. Later syncs request
+    only fills at or after the stored cursor, plus one backfill batch older
+    than the oldest stored fill while history is still incomplete. A sync too
+    far behind to page forward to the cursor keeps what is stored, adds the
+    newest pages and backfills the gap down to the old cursor, one batch per
+    sync. Returns ``(ledger, history_complete, info)``; history counts as
+    incomplete while a gap is open.
+    """
+    with _LEDGERS_LOCK:
+        account_lock = _LEDGER_LOCKS.setdefault(account_key, threading.Lock())
+    with account_lock:
+        state = portfolio_fills.sync_state(account_key)
+        ledger = _LEDGERS.get(account_key)
+        if ledger is None or state is None:
+            ledger = FillLedger()
+            if state is not None:
+                ledger.add(portfolio_fills.load_fills(account_key))
+            _LEDGERS[account_key] = ledger
+
+        mode = "incremental"
+        gap: tuple[str, str] | None = None
+        fetched: list[dict[str, Any]] = []
+        if state is None or not state.get("newest_ts"):
+            page = client.list_fills_between()
+            fetched = page.items
+            complete = page.complete
+            mode = "full"
+        else:
+            if state.get("gap_end_ts"):
+                gap = (state["gap_start_ts"], state["gap_end_ts"])
+            page = client.list_fills_between(start=state["newest_ts"], max_pages=20)
+            fetched = page.items
+            complete = state["history_complete"]
+            if not page.complete:
+                # Too far behind to page forward to the cursor: keep the newest
+                # pages and backfill between them and the stored fills.
+                oldest = _oldest_fill_ts(page.items)
+                if oldest:
+                    logging.info("portfolio fills: cursor too old, backfilling gap")
+                    gap = (gap[0] if gap else state["newest_ts"], oldest)
+            if gap:
+                between = client.list_fills_between(
+                    start=gap[0], end=gap[1], max_pages=20
+                )
+                fetched = fetched + between.items
+                oldest = _oldest_fill_ts(between.items)
+                if between.complete:
+                    gap = None
+                elif oldest:
+                    gap = (gap[0], oldest)
+                mode += "+gap"
+            if not complete and state.get("oldest_ts"):
+                older = client.list_fills_between(end=state["oldest_ts"])
+                fetched = fetched + older.items
+                complete = older.complete
+                mode += "+backfill"
+
+        portfolio_fills.save_fills(
+            account_key,
+            fetched,
+            history_complete=complete,
+            synced_at=_iso_now(),
+            gap=gap,
+        )
+        new_count = ledger.add(fetched)
+        return ledger, complete and gap is None, {
+            "mode": mode,
+            "fetched": len(fetched),
+            "new": new_count,
+            "stored": len(ledger),
+        }
+
+
+def _oldest_fill_ts(fills: Iterable[dict[str, Any]]) -> str | None:
+    return min(filter(None, map(portfolio_fills.fill_timestamp, fills)), default=None)
+
+
 def apply_manual_cost_basis(
     snapshot: dict[str, Any],
     manual_map: dict[str, dict[str, Any]] | None,
@@ -474,7 +805,102 @@ def _serialize_open_order(order: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+# Registered by the app: () -> {SYMBOL: {"price", "age_seconds", "source",
+# "change_24h_pct"}} built from the live WebSocket tape and the board's last
+# price snapshot, so holdings the board already tracks cost no API calls.
+_LIVE_PRICE_SOURCE: Callable[[], dict[str, dict[str, Any]]] | None = None
+
+
+def set_live_price_source(
+    source: Callable[[], dict[str, dict[str, Any]]] | None,
+) -> None:
+    global _LIVE_PRICE_SOURCE
+    _LIVE_PRICE_SOURCE = source
+
+
+def _live_prices() -> dict[str, dict[str, Any]]:
+    source = _LIVE_PRICE_SOURCE
+    if source is None:
+        return {}
+    try:
+        raw = source() or {}
+    except Exception:
+        logging.debug("portfolio: live price source failed", exc_info=True)
+        return {}
+    live: dict[str, dict[str, Any]] = {}
+    for symbol, row in raw.items():
+        if not isinstance(row, dict):
+            continue
+        price = _decimal(row.get("price"))
+        age = _float(row.get("age_seconds"))
+        if price <= 0 or age is None or age > LIVE_PRICE_MAX_AGE_S:
+            continue
+        live[str(symbol).upper()] = {**row, "price": price, "age_seconds": age}
+    return live
+
+
+# Shared by all services; one snapshot load uses three workers at most.
+_FETCH_POOL = ThreadPoolExecutor(
+    max_workers=max(3, FETCH_WORKERS), thread_name_prefix="portfolio-fetch"
+)
+
+
+def _timed(phases: dict[str, float], name: str, fn: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        phases[name] = round((time.perf_counter() - started) * 1000.0, 1)
+
+
+def _fetch_concurrently(
+    calls: dict[str, Callable[[], Any]],
+    phases: dict[str, float],
+    deadline: float,
+) -> dict[str, Any]:
+    """Run independent fetches in parallel; errors raise in ``calls`` order."""
+    futures = {
+        name: _FETCH_POOL.submit(_timed, phases, name, fn) for name, fn in calls.items()
+    }
+    # Requests already fit themselves to the deadline; the grace covers a
+    # fetch that is between requests when it passes.
+    _done, pending = wait(
+        futures.values(), timeout=max(0.0, deadline - time.monotonic()) + 1.0
+    )
+    if pending:
+        raise CoinbaseRequestError("Coinbase did not respond in time.")
+    return {name: future.result() for name, future in futures.items()}
+
+
+@dataclass(frozen=True)
+class _CachedSnapshot:
+    """A published snapshot. ``data`` is shared by every reader, never mutated."""
+
+    data: dict[str, Any]
+    held: frozenset[str]
+    loaded_at: float
+
+
+def _held_from(data: dict[str, Any]) -> frozenset[str]:
+    return frozenset(
+        str(row.get("symbol") or row.get("currency") or "").upper()
+        for row in data.get("holdings") or []
+        if (row.get("symbol") or row.get("currency")) and not row.get("is_cash")
+    )
+
+
 class PortfolioService:
+    """Cached, view-only portfolio snapshots with stale-while-revalidate reads.
+
+    Reads never deep-copy: ``snapshot()`` returns a shallow top-level copy of
+    the published snapshot whose nested holdings/orders are shared and must
+    be treated as read-only (pass ``mutable=True`` for a private deep copy).
+    A read past ``REFRESH_AHEAD_RATIO`` of the TTL starts one background
+    refresh; a read after expiry but within ``stale_ttl_seconds`` is served
+    the previous snapshot at once while that refresh runs. Only a cold cache,
+    a snapshot older than ``stale_ttl_seconds``, or ``force`` loads inline.
+    """
+
     def __init__(
         self,
         client: CoinbaseAdvancedTradeClient | Any,
@@ -485,9 +911,13 @@ class PortfolioService:
         self.client = client
         self.cache_ttl_seconds = max(5, cache_ttl_seconds)
         self.stale_ttl_seconds = max(self.cache_ttl_seconds, stale_ttl_seconds)
-        self._cache: dict[str, Any] | None = None
-        self._cache_time = 0.0
+        self.refresh_ahead_seconds = self.cache_ttl_seconds * REFRESH_AHEAD_RATIO
+        self._cache: _CachedSnapshot | None = None
+        # Serialises loads; readers never take it on the fresh/stale paths.
         self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_failed = False
 
     @staticmethod
     def _safe_permissions(raw: dict[str, Any]) -> dict[str, Any]:
@@ -500,56 +930,220 @@ class PortfolioService:
             "portfolio_type": raw.get("portfolio_type"),
         }
 
-    def snapshot(self, *, force: bool = False) -> dict[str, Any]:
-        now = time.monotonic()
+    def snapshot(
+        self, *, force: bool = False, mutable: bool = False
+    ) -> dict[str, Any]:
+        entry = self._cache
+        if not force and entry is not None:
+            age = time.monotonic() - entry.loaded_at
+            if age < self.stale_ttl_seconds:
+                if age >= self.refresh_ahead_seconds:
+                    self._refresh_in_background()
+                if age < self.cache_ttl_seconds:
+                    return self._view(entry, "fresh", mutable)
+                return self._stale_view(entry, age, mutable)
+
         with self._lock:
+            entry = self._cache
+            now = time.monotonic()
             if (
                 not force
-                and self._cache
-                and (now - self._cache_time) < self.cache_ttl_seconds
+                and entry is not None
+                and (now - entry.loaded_at) < self.cache_ttl_seconds
             ):
-                cached = deepcopy(self._cache)
-                cached["cache"] = "fresh"
-                return cached
-
+                # Another caller finished a load while this one waited.
+                return self._view(entry, "fresh", mutable)
             try:
-                snapshot = self._load()
+                entry = self._publish(self._load())
             except CoinbaseRequestError:
-                if self._cache and (now - self._cache_time) < self.stale_ttl_seconds:
-                    cached = deepcopy(self._cache)
-                    cached["status"] = "stale"
-                    cached["cache"] = "last_good"
-                    cached["stale_seconds"] = int(now - self._cache_time)
-                    return cached
+                if entry and (now - entry.loaded_at) < self.stale_ttl_seconds:
+                    return self._stale_view(entry, now - entry.loaded_at, mutable)
                 raise
+            return self._view(entry, "refreshed", mutable)
 
-            self._cache = deepcopy(snapshot)
-            self._cache_time = now
-            return snapshot
+    def _publish(self, data: dict[str, Any]) -> _CachedSnapshot:
+        entry = _CachedSnapshot(data, _held_from(data), time.monotonic())
+        self._cache = entry
+        self._refresh_failed = False
+        return entry
 
-    def held_symbols(self, *, fetch: bool = False) -> set[str]:
+    @staticmethod
+    def _view(
+        entry: _CachedSnapshot, cache: str, mutable: bool, **extra: Any
+    ) -> dict[str, Any]:
+        view = deepcopy(entry.data) if mutable else dict(entry.data)
+        view["cache"] = cache
+        view.update(extra)
+        return view
+
+    def _stale_view(
+        self, entry: _CachedSnapshot, age: float, mutable: bool
+    ) -> dict[str, Any]:
+        if self._refresh_failed:
+            return self._view(
+                entry, "last_good", mutable, status="stale", stale_seconds=int(age)
+            )
+        return self._view(entry, "revalidating", mutable)
+
+    def _refresh_in_background(self) -> None:
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._background_refresh, name="portfolio-refresh", daemon=True
+        ).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._lock:
+                entry = self._cache
+                if (
+                    entry is not None
+                    and time.monotonic() - entry.loaded_at < self.refresh_ahead_seconds
+                ):
+                    return
+                self._publish(self._load())
+        except PortfolioModeError as exc:
+            self._refresh_failed = True
+            logging.info("portfolio: background refresh failed: %s", exc)
+        except Exception:
+            self._refresh_failed = True
+            logging.exception("portfolio: background refresh failed")
+        finally:
+            with self._state_lock:
+                self._refreshing = False
+
+    def held_symbols(self, *, fetch: bool = False) -> frozenset[str]:
         """Non-cash currencies currently held, as base symbols (e.g. {"BTC"}).
 
         With fetch=False this only reads the in-memory cache and never touches
         the network, so it is safe on request paths. fetch=True may refresh
         via snapshot() and belongs in background threads only.
         """
-        snapshot: dict[str, Any] | None
         if fetch:
-            snapshot = self.snapshot()
-        else:
-            with self._lock:
-                snapshot = deepcopy(self._cache) if self._cache else None
-        if not snapshot:
-            return set()
-        return {
-            str(row.get("currency") or "").upper()
-            for row in snapshot.get("holdings") or []
-            if row.get("currency") and not row.get("is_cash")
-        }
+            self.snapshot()
+        entry = self._cache
+        return entry.held if entry is not None else frozenset()
+
+    def _fill_ledger(
+        self, permissions: dict[str, Any]
+    ) -> tuple[FillLedger, bool, dict[str, Any]]:
+        """Cost-basis fills, synced incrementally when the client pages by time."""
+        account_key = str(permissions.get("portfolio_id") or "")
+        if account_key and hasattr(self.client, "list_fills_between"):
+            try:
+                return sync_fill_ledger(self.client, account_key)
+            except CoinbaseRequestError:
+                raise
+            except Exception:
+                logging.exception("portfolio fills: local store failed; full fetch")
+        page = self.client.list_fills()
+        ledger = FillLedger()
+        ledger.add(page.items)
+        return ledger, page.complete, {"mode": "full", "fetched": len(page.items)}
+
+    def _holding_prices(
+        self, currencies: Iterable[str]
+    ) -> dict[str, tuple[Decimal, str | None, Any, str | None, float | None]]:
+        """``{currency: (price, product_id, change_24h_pct, source, age_seconds)}``.
+
+        Live tape/board prices first; the rest in one batched product request
+        (or per-product lookups for clients without ``list_products``).
+        """
+        live = _live_prices()
+        prices: dict[
+            str, tuple[Decimal, str | None, Any, str | None, float | None]
+        ] = {}
+        missing: list[str] = []
+        for currency in dict.fromkeys(currencies):
+            if currency in USD_EQUIVALENTS:
+                prices[currency] = (Decimal("1"), None, None, "cash", None)
+            elif currency in live:
+                row = live[currency]
+                prices[currency] = (
+                    row["price"],
+                    f"{currency}-USD",
+                    row.get("change_24h_pct"),
+                    str(row.get("source") or "live"),
+                    row["age_seconds"],
+                )
+            else:
+                missing.append(currency)
+        if not missing:
+            return prices
+
+        products: dict[str, dict[str, Any]] | None = None
+        if hasattr(self.client, "list_products"):
+            try:
+                products = {
+                    str(item.get("product_id") or "").upper(): item
+                    for item in self.client.list_products(
+                        f"{currency}-{quote}"
+                        for currency in missing
+                        for quote in ("USD", "USDC")
+                    )
+                }
+            except CoinbaseRequestError:
+                logging.info("portfolio: batched product lookup failed; per product")
+
+        for currency in missing:
+            product_payload: dict[str, Any] = {}
+            product_id: str | None = None
+            for quote in ("USD", "USDC"):
+                candidate = f"{currency}-{quote}"
+                if products is not None:
+                    product_payload = products.get(candidate) or {}
+                else:
+                    try:
+                        product_payload = self.client.get_product(candidate)
+                    except CoinbaseRequestError:
+                        continue
+                price = _decimal(product_payload.get("price"))
+                if price > 0:
+                    product_id = candidate
+                    prices[currency] = (
+                        price,
+                        product_id,
+                        product_payload.get("price_percentage_change_24h"),
+                        "coinbase_product",
+                        0.0,
+                    )
+                    break
+            if currency not in prices:
+                prices[currency] = (Decimal("0"), product_id, None, None, None)
+        return prices
 
     def _load(self) -> dict[str, Any]:
-        permissions = self._safe_permissions(self.client.get_key_permissions())
+        started = time.perf_counter()
+        deadline = time.monotonic() + FETCH_DEADLINE_S
+        set_deadline = getattr(self.client, "set_deadline", None)
+        call_stats = getattr(self.client, "call_stats", None)
+        if call_stats is not None:
+            call_stats(reset=True)
+        if set_deadline is not None:
+            set_deadline(deadline)
+        phases: dict[str, float] = {}
+        try:
+            snapshot = self._load_snapshot(deadline, phases)
+        finally:
+            if set_deadline is not None:
+                set_deadline(None)
+        snapshot["timing"] = {
+            "total_ms": round((time.perf_counter() - started) * 1000.0, 1),
+            "phases_ms": phases,
+            "coinbase": call_stats() if call_stats is not None else None,
+        }
+        return snapshot
+
+    def _load_snapshot(
+        self, deadline: float, phases: dict[str, float]
+    ) -> dict[str, Any]:
+        # Permissions stay first and alone: balances are never requested with
+        # a key that could trade or transfer.
+        permissions = self._safe_permissions(
+            _timed(phases, "permissions", self.client.get_key_permissions)
+        )
         if not permissions["can_view"]:
             raise UnsafeCoinbasePermissions(
                 "The configured Coinbase key does not have View permission.",
@@ -561,9 +1155,18 @@ class PortfolioService:
                 details={"permissions": permissions},
             )
 
-        accounts_page = self.client.list_accounts()
-        fills_page = self.client.list_fills()
-        orders_page = self.client.list_orders()
+        fetched = _fetch_concurrently(
+            {
+                "accounts": self.client.list_accounts,
+                "fills": lambda: self._fill_ledger(permissions),
+                "orders": self.client.list_orders,
+            },
+            phases,
+            deadline,
+        )
+        accounts_page = fetched["accounts"]
+        ledger, fills_complete, fill_sync = fetched["fills"]
+        orders_page = fetched["orders"]
         active_orders = [
             order
             for order in orders_page.items
@@ -579,32 +1182,27 @@ class PortfolioService:
                 continue
             account_rows.append((account, quantity, available, held))
 
-        prices: dict[str, tuple[Decimal, str | None, dict[str, Any]]] = {}
-        for account, _quantity, _available, _held in account_rows:
-            currency = str(account.get("currency") or "").upper()
-            if currency in USD_EQUIVALENTS:
-                prices[currency] = (Decimal("1"), None, {})
-                continue
-            product_payload: dict[str, Any] = {}
-            product_id: str | None = None
-            for quote in ("USD", "USDC"):
-                candidate = f"{currency}-{quote}"
-                try:
-                    product_payload = self.client.get_product(candidate)
-                    price = _decimal(product_payload.get("price"))
-                except CoinbaseRequestError:
-                    continue
-                if price > 0:
-                    product_id = candidate
-                    prices[currency] = (price, product_id, product_payload)
-                    break
-            if currency not in prices:
-                prices[currency] = (Decimal("0"), product_id, product_payload)
+        prices = _timed(
+            phases,
+            "prices",
+            lambda: self._holding_prices(
+                [
+                    str(account.get("currency") or "").upper()
+                    for account, *_ in account_rows
+                ]
+            ),
+        )
+        price_sources: dict[str, int] = {}
 
         holdings: list[dict[str, Any]] = []
         for account, quantity, available, held in account_rows:
             currency = str(account.get("currency") or "").upper()
-            price, product_id, product = prices.get(currency, (Decimal("0"), None, {}))
+            price, product_id, change_24h, price_source, price_age = prices.get(
+                currency, (Decimal("0"), None, None, None, None)
+            )
+            if currency not in USD_EQUIVALENTS:
+                key = price_source if price > 0 else "missing"
+                price_sources[key] = price_sources.get(key, 0) + 1
             market_value = quantity * price if price > 0 else None
             is_cash = currency in USD_EQUIVALENTS
             if is_cash:
@@ -615,15 +1213,12 @@ class PortfolioService:
                     "unknown_quantity": 0.0,
                     "known_cost_usd": _float(quantity),
                     "fill_count": 0,
-                    "history_complete": fills_page.complete,
+                    "history_complete": fills_complete,
                     "source": "cash_balance",
                 }
             else:
-                cost_basis = reconstruct_cost_basis(
-                    currency,
-                    quantity,
-                    fills_page.items,
-                    history_complete=fills_page.complete,
+                cost_basis = ledger.cost_basis(
+                    currency, quantity, history_complete=fills_complete
                 )
 
             unrealized_pnl = None
@@ -647,13 +1242,15 @@ class PortfolioService:
                     "available_quantity": _float(available),
                     "held_quantity": _float(held),
                     "price_usd": _float(price) if price > 0 else None,
+                    "price_source": price_source if price > 0 else None,
+                    "price_age_seconds": (
+                        round(price_age, 1) if price_age is not None else None
+                    ),
                     "market_value_usd": (
                         _float(market_value) if market_value is not None else None
                     ),
                     "allocation_pct": None,
-                    "price_change_24h_pct": _float(
-                        product.get("price_percentage_change_24h")
-                    ),
+                    "price_change_24h_pct": _float(change_24h),
                     "is_cash": is_cash,
                     "cost_basis": cost_basis,
                     "unrealized_pnl_usd": (
@@ -724,7 +1321,9 @@ class PortfolioService:
             ],
             "data_quality": {
                 "accounts_complete": accounts_page.complete,
-                "fills_complete": fills_page.complete,
+                "fills_complete": fills_complete,
+                "fill_sync": fill_sync,
+                "price_sources": price_sources,
                 "orders_complete": orders_page.complete,
                 "cost_basis_rule": "advanced_trade_fills_only",
             },
@@ -749,7 +1348,7 @@ def get_portfolio_service(
         return _SERVICE
 
 
-def owner_held_symbols(*, fetch: bool = False) -> set[str]:
+def owner_held_symbols(*, fetch: bool = False) -> frozenset[str]:
     """Held symbols of the **server owner** (env-key account), not of a user.
 
     This reads the process-global service built from COINBASE_API_KEY_*, so it
@@ -765,7 +1364,7 @@ def owner_held_symbols(*, fetch: bool = False) -> set[str]:
     try:
         return get_portfolio_service().held_symbols(fetch=fetch)
     except Exception:
-        return set()
+        return frozenset()
 
 
 # Back-compat alias: the old name did not say whose holdings it returned,
@@ -1114,4 +1713,7 @@ __all__ = [
     "portfolio_bp",
     "reconstruct_cost_basis",
     "apply_manual_cost_basis",
+    "FillLedger",
+    "sync_fill_ledger",
+    "set_live_price_source",
 ]
@@ -5,60 +5,21 @@ short-term momentum, and a volume trend from raw OHLC candles. These are
 *descriptive* — they report where price has been and how it is behaving, and
 are explicitly NOT outcome-validated (BHABIT does not yet claim these levels
 predict anything). The route layer fetches candles; this module is pure math so
-it can be unit-tested without network access.
+it can be unit-tested without network access. The numbers themselves come from
+the batched ``indicator_engine`` or, for ``/api/portfolio/intel``, from the
+per-bar state in ``indicator_stream`` via ``levels_from_indicators``.
 
 Candle shape (Coinbase Exchange): ``[time, low, high, open, close, volume]``.
 """
 
 from __future__ import annotations
 
-from statistics import median
-from typing import Any
+from typing import Any, Hashable
 
-_ATR_PERIOD = 14
-
-
-def _to_rows(
-    candles: list[list[Any]],
-) -> list[tuple[float, float, float, float, float, float]]:
-    rows: list[tuple[float, float, float, float, float, float]] = []
-    for candle in candles or []:
-        if not candle or len(candle) < 6:
-            continue
-        try:
-            ts, low, high, open_, close, volume = (
-                float(candle[0]),
-                float(candle[1]),
-                float(candle[2]),
-                float(candle[3]),
-                float(candle[4]),
-                float(candle[5]),
-            )
-        except (TypeError, ValueError):
-            continue
-        if high <= 0 or low <= 0 or close <= 0:
-            continue
-        rows.append((ts, low, high, open_, close, volume))
-    # Ascending by timestamp so true-range sequencing is correct.
-    rows.sort(key=lambda r: r[0])
-    return rows
-
-
-def _atr(rows: list[tuple[float, ...]], period: int = _ATR_PERIOD) -> float | None:
-    """Average True Range over the most recent ``period`` candles."""
-    if len(rows) < 2:
-        return None
-    true_ranges: list[float] = []
-    for idx in range(1, len(rows)):
-        _, low, high, _open, _close, _vol = rows[idx]
-        prev_close = rows[idx - 1][4]
-        true_ranges.append(
-            max(high - low, abs(high - prev_close), abs(low - prev_close))
-        )
-    window = true_ranges[-period:]
-    if not window:
-        return None
-    return sum(window) / len(window)
+try:
+    from indicator_engine import INDICATORS, series_key
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.indicator_engine import INDICATORS, series_key
 
 
 def _range_zone(position_pct: float) -> str:
@@ -73,19 +34,14 @@ def _range_zone(position_pct: float) -> str:
     return "near_resistance"
 
 
-def compute_levels(
-    candles: list[list[Any]],
+def _levels_from(
+    ind: dict[str, float | None] | None,
     current_price: float | None,
-    *,
-    granularity_seconds: int = 3600,
+    granularity_seconds: int,
 ) -> dict[str, Any] | None:
-    """Derive descriptive levels + behavior from OHLC candles.
-
-    Returns ``None`` when there aren't enough candles to say anything honest.
-    """
-    rows = _to_rows(candles)
-    if len(rows) < 3:
+    if not ind or (ind.get("count") or 0) < 3:
         return None
+    count = int(ind["count"])
 
     price = None
     try:
@@ -93,14 +49,10 @@ def compute_levels(
     except (TypeError, ValueError):
         price = None
     if not price or price <= 0:
-        price = rows[-1][4]  # fall back to last close
-
-    lows = [r[1] for r in rows]
-    highs = [r[2] for r in rows]
-    volumes = [r[5] for r in rows]
+        price = ind["last_close"]  # fall back to last close
 
-    support = min(lows)
-    resistance = max(highs)
+    support = ind["support"]
+    resistance = ind["resistance"]
     span = resistance - support
 
     # Where price sits in the recent range (clamped 0..100).
@@ -110,7 +62,8 @@ def compute_levels(
     else:
         range_position = 50.0
 
-    atr = _atr(rows)
+    # ATR over the most recent 14 candles, as a band around price.
+    atr = ind["atr"]
     band_low = band_high = volatility_pct = None
     if atr is not None and atr > 0:
         band_low = max(0.0, price - atr)
@@ -118,20 +71,12 @@ def compute_levels(
         volatility_pct = (atr / price) * 100.0
 
     # Short-term momentum: change across the two most recent candles.
-    momentum_pct = None
-    if len(rows) >= 2:
-        prev_close = rows[-2][4]
-        if prev_close > 0:
-            momentum_pct = ((rows[-1][4] - prev_close) / prev_close) * 100.0
+    momentum_pct = ind["momentum_pct"]
 
     # Volume trend: most recent candle vs the median of the prior window.
-    volume_ratio = None
-    if len(volumes) >= 4:
-        baseline = median(volumes[:-1])
-        if baseline > 0:
-            volume_ratio = volumes[-1] / baseline
+    volume_ratio = ind["volume_ratio_last"]
 
-    window_hours = round((len(rows) * granularity_seconds) / 3600.0, 1)
+    window_hours = round((count * granularity_seconds) / 3600.0, 1)
 
     def _r(value: float | None) -> float | None:
         return round(value, 8) if value is not None else None
@@ -150,10 +95,73 @@ def compute_levels(
         "momentum_1h_pct": round(momentum_pct, 2) if momentum_pct is not None else None,
         "volume_ratio": round(volume_ratio, 2) if volume_ratio is not None else None,
         "window_hours": window_hours,
-        "candle_count": len(rows),
+        "candle_count": count,
         "outcome_validated": False,
         "source": "coinbase_candles",
     }
 
 
-__all__ = ["compute_levels"]
+def compute_levels_batch(
+    candles_by_symbol: dict[str, list[list[Any]]],
+    price_by_symbol: dict[str, float | None] | None = None,
+    *,
+    granularity_seconds: int = 3600,
+) -> dict[str, dict[str, Any]]:
+    """``compute_levels`` for many symbols through one indicator batch.
+
+    Symbols whose candles haven't changed since the last call are served from
+    the shared indicator cache. Symbols without enough candles are omitted.
+    """
+    prices = price_by_symbol or {}
+    keys: dict[str, Hashable] = {
+        sym: series_key(sym, granularity_seconds, candles)
+        for sym, candles in candles_by_symbol.items()
+    }
+    rows = INDICATORS.compute_many(
+        {keys[sym]: candles for sym, candles in candles_by_symbol.items()}
+    )
+    return levels_from_indicators(
+        {sym: rows.get(key) for sym, key in keys.items()},
+        prices,
+        granularity_seconds=granularity_seconds,
+    )
+
+
+def levels_from_indicators(
+    rows_by_symbol: dict[str, dict[str, Any] | None],
+    price_by_symbol: dict[str, float | None] | None = None,
+    *,
+    granularity_seconds: int = 3600,
+) -> dict[str, dict[str, Any]]:
+    """Levels from precomputed indicator rows (batched or streamed state)."""
+    prices = price_by_symbol or {}
+    levels: dict[str, dict[str, Any]] = {}
+    for sym, row in rows_by_symbol.items():
+        price = prices.get(sym)
+        if price is None and row:
+            price = row.get("price")
+        computed = _levels_from(row, price, granularity_seconds)
+        if computed:
+            levels[sym] = computed
+    return levels
+
+
+def compute_levels(
+    candles: list[list[Any]],
+    current_price: float | None,
+    *,
+    granularity_seconds: int = 3600,
+    symbol: str = "",
+) -> dict[str, Any] | None:
+    """Derive descriptive levels + behavior from OHLC candles.
+
+    Returns ``None`` when there aren't enough candles to say anything honest.
+    """
+    return compute_levels_batch(
+        {symbol: candles},
+        {symbol: current_price},
+        granularity_seconds=granularity_seconds,
+    ).get(symbol)
+
+
+__all__ = ["compute_levels", "compute_levels_batch", "levels_from_indicators"]
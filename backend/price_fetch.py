@@ -3,9 +3,11 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Tuple
 from config import CONFIG
 from reliability import CircuitBreaker
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from requests.exceptions import RequestException, ConnectTimeout, ReadTimeout
+try:
+    from coinbase_rest import COINBASE
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.coinbase_rest import COINBASE
 
 COINBASE_PRODUCTS_URL = "https://api.exchange.coinbase.com/products"
 MAJOR_COINS = {
@@ -24,19 +26,6 @@ BACKOFF_MAX = float(os.environ.get('COINBASE_BACKOFF_MAX','30'))
 BACKOFF_RESET_MIN = int(os.environ.get('BACKOFF_SUCCESS_RESET_MIN_PRICES','20'))
 _rate = {"failures":0,"next":0.0,"last_error":None}
 
-# Configure a session with reasonable retry/backoff to reduce transient connection failures
-_SESSION = requests.Session()
-_RETRY_STRATEGY = Retry(
-    total=int(os.environ.get('PRICE_FETCH_REQUEST_RETRIES','3')),  # a couple retries
-    status_forcelist=(429, 500, 502, 503, 504),
-    allowed_methods=frozenset(['GET']),
-    backoff_factor=float(os.environ.get('PRICE_FETCH_RETRY_BACKOFF','0.5')),
-    raise_on_status=False,
-)
-_ADAPTER = HTTPAdapter(max_retries=_RETRY_STRATEGY)
-_SESSION.mount('https://', _ADAPTER)
-_SESSION.mount('http://', _ADAPTER)
-
 # Timeouts: allow a longer connect and read timeout (connect, read)
 # Use explicit env vars for connect/read to keep behaviour clear
 API_TIMEOUT_CONNECT = int(CONFIG.get('API_TIMEOUT_CONNECT', os.environ.get('API_TIMEOUT_CONNECT', '5')))
@@ -92,8 +81,8 @@ def _load_products(now: float):
             _metrics['products_cache_hits'] += 1
         return _products_cache['items']
     try:
-        # Use requests.get so tests that patch `requests.get` intercept calls.
-        r = requests.get(COINBASE_PRODUCTS_URL, timeout=API_TIMEOUT)
+        # Shared, rate-budgeted client; the price loop has top priority.
+        r = COINBASE.get(COINBASE_PRODUCTS_URL, priority='price', timeout=API_TIMEOUT)
     except RequestException as e:  # network error
         with _metrics_lock:
             _metrics['errors'] += 1
@@ -175,8 +164,7 @@ def fetch_prices() -> Dict[str,float]:
         acquired = _semaphore.acquire(timeout=10)
         try:
             try:
-                # Call requests.get here so test patches against `requests.get` will apply.
-                r = requests.get(f"https://api.exchange.coinbase.com/products/{sym}/ticker", timeout=TICKER_TIMEOUT)
+                r = COINBASE.get(f"/products/{sym}/ticker", priority='price', timeout=TICKER_TIMEOUT)
                 if r.status_code == 200:
                     data = r.json(); price = float(data.get('price') or 0)
                     if price > 0:
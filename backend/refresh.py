@@ -4,7 +4,7 @@ Uses ThreadPoolExecutor for non-blocking FinBERT inference
 """
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from typing import Iterable
+from typing import Iterable, List
 
 from cache import (
     CachePolicy,
@@ -17,6 +17,12 @@ from sentiment_intelligence import IntelligenceEngine, build_report
 
 logger = logging.getLogger(__name__)
 
+try:
+    from sentiment_aggregator import get_sentiment_for_symbols
+except ImportError as e:  # aggregator unavailable: each report fetches its own sources
+    logger.warning(f"Batch sentiment prefetch disabled: {e}")
+    get_sentiment_for_symbols = None
+
 
 class Refresher:
     """
@@ -90,20 +96,42 @@ class Refresher:
         logger.debug(f"🚀 Triggered refresh for {symbol}")
         return True
 
+    def _compute_and_store_many(self, symbols: List[str]) -> None:
+        """
+        Batch worker: one shared sentiment cycle, then per-symbol reports.
+
+        Fear & Greed, RSS and Reddit are fetched once for the whole batch and
+        land in the aggregator's caches, so the per-symbol builds that follow
+        reuse them instead of each refetching.
+        """
+        if get_sentiment_for_symbols is not None:
+            try:
+                get_sentiment_for_symbols(symbols)
+            except Exception as e:
+                logger.warning(f"⚠️  Shared sentiment cycle failed: {e}")
+        for symbol in symbols:
+            self.pool.submit(self._compute_and_store, symbol)
+
     def trigger_refresh_many(self, symbols: Iterable[str]) -> int:
         """
         Batch trigger for the Watchlist.
 
+        Symbols whose lock is free are refreshed together from one source
+        fetch cycle (see ``_compute_and_store_many``).
+
         Returns:
             Count of refreshes actually triggered (some may be locked).
         """
-        count = 0
-        for s in symbols:
-            if self.trigger_refresh(s):
-                count += 1
-        if count > 0:
-            logger.info(f"🚀 Triggered {count} refreshes")
-        return count
+        locked: List[str] = []
+        for s in dict.fromkeys(sym.upper() for sym in symbols):
+            if acquire_refresh_lock(self.rds, s, self.policy):
+                locked.append(s)
+            else:
+                logger.debug(f"⏭️  Refresh already in progress for {s}, skipping")
+        if locked:
+            self.pool.submit(self._compute_and_store_many, locked)
+            logger.info(f"🚀 Triggered {len(locked)} refreshes")
+        return len(locked)
 
     def shutdown(self, wait: bool = True):
         """Gracefully shut down the thread pool."""
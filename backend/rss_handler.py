@@ -6,16 +6,20 @@ Handles all RSS feed sources with rate limiting and caching
 
 import asyncio
 import aiohttp
-import feedparser
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
 import hashlib
 import json
-from bs4 import BeautifulSoup
 import re
 
+try:
+    from rss_ingest import RSS_INGEST, clean_html
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.rss_ingest import RSS_INGEST, clean_html
+
 class RSSHandler:
     def __init__(self, rss_config: List[Dict]):
         self.rss_config = rss_config
@@ -41,25 +45,7 @@ class RSSHandler:
     
     def _clean_content(self, content: str) -> str:
         """Clean HTML and extract readable text"""
-        if not content:
-            return ""
-        
-        # Parse HTML
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text and clean it
-        text = soup.get_text()
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text
+        return clean_html(content)
     
     def _detect_language(self, text: str) -> str:
         """Simple language detection based on common patterns"""
@@ -81,86 +67,72 @@ class RSSHandler:
         """Generate cache key for URL"""
         return hashlib.md5(url.encode()).hexdigest()
     
-    async def _fetch_feed(self, feed_config: Dict) -> List[Dict]:
-        """Fetch and parse a single RSS feed"""
-        url = feed_config['url']
+    def _due(self, feed_config: Dict, now: datetime) -> bool:
+        """Per-feed 5 minute minimum between fetches"""
+        last_fetch = self.rate_limits.get(feed_config['url'])
+        if last_fetch and now - last_fetch < timedelta(minutes=5):
+            self.logger.debug(f"Rate limiting {feed_config['name']}, skipping")
+            return False
+        return True
+    
+    def _feed_items(self, feed_config: Dict, entries: List[Dict], now: datetime) -> List[Dict]:
+        """Items from entries rss_ingest already parsed and cleaned off the loop"""
         name = feed_config['name']
-        base_trust = feed_config['base_trust']
-        
-        try:
-            # Check rate limiting
-            now = datetime.now()
-            if url in self.rate_limits:
-                last_fetch = self.rate_limits[url]
-                if now - last_fetch < timedelta(minutes=5):  # 5 minute minimum between fetches
-                    self.logger.debug(f"Rate limiting {name}, skipping")
-                    return []
+        items = []
+        for entry in entries[:10]:  # Limit to recent 10 items
+            clean_content = entry['text']
             
-            self.logger.info(f"Fetching RSS feed: {name}")
+            if len(clean_content) < 50:  # Skip very short content
+                continue
             
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    self.logger.error(f"HTTP {response.status} for {name}")
-                    return []
-                
-                content = await response.text()
-                
-            # Update rate limit tracking
-            self.rate_limits[url] = now
-            
-            # Parse feed
-            feed = feedparser.parse(content)
-            
-            if not feed.entries:
-                self.logger.warning(f"No entries found in {name}")
-                return []
-            
-            items = []
-            for entry in feed.entries[:10]:  # Limit to recent 10 items
-                # Extract content
-                content_text = ""
-                if hasattr(entry, 'content') and entry.content:
-                    content_text = entry.content[0].value
-                elif hasattr(entry, 'description'):
-                    content_text = entry.description
-                elif hasattr(entry, 'summary'):
-                    content_text = entry.summary
-                
-                # Clean content
-                clean_content = self._clean_content(content_text)
-                
-                if len(clean_content) < 50:  # Skip very short content
-                    continue
-                
-                # Parse date
-                published = datetime.now()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                
-                # Skip old articles (older than 24 hours)
-                if now - published > timedelta(days=1):
-                    continue
-                
-                # Detect language
-                language = self._detect_language(clean_content)
-                
-                item = {
-                    'source': name,
-                    'title': getattr(entry, 'title', ''),
-                    'content': clean_content,
-                    'url': getattr(entry, 'link', ''),
-                    'timestamp': published,
-                    'base_trust': base_trust,
-                    'language': language
-                }
-                items.append(item)
+            # Parse date
+            published = datetime.now()
+            if entry['published']:
+                published = datetime(*entry['published'])
             
-            self.logger.info(f"Collected {len(items)} items from {name}")
-            return items
+            # Skip old articles (older than 24 hours)
+            if now - published > timedelta(days=1):
+                continue
             
-        except Exception as e:
-            self.logger.error(f"Error fetching {name}: {str(e)}")
+            item = {
+                'source': name,
+                'title': entry['title'],
+                'content': clean_content,
+                'url': entry['link'],
+                'timestamp': published,
+                'base_trust': feed_config['base_trust'],
+                'language': self._detect_language(clean_content)
+            }
+            items.append(item)
+        
+        self.logger.info(f"Collected {len(items)} items from {name}")
+        return items
+    
+    async def _fetch_feeds(self, feed_configs: List[Dict]) -> List[Dict]:
+        """Fetch every RSS feed in one concurrent pass (conditional GETs)"""
+        now = datetime.now()
+        due = [config for config in feed_configs if self._due(config, now)]
+        if not due:
             return []
+        
+        self.logger.info(f"Fetching {len(due)} RSS feeds")
+        fetched = await RSS_INGEST.fetch_all(
+            [config['url'] for config in due], session=self.session
+        )
+        
+        items = []
+        for config in due:
+            result = fetched.get(config['url'])
+            if result is None or result.status == 'error':
+                error = result.error if result is not None else 'not fetched'
+                self.logger.error(f"Error fetching {config['name']}: {error}")
+                continue
+            self.rate_limits[config['url']] = now
+            if not result.entries:
+                self.logger.warning(f"No entries found in {config['name']}")
+                continue
+            items.extend(self._feed_items(config, result.entries, now))
+        return items
     
     async def _fetch_cryptopanic_api(self, config: Dict) -> List[Dict]:
         """Fetch from CryptoPanic API (special handling)"""
@@ -241,15 +213,16 @@ class RSSHandler:
     
     async def _fetch_all_feeds_internal(self) -> List[Dict]:
         """Internal method to fetch all feeds"""
-        tasks = []
-        
-        for feed_config in self.rss_config:
-            if feed_config.get('method') == 'api':
-                # Special handling for API-based feeds
-                tasks.append(self._fetch_cryptopanic_api(feed_config))
-            else:
-                # Regular RSS feeds
-                tasks.append(self._fetch_feed(feed_config))
+        # Special handling for API-based feeds; regular RSS feeds are fetched
+        # together in one ingest pass
+        tasks = [
+            self._fetch_cryptopanic_api(feed_config)
+            for feed_config in self.rss_config
+            if feed_config.get('method') == 'api'
+        ]
+        tasks.append(self._fetch_feeds(
+            [config for config in self.rss_config if config.get('method') != 'api']
+        ))
         
         # Execute all tasks concurrently
         results = await asyncio.gather(*tasks, return_exceptions=True)
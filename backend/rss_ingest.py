@@ -0,0 +1,225 @@
+"""Concurrent RSS ingestion with conditional GETs and off-loop parsing.
+
+The sentiment aggregator's RSS source used to call
+``feedparser.parse(url)`` for one feed after another. ``RSSHandler`` fetched
+concurrently, but it ran feedparser and BeautifulSoup on the event-loop
+thread. Either way, a sentiment cycle grew linearly with the number of
+configured feeds. Both now go through ``RSS_INGEST``:
+
+- All feeds are requested at once, bounded by ``RSS_MAX_CONCURRENCY``.
+- Each feed remembers its ``ETag``/``Last-Modified``. The next request
+  sends ``If-None-Match``/``If-Modified-Since``, and on a ``304`` the
+  previously parsed entries are served without re-parsing anything.
+- feedparser and HTML cleaning run in a dedicated thread pool
+  (``RSS_PARSE_WORKERS``), off the event loop.
+
+Entries come back as plain dicts (``title``, ``summary``, ``content``,
+``text`` (the cleaned content), ``link``, ``published``), so callers never
+touch feedparser objects. ``stats()`` reports fetched, not-modified and
+failed requests plus parse time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Iterable
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover - aiohttp is a declared dependency
+    aiohttp = None
+try:
+    import feedparser  # type: ignore
+except Exception:
+    feedparser = None
+try:
+    from bs4 import BeautifulSoup  # type: ignore
+except Exception:
+    BeautifulSoup = None
+
+logger = logging.getLogger(__name__)
+
+RSS_FETCH_TIMEOUT_S = float(os.getenv("RSS_FETCH_TIMEOUT_S", "10"))
+RSS_MAX_CONCURRENCY = int(os.getenv("RSS_MAX_CONCURRENCY", "16"))
+RSS_PARSE_WORKERS = int(os.getenv("RSS_PARSE_WORKERS", "4"))
+USER_AGENT = "CryptoSentimentBot/1.0 (https://example.com/contact)"
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+
+def clean_html(content: str) -> str:
+    """Readable text from an HTML fragment (scripts and styles dropped)."""
+    if not content:
+        return ""
+    if BeautifulSoup is not None:
+        soup = BeautifulSoup(content, "html.parser")
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text = soup.get_text()
+    else:
+        text = _TAG_RE.sub(" ", content)
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return " ".join(chunk for chunk in chunks if chunk)
+
+
+def parse_feed(body: bytes) -> list[dict[str, Any]]:
+    """Parse one feed document into plain entry dicts (runs in the pool)."""
+    parsed = feedparser.parse(body)
+    entries = []
+    for entry in parsed.entries or []:
+        content = ""
+        if getattr(entry, "content", None):
+            content = entry.content[0].value
+        elif getattr(entry, "description", None):
+            content = entry.description
+        elif getattr(entry, "summary", None):
+            content = entry.summary
+        published = getattr(entry, "published_parsed", None)
+        entries.append(
+            {
+                "title": str(getattr(entry, "title", "") or ""),
+                "summary": str(getattr(entry, "summary", "") or ""),
+                "content": str(content or ""),
+                "text": clean_html(str(content or "")),
+                "link": str(getattr(entry, "link", "") or ""),
+                "published": tuple(published[:6]) if published else None,
+            }
+        )
+    return entries
+
+
+@dataclass
+class FeedResult:
+    url: str
+    status: str  # "ok", "not_modified" or "error"
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+
+
+class RSSIngestor:
+    """Fetches many feeds at once; remembers validators and parsed entries."""
+
+    def __init__(
+        self,
+        *,
+        timeout_s: float = RSS_FETCH_TIMEOUT_S,
+        max_concurrency: int = RSS_MAX_CONCURRENCY,
+        parse_workers: int = RSS_PARSE_WORKERS,
+    ):
+        self.timeout_s = timeout_s
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, parse_workers), thread_name_prefix="rss-parse"
+        )
+        self._lock = threading.Lock()
+        self._validators: dict[str, tuple[str | None, str | None]] = {}
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._stats = {
+            "fetched": 0,
+            "not_modified": 0,
+            "errors": 0,
+            "entries_parsed": 0,
+            "parse_ms_total": 0.0,
+        }
+
+    async def fetch_all(
+        self, urls: Iterable[str], *, session: Any = None
+    ) -> dict[str, FeedResult]:
+        """``{url: FeedResult}`` for every feed, fetched concurrently.
+
+        ``session`` is an existing ``aiohttp.ClientSession`` to reuse; without
+        one, a session is opened for this call.
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return {}
+        if aiohttp is None or feedparser is None:
+            reason = "aiohttp not installed" if aiohttp is None else "no feedparser"
+            return {url: FeedResult(url, "error", error=reason) for url in urls}
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            results = await asyncio.gather(
+                *(self._fetch_one(session, url, slots) for url in urls)
+            )
+        finally:
+            if own_session:
+                await session.close()
+        return dict(zip(urls, results))
+
+    async def _fetch_one(
+        self, session: Any, url: str, slots: asyncio.Semaphore
+    ) -> FeedResult:
+        headers = {"User-Agent": USER_AGENT}
+        with self._lock:
+            cached = self._entries.get(url)
+            etag, modified = self._validators.get(url, (None, None))
+        if cached is not None:
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+
+        try:
+            async with slots:
+                async with session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+                ) as resp:
+                    if resp.status == 304 and cached is not None:
+                        with self._lock:
+                            self._stats["not_modified"] += 1
+                        return FeedResult(url, "not_modified", cached)
+                    if resp.status != 200:
+                        raise RuntimeError(f"HTTP {resp.status}")
+                    body = await resp.read()
+                    etag = resp.headers.get("ETag")
+                    modified = resp.headers.get("Last-Modified")
+
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            entries = await loop.run_in_executor(
+                self._executor, partial(parse_feed, body)
+            )
+            parse_ms = (time.perf_counter() - started) * 1000.0
+        except Exception as exc:
+            error = "timeout" if isinstance(exc, asyncio.TimeoutError) else str(exc)
+            logger.debug("RSS fetch failed for %s: %s", url, error)
+            with self._lock:
+                self._stats["errors"] += 1
+            return FeedResult(url, "error", error=error)
+
+        with self._lock:
+            self._stats["fetched"] += 1
+            self._stats["entries_parsed"] += len(entries)
+            self._stats["parse_ms_total"] += parse_ms
+            self._entries[url] = entries
+            if etag or modified:
+                self._validators[url] = (etag, modified)
+            else:
+                self._validators.pop(url, None)
+        return FeedResult(url, "ok", entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["parse_ms_total"] = round(out["parse_ms_total"], 1)
+            out["feeds_with_validators"] = len(self._validators)
+            return out
+
+
+RSS_INGEST = RSSIngestor()
+
+__all__ = ["RSS_INGEST", "FeedResult", "RSSIngestor", "clean_html", "parse_feed"]
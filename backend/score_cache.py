@@ -0,0 +1,265 @@
+"""Content-hash memo of per-item sentiment scores, shared across cycles.
+
+Most RSS, Reddit and scraper items seen in one refresh are the same articles
+as in the previous one, yet every cycle re-scored all of them.
+``SCORE_CACHE`` remembers each score, keyed by
+``sha256(model_version + normalized text)``:
+
+- Normalization is NFC, whitespace collapsing and trimming. Case is kept:
+  VADER and the lexicon scorers treat capitals as emphasis.
+- The model version belongs in the key. A lexicon or model change then
+  misses cleanly instead of serving stale scores.
+- Scores live in a bounded in-memory LRU (``SCORE_CACHE_MEMORY_ENTRIES``)
+  in front of a bounded SQLite table (``SCORE_CACHE_DB``,
+  ``SCORE_CACHE_DISK_ENTRIES``), so a restart still starts warm.
+
+Values must be JSON-serializable. ``stats()`` reports memory and disk hits,
+misses and the hit rate, overall and per model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(
+    os.environ.get("SCORE_CACHE_DB")
+    or Path(__file__).resolve().parent / "data" / "sentiment_scores.sqlite"
+)
+MEMORY_ENTRIES = int(os.environ.get("SCORE_CACHE_MEMORY_ENTRIES", "20000"))
+DISK_ENTRIES = int(os.environ.get("SCORE_CACHE_DISK_ENTRIES", "200000"))
+TRIM_EVERY_WRITES = 1000
+
+_WS_RE = re.compile(r"\s+")
+_MISSING = object()
+
+
+def normalize_text(text: str) -> str:
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def content_key(text: str, model_version: str) -> str:
+    h = hashlib.sha256()
+    h.update(model_version.encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+def model_version(name: str, *parts: Any) -> str:
+    """``name`` plus a short digest of whatever changes the model's output."""
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:12]
+    return f"{name}:{digest}"
+
+
+class ScoreCache:
+    def __init__(self, path=None, *, memory_entries=None, disk_entries=None):
+        self._path = Path(path) if path else None
+        self.memory_entries = (
+            MEMORY_ENTRIES if memory_entries is None else memory_entries
+        )
+        self.disk_entries = DISK_ENTRIES if disk_entries is None else disk_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._writes_since_trim = 0
+        self._disk_ok = True
+        self._models: dict[str, dict[str, int]] = {}
+
+    # ─── SQLite ───────────────────────────────────────────────────────
+
+    @property
+    def path(self) -> Path:
+        return self._path or DB_PATH
+
+    def _conn(self):
+        path = self.path
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.path == path:
+            return conn
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scores (
+              key TEXT PRIMARY KEY,
+              model TEXT NOT NULL,
+              value TEXT NOT NULL,
+              used_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_used_at ON scores(used_at)")
+        self._local.conn = conn
+        self._local.path = path
+        return conn
+
+    def _disk_get(self, key: str) -> Any:
+        if not self._disk_ok:
+            return _MISSING
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            conn.execute(
+                "UPDATE scores SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError) as exc:
+            self._disable_disk(exc)
+            return _MISSING
+
+    def _disk_put(self, key: str, model: str, value: Any) -> None:
+        if not self._disk_ok:
+            return
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO scores (key, model, value, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, model, json.dumps(value, default=str), time.time()),
+            )
+            conn.commit()
+            with self._lock:
+                self._writes_since_trim += 1
+                trim = self._writes_since_trim >= TRIM_EVERY_WRITES
+                if trim:
+                    self._writes_since_trim = 0
+            if trim:
+                self._trim(conn)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as exc:
+            self._disable_disk(exc)
+
+    def _trim(self, conn) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+        excess = count - self.disk_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM scores WHERE key IN "
+                "(SELECT key FROM scores ORDER BY used_at LIMIT ?)",
+                (excess,),
+            )
+            conn.commit()
+
+    def _disable_disk(self, exc: Exception) -> None:
+        # Memory-only from here on; scoring must never fail because of the cache.
+        if self._disk_ok:
+            logger.warning("score cache disk tier disabled: %s", exc)
+        self._disk_ok = False
+
+    # ─── lookups ──────────────────────────────────────────────────────
+
+    def _count(self, model: str, outcome: str) -> None:
+        row = self._models.setdefault(
+            model, {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        )
+        row[outcome] += 1
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, model: str) -> Any:
+        """Cached value for ``text`` under ``model``, or ``None``."""
+        value = self._lookup(content_key(text, model), model)
+        return None if value is _MISSING else value
+
+    def _lookup(self, key: str, model: str) -> Any:
+        with self._lock:
+            value = self._memory.get(key, _MISSING)
+            if value is not _MISSING:
+                self._memory.move_to_end(key)
+                self._count(model, "memory_hits")
+                return value
+        value = self._disk_get(key)
+        with self._lock:
+            if value is _MISSING:
+                self._count(model, "misses")
+            else:
+                self._count(model, "disk_hits")
+                self._remember(key, value)
+        return value
+
+    def put(self, text: str, model: str, value: Any) -> None:
+        key = content_key(text, model)
+        with self._lock:
+            self._remember(key, value)
+        self._disk_put(key, model, value)
+
+    def get_or_compute(self, text: str, model: str, compute: Callable[[], Any]) -> Any:
+        key = content_key(text, model)
+        value = self._lookup(key, model)
+        if value is _MISSING:
+            value = compute()
+            with self._lock:
+                self._remember(key, value)
+            self._disk_put(key, model, value)
+        return value
+
+    async def aget_or_compute(
+        self, text: str, model: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        key = content_key(text, model)
+        value = self._lookup(key, model)
+        if value is _MISSING:
+            value = await compute()
+            with self._lock:
+                self._remember(key, value)
+            self._disk_put(key, model, value)
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            models = {}
+            totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+            for name, row in sorted(self._models.items()):
+                lookups = sum(row.values())
+                hits = row["memory_hits"] + row["disk_hits"]
+                models[name] = {
+                    **row,
+                    "hit_rate": round(hits / lookups, 4) if lookups else None,
+                }
+                for k in totals:
+                    totals[k] += row[k]
+            lookups = sum(totals.values())
+            hits = totals["memory_hits"] + totals["disk_hits"]
+            return {
+                **totals,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "memory_entries": len(self._memory),
+                "disk_enabled": self._disk_ok,
+                "models": models,
+            }
+
+
+SCORE_CACHE = ScoreCache()
+
+__all__ = [
+    "SCORE_CACHE",
+    "ScoreCache",
+    "content_key",
+    "model_version",
+    "normalize_text",
+]
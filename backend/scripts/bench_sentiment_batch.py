@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+CPU throughput of SentimentAnalyzer batch scoring.
+
+Scores the same corpus with transformer mini-batches of 1, 16 and 64 texts
+(``SENTIMENT_BATCH_SIZE``) and prints texts/second. The score cache is
+bypassed so every run does the full model work.
+
+  python scripts/bench_sentiment_batch.py                 # configured model
+  python scripts/bench_sentiment_batch.py --random-init   # offline, BERT-base sized
+
+``--random-init`` swaps in an untrained BERT-base classifier (the FinBERT
+architecture) so throughput can be measured without downloading weights.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import sentiment_analyzer
+
+WORDS = (
+    "bitcoin ethereum solana pump dump bullish bearish breakout support resistance "
+    "whales accumulate sell buy moon crash rally volume market traders etf funding "
+    "liquidations leverage short long rebound correction fear greed hodl rekt"
+).split()
+
+
+def _corpus(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 60)))
+        for _ in range(n)
+    ]
+
+
+def _random_init_pipeline(workdir: Path):
+    from transformers import (
+        BertConfig,
+        BertForSequenceClassification,
+        BertTokenizerFast,
+        pipeline,
+    )
+
+    vocab = workdir / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]))
+    config = BertConfig(
+        num_labels=3,
+        id2label={0: "positive", 1: "negative", 2: "neutral"},
+        label2id={"positive": 0, "negative": 1, "neutral": 2},
+    )
+    model = BertForSequenceClassification(config).eval()
+    return pipeline(
+        "sentiment-analysis", model=model, tokenizer=BertTokenizerFast(str(vocab))
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="1,16,64")
+    parser.add_argument("--random-init", action="store_true")
+    args = parser.parse_args()
+
+    if not sentiment_analyzer.TRANSFORMERS_AVAILABLE:
+        sys.exit("transformers is not installed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.random_init:
+            cls = sentiment_analyzer.SentimentAnalyzer
+            cls._initialize_models = lambda self: None
+            analyzer = cls()
+            analyzer.transformer_analyzer = _random_init_pipeline(Path(tmp))
+            if sentiment_analyzer.VADER_AVAILABLE:
+                vader = sentiment_analyzer.SentimentIntensityAnalyzer()
+                analyzer.vader_analyzer = vader
+        else:
+            analyzer = sentiment_analyzer.SentimentAnalyzer()
+        if not analyzer.transformer_analyzer:
+            sys.exit("no transformer model loaded (try --random-init)")
+
+        texts = _corpus(args.texts)
+        asyncio.run(analyzer._score_batch(texts[:8]))  # warm up
+        models = analyzer.get_analyzer_stats()["available_models"]
+        print(f"{len(texts)} texts, models: {', '.join(models)}")
+        for size in (int(s) for s in args.batch_sizes.split(",")):
+            sentiment_analyzer.SENTIMENT_BATCH_SIZE = size
+            started = time.perf_counter()
+            asyncio.run(analyzer._score_batch(texts))
+            elapsed = time.perf_counter() - started
+            print(f"batch {size:>3}: {len(texts) / elapsed:8.1f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Per-item ``setex`` vs one pipelined ``SentimentStore.write_cycle``.
+
+Starts a local Redis stand-in (a minimal RESP server that answers every
+command with ``+OK``) that sleeps ``--rtt-ms`` before answering each read,
+which is how network latency shows up for a client. A real server can be
+used instead with ``--redis-url``.
+
+  python scripts/bench_sentiment_store.py --items 500 --rtt-ms 0.5
+"""
+import argparse
+import json
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import redis
+
+from sentiment_store import SentimentStore
+
+
+def _serve(conn: socket.socket, rtt_s: float) -> None:
+    buffer = b""
+    with conn:
+        while True:
+            chunk = conn.recv(1 << 16)
+            if not chunk:
+                return
+            buffer += chunk
+            replies = offset = 0
+            # Count complete RESP arrays: *<n>\r\n then n bulk strings
+            while True:
+                parsed = _command_end(buffer, offset)
+                if parsed is None:
+                    break
+                offset = parsed
+                replies += 1
+            buffer = buffer[offset:]
+            if replies:
+                time.sleep(rtt_s)
+                conn.sendall(b"+OK\r\n" * replies)
+
+
+def _command_end(buffer: bytes, start: int):
+    if not buffer.startswith(b"*", start):
+        return None
+    end = buffer.find(b"\r\n", start)
+    if end < 0:
+        return None
+    pos, count = end + 2, int(buffer[start + 1 : end])
+    for _ in range(count):
+        end = buffer.find(b"\r\n", pos)
+        if end < 0:
+            return None
+        size = int(buffer[pos + 1 : end])
+        pos = end + 2 + size + 2
+        if pos > len(buffer):
+            return None
+    return pos
+
+
+def _accept(server: socket.socket, rtt_s: float) -> None:
+    while True:
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        threading.Thread(target=_serve, args=(conn, rtt_s), daemon=True).start()
+
+
+def _stand_in(rtt_s: float) -> int:
+    """Port of a stand-in running in its own process (no shared GIL)."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    ctx = multiprocessing.get_context("fork")
+    ctx.Process(target=_accept, args=(server, rtt_s), daemon=True).start()
+    return server.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        client = redis.Redis.from_url(args.redis_url)
+    else:
+        client = redis.Redis(port=_stand_in(args.rtt_ms / 1000))
+    items = [
+        {
+            "source": f"source-{i % 12}",
+            "content": "bitcoin breaks out while ethereum lags " * 3,
+            "sentiment_score": 0.61,
+            "timestamp": datetime.now(),
+            "symbols": ["BTC", "ETH"],
+        }
+        for i in range(args.items)
+    ]
+    aggregate = {"timestamp": datetime.now(), "items": items[:50]}
+
+    started = time.perf_counter()
+    timestamp = datetime.now().isoformat()
+    for item in items:
+        key = f"sentiment:raw:{timestamp}:{item['source']}"
+        client.setex(key, 86400, json.dumps(item, default=str))
+    key = f"sentiment:aggregated:{timestamp}"
+    client.setex(key, 86400 * 7, json.dumps(aggregate, default=str))
+    per_item = time.perf_counter() - started
+
+    store = SentimentStore(client)
+    started = time.perf_counter()
+    store.write_cycle(datetime.now().isoformat(), raw=items, aggregate=aggregate)
+    pipelined = time.perf_counter() - started
+
+    print(f"{args.items} items, simulated RTT {args.rtt_ms} ms")
+    print(f"per-item setex : {per_item * 1000:8.1f} ms ({args.items + 1} round trips)")
+    print(f"write_cycle    : {pipelined * 1000:8.1f} ms (1 round trip)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Local handoff of sentiment generations from the 8003 service to the board.
+
+The sentiment service publishes every new ``SentimentResponse`` generation to
+a JSON file next to the board's other local state:
+
+    {"generation": 42, "published_at": 1760000000.0, "payload": {...}}
+
+Writes go to a temp file that is then renamed into place, so a reader never
+sees a half-written generation. On the Flask side, ``HandoffReader.latest()``
+costs one ``stat`` per call. It re-reads and re-parses the file only when the
+file has changed, so serving the latest generation makes no upstream calls.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HANDOFF_PATH = (
+    Path(__file__).resolve().parents[1] / "data" / "sentiment_handoff.json"
+)
+
+
+def handoff_path() -> Path:
+    return Path(os.getenv("SENTIMENT_HANDOFF_PATH") or DEFAULT_HANDOFF_PATH)
+
+
+def handoff_enabled() -> bool:
+    return os.getenv("SENTIMENT_HANDOFF", "1") == "1"
+
+
+class HandoffWriter:
+    """Publishes generations atomically; the counter survives restarts."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        self._generation: Optional[int] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or handoff_path()
+
+    def _next_generation(self) -> int:
+        if self._generation is None:
+            try:
+                current = json.loads(self.path.read_text("utf-8"))
+                self._generation = int(current.get("generation") or 0)
+            except (OSError, ValueError, TypeError, AttributeError):
+                self._generation = 0
+        self._generation += 1
+        return self._generation
+
+    def publish(self, payload: Dict[str, Any]) -> int:
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        generation = self._next_generation()
+        body = json.dumps(
+            {"generation": generation, "published_at": time.time(), "payload": payload},
+            separators=(",", ":"),
+            default=str,
+        )
+        fd, tmp = tempfile.mkstemp(prefix=".handoff-", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        return generation
+
+
+class HandoffReader:
+    """Latest published generation, re-parsed only when the file changes."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[tuple] = None
+        self._latest: Optional[Dict[str, Any]] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or handoff_path()
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """``{"generation", "published_at", "payload"}`` or None."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    envelope = json.loads(self.path.read_text("utf-8"))
+                except (OSError, ValueError) as exc:
+                    logger.debug("sentiment handoff unreadable: %s", exc)
+                    return self._latest
+                if isinstance(envelope, dict) and isinstance(
+                    envelope.get("payload"), dict
+                ):
+                    self._latest = envelope
+                self._signature = signature
+            return self._latest
+
+
+__all__ = [
+    "HandoffReader",
+    "HandoffWriter",
+    "handoff_enabled",
+    "handoff_path",
+]
@@ -0,0 +1,235 @@
+"""Shared async HTTP client for the sentiment service's upstream sources.
+
+One pooled ``aiohttp`` session serves every source (Fear & Greed, CoinGecko,
+the derivatives venues), so refreshes reuse keep-alive connections instead of
+opening a new TCP/TLS connection per request on a default-executor thread.
+
+- Each host gets its own semaphore (``per_host_limit``), so one slow venue
+  can't take every pooled connection.
+- Each source gets its own total timeout (``SOURCE_TIMEOUTS``), which covers
+  both the wait for a slot and the request itself.
+- Non-2xx responses raise ``UpstreamHTTPError`` with ``status_code``, which is
+  what the service's source-error classification reads.
+
+``stats()`` reports per-source request, error and timeout counts and latency,
+plus connection reuse versus new connections (socket churn).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover - aiohttp is a declared dependency
+    aiohttp = None
+
+DEFAULT_TIMEOUT_S = 1.5
+SOURCE_TIMEOUTS: Dict[str, float] = {
+    "fear_greed": 1.0,
+    "coingecko": 1.0,
+    "binance": 1.2,
+    "okx": 1.2,
+    "bybit": 1.2,
+    "hyperliquid": 1.5,
+    "coinalyze": 1.5,
+}
+PER_HOST_LIMIT = int(os.getenv("SENTIMENT_HTTP_PER_HOST_LIMIT", "4"))
+POOL_LIMIT = int(os.getenv("SENTIMENT_HTTP_POOL_LIMIT", "32"))
+KEEPALIVE_S = float(os.getenv("SENTIMENT_HTTP_KEEPALIVE_S", "60"))
+
+
+class UpstreamHTTPError(Exception):
+    """Non-2xx response from an upstream source."""
+
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class SentimentHTTPClient:
+    """Pooled keep-alive session with per-host limits and per-source budgets."""
+
+    def __init__(
+        self,
+        *,
+        per_host_limit: int = PER_HOST_LIMIT,
+        pool_limit: int = POOL_LIMIT,
+        keepalive_s: float = KEEPALIVE_S,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.per_host_limit = max(1, per_host_limit)
+        self.pool_limit = pool_limit
+        self.keepalive_s = keepalive_s
+        self.timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+        self._session: Optional[Any] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._sources: Dict[str, Dict[str, float]] = {}
+        self._connections = {"created": 0, "reused": 0}
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    def _trace_config(self) -> Any:
+        trace = aiohttp.TraceConfig()
+
+        async def _created(_session, _ctx, _params):
+            self._connections["created"] += 1
+
+        async def _reused(_session, _ctx, _params):
+            self._connections["reused"] += 1
+
+        trace.on_connection_create_end.append(_created)
+        trace.on_connection_reuseconn.append(_reused)
+        return trace
+
+    async def _ensure_session(self) -> Any:
+        if aiohttp is None:
+            raise RuntimeError("aiohttp not installed")
+        loop = asyncio.get_running_loop()
+        if self.closed or self._loop is not loop:
+            # A session belongs to the loop that created it (tests and CLI
+            # tools may run several loops in one process).
+            await self._retire_session()
+            if not self.closed and self._loop is loop:
+                return self._session  # another request opened it meanwhile
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_limit,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=self.keepalive_s,
+                ),
+                trace_configs=[self._trace_config()],
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._session
+
+    async def _retire_session(self) -> None:
+        """Close the session left behind on a previous loop before replacing it."""
+        session, loop = self._session, self._loop
+        self._session = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Still alive on another thread: close it on its own loop.
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # Once its loop is closed, aiohttp only marks the connector closed and
+        # drops the pool; the sockets go with their transports. A stopped but
+        # open loop can't finish the close from here, so its waiter errors.
+        try:
+            await session.close()
+        except RuntimeError:
+            pass
+
+    async def start(self) -> None:
+        """Open the pooled session on the running loop."""
+        await self._ensure_session()
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return slot
+
+    def _record(self, source: str, started: float, outcome: str) -> None:
+        row = self._sources.setdefault(
+            source,
+            {
+                "requests": 0,
+                "errors": 0,
+                "timeouts": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            },
+        )
+        ms = (time.perf_counter() - started) * 1000.0
+        row["requests"] += 1
+        row["total_ms"] += ms
+        row["max_ms"] = max(row["max_ms"], ms)
+        if outcome == "timeout":
+            row["timeouts"] += 1
+        elif outcome == "error":
+            row["errors"] += 1
+
+    async def _request(
+        self, method: str, url: str, source: str, timeout: Optional[float], **kwargs
+    ) -> Any:
+        session = await self._ensure_session()
+        budget = timeout if timeout is not None else self.timeouts.get(
+            source, DEFAULT_TIMEOUT_S
+        )
+
+        async def _call() -> Any:
+            async with self._slot(url):
+                async with session.request(method, url, **kwargs) as resp:
+                    if resp.status >= 400:
+                        raise UpstreamHTTPError(resp.status, url)
+                    return await resp.json(content_type=None)
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(_call(), timeout=budget)
+        except asyncio.TimeoutError:
+            self._record(source, started, "timeout")
+            raise
+        except Exception:
+            self._record(source, started, "error")
+            raise
+        self._record(source, started, "ok")
+        return result
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        source: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        return await self._request("GET", url, source, timeout, params=params)
+
+    async def post_json(
+        self,
+        url: str,
+        *,
+        source: str,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        return await self._request("POST", url, source, timeout, json=json)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": dict(self._connections),
+            "sources": {
+                name: {
+                    "requests": int(row["requests"]),
+                    "errors": int(row["errors"]),
+                    "timeouts": int(row["timeouts"]),
+                    "avg_ms": (
+                        round(row["total_ms"] / row["requests"], 1)
+                        if row["requests"]
+                        else None
+                    ),
+                    "max_ms": round(row["max_ms"], 1),
+                }
+                for name, row in sorted(self._sources.items())
+            },
+        }
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+__all__ = ["SentimentHTTPClient", "UpstreamHTTPError", "SOURCE_TIMEOUTS"]
@@ -41,6 +41,15 @@ from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from sentiment_aggregator_enhanced import aggregator as _enhanced_aggregator
 
+try:
+    from rss_ingest import RSS_INGEST
+    from score_cache import SCORE_CACHE, model_version
+    from symbol_matcher import SymbolMatcher
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.rss_ingest import RSS_INGEST
+    from backend.score_cache import SCORE_CACHE, model_version
+    from backend.symbol_matcher import SymbolMatcher
+
 
 # ----------------------------
 # Custom Exceptions
@@ -607,15 +616,26 @@ if isinstance(_LEX, dict) and _LEX:
         logger.info(f"Updated VADER lexicon with {len(lex_update)} crypto-specific terms")
 
 
-def vader_score_0_1(text: str) -> float:
-    if not text:
-        return 0.5
+# Scores are memoized by content hash; the configured lexicon is part of the
+# model version, so editing it invalidates every cached score.
+_VADER_MODEL = model_version("vader", _LEX, len(_ANALYZER.lexicon))
+
+
+def _vader_compound_0_1(text: str) -> float:
     vs = _ANALYZER.polarity_scores(text)
     c = float(vs.get("compound", 0.0))
     c = max(-1.0, min(1.0, c))
     return (c + 1.0) / 2.0
 
 
+def vader_score_0_1(text: str) -> float:
+    if not text:
+        return 0.5
+    return float(
+        SCORE_CACHE.get_or_compute(text, _VADER_MODEL, lambda: _vader_compound_0_1(text))
+    )
+
+
 # ----------------------------
 # Trending Topics Extraction
 # ----------------------------
@@ -827,6 +847,10 @@ def _hash_key(*parts: str) -> str:
     return h.hexdigest()
 
 
+# _CONFIG is loaded once at import; hash it once rather than on every lookup.
+_CFG_HASH = _hash_key(json.dumps(_CONFIG, sort_keys=True))
+
+
 async def fetch_fear_greed() -> Tuple[Optional[int], Optional[str], Dict[str, Any]]:
     cache_key = _hash_key("fg", "global")
     cached = _SOURCE_CACHE.get(cache_key)
@@ -922,17 +946,7 @@ async def fetch_coingecko_metrics(sym: str) -> Dict[str, Any]:
         return result
 
 
-def fetch_rss_sentiment(feeds: List[Dict[str, Any]], max_items: int) -> Dict[str, Any]:
-    if feedparser is None:
-        logger.warning("RSS feeds disabled: feedparser not installed")
-        return {"enabled": False, "reason": "feedparser_not_installed"}
-
-    cache_key = _hash_key("rss", json.dumps(feeds, sort_keys=True))
-    cached = _SOURCE_CACHE.get(cache_key)
-    if cached is not None:
-        return cached
-
-    logger.debug(f"Fetching {len(feeds or [])} RSS feeds (max_items={max_items})")
+def _score_rss_feeds(feeds: List[Dict[str, Any]], fetched: Dict[str, Any], max_items: int) -> Dict[str, Any]:
     results: List[Dict[str, Any]] = []
     weighted_samples: List[float] = []
     total_items = 0
@@ -944,44 +958,62 @@ def fetch_rss_sentiment(feeds: List[Dict[str, Any]], max_items: int) -> Dict[str
             continue
         weight = float(f.get("weight") or 1.0)
 
-        try:
-            parsed = feedparser.parse(url)
-            entries = (parsed.entries or [])[:max_items]
-            local_scores: List[float] = []
-
-            for e in entries:
-                title = str(getattr(e, "title", "") or "")
-                summary = str(getattr(e, "summary", "") or "")
-                s = vader_score_0_1((title + " " + summary).strip())
-                local_scores.append(s)
-
-            if local_scores:
-                avg = sum(local_scores) / len(local_scores)
-                results.append({"name": name, "url": url, "items": len(local_scores), "avg_score_0_1": float(avg), "weight": weight})
-                rep = max(1, int(round(weight * 2)))
-                weighted_samples.extend([avg] * rep)
-                total_items += len(local_scores)
-            else:
-                results.append({"name": name, "url": url, "items": 0, "weight": weight})
-                logger.debug(f"RSS feed {name} returned no items")
-        except Exception as e:
-            logger.error(f"Failed to fetch RSS feed {name} ({url}): {e}")
-            results.append({"name": name, "url": url, "error": str(e), "weight": weight})
+        feed = fetched.get(url)
+        if feed is None or feed.status == "error":
+            error = feed.error if feed is not None else "not fetched"
+            logger.error(f"Failed to fetch RSS feed {name} ({url}): {error}")
+            results.append({"name": name, "url": url, "error": error, "weight": weight})
+            continue
+
+        local_scores: List[float] = []
+        for e in feed.entries[:max_items]:
+            s = vader_score_0_1((e["title"] + " " + e["summary"]).strip())
+            local_scores.append(s)
+
+        if local_scores:
+            avg = sum(local_scores) / len(local_scores)
+            results.append({"name": name, "url": url, "items": len(local_scores), "avg_score_0_1": float(avg), "weight": weight})
+            rep = max(1, int(round(weight * 2)))
+            weighted_samples.extend([avg] * rep)
+            total_items += len(local_scores)
+        else:
+            results.append({"name": name, "url": url, "items": 0, "weight": weight})
+            logger.debug(f"RSS feed {name} returned no items")
 
     if not weighted_samples:
-        result = {"enabled": True, "score_0_1": None, "feeds": results, "items": total_items}
-        _SOURCE_CACHE.set(cache_key, result, RSS_TTL)
-        return result
+        return {"enabled": True, "score_0_1": None, "feeds": results, "items": total_items}
 
     avg_score = float(sum(weighted_samples) / len(weighted_samples))
-    result = {
+    logger.info(f"RSS sentiment: score={avg_score:.3f}, feeds={len(results)}, items={total_items}")
+    return {
         "enabled": True,
         "score_0_1": avg_score,
         "feeds": results,
         "items": total_items,
     }
+
+
+async def fetch_rss_sentiment_async(feeds: List[Dict[str, Any]], max_items: int) -> Dict[str, Any]:
+    """RSS sentiment for every configured feed from one concurrent ingest pass.
+
+    All feeds are fetched at once with conditional GETs (unchanged feeds cost a
+    304); parsing runs in rss_ingest's worker pool and VADER scoring in a thread,
+    so nothing CPU-bound runs on the event loop.
+    """
+    if feedparser is None:
+        logger.warning("RSS feeds disabled: feedparser not installed")
+        return {"enabled": False, "reason": "feedparser_not_installed"}
+
+    cache_key = _hash_key("rss", json.dumps(feeds, sort_keys=True))
+    cached = _SOURCE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    logger.debug(f"Fetching {len(feeds or [])} RSS feeds (max_items={max_items})")
+    urls = [str(f.get("url") or "").strip() for f in feeds or []]
+    fetched = await RSS_INGEST.fetch_all(urls, session=_get_http_session())
+    result = await asyncio.to_thread(_score_rss_feeds, feeds, fetched, max_items)
     _SOURCE_CACHE.set(cache_key, result, RSS_TTL)
-    logger.info(f"RSS sentiment: score={avg_score:.3f}, feeds={len(results)}, items={total_items}")
     return result
 
 
@@ -999,73 +1031,136 @@ def _praw_client() -> Optional[Any]:
         return None
 
 
-def fetch_reddit_sentiment(subreddits: List[str], query: Optional[str], max_posts: int) -> Dict[str, Any]:
-    cache_key = _hash_key("reddit", ",".join(subreddits or []), query or "")
+_REDDIT_POST_LOCKS: Dict[str, threading.Lock] = {}
+_REDDIT_POST_LOCKS_GUARD = threading.Lock()
+
+
+def fetch_reddit_posts(subreddits: List[str], max_posts: int) -> Dict[str, Any]:
+    """Hot post texts per subreddit, fetched once and shared by every query.
+
+    Market-wide and symbol-mention scoring run in parallel threads; the
+    per-key lock makes the second caller wait for the first one's fetch.
+    """
+    cache_key = _hash_key("reddit_posts", ",".join(subreddits or []), str(max_posts))
     cached = _SOURCE_CACHE.get(cache_key)
     if cached is not None:
         return cached
 
+    with _REDDIT_POST_LOCKS_GUARD:
+        lock = _REDDIT_POST_LOCKS.setdefault(cache_key, threading.Lock())
+    with lock:
+        cached = _SOURCE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        return _fetch_reddit_posts_uncached(cache_key, subreddits, max_posts)
+
+
+def _fetch_reddit_posts_uncached(cache_key: str, subreddits: List[str], max_posts: int) -> Dict[str, Any]:
     reddit = _praw_client()
     if reddit is None:
         result = {"enabled": False, "reason": "reddit_not_configured"}
         _SOURCE_CACHE.set(cache_key, result, REDDIT_TTL)
         return result
 
-    q = (query or "").strip().lower()
-    per_sub: List[Dict[str, Any]] = []
-    scores: List[float] = []
-    scored = 0
-    total_mentions = 0
-
+    posts: Dict[str, Any] = {}
     for sr in subreddits or []:
         sr = str(sr).strip()
         if not sr:
             continue
         try:
-            sub = reddit.subreddit(sr)
-            posts = list(sub.hot(limit=max_posts))
-            local_scores: List[float] = []
-            mentions = 0
-
-            for p in posts:
+            texts = []
+            for p in reddit.subreddit(sr).hot(limit=max_posts):
                 title = str(getattr(p, "title", "") or "")
                 selftext = str(getattr(p, "selftext", "") or "")
-                text = (title + " " + selftext).strip()
-
-                if q and q not in text.lower():
-                    continue
-                if q:
-                    mentions += 1
-
-                local_scores.append(vader_score_0_1(text))
-
-            if local_scores:
-                avg = sum(local_scores) / len(local_scores)
-                per_sub.append({"subreddit": sr, "items": len(local_scores), "mentions": mentions if q else None, "avg_score_0_1": float(avg)})
-                scores.append(avg)
-                scored += len(local_scores)
-                total_mentions += mentions
-            else:
-                per_sub.append({"subreddit": sr, "items": 0, "mentions": mentions if q else None})
+                texts.append((title + " " + selftext).strip())
+            posts[sr] = texts
         except Exception as e:
-            per_sub.append({"subreddit": sr, "error": str(e)})
+            posts[sr] = {"error": str(e)}
 
-    if not scores:
-        result = {"enabled": True, "score_0_1": None, "items": scored, "mentions": total_mentions if q else None, "subreddits": per_sub}
-        _SOURCE_CACHE.set(cache_key, result, REDDIT_TTL)
-        return result
+    result = {"enabled": True, "subreddits": posts}
+    _SOURCE_CACHE.set(cache_key, result, REDDIT_TTL)
+    return result
+
+
+def _reddit_result(per_sub_scores: Dict[str, Any], counts_mentions: bool) -> Dict[str, Any]:
+    """``fetch_reddit_sentiment``-shaped summary of per-subreddit post scores."""
+    per_sub: List[Dict[str, Any]] = []
+    scores: List[float] = []
+    scored = 0
+    for sr, local_scores in per_sub_scores.items():
+        if isinstance(local_scores, dict):
+            per_sub.append({"subreddit": sr, **local_scores})
+            continue
+        mentions = len(local_scores) if counts_mentions else None
+        if local_scores:
+            avg = sum(local_scores) / len(local_scores)
+            per_sub.append({"subreddit": sr, "items": len(local_scores), "mentions": mentions, "avg_score_0_1": float(avg)})
+            scores.append(avg)
+            scored += len(local_scores)
+        else:
+            per_sub.append({"subreddit": sr, "items": 0, "mentions": mentions})
 
-    result = {
+    return {
         "enabled": True,
-        "score_0_1": float(sum(scores) / len(scores)),
+        "score_0_1": float(sum(scores) / len(scores)) if scores else None,
         "items": scored,
-        "mentions": total_mentions if q else None,
+        "mentions": scored if counts_mentions else None,
         "subreddits": per_sub,
     }
+
+
+def fetch_reddit_sentiment(subreddits: List[str], query: Optional[str], max_posts: int) -> Dict[str, Any]:
+    cache_key = _hash_key("reddit", ",".join(subreddits or []), query or "")
+    cached = _SOURCE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    posts = fetch_reddit_posts(subreddits, max_posts)
+    if not posts.get("enabled"):
+        return posts
+
+    q = (query or "").strip().lower()
+    per_sub_scores: Dict[str, Any] = {}
+    for sr, texts in posts["subreddits"].items():
+        if isinstance(texts, dict):
+            per_sub_scores[sr] = texts
+            continue
+        per_sub_scores[sr] = [vader_score_0_1(t) for t in texts if not q or q in t.lower()]
+
+    result = _reddit_result(per_sub_scores, bool(q))
     _SOURCE_CACHE.set(cache_key, result, REDDIT_TTL)
     return result
 
 
+def fetch_reddit_mentions_many(subreddits: List[str], symbols: List[str], max_posts: int) -> Dict[str, Dict[str, Any]]:
+    """Per-symbol mention sentiment from one post fetch and one matcher pass.
+
+    Each post is scored once, however many of the symbols it mentions.
+    Matching is on whole tokens, so ``ETH`` does not count "whether".
+    """
+    posts = fetch_reddit_posts(subreddits, max_posts)
+    if not posts.get("enabled"):
+        return {sym: dict(posts) for sym in symbols}
+
+    matcher = SymbolMatcher(symbols)
+    per_symbol: Dict[str, Dict[str, Any]] = {sym: {} for sym in matcher.symbols}
+    for sr, texts in posts["subreddits"].items():
+        if isinstance(texts, dict):
+            for sym in per_symbol:
+                per_symbol[sym][sr] = texts
+            continue
+        for sym in per_symbol:
+            per_symbol[sym][sr] = []
+        for text in texts:
+            found = matcher.match(text)
+            if found:
+                score = vader_score_0_1(text)
+                for sym in found:
+                    per_symbol[sym][sr].append(score)
+
+    return {sym: _reddit_result(per_sub_scores, True) for sym, per_sub_scores in per_symbol.items()}
+
+
 # ------------------------------------------------------------------
 # Compatibility shims (stable public API expected by tests)
 # These thin wrappers keep older function names available while
@@ -1073,8 +1168,8 @@ def fetch_reddit_sentiment(subreddits: List[str], query: Optional[str], max_post
 # ------------------------------------------------------------------
 
 
-def fetch_reddit_mentions(subreddits: List[str], symbol: Optional[str], max_posts: int) -> Dict[str, Any]:
-    """Compatibility shim for older `fetch_reddit_mentions` name.
+def fetch_reddit_symbol_mentions(subreddits: List[str], symbol: Optional[str], max_posts: int) -> Dict[str, Any]:
+    """Compatibility shim for the older sync `fetch_reddit_mentions` signature.
 
     Delegates to `fetch_reddit_sentiment`. Accepts `symbol` which maps
     to the `query` parameter of the current implementation.
@@ -1088,7 +1183,7 @@ def fetch_reddit_mentions(subreddits: List[str], symbol: Optional[str], max_post
 
 def fetch_reddit_public_mentions(subreddits: List[str], symbol: Optional[str], max_posts: int) -> Dict[str, Any]:
     """Alias for public-facing reddit mention collector used in older code/tests."""
-    return fetch_reddit_mentions(subreddits, symbol, max_posts)
+    return fetch_reddit_symbol_mentions(subreddits, symbol, max_posts)
 
 
 def _tweepy_client() -> Optional[Any]:
@@ -1293,40 +1388,121 @@ def _source_record(name: str, tier: str, weight: float, score_0_1: Optional[floa
 # ----------------------------
 
 
+def _sentiment_cache_key(sym: str) -> str:
+    return _hash_key("sentiment", sym, _CFG_HASH)
+
+
 async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
     sym = normalize_symbol(symbol)
-    logger.info(f"Computing sentiment for {symbol} (normalized: {sym})")
+    return (await _compute_sentiment_many_async([sym]))[sym]
 
-    ttl = RESULT_TTL
+
+async def _compute_sentiment_many_async(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Sentiment for every symbol in one cycle, keyed by normalized symbol.
+
+    Fear & Greed, RSS and market-wide Reddit are fetched once for the whole
+    batch; symbol-mention Reddit scoring shares one post fetch and one
+    ``SymbolMatcher`` pass. Only CoinGecko and Twitter stay per symbol, and
+    those run concurrently.
+    """
+    syms = list(dict.fromkeys(normalize_symbol(s) for s in symbols))
+    logger.info(f"Computing sentiment for {len(syms)} symbol(s): {', '.join(syms)}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for sym in syms:
+        cached = _RESULT_CACHE.get(_sentiment_cache_key(sym))
+        if cached is not None:
+            logger.debug(f"Returning cached sentiment for {sym}")
+            cached["metadata"]["cache_hit"] = True
+            _METRICS.record_cache_hit()
+            results[sym] = cached
+        else:
+            _METRICS.record_cache_miss()
+            missing.append(sym)
+    if not missing:
+        return results
+
+    logger.debug(f"Cache miss for {', '.join(missing)}, fetching from sources")
+    sources_cfg = _cfg("sources", {}) or {}
     max_rss = int(_cfg("sentiment.max_rss_items", 25) or 25)
     max_reddit = int(_cfg("sentiment.max_reddit_posts", 40) or 40)
+    t0 = time.time()
+
+    def enabled(name: str) -> bool:
+        return bool(sources_cfg.get(name, {}).get("enabled", False))
+
+    # Symbol-independent sources: one fetch for the whole batch
+    shared_tasks: Dict[str, Any] = {}
+    if enabled("fear_greed"):
+        shared_tasks["fear_greed"] = fetch_fear_greed()
+    if enabled("rss"):
+        shared_tasks["rss"] = fetch_rss_sentiment_async(sources_cfg["rss"].get("feeds", []) or [], max_rss)
+    if enabled("reddit_global"):
+        subs = sources_cfg["reddit_global"].get("subreddits", []) or []
+        shared_tasks["reddit_global"] = asyncio.to_thread(fetch_reddit_sentiment, subs, None, max_reddit)
+    if enabled("reddit_symbol"):
+        subs = sources_cfg["reddit_symbol"].get("subreddits", []) or []
+        shared_tasks["reddit_symbol"] = asyncio.to_thread(fetch_reddit_mentions_many, subs, missing, max_reddit)
+
+    # Per-symbol sources, all in flight together
+    per_symbol_tasks: Dict[Tuple[str, str], Any] = {}
+    if enabled("coingecko"):
+        for sym in missing:
+            per_symbol_tasks[("coingecko", sym)] = fetch_coingecko_metrics(sym)
+    if enabled("twitter"):
+        max_tweets = int(sources_cfg["twitter"].get("max_tweets", 50) or 50)
+        for sym in missing:
+            per_symbol_tasks[("twitter", sym)] = fetch_twitter_sentiment_async(sym, max_tweets=max_tweets)
+
+    gathered = await asyncio.gather(*shared_tasks.values(), *per_symbol_tasks.values())
+    shared = dict(zip(shared_tasks, gathered[: len(shared_tasks)]))
+    per_symbol = dict(zip(per_symbol_tasks, gathered[len(shared_tasks):]))
+
+    for sym in missing:
+        rs_all = shared.get("reddit_symbol")
+        out = _assemble_sentiment(
+            sym,
+            sources_cfg,
+            fg=shared.get("fear_greed"),
+            cg=per_symbol.get(("coingecko", sym)),
+            rss=shared.get("rss"),
+            rg=shared.get("reddit_global"),
+            rs=rs_all.get(sym) if rs_all is not None else None,
+            tw=per_symbol.get(("twitter", sym)),
+            t0=t0,
+        )
+        _RESULT_CACHE.set(_sentiment_cache_key(sym), out, RESULT_TTL)
+        results[sym] = out
+    return {sym: results[sym] for sym in syms}
+
+
+def _assemble_sentiment(
+    sym: str,
+    sources_cfg: Dict[str, Any],
+    *,
+    fg: Optional[Tuple[Optional[int], Optional[str], Dict[str, Any]]],
+    cg: Optional[Dict[str, Any]],
+    rss: Optional[Dict[str, Any]],
+    rg: Optional[Dict[str, Any]],
+    rs: Optional[Dict[str, Any]],
+    tw: Optional[Dict[str, Any]],
+    t0: float,
+) -> Dict[str, Any]:
+    """One symbol's result from already-fetched source payloads.
+
+    A payload is ``None`` when its source is disabled.
+    """
     tier_weights = _cfg("sentiment.tier_weights", {}) or {"tier1": 0.85, "tier2": 0.70, "tier3": 0.50, "fringe": 0.30}
     divergence_threshold = float(_cfg("sentiment.divergence_threshold", 0.12) or 0.12)
-
-    cfg_hash = _hash_key(json.dumps(_CONFIG, sort_keys=True))
-    cache_key = _hash_key("sentiment", sym, cfg_hash)
-    cached = _RESULT_CACHE.get(cache_key)
-    if cached is not None:
-        logger.debug(f"Returning cached sentiment for {sym}")
-        cached["metadata"]["cache_hit"] = True
-        _METRICS.record_cache_hit()
-        return cached
-
-    logger.debug(f"Cache miss for {sym}, fetching from sources")
-    _METRICS.record_cache_miss()
-    sources_cfg = _cfg("sources", {}) or {}
     bucket = _tier_bucket()
     sources: List[Dict[str, Any]] = []
-    t0 = time.time()
-
-    fg_task = asyncio.create_task(fetch_fear_greed()) if sources_cfg.get("fear_greed", {}).get("enabled", False) else None
-    cg_task = asyncio.create_task(fetch_coingecko_metrics(sym)) if sources_cfg.get("coingecko", {}).get("enabled", False) else None
 
     # Fear & Greed
     idx = label = None
     fg_meta: Dict[str, Any] = {}
-    if fg_task:
-        idx, label, fg_meta = await fg_task
+    if fg is not None:
+        idx, label, fg_meta = fg
         fg_score = (float(idx) / 100.0) if idx is not None else None
         fg_cfg = sources_cfg.get("fear_greed", {})
         sources.append(_source_record(
@@ -1341,8 +1517,7 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
 
     # CoinGecko
     cg_metrics: Dict[str, Any] = {}
-    if cg_task:
-        cg = await cg_task
+    if cg is not None:
         cg_score = cg.get("score_0_1") if cg.get("enabled") else None
         cg_metrics = cg.get("metrics") or {}
         cg_cfg = sources_cfg.get("coingecko", {})
@@ -1356,10 +1531,10 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
         ))
         _add(bucket, str(cg_cfg.get("tier", "tier1")), cg_score if _isfinite(cg_score) else None, float(cg_cfg.get("weight", 0.85)))
 
-    # RSS (sync -> offload to thread)
-    rss_cfg = sources_cfg.get("rss", {})
-    if rss_cfg.get("enabled", False):
-        rss = await asyncio.to_thread(fetch_rss_sentiment, rss_cfg.get("feeds", []) or [], max_rss)
+    # RSS (market-wide, shared by every symbol in the batch)
+    rss_score = None
+    if rss is not None:
+        rss_cfg = sources_cfg.get("rss", {})
         rss_score = rss.get("score_0_1")
         sources.append(_source_record(
             name="RSS News (Market)",
@@ -1371,10 +1546,10 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
         ))
         _add(bucket, str(rss_cfg.get("tier", "tier2")), rss_score if _isfinite(rss_score) else None, float(rss_cfg.get("weight", 0.75)))
 
-    # Reddit market-wide (PRAW, sync)
-    rg_cfg = sources_cfg.get("reddit_global", {})
-    if rg_cfg.get("enabled", False):
-        rg = await asyncio.to_thread(fetch_reddit_sentiment, rg_cfg.get("subreddits", []) or [], None, max_reddit)
+    # Reddit market-wide
+    rg_score = None
+    if rg is not None:
+        rg_cfg = sources_cfg.get("reddit_global", {})
         rg_score = rg.get("score_0_1")
         sources.append(_source_record(
             name="Reddit (Market)",
@@ -1386,11 +1561,10 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
         ))
         _add(bucket, str(rg_cfg.get("tier", "tier2")), rg_score if _isfinite(rg_score) else None, float(rg_cfg.get("weight", 0.75)))
 
-    # Reddit symbol mentions (PRAW, sync)
-    rs_cfg = sources_cfg.get("reddit_symbol", {})
+    # Reddit symbol mentions
     reddit_mentions = None
-    if rs_cfg.get("enabled", False):
-        rs = await asyncio.to_thread(fetch_reddit_sentiment, rs_cfg.get("subreddits", []) or [], sym.lower(), max_reddit)
+    if rs is not None:
+        rs_cfg = sources_cfg.get("reddit_symbol", {})
         rs_score = rs.get("score_0_1")
         try:
             reddit_mentions = sum(int(x.get("mentions") or 0) for x in (rs.get("subreddits") or []) if isinstance(x, dict))
@@ -1406,13 +1580,11 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
         ))
         _add(bucket, str(rs_cfg.get("tier", "tier3")), rs_score if _isfinite(rs_score) else None, float(rs_cfg.get("weight", 0.60)))
 
-    # Twitter sentiment (async)
-    tw_cfg = sources_cfg.get("twitter", {})
+    # Twitter sentiment
     twitter_score = None
     twitter_mentions = None
-    if tw_cfg.get("enabled", False):
-        max_tweets = int(tw_cfg.get("max_tweets", 50) or 50)
-        tw = await fetch_twitter_sentiment_async(sym, max_tweets=max_tweets)
+    if tw is not None:
+        tw_cfg = sources_cfg.get("twitter", {})
         twitter_score = tw.get("score_0_1")
         twitter_mentions = tw.get("mentions")
         sources.append(_source_record(
@@ -1430,17 +1602,14 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
     divergence = _divergence_alerts(tier_scores, divergence_threshold)
 
     # Extract trending topics from RSS and Reddit
-    trending_topics = extract_trending_topics(
-        rss if rss_cfg.get("enabled", False) else {},
-        rg if rg_cfg.get("enabled", False) else {}
-    )
+    trending_topics = extract_trending_topics(rss or {}, rg or {})
 
     # Populate social_breakdown with actual values
     social_breakdown = {
-        "reddit": rg_score if rg_cfg.get("enabled", False) and _isfinite(rg_score) else None,
-        "twitter": twitter_score if tw_cfg.get("enabled", False) and _isfinite(twitter_score) else None,
+        "reddit": rg_score if _isfinite(rg_score) else None,
+        "twitter": twitter_score if _isfinite(twitter_score) else None,
         "telegram": None,  # Future: Telegram integration
-        "news": rss_score if rss_cfg.get("enabled", False) and _isfinite(rss_score) else None,
+        "news": rss_score if _isfinite(rss_score) else None,
     }
 
     # Get sentiment history for this symbol
@@ -1484,8 +1653,6 @@ async def _compute_sentiment_async(symbol: str) -> Dict[str, Any]:
         },
     }
 
-    _RESULT_CACHE.set(cache_key, out, ttl)
-
     # Log summary
     elapsed_ms = out["metadata"]["processing_time_ms"]
     sources_ok = out["metadata"]["sources_successful"]
@@ -1539,6 +1706,17 @@ def get_sentiment_for_symbol(symbol: str) -> Dict[str, Any]:
     return fut.result()
 
 
+def get_sentiment_for_symbols(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Sync entrypoint for a whole watchlist, keyed by normalized symbol.
+
+    Shared sources are fetched once for the batch rather than once per symbol.
+    """
+    logger.debug(f"get_sentiment_for_symbols called with {len(symbols)} symbol(s)")
+    _ensure_bg_loop()
+    fut = asyncio.run_coroutine_threadsafe(_compute_sentiment_many_async(symbols), _BG_LOOP)
+    return fut.result()
+
+
 def get_metrics() -> Dict[str, Any]:
     """Get observability metrics for monitoring.
 
@@ -1551,8 +1729,14 @@ def get_metrics() -> Dict[str, Any]:
         - cache_hits/cache_misses: Cache hit/miss counts
         - source_availability: Availability percentage per source
         - source_failures/source_successes: Per-source failure/success counts
+        - rss_ingest: RSS fetched/304/error counts and parse time
+        - score_cache: per-item score memo hits/misses and hit rate
     """
-    return _METRICS.get_metrics()
+    return {
+        **_METRICS.get_metrics(),
+        "rss_ingest": RSS_INGEST.stats(),
+        "score_cache": SCORE_CACHE.stats(),
+    }
 
 
 # ----------------------------
@@ -1593,7 +1777,24 @@ class EnhancedAggregator:
                 logger.warning(f"AI engine unavailable: {e}")
                 self.enable_ai = False
 
-    async def aggregate_intelligence_bundle(self, symbol: str) -> Dict[str, Any]:
+    async def aggregate_intelligence_bundles(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Intelligence bundles for several symbols from one sentiment cycle.
+
+        Traditional sentiment for the whole batch comes from a single
+        ``_compute_sentiment_many_async`` call; the per-symbol AI steps then
+        run concurrently. Keyed by normalized symbol.
+        """
+        traditional = await _compute_sentiment_many_async(symbols)
+        bundles = await asyncio.gather(*(
+            self.aggregate_intelligence_bundle(sym, traditional_data=data)
+            for sym, data in traditional.items()
+        ))
+        return dict(zip(traditional, bundles))
+
+    async def aggregate_intelligence_bundle(
+        self, symbol: str, traditional_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Create an AI-ready intelligence bundle for a symbol.
 
@@ -1605,6 +1806,8 @@ class EnhancedAggregator:
 
         Args:
             symbol: Crypto symbol (e.g., "BTC", "ETH")
+            traditional_data: Already computed sentiment for the symbol, as
+                supplied by ``aggregate_intelligence_bundles``
 
         Returns:
             {
@@ -1647,7 +1850,8 @@ class EnhancedAggregator:
         start_time = time.time()
 
         # 1. Get traditional sentiment data (Phase 0-3)
-        traditional_data = await _compute_sentiment_async(symbol)
+        if traditional_data is None:
+            traditional_data = await _compute_sentiment_async(symbol)
 
         # 2. Extract raw context for AI analysis
         raw_headlines = []
@@ -1849,6 +2053,29 @@ def get_intelligence_bundle(symbol: str) -> Dict[str, Any]:
     return fut.result()
 
 
+def get_intelligence_bundles(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Sync-friendly entrypoint for intelligence bundles over a watchlist.
+
+    Costs one source-fetch cycle for the whole list instead of one per symbol.
+
+    Args:
+        symbols: Crypto symbols (e.g., ["BTC", "ETH"])
+
+    Returns:
+        Intelligence bundles keyed by normalized symbol
+    """
+    logger.debug(f"get_intelligence_bundles called with {len(symbols)} symbol(s)")
+    _ensure_bg_loop()
+
+    aggregator = get_enhanced_aggregator()
+    fut = asyncio.run_coroutine_threadsafe(
+        aggregator.aggregate_intelligence_bundles(symbols),
+        _BG_LOOP
+    )
+    return fut.result()
+
+
 # --- BACKWARD COMPATIBILITY SHIMS (For Legacy Tests) -----------------------
 
 async def fetch_reddit_mentions(symbol: str) -> Dict[str, Any]:
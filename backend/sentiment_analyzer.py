@@ -12,6 +12,16 @@ import numpy as np
 from datetime import datetime
 import pickle
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+try:
+    from model_registry import MODELS, sentiment_pipeline
+    from score_cache import SCORE_CACHE, model_version
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.model_registry import MODELS, sentiment_pipeline
+    from backend.score_cache import SCORE_CACHE, model_version
 
 # NLP Libraries
 try:
@@ -20,27 +30,39 @@ try:
 except ImportError:
     VADER_AVAILABLE = False
     
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# transformers/torch and TextBlob are imported by the model registry on
+# first use, so importing this module stays cheap
+TRANSFORMERS_AVAILABLE = bool(find_spec('transformers') and find_spec('torch'))
+TEXTBLOB_AVAILABLE = bool(find_spec('textblob'))
 
-try:
+def _load_textblob():
     from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+    return TextBlob
+
+# Texts per padded transformer forward pass in analyze_batch
+SENTIMENT_BATCH_SIZE = int(os.environ.get("SENTIMENT_BATCH_SIZE", "16"))
+
+# Marks a model that is available but not loaded until first use
+_LAZY = object()
 
 class SentimentAnalyzer:
     def __init__(self):
+        started = time.perf_counter()
         self.logger = logging.getLogger(__name__)
         
         # Initialize available models
+        self._vader = None
+        self._transformer = None
         self.vader_analyzer = None
         self.transformer_analyzer = None
         self.custom_crypto_model = None
+        self._model_version = None
+        
+        # Transformer inference runs here, off the event loop
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='sentiment-infer'
+        )
+        self._lexicon_phrases = None
         
         # Crypto-specific sentiment lexicon
         self.crypto_sentiment_lexicon = self._build_crypto_lexicon()
@@ -53,46 +75,53 @@ class SentimentAnalyzer:
         }
         
         self._initialize_models()
+        self._init_ms = (time.perf_counter() - started) * 1000
     
     def _initialize_models(self):
-        """Initialize all available sentiment analysis models"""
-        # Initialize VADER
-        if VADER_AVAILABLE:
-            try:
-                self.vader_analyzer = SentimentIntensityAnalyzer()
-                # Add crypto-specific terms to VADER lexicon
-                self._enhance_vader_lexicon()
-                self.logger.info("VADER sentiment analyzer initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize VADER: {e}")
+        """Register the available sentiment analysis models
         
-        # Initialize Transformer model
+        Nothing heavy happens here: VADER and the transformer are loaded on
+        first use through the process-wide model registry, and every
+        analyzer in the process shares the same instances.
+        """
+        if VADER_AVAILABLE:
+            self._vader = _LAZY
         if TRANSFORMERS_AVAILABLE:
-            try:
-                # Use a financial sentiment model if available, otherwise default
-                model_name = "ProsusAI/finbert"  # Financial BERT model
-                try:
-                    self.transformer_analyzer = pipeline(
-                        "sentiment-analysis",
-                        model=model_name,
-                        tokenizer=model_name,
-                        device=0 if torch.cuda.is_available() else -1
-                    )
-                    self.logger.info("FinBERT transformer model initialized")
-                except:
-                    # Fallback to default model
-                    self.transformer_analyzer = pipeline(
-                        "sentiment-analysis",
-                        model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                        device=0 if torch.cuda.is_available() else -1
-                    )
-                    self.logger.info("RoBERTa sentiment model initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize transformer model: {e}")
+            self._transformer = _LAZY
         
         # Try to load custom crypto model
         self._load_custom_crypto_model()
     
+    @property
+    def vader_analyzer(self):
+        """Shared VADER analyzer with the crypto lexicon, loaded on first use"""
+        if self._vader is _LAZY:
+            key = model_version('vader', sorted(self.crypto_sentiment_lexicon.items()))
+            self._vader = MODELS.get(key, self._load_vader)
+        return self._vader
+    
+    @vader_analyzer.setter
+    def vader_analyzer(self, analyzer):
+        self._vader = analyzer
+    
+    @property
+    def transformer_analyzer(self):
+        """Shared transformer pipeline (FinBERT, else RoBERTa), loaded on first use"""
+        if self._transformer is _LAZY:
+            self._transformer = sentiment_pipeline()
+        return self._transformer
+    
+    @transformer_analyzer.setter
+    def transformer_analyzer(self, analyzer):
+        self._transformer = analyzer
+    
+    def _load_vader(self):
+        """Build a VADER analyzer with the crypto terms added to its lexicon"""
+        analyzer = SentimentIntensityAnalyzer()
+        self._enhance_vader_lexicon(analyzer)
+        self.logger.info("VADER sentiment analyzer initialized")
+        return analyzer
+    
     def _build_crypto_lexicon(self) -> Dict[str, float]:
         """Build crypto-specific sentiment lexicon"""
         crypto_lexicon = {
@@ -139,20 +168,21 @@ class SentimentAnalyzer:
         
         return crypto_lexicon
     
-    def _enhance_vader_lexicon(self):
+    def _enhance_vader_lexicon(self, analyzer=None):
         """Add crypto-specific terms to VADER lexicon"""
-        if not self.vader_analyzer:
+        analyzer = analyzer or self.vader_analyzer
+        if not analyzer:
             return
         
         # Add crypto terms to VADER's lexicon
         for term, score in self.crypto_sentiment_lexicon.items():
             # Convert 0-1 scale to VADER's -4 to 4 scale
             vader_score = (score - 0.5) * 8
-            self.vader_analyzer.lexicon[term.lower()] = vader_score
+            analyzer.lexicon[term.lower()] = vader_score
             
             # Also add variations
-            self.vader_analyzer.lexicon[term.replace('_', '')] = vader_score
-            self.vader_analyzer.lexicon[term.replace('_', ' ')] = vader_score
+            analyzer.lexicon[term.replace('_', '')] = vader_score
+            analyzer.lexicon[term.replace('_', ' ')] = vader_score
     
     def _load_custom_crypto_model(self):
         """Load custom trained crypto sentiment model if available"""
@@ -232,7 +262,7 @@ class SentimentAnalyzer:
         
         return text
     
-    async def _analyze_with_vader(self, text: str) -> Dict:
+    def _analyze_with_vader(self, text: str) -> Dict:
         """Analyze sentiment using VADER"""
         if not self.vader_analyzer:
             return {}
@@ -253,51 +283,80 @@ class SentimentAnalyzer:
             self.logger.error(f"VADER analysis error: {e}")
             return {}
     
-    async def _analyze_with_transformer(self, text: str) -> Dict:
-        """Analyze sentiment using transformer model"""
-        if not self.transformer_analyzer:
-            return {}
+    def _analyze_with_transformer(self, texts: List[str]) -> List[Dict]:
+        """Analyze sentiment using transformer model, in padded mini-batches"""
+        if not self.transformer_analyzer or not texts:
+            return [{} for _ in texts]
+        
+        import torch
+        
+        tokenizer = self.transformer_analyzer.tokenizer
+        model = self.transformer_analyzer.model
+        max_length = min(512, getattr(tokenizer, 'model_max_length', 512) or 512)
+        
+        # Similar lengths share a batch, so little compute goes to padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [{} for _ in texts]
+        for start in range(0, len(order), max(1, SENTIMENT_BATCH_SIZE)):
+            chunk = order[start:start + max(1, SENTIMENT_BATCH_SIZE)]
+            encoded = tokenizer(
+                [texts[i] for i in chunk],
+                padding=True,
+                truncation=True,
+                max_length=max_length,
+                return_tensors='pt'
+            ).to(model.device)
+            with torch.inference_mode():
+                probs = torch.softmax(model(**encoded).logits, dim=-1)
+            confidences, label_ids = probs.max(dim=-1)
+            for i, confidence, label_id in zip(
+                chunk, confidences.tolist(), label_ids.tolist()
+            ):
+                results[i] = self._transformer_result(
+                    model.config.id2label[label_id], confidence
+                )
+        return results
+    
+    def _transformer_result(self, label: str, confidence: float) -> Dict:
+        """Map a transformer label and its probability to a sentiment score"""
+        label = label.upper()
+        
+        # Handle different model label formats
+        if 'POSITIVE' in label or 'BULLISH' in label:
+            sentiment_score = 0.5 + (confidence * 0.5)
+        elif 'NEGATIVE' in label or 'BEARISH' in label:
+            sentiment_score = 0.5 - (confidence * 0.5)
+        else:  # NEUTRAL
+            sentiment_score = 0.5
         
-        try:
-            # Truncate text if too long for transformer
-            max_length = 512
-            if len(text.split()) > max_length:
-                text = ' '.join(text.split()[:max_length])
-            
-            result = self.transformer_analyzer(text)
-            
-            if isinstance(result, list) and len(result) > 0:
-                result = result[0]
-            
-            # Map labels to sentiment scores
-            label = result['label'].upper()
-            confidence = result['score']
-            
-            # Handle different model label formats
-            if 'POSITIVE' in label or 'BULLISH' in label:
-                sentiment_score = 0.5 + (confidence * 0.5)
-            elif 'NEGATIVE' in label or 'BEARISH' in label:
-                sentiment_score = 0.5 - (confidence * 0.5)
-            else:  # NEUTRAL
-                sentiment_score = 0.5
-            
-            return {
-                'sentiment_score': sentiment_score,
-                'confidence': confidence,
-                'raw_label': label,
-                'model': 'transformer'
-            }
-        except Exception as e:
-            self.logger.error(f"Transformer analysis error: {e}")
-            return {}
+        return {
+            'sentiment_score': sentiment_score,
+            'confidence': confidence,
+            'raw_label': label,
+            'model': 'transformer'
+        }
     
-    async def _analyze_with_crypto_lexicon(self, text: str) -> Dict:
+    def _analyze_with_crypto_lexicon(self, text: str) -> Dict:
         """Analyze sentiment using crypto-specific lexicon"""
         try:
             words = text.lower().split()
             sentiment_scores = []
             matched_terms = []
             
+            # Multi-word phrases are matched against the whole text, so they
+            # are found once and then counted for every word as before
+            if self._lexicon_phrases is None:
+                self._lexicon_phrases = [
+                    (phrase, phrase.replace('_', ' ').replace(' ', ''))
+                    for phrase in self.crypto_sentiment_lexicon
+                    if '_' in phrase or ' ' in phrase
+                ]
+            compact = text.replace(' ', '')
+            phrase_hits = [
+                phrase for phrase, normalized in self._lexicon_phrases
+                if normalized in compact
+            ]
+            
             for word in words:
                 # Direct match
                 if word in self.crypto_sentiment_lexicon:
@@ -311,12 +370,9 @@ class SentimentAnalyzer:
                     matched_terms.append(word_underscore)
                 
                 # Check for phrase matches
-                for phrase in self.crypto_sentiment_lexicon:
-                    if '_' in phrase or ' ' in phrase:
-                        phrase_normalized = phrase.replace('_', ' ').replace(' ', '')
-                        if phrase_normalized in text.replace(' ', ''):
-                            sentiment_scores.append(self.crypto_sentiment_lexicon[phrase])
-                            matched_terms.append(phrase)
+                for phrase in phrase_hits:
+                    sentiment_scores.append(self.crypto_sentiment_lexicon[phrase])
+                    matched_terms.append(phrase)
             
             if sentiment_scores:
                 # Weight by frequency and recency of terms
@@ -341,13 +397,13 @@ class SentimentAnalyzer:
             self.logger.error(f"Crypto lexicon analysis error: {e}")
             return {}
     
-    async def _analyze_with_textblob(self, text: str) -> Dict:
+    def _analyze_with_textblob(self, text: str) -> Dict:
         """Analyze sentiment using TextBlob (fallback method)"""
         if not TEXTBLOB_AVAILABLE:
             return {}
         
         try:
-            blob = TextBlob(text)
+            blob = MODELS.get('textblob', _load_textblob)(text)
             polarity = blob.sentiment.polarity  # -1 to 1
             
             # Convert to 0-1 scale
@@ -431,9 +487,87 @@ class SentimentAnalyzer:
             'agreement_variance': np.var([a['sentiment_score'] for a in valid_analyses]) if len(valid_analyses) > 1 else 0
         }
     
-    async def analyze(self, text: str, language: str = None) -> Dict:
-        """Main sentiment analysis method"""
-        if not text or len(text.strip()) < 5:
+    @property
+    def model_version(self) -> str:
+        """Identifies everything that changes a score, for the score cache"""
+        if self._model_version is None:
+            # Resolve the lazy models first: one that fails to load is not
+            # part of the ensemble
+            self.vader_analyzer
+            transformer = getattr(self.transformer_analyzer, 'model', None)
+            self._model_version = model_version(
+                'ensemble',
+                self.get_analyzer_stats()['available_models'],
+                getattr(transformer, 'name_or_path', None),
+                MODELS.key_for(self.transformer_analyzer),
+                sorted(self.crypto_sentiment_lexicon.items()),
+            )
+        return self._model_version
+    
+    async def _score(self, text: str) -> Dict:
+        """Run every available model on one text and combine them"""
+        return (await self._score_batch([text]))[0]
+    
+    async def _score_batch(self, texts: List[str]) -> List[Dict]:
+        """Run every available model over a batch of texts and combine them"""
+        # Preprocess text
+        processed_texts = [self._preprocess_text(text) for text in texts]
+        
+        # The transformer starts on its worker thread first; the cheap
+        # scorers then make one pass over the batch while it runs
+        inference = None
+        if self.transformer_analyzer:
+            inference = asyncio.get_running_loop().run_in_executor(
+                self._inference_executor,
+                self._analyze_with_transformer,
+                processed_texts
+            )
+        
+        vader_results = [
+            self._analyze_with_vader(text) if self.vader_analyzer else {}
+            for text in processed_texts
+        ]
+        lexicon_results = [
+            self._analyze_with_crypto_lexicon(text) for text in processed_texts
+        ]
+        textblob_results = [
+            self._analyze_with_textblob(text) if TEXTBLOB_AVAILABLE else {}
+            for text in processed_texts
+        ]
+        
+        transformer_results = [{} for _ in processed_texts]
+        if inference is not None:
+            try:
+                transformer_results = await inference
+            except Exception as e:
+                self.logger.error(f"Transformer analysis error: {e}")
+        
+        scored = []
+        for i, processed_text in enumerate(processed_texts):
+            analyses = (
+                vader_results[i],
+                transformer_results[i],
+                lexicon_results[i],
+                textblob_results[i]
+            )
+            valid_analyses = [a for a in analyses if 'sentiment_score' in a]
+            
+            # Combine results using ensemble method
+            ensemble_result = self._ensemble_sentiment(valid_analyses)
+            
+            scored.append({
+                'score': float(ensemble_result['score']),
+                'confidence': float(ensemble_result['confidence']),
+                'model': ensemble_result['model'],
+                'processed_text': processed_text,
+                'individual_results': ensemble_result.get('individual_analyses', []),
+                'agreement_variance': float(ensemble_result.get('agreement_variance', 0))
+            })
+        return scored
+    
+    def _result(self, text: str, scored: Optional[Dict], language: str = None) -> Dict:
+        """Attach language and timestamp to a (possibly cached) score"""
+        if not text or len(text.strip()) < 5 or scored is None:
             return {
                 'score': 0.5,
                 'confidence': 0.0,
@@ -445,64 +579,62 @@ class SentimentAnalyzer:
         if not language:
             language = self._detect_language(text)
         
-        # Preprocess text
-        processed_text = self._preprocess_text(text)
-        
-        # Run all available analyses concurrently
-        analysis_tasks = []
-        
-        if self.vader_analyzer:
-            analysis_tasks.append(self._analyze_with_vader(processed_text))
-        
-        if self.transformer_analyzer:
-            analysis_tasks.append(self._analyze_with_transformer(processed_text))
-        
-        analysis_tasks.append(self._analyze_with_crypto_lexicon(processed_text))
-        
-        if TEXTBLOB_AVAILABLE:
-            analysis_tasks.append(self._analyze_with_textblob(processed_text))
-        
-        # Execute all analyses
-        try:
-            analyses = await asyncio.gather(*analysis_tasks, return_exceptions=True)
-            
-            # Filter out exceptions
-            valid_analyses = [a for a in analyses if isinstance(a, dict) and 'sentiment_score' in a]
-            
-        except Exception as e:
-            self.logger.error(f"Error in sentiment analysis: {e}")
-            valid_analyses = []
-        
-        # Combine results using ensemble method
-        ensemble_result = self._ensemble_sentiment(valid_analyses)
-        
         return {
-            'score': ensemble_result['score'],
-            'confidence': ensemble_result['confidence'],
+            **scored,
             'language': language,
-            'model': ensemble_result['model'],
-            'processed_text': processed_text,
-            'individual_results': ensemble_result.get('individual_analyses', []),
-            'agreement_variance': ensemble_result.get('agreement_variance', 0),
             'timestamp': datetime.now()
         }
     
+    async def analyze(self, text: str, language: str = None) -> Dict:
+        """Main sentiment analysis method"""
+        if not text or len(text.strip()) < 5:
+            return self._result(text, None)
+        
+        # Items repeat across refresh cycles: only unseen content is scored
+        scored = await SCORE_CACHE.aget_or_compute(
+            text, self.model_version, lambda: self._score(text)
+        )
+        return self._result(text, scored, language)
+    
     async def analyze_batch(self, texts: List[str], language: str = None) -> List[Dict]:
-        """Analyze multiple texts in batch"""
-        tasks = [self.analyze(text, language) for text in texts]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        """Analyze multiple texts in batch
+        
+        Cached texts are served as-is; the rest go through the models
+        together, the transformer in padded mini-batches of
+        ``SENTIMENT_BATCH_SIZE``.
+        """
+        version = self.model_version
+        scored = {}
+        unseen = []
+        for text in texts:
+            if not text or len(text.strip()) < 5 or text in scored:
+                continue
+            scored[text] = SCORE_CACHE.get(text, version)
+            if scored[text] is None:
+                unseen.append(text)
+        
+        if unseen:
+            for text, result in zip(unseen, await self._score_batch(unseen)):
+                SCORE_CACHE.put(text, version, result)
+                scored[text] = result
+        
+        return [self._result(text, scored.get(text), language) for text in texts]
     
     def get_analyzer_stats(self) -> Dict:
         """Get statistics about available analyzers"""
         stats = {
             'available_models': [],
             'crypto_lexicon_size': len(self.crypto_sentiment_lexicon),
-            'supported_languages': list(self.language_patterns.keys())
+            'supported_languages': list(self.language_patterns.keys()),
+            'init_ms': round(self._init_ms, 1),
+            # Process RSS plus load time and memory of each shared model
+            'model_registry': MODELS.stats()
         }
         
-        if self.vader_analyzer:
+        # Lazy models count as available without being loaded here
+        if self._vader is not None:
             stats['available_models'].append('vader')
-        if self.transformer_analyzer:
+        if self._transformer is not None:
             stats['available_models'].append('transformer')
         if self.custom_crypto_model:
             stats['available_models'].append('custom_crypto')
@@ -5,19 +5,22 @@ from __future__ import annotations
 import argparse
 import asyncio
 import contextlib
+import functools
 import logging
 import math
 import os
+import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from fastapi import FastAPI, HTTPException, WebSocket
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-import requests
 from pydantic import BaseModel, Field
 
+from backend.sentiment.handoff import HandoffWriter, handoff_enabled
+from backend.sentiment.http_client import SentimentHTTPClient, UpstreamHTTPError
 from backend.sentiment.providers import get_provider
 from backend.sentiment.source_loader import load_sources, SentimentSourceLoaderError
 
@@ -26,6 +29,8 @@ logger = logging.getLogger("sentiment_api")
 
 @contextlib.asynccontextmanager
 async def _lifespan(application: FastAPI):
+    await _HTTP.start()
+    application.state.http_client = _HTTP
     task = None
     if SENTIMENT_CACHE_TTL > 0:
         task = asyncio.create_task(_cache_refresher_loop())
@@ -37,6 +42,7 @@ async def _lifespan(application: FastAPI):
             task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await task
+        await _HTTP.close()
 
 
 app = FastAPI(title="Moonwalking Sentiment API", lifespan=_lifespan)
@@ -74,6 +80,13 @@ COINALYZE_DERIVATIVES_SYMBOLS = {"BTC": "BTCUSDT_PERP.A", "ETH": "ETHUSDT_PERP.A
 # Default funding interval (hours) for the CEX venues that settle every 8h.
 DEFAULT_FUNDING_INTERVAL_HOURS = 8.0
 
+# One pooled keep-alive client for every upstream source; opened and closed
+# by _lifespan (and lazily on first use outside the app, e.g. in tests).
+_HTTP = SentimentHTTPClient()
+# Every new generation is pushed to the board through a local handoff file,
+# so the board's request path never calls back into this service.
+_HANDOFF = HandoffWriter()
+
 DATA_SOURCES: List["DataSource"] = []
 SOURCE_COUNTS = {"tier1": 0, "tier2": 0, "tier3": 0, "fringe": 0}
 _SENTIMENT_CACHE: Optional["SentimentResponse"] = None
@@ -93,6 +106,14 @@ _BINANCE_DERIVATIVES_CACHE: Optional[Dict[str, Any]] = None
 _BINANCE_DERIVATIVES_CACHE_TS: Optional[datetime] = None
 BINANCE_DERIVATIVES_CACHE_TTL_SEC = 120  # 2 minutes
 BINANCE_DERIVATIVES_STALE_SEC = 10 * 60  # 10 minutes
+# One wall-clock budget for all derivatives venue legs in a refresh cycle.
+DERIVATIVES_CYCLE_DEADLINE_S = float(
+    os.getenv("SENTIMENT_DERIVATIVES_DEADLINE_S", "2.0")
+)
+# (venue, key) -> {"task", "result", "result_ts"}; legs that miss a cycle's
+# deadline keep running and their result is picked up by the next cycle.
+_DERIVATIVES_LEGS: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_DERIVATIVES_VENUE_STATS: Dict[str, Dict[str, Any]] = {}
 
 
 class SentimentTier(str, Enum):
@@ -303,7 +324,7 @@ async def _hydrate_sentiment_cache(force: bool = False) -> SentimentResponse:
     global _SENTIMENT_CACHE, _SENTIMENT_CACHE_TS
 
     if SENTIMENT_CACHE_TTL <= 0 and not force:
-        return await _build_sentiment_payload()
+        return _publish_generation(await _build_sentiment_payload())
 
     now = datetime.now(timezone.utc)
     if (
@@ -314,12 +335,21 @@ async def _hydrate_sentiment_cache(force: bool = False) -> SentimentResponse:
     ):
         return _SENTIMENT_CACHE
 
-    payload = await _build_sentiment_payload()
+    payload = _publish_generation(await _build_sentiment_payload())
     _SENTIMENT_CACHE = payload
     _SENTIMENT_CACHE_TS = now
     return payload
 
 
+def _publish_generation(payload: SentimentResponse) -> SentimentResponse:
+    if handoff_enabled():
+        try:
+            _HANDOFF.publish(jsonable_encoder(payload))
+        except Exception:
+            logger.exception("Failed to publish sentiment handoff")
+    return payload
+
+
 async def _build_sentiment_payload() -> SentimentResponse:
     """Build a real-only market-wide sentiment snapshot.
 
@@ -519,13 +549,8 @@ def _fear_greed_label(value: int) -> str:
     return "Extreme Greed"
 
 
-async def _fetch_json(url: str, timeout: float) -> Any:
-    def _req():
-        resp = requests.get(url, timeout=timeout)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_req)
+async def _fetch_json(url: str, timeout: float, source: str) -> Any:
+    return await _HTTP.get_json(url, source=source, timeout=timeout)
 
 
 def _stamp_payload(
@@ -548,7 +573,7 @@ async def _get_fear_greed_payload() -> Optional[Dict[str, Any]]:
             return _stamp_payload(_FNG_CACHE, _FNG_CACHE_TS, FNG_CACHE_TTL_SEC)
 
     try:
-        raw = await _fetch_json(FNG_URL, timeout=1.0)
+        raw = await _fetch_json(FNG_URL, timeout=1.0, source="fear_greed")
         data_list = (raw or {}).get("data") or []
         item = data_list[0] if data_list else {}
         value = item.get("value")
@@ -590,7 +615,7 @@ async def _get_market_pulse_payload() -> Optional[Dict[str, Any]]:
             return _stamp_payload(_CG_CACHE, _CG_CACHE_TS, CG_CACHE_TTL_SEC)
 
     try:
-        raw = await _fetch_json(CG_GLOBAL_URL, timeout=1.0)
+        raw = await _fetch_json(CG_GLOBAL_URL, timeout=1.0, source="coingecko")
         data = (raw or {}).get("data") or {}
         payload = {
             "total_market_cap_usd": _safe_float(
@@ -623,14 +648,9 @@ async def _get_market_pulse_payload() -> Optional[Dict[str, Any]]:
 
 
 async def _get_binance_json(path: str, params: Dict[str, str]) -> Any:
-    def _req():
-        resp = requests.get(
-            f"{BINANCE_FAPI_BASE_URL}{path}", params=params, timeout=1.2
-        )
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_req)
+    return await _HTTP.get_json(
+        f"{BINANCE_FAPI_BASE_URL}{path}", source="binance", params=params
+    )
 
 
 async def _get_binance_symbol_positioning(
@@ -658,12 +678,7 @@ async def _get_binance_symbol_positioning(
 
 
 async def _get_okx_json(path: str, params: Dict[str, str]) -> Any:
-    def _req():
-        resp = requests.get(f"{OKX_BASE_URL}{path}", params=params, timeout=1.2)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_req)
+    return await _HTTP.get_json(f"{OKX_BASE_URL}{path}", source="okx", params=params)
 
 
 async def _get_okx_symbol_positioning(
@@ -694,12 +709,9 @@ async def _get_okx_symbol_positioning(
 
 
 async def _get_bybit_json(path: str, params: Dict[str, str]) -> Any:
-    def _req():
-        resp = requests.get(f"{BYBIT_BASE_URL}{path}", params=params, timeout=1.2)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_req)
+    return await _HTTP.get_json(
+        f"{BYBIT_BASE_URL}{path}", source="bybit", params=params
+    )
 
 
 async def _get_bybit_symbol_positioning(
@@ -749,17 +761,12 @@ async def _get_hyperliquid_positioning() -> (
     it against the 8h CEX venues.
     """
 
-    def _req():
-        resp = requests.post(
+    try:
+        data = await _HTTP.post_json(
             f"{HYPERLIQUID_BASE_URL}/info",
+            source="hyperliquid",
             json={"type": "metaAndAssetCtxs"},
-            timeout=1.5,
         )
-        resp.raise_for_status()
-        return resp.json()
-
-    try:
-        data = await asyncio.to_thread(_req)
         meta, asset_ctxs = data[0], data[1]
         universe = meta.get("universe") or []
         index_by_name = {asset.get("name"): i for i, asset in enumerate(universe)}
@@ -801,16 +808,11 @@ async def _get_hyperliquid_positioning() -> (
 
 
 async def _get_coinalyze_json(path: str, params: Dict[str, str]) -> Any:
-    def _req():
-        resp = requests.get(
-            f"{COINALYZE_BASE_URL}{path}",
-            params={**params, "api_key": COINALYZE_API_KEY},
-            timeout=1.5,
-        )
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_req)
+    return await _HTTP.get_json(
+        f"{COINALYZE_BASE_URL}{path}",
+        source="coinalyze",
+        params={**params, "api_key": COINALYZE_API_KEY},
+    )
 
 
 async def _get_coinalyze_positioning() -> (
@@ -859,7 +861,10 @@ async def _get_coinalyze_positioning() -> (
 
 
 def _source_error(exchange: str, symbol: str, exc: Exception) -> Dict[str, Any]:
-    status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(exc, UpstreamHTTPError):
+        status_code = exc.status_code
+    else:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
     if status_code in (401, 403, 451):
         status = "blocked"
     else:
@@ -917,6 +922,137 @@ def _summarize_derivatives_positioning(
     }
 
 
+LegResult = List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+
+
+def _derivatives_legs() -> List[Tuple[str, str, Callable[[], Awaitable[Any]]]]:
+    """Every venue/symbol leg as ``(venue, key, start)``; all run in parallel."""
+    legs: List[Tuple[str, str, Callable[[], Awaitable[Any]]]] = []
+    for symbol in BINANCE_DERIVATIVES_SYMBOLS.values():
+        legs.append(
+            ("binance", symbol, lambda s=symbol: _get_binance_symbol_positioning(s))
+        )
+    for base_asset, instrument_id in OKX_DERIVATIVES_SYMBOLS.items():
+        legs.append(
+            (
+                "okx",
+                instrument_id,
+                lambda b=base_asset, i=instrument_id: _get_okx_symbol_positioning(
+                    b, i
+                ),
+            )
+        )
+    for base_asset, symbol in BYBIT_DERIVATIVES_SYMBOLS.items():
+        legs.append(
+            (
+                "bybit",
+                symbol,
+                lambda b=base_asset, s=symbol: _get_bybit_symbol_positioning(b, s),
+            )
+        )
+    # Hyperliquid (on-chain, keyless) and Coinalyze (CEX-aggregated, key-gated)
+    # each return a ready list of (item, error) tuples from one leg.
+    legs.append(("hyperliquid", "metaAndAssetCtxs", _get_hyperliquid_positioning))
+    legs.append(("coinalyze", "aggregate", _get_coinalyze_positioning))
+    return legs
+
+
+def _venue_stats(venue: str) -> Dict[str, Any]:
+    return _DERIVATIVES_VENUE_STATS.setdefault(
+        venue,
+        {
+            "legs": 0,
+            "timeouts": 0,
+            "late_results": 0,
+            "errors": 0,
+            "last_ms": None,
+            "max_ms": 0.0,
+        },
+    )
+
+
+def _leg_finished(venue: str, key: str, started: float, task: asyncio.Task) -> None:
+    """Record a leg's result whenever it lands, in this cycle or a later one."""
+    ms = (time.perf_counter() - started) * 1000.0
+    stats = _venue_stats(venue)
+    stats["last_ms"] = round(ms, 1)
+    stats["max_ms"] = round(max(stats["max_ms"], ms), 1)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        stats["errors"] += 1
+        result: LegResult = [(None, _source_error(venue, key, exc))]
+    else:
+        raw = task.result()
+        result = list(raw) if isinstance(raw, list) else [raw]
+        if any(error for _, error in result):
+            stats["errors"] += 1
+    _DERIVATIVES_LEGS[(venue, key)].update(
+        result=result, result_ts=time.monotonic(), task=None
+    )
+
+
+async def _run_derivatives_legs(
+    legs: List[Tuple[str, str, Callable[[], Awaitable[Any]]]],
+    deadline_s: Optional[float] = None,
+) -> LegResult:
+    """Launch every leg at once and collect what finishes within the deadline.
+
+    A leg still running at the deadline is left to finish in the background
+    (it is not restarted while in flight); its result is used by the next
+    cycle. Until then the leg's previous result stands in if it is younger
+    than ``BINANCE_DERIVATIVES_STALE_SEC``, otherwise the leg reports a
+    timeout error.
+    """
+    loop = asyncio.get_running_loop()
+    deadline_s = DERIVATIVES_CYCLE_DEADLINE_S if deadline_s is None else deadline_s
+    tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+    for venue, key, start in legs:
+        state = _DERIVATIVES_LEGS.setdefault((venue, key), {})
+        task = state.get("task")
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(start())
+            task.add_done_callback(
+                functools.partial(_leg_finished, venue, key, time.perf_counter())
+            )
+            state["task"] = task
+            _venue_stats(venue)["legs"] += 1
+        tasks[(venue, key)] = task
+
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline_s)
+
+    results: LegResult = []
+    now = time.monotonic()
+    for (venue, key), task in tasks.items():
+        state = _DERIVATIVES_LEGS[(venue, key)]
+        if task.done():
+            # _leg_finished was registered before asyncio.wait's own callback,
+            # so it has already stored this task's result.
+            results.extend(state.get("result") or [])
+            continue
+        stats = _venue_stats(venue)
+        stats["timeouts"] += 1
+        previous = state.get("result")
+        age = now - state.get("result_ts", 0)
+        if previous and age <= BINANCE_DERIVATIVES_STALE_SEC:
+            stats["late_results"] += 1
+            results.extend(previous)
+        else:
+            results.append(
+                (
+                    None,
+                    _source_error(
+                        venue,
+                        key,
+                        asyncio.TimeoutError(f"no result within {deadline_s:.1f}s"),
+                    ),
+                )
+            )
+    return results
+
+
 async def _get_derivatives_positioning_payload() -> Optional[Dict[str, Any]]:
     global _BINANCE_DERIVATIVES_CACHE, _BINANCE_DERIVATIVES_CACHE_TS
     now = datetime.now(timezone.utc)
@@ -930,35 +1066,7 @@ async def _get_derivatives_positioning_payload() -> Optional[Dict[str, Any]]:
                 BINANCE_DERIVATIVES_CACHE_TTL_SEC,
             )
 
-    binance_symbols = await asyncio.gather(
-        *(
-            _get_binance_symbol_positioning(symbol)
-            for symbol in BINANCE_DERIVATIVES_SYMBOLS.values()
-        )
-    )
-    okx_symbols = await asyncio.gather(
-        *(
-            _get_okx_symbol_positioning(base_asset, instrument_id)
-            for base_asset, instrument_id in OKX_DERIVATIVES_SYMBOLS.items()
-        )
-    )
-    bybit_symbols = await asyncio.gather(
-        *(
-            _get_bybit_symbol_positioning(base_asset, symbol)
-            for base_asset, symbol in BYBIT_DERIVATIVES_SYMBOLS.items()
-        )
-    )
-    # Hyperliquid (on-chain, keyless) and Coinalyze (CEX-aggregated, key-gated)
-    # each return a ready list of (item, error) tuples.
-    hyperliquid_symbols = await _get_hyperliquid_positioning()
-    coinalyze_symbols = await _get_coinalyze_positioning()
-    results = [
-        *binance_symbols,
-        *okx_symbols,
-        *bybit_symbols,
-        *hyperliquid_symbols,
-        *coinalyze_symbols,
-    ]
+    results = await _run_derivatives_legs(_derivatives_legs())
     source_errors = [error for _, error in results if error]
     valid_symbols = [item for item, _ in results if item]
     if valid_symbols:
@@ -1303,6 +1411,11 @@ async def health_check() -> Dict[str, Any]:
         "active_sources": active_sources,
         "configured_sources": configured_sources,
         "data_status": data_status,
+        "http": _HTTP.stats(),
+        "derivatives_venues": {
+            venue: dict(stats)
+            for venue, stats in sorted(_DERIVATIVES_VENUE_STATS.items())
+        },
         "last_update": datetime.now(timezone.utc).isoformat(),
     }
 
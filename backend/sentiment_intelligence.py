@@ -4,7 +4,11 @@ from typing import List, Dict
 
 import torch
 import google.generativeai as genai
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+try:
+    from model_registry import load_sequence_classifier
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.model_registry import load_sequence_classifier
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +43,11 @@ class HybridIntelligence:
     def _load_finbert(self):
         try:
             logger.info("Loading local FinBERT model...")
-            self.tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                "ProsusAI/finbert"
-            ).to(self.device)
-            self.model.eval()
+            # Shared with SentimentAnalyzer when both run on the same device
+            loaded = load_sequence_classifier("ProsusAI/finbert", device=self.device)
+            if loaded is None:
+                return
+            self.tokenizer, self.model = loaded
             logger.info("✅ FinBERT loaded successfully on " + str(self.device))
         except Exception as e:
             logger.error(f"❌ Failed to load FinBERT: {e}")
@@ -63,6 +67,8 @@ class HybridIntelligence:
         except Exception:
             # If model fails to load, degrade gracefully.
             return {"score": 0, "label": "Neutral", "confidence": 0}
+        if self.model is None:
+            return {"score": 0, "label": "Neutral", "confidence": 0}
 
         inputs = self.tokenizer(
             headlines,
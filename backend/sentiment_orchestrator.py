@@ -28,6 +28,11 @@ from analysis.aggregator import DataAggregator
 from utils.rate_limiter import RateLimiter
 from utils.cache_manager import CacheManager
 
+try:
+    from sentiment_store import SentimentStore
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.sentiment_store import SentimentStore
+
 @dataclass
 class SentimentData:
     source: str
@@ -65,7 +70,9 @@ class SentimentOrchestrator:
         self.symbol_map = self.config.get('symbol_map', {})
         
         # Storage
-        self.redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
+        # Aggregates are stored as binary, so responses stay undecoded
+        self.redis_client = redis.Redis(host='localhost', port=6379)
+        self.store = SentimentStore(self.redis_client)
         self.data_storage = []
         
     def _load_config(self, config_path: str) -> Dict:
@@ -357,9 +364,6 @@ class SentimentOrchestrator:
         """Process and aggregate all sentiment data"""
         self.logger.info("Processing and aggregating sentiment data...")
         
-        # Store raw data
-        await self._store_raw_data(sentiment_data)
-        
         # Aggregate by different dimensions
         aggregated = await self.aggregator.aggregate_sentiment(sentiment_data)
         
@@ -378,26 +382,22 @@ class SentimentOrchestrator:
             'source_breakdown': self._get_source_breakdown(sentiment_data)
         }
         
-        # Store aggregated results
-        await self._store_aggregated_results(result)
+        # Store raw data and aggregated results
+        await self._store_cycle(sentiment_data, result)
         
         return result
     
-    async def _store_raw_data(self, sentiment_data: List[SentimentData]):
-        """Store raw sentiment data"""
+    async def _store_cycle(self, sentiment_data: List[SentimentData], results: Dict):
+        """Store raw items and the aggregate in one batched write"""
         timestamp = datetime.now().isoformat()
         
-        for data in sentiment_data:
-            key = f"sentiment:raw:{timestamp}:{data.source}"
-            value = json.dumps(asdict(data), default=str)
-            self.redis_client.setex(key, 86400, value)  # 24 hour expiry
-    
-    async def _store_aggregated_results(self, results: Dict):
-        """Store aggregated results"""
-        timestamp = datetime.now().isoformat()
-        key = f"sentiment:aggregated:{timestamp}"
-        value = json.dumps(results, default=str)
-        self.redis_client.setex(key, 86400 * 7, value)  # 7 day expiry
+        # One pipelined round trip (or one local transaction), off the event loop
+        await asyncio.to_thread(
+            self.store.write_cycle,
+            timestamp,
+            raw=[asdict(data) for data in sentiment_data],
+            aggregate=results
+        )
     
     def _get_source_breakdown(self, sentiment_data: List[SentimentData]) -> Dict:
         """Get breakdown of data by source type"""
@@ -514,9 +514,7 @@ class SentimentOrchestrator:
         # Store alerts
         if alerts:
             timestamp = datetime.now().isoformat()
-            key = f"sentiment:alerts:{timestamp}"
-            value = json.dumps(alerts, default=str)
-            self.redis_client.setex(key, 86400 * 7, value)  # 7 day expiry
+            await asyncio.to_thread(self.store.write_cycle, timestamp, alerts=alerts)
 
 async def main():
     """Main entry point"""
@@ -0,0 +1,199 @@
+"""Batched persistence for ``SentimentOrchestrator`` collection cycles.
+
+The orchestrator used to issue one blocking ``redis.setex`` per collected
+item, on the event loop, and then store the aggregate as
+``json.dumps(default=str)``. ``SentimentStore.write_cycle`` now writes a
+whole cycle at once:
+
+- With Redis, the raw items, the aggregate and any alerts go through one
+  non-transactional pipeline, so a cycle costs one round trip.
+- Without Redis (client missing or unreachable), the same records are
+  appended to a local SQLite file (``SENTIMENT_STORE_DB``) in one
+  transaction. Expired rows are pruned every ``PRUNE_EVERY_WRITES`` writes.
+
+Raw items and alerts stay JSON so existing readers keep working. The
+aggregate is packed with ``encode_aggregate``: compact JSON, zlib-compressed
+behind a short magic header. ``decode_aggregate`` reverses it. The caller
+decides whether to run ``write_cycle`` in a worker thread.
+
+``stats()`` reports writes, round trips, records, bytes written and the
+backend used last.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(
+    os.environ.get("SENTIMENT_STORE_DB")
+    or Path(__file__).resolve().parent / "data" / "sentiment_store.sqlite"
+)
+RAW_TTL_S = 86400  # 24 hour expiry
+AGGREGATE_TTL_S = 86400 * 7  # 7 day expiry
+ALERTS_TTL_S = 86400 * 7
+PRUNE_EVERY_WRITES = 100
+
+AGGREGATE_MAGIC = b"SA1"
+
+
+def encode_aggregate(result: Any) -> bytes:
+    """Compact binary form of an aggregate (datetimes become ISO strings)."""
+    body = json.dumps(
+        result, separators=(",", ":"), default=_default, ensure_ascii=False
+    ).encode("utf-8")
+    return AGGREGATE_MAGIC + zlib.compress(body, 6)
+
+
+def decode_aggregate(blob: bytes) -> Any:
+    if not blob.startswith(AGGREGATE_MAGIC):
+        raise ValueError("not an encoded sentiment aggregate")
+    return json.loads(zlib.decompress(blob[len(AGGREGATE_MAGIC) :]))
+
+
+def _default(value: Any) -> Any:
+    isoformat = getattr(value, "isoformat", None)
+    return isoformat() if callable(isoformat) else str(value)
+
+
+class SentimentStore:
+    def __init__(self, redis_client: Any = None, path=None):
+        self.redis_client = redis_client
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {
+            "writes": 0,
+            "round_trips": 0,
+            "records": 0,
+            "bytes": 0,
+            "redis_errors": 0,
+            "backend": None,
+        }
+
+    @property
+    def path(self) -> Path:
+        return self._path or DB_PATH
+
+    def write_cycle(
+        self,
+        timestamp: str,
+        *,
+        raw: Iterable[dict[str, Any]] = (),
+        aggregate: Any = None,
+        alerts: list[dict[str, Any]] | None = None,
+    ) -> str:
+        """Persist one cycle's records in a single round trip.
+
+        Returns the backend that took the write (``"redis"`` or ``"sqlite"``).
+        """
+        records = []
+        for i, item in enumerate(raw):
+            # The index keeps several items from one source apart
+            key = f"sentiment:raw:{timestamp}:{item.get('source')}:{i}"
+            value = json.dumps(item, default=str).encode("utf-8")
+            records.append((key, RAW_TTL_S, value))
+        if aggregate is not None:
+            key = f"sentiment:aggregated:{timestamp}"
+            records.append((key, AGGREGATE_TTL_S, encode_aggregate(aggregate)))
+        if alerts:
+            key = f"sentiment:alerts:{timestamp}"
+            value = json.dumps(alerts, default=str).encode("utf-8")
+            records.append((key, ALERTS_TTL_S, value))
+
+        backend = "sqlite"
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, ttl, value in records:
+                    pipe.setex(key, ttl, value)
+                pipe.execute()
+                backend = "redis"
+            except Exception as exc:
+                logger.warning(f"Redis write failed, using local store: {exc}")
+                with self._lock:
+                    self._stats["redis_errors"] += 1
+        if backend == "sqlite":
+            self._append(records)
+
+        with self._lock:
+            self._stats["writes"] += 1
+            self._stats["round_trips"] += 1
+            self._stats["records"] += len(records)
+            self._stats["bytes"] += sum(len(value) for _, _, value in records)
+            self._stats["backend"] = backend
+        return backend
+
+    # ─── local fallback ───────────────────────────────────────────────
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+              key TEXT NOT NULL,
+              value BLOB NOT NULL,
+              expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS records_expires_at ON records(expires_at)"
+        )
+        self._local.conn = conn
+        return conn
+
+    def _append(self, records: list[tuple[str, int, bytes]]) -> None:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO records (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, now + ttl) for key, ttl, value in records],
+            )
+            if (self._stats["writes"] + 1) % PRUNE_EVERY_WRITES == 0:
+                conn.execute("DELETE FROM records WHERE expires_at < ?", (now,))
+
+    def get(self, key: str) -> bytes | None:
+        """Latest unexpired value for ``key`` from whichever backend holds it."""
+        if self.redis_client is not None:
+            try:
+                value = self.redis_client.get(key)
+                if value is not None:
+                    return value.encode("utf-8") if isinstance(value, str) else value
+            except Exception:
+                pass
+        if not self.path.exists():
+            return None
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value FROM records WHERE key = ? AND expires_at >= ? "
+                "ORDER BY rowid DESC LIMIT 1",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return bytes(row[0]) if row else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+
+__all__ = ["SentimentStore", "decode_aggregate", "encode_aggregate"]
@@ -0,0 +1,247 @@
+"""Per-thread pooled SQLite connections with one-time setup and statement timing.
+
+The member database (``watchlists.sqlite``: users, watchlists, alert rules,
+manual cost basis) used to be opened on every call: ``mkdir``, ``connect``,
+``PRAGMA foreign_keys``, and ``close`` again a few statements later. Route
+handlers under gunicorn threads paid that setup on every request.
+
+``SQLitePool.connect()`` hands out a connection that keeps the
+open/``try``/``close()`` calling convention, but ``close()`` returns it to an
+idle list owned by the calling thread instead of closing it:
+
+    conn = POOL.connect()
+    try:
+        ...
+    finally:
+        conn.close()          # back to this thread's idle list
+
+Nested ``connect()`` calls on one thread get distinct connections, so an inner
+commit can never commit an outer caller's half-finished transaction. A
+connection returned with an open transaction is rolled back first, exactly as
+closing it would have done.
+
+Per database file, the first open switches the journal to WAL (readers no
+longer block behind a writer) and every connection sets ``busy_timeout``.
+Statements run through ``execute``/``executemany``/``executescript`` are timed
+into ``SQL_METRICS`` by verb; anything slower than ``MW_SQLITE_SLOW_MS`` is
+logged.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    from pipeline_timing import CYCLE_STAGE, PipelineTimer
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.pipeline_timing import CYCLE_STAGE, PipelineTimer
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_MS = int(os.environ.get("MW_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SLOW_STATEMENT_MS = float(os.environ.get("MW_SQLITE_SLOW_MS", "200"))
+MAX_IDLE_PER_THREAD = int(os.environ.get("MW_SQLITE_MAX_IDLE_PER_THREAD", "2"))
+
+_VERBS = {"select", "insert", "update", "delete", "replace", "with", "pragma"}
+
+
+def _verb(sql):
+    head = str(sql or "").lstrip().split(None, 1)
+    word = head[0].lower() if head else ""
+    return word if word in _VERBS else "other"
+
+
+class SQLMetrics:
+    """Statement wall time by verb, in the pipeline histogram format."""
+
+    def __init__(self):
+        self._timer = PipelineTimer(slow_traces=0)
+        self._lock = threading.Lock()
+        self.slow = 0
+
+    def observe(self, verb, ms, sql=None):
+        self._timer.record_stages([(verb, ms)])
+        if ms >= SLOW_STATEMENT_MS:
+            with self._lock:
+                self.slow += 1
+            text = " ".join(str(sql).split())[:200]
+            logger.warning("slow sqlite %s (%.1f ms): %s", verb, ms, text)
+
+    def snapshot(self):
+        timing = self._timer.snapshot()
+        with self._lock:
+            slow = self.slow
+        return {
+            "statements": timing["cycles"],
+            "slow": slow,
+            "slow_ms": SLOW_STATEMENT_MS,
+            "by_verb": {
+                k: v for k, v in timing["stages"].items() if k != CYCLE_STAGE
+            },
+        }
+
+    def prometheus_lines(self):
+        lines = [
+            line
+            for line in self._timer.histogram_lines(
+                "sqlite_statement_duration_seconds",
+                label="verb",
+                help_txt="Wall time per member-database statement",
+            )
+            if f'verb="{CYCLE_STAGE}"' not in line
+        ]
+        with self._lock:
+            slow = self.slow
+        lines.append(
+            "# HELP sqlite_slow_statements_total Statements over MW_SQLITE_SLOW_MS"
+        )
+        lines.append("# TYPE sqlite_slow_statements_total counter")
+        lines.append(f"sqlite_slow_statements_total {slow}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self.slow = 0
+        self._timer.reset()
+
+
+SQL_METRICS = SQLMetrics()
+
+
+def _elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000.0
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() returns it to its pool."""
+
+    def execute(self, sql, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            SQL_METRICS.observe(_verb(sql), _elapsed_ms(started), sql)
+
+    def executemany(self, sql, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, *args)
+        finally:
+            SQL_METRICS.observe(_verb(sql), _elapsed_ms(started), sql)
+
+    def executescript(self, script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            SQL_METRICS.observe("script", _elapsed_ms(started), script)
+
+    def close(self):
+        pool = getattr(self, "_pool", None)
+        if pool is None:
+            super().close()
+        else:
+            pool._release(self)
+
+    def discard(self):
+        """Really close, bypassing the pool."""
+        self._pool = None
+        super().close()
+
+
+class SQLitePool:
+    """Per-thread idle lists of ready connections to one database file.
+
+    ``path`` may be a callable so the file can be re-pointed at runtime (tests
+    swap the module-level path); idle connections to a previous path are
+    closed on the next checkout.
+    """
+
+    def __init__(self, path, *, busy_timeout_ms=None, max_idle=None):
+        self._path = path
+        self.busy_timeout_ms = int(
+            BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+        )
+        self.max_idle = max(
+            0, int(MAX_IDLE_PER_THREAD if max_idle is None else max_idle)
+        )
+        self._local = threading.local()
+        self._prepared = set()
+        self._prepare_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def _resolve(self):
+        return Path(self._path() if callable(self._path) else self._path)
+
+    def _idle(self, path):
+        local = self._local
+        if getattr(local, "path", None) != path:
+            for conn in getattr(local, "idle", ()):
+                conn.discard()
+            local.path = path
+            local.idle = []
+        return local.idle
+
+    def connect(self):
+        path = self._resolve()
+        idle = self._idle(path)
+        if idle:
+            with self._stats_lock:
+                self.reused += 1
+            conn = idle.pop()
+        else:
+            conn = self._open(path)
+            conn._pool_path = path
+        conn._pool = self
+        return conn
+
+    def _open(self, path):
+        if path not in self._prepared:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        if path not in self._prepared:
+            with self._prepare_lock:
+                if path not in self._prepared:
+                    # Persistent per file; readers stop waiting on writers.
+                    try:
+                        conn.execute("PRAGMA journal_mode = WAL")
+                    except sqlite3.DatabaseError:
+                        logger.warning("sqlite: WAL unavailable for %s", path)
+                    self._prepared.add(path)
+        with self._stats_lock:
+            self.opened += 1
+        return conn
+
+    def _release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.discard()
+            return
+        path = self._resolve()
+        if getattr(conn, "_pool_path", None) != path:
+            conn.discard()
+            return
+        idle = self._idle(path)
+        if len(idle) < self.max_idle and conn not in idle:
+            idle.append(conn)
+        else:
+            conn.discard()
+
+    def stats(self):
+        with self._stats_lock:
+            return {"opened": self.opened, "reused": self.reused}
@@ -0,0 +1,58 @@
+"""Attribute free text to coin symbols in one pass.
+
+Shared sources (Reddit posts, RSS headlines) are fetched once per sentiment
+batch. ``SymbolMatcher`` then finds every watched symbol an item mentions
+with a single compiled alternation, instead of one substring scan per
+symbol. Matches are case-insensitive but bounded by non-alphanumerics, so
+``ETH`` matches "eth pumps" and "$ETH" but not "whether".
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class SymbolMatcher:
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        aliases: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        self.symbols: List[str] = list(dict.fromkeys(s.upper() for s in symbols if s))
+        self._owner: Dict[str, str] = {}
+        for sym in self.symbols:
+            self._owner.setdefault(sym.lower(), sym)
+            for alias in (aliases or {}).get(sym, ()):
+                self._owner.setdefault(str(alias).lower(), sym)
+        # Longest first, so "BTC.D"-style keys win over their prefixes
+        terms = sorted(self._owner, key=len, reverse=True)
+        self._pattern = (
+            re.compile(
+                r"(?<![a-z0-9])(" + "|".join(map(re.escape, terms)) + r")(?![a-z0-9])",
+                re.IGNORECASE,
+            )
+            if terms
+            else None
+        )
+
+    def match(self, text: str) -> Set[str]:
+        """Symbols mentioned in ``text``."""
+        if self._pattern is None or not text:
+            return set()
+        return {self._owner[m.group(1).lower()] for m in self._pattern.finditer(text)}
+
+    def attribute(
+        self, items: Iterable[T], text: Callable[[T], str] = str
+    ) -> Dict[str, List[T]]:
+        """``{symbol: [items mentioning it]}`` for every symbol, in item order."""
+        out: Dict[str, List[T]] = {sym: [] for sym in self.symbols}
+        for item in items:
+            for sym in self.match(text(item)):
+                out[sym].append(item)
+        return out
+
+
+__all__ = ["SymbolMatcher"]
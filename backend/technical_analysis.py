@@ -1,9 +1,15 @@
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
-import requests
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
+
+try:
+    from candle_store import CANDLES
+    from indicator_stream import INDICATOR_STREAMS
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.candle_store import CANDLES
+    from backend.indicator_stream import INDICATOR_STREAMS
 
 class TechnicalAnalysis:
     """Technical analysis calculations for cryptocurrency data"""
@@ -91,9 +97,7 @@ class TechnicalAnalysis:
         }
 
 class CoinbaseDataFetcher:
-    """Fetch historical data from Coinbase Pro API"""
-    
-    BASE_URL = "https://api.exchange.coinbase.com"
+    """Historical Coinbase candles, read through the shared candle store"""
     
     @classmethod
     def get_historical_data(cls, symbol: str, hours: int = 24) -> Optional[Dict]:
@@ -107,28 +111,12 @@ class CoinbaseDataFetcher:
             else:
                 granularity = 3600  # 1-hour candles
                 
-            end_time = datetime.now()
-            start_time = end_time - timedelta(hours=hours)
-            
-            url = f"{cls.BASE_URL}/products/{symbol}-USD/candles"
-            params = {
-                'start': start_time.isoformat(),
-                'end': end_time.isoformat(),
-                'granularity': granularity
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code != 200:
-                return None
-                
-            candles = response.json()
+            start_ts = int(time.time()) - hours * 3600
+            candles = CANDLES.range(f"{symbol}-USD", granularity, start_ts)
             if not candles:
                 return None
                 
-            # Sort by timestamp (ascending)
-            candles.sort(key=lambda x: x[0])
-            
-            # Extract OHLCV data
+            # Extract OHLCV data (the store returns candles oldest first)
             timestamps = [candle[0] for candle in candles]
             opens = [float(candle[3]) for candle in candles]
             highs = [float(candle[2]) for candle in candles]
@@ -151,12 +139,34 @@ class CoinbaseDataFetcher:
             print(f"Error fetching historical data for {symbol}: {e}")
             return None
 
+def _rounded(value: Optional[float], digits: int) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+def _volume_analysis(row: Dict) -> Dict:
+    """calculate_volume_profile's labels from the streamed volume window"""
+    avg_vol = row.get('volume_mean')
+    recent_vol = row.get('volume_recent_mean')
+    if avg_vol is None or recent_vol is None:
+        return {"avg_volume": None, "volume_trend": "neutral"}
+    if recent_vol > avg_vol * 1.5:
+        trend = "high"
+    elif recent_vol < avg_vol * 0.5:
+        trend = "low"
+    else:
+        trend = "normal"
+    return {
+        "avg_volume": round(avg_vol, 2),
+        "recent_volume": round(recent_vol, 2),
+        "volume_trend": trend
+    }
+
 def get_technical_analysis(symbol: str) -> Dict:
     """Get complete technical analysis for a symbol"""
-    # Fetch historical data
-    historical_data = CoinbaseDataFetcher.get_historical_data(symbol, hours=72)  # 3 days for better indicators
+    # Incremental 1h indicator state: only bars closed since the last call are
+    # applied, and only the candle store's tail fetch goes upstream
+    row = INDICATOR_STREAMS.refresh(symbol, 3600, priority="charts")
     
-    if not historical_data:
+    if not row:
         return {
             'symbol': symbol,
             'error': 'Unable to fetch historical data',
@@ -167,29 +177,33 @@ def get_technical_analysis(symbol: str) -> Dict:
             'recommendation': 'No data available'
         }
     
-    closes = historical_data['closes']
-    volumes = historical_data['volumes']
-    
-    # Calculate indicators
-    ta = TechnicalAnalysis()
-    rsi = ta.calculate_rsi(closes)
-    macd = ta.calculate_macd(closes)
-    bollinger = ta.calculate_bollinger_bands(closes)
-    volume_analysis = ta.calculate_volume_profile(closes, volumes)
+    rsi = _rounded(row['rsi'], 2)
+    macd = {
+        "macd": _rounded(row['macd'], 6),
+        "signal": _rounded(row['macd_signal'], 6),
+        "histogram": _rounded(row['macd_hist'], 6)
+    }
+    bollinger = {
+        "upper": _rounded(row['bb_upper'], 4),
+        "middle": _rounded(row['bb_middle'], 4),
+        "lower": _rounded(row['bb_lower'], 4)
+    }
+    volume_analysis = _volume_analysis(row)
+    current_price = row['price']
     
     # Generate simple recommendation
-    recommendation = generate_recommendation(rsi, macd, closes[-1], bollinger)
+    recommendation = generate_recommendation(rsi, macd, current_price, bollinger)
     
     return {
         'symbol': symbol,
-        'current_price': closes[-1],
+        'current_price': current_price,
         'rsi': rsi,
         'macd': macd,
         'bollinger_bands': bollinger,
         'volume_analysis': volume_analysis,
         'recommendation': recommendation,
         'last_updated': datetime.now().isoformat(),
-        'data_points': len(closes)
+        'data_points': int(row['volume_count'])
     }
 
 def generate_recommendation(rsi: Optional[float], macd: Dict, current_price: float, bollinger: Dict) -> str:
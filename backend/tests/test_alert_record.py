@@ -0,0 +1,88 @@
+from pathlib import Path
+from collections import deque
+import copy
+import json
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alert_record import AlertRecord, freeze_alert
+
+
+def _alert(symbol="BTC-USD"):
+    ts = "2026-01-01T00:00:00+00:00"
+    return {
+        "id": f"whale_move_{symbol}_abc",
+        "symbol": "".join(symbol),  # a fresh string object, as .upper() gives
+        "type": "whale_move",
+        "type_key": "whale_move",
+        "severity": "high",
+        "ts": ts,
+        "event_ts": "".join(ts),
+        "event_ts_ms": 1767225600000,
+        "evidence": {"pct_1m": 1.5, "mood": "euphoria"},
+        "interpretation": {"supportingFactors": ["Volume confirms the move"]},
+    }
+
+
+def test_record_is_a_read_only_dict_with_same_json():
+    raw = _alert()
+    rec = freeze_alert(raw)
+
+    assert isinstance(rec, dict)
+    assert json.dumps(rec, sort_keys=True) == json.dumps(raw, sort_keys=True)
+    with pytest.raises(TypeError):
+        rec["severity"] = "low"
+    with pytest.raises(TypeError):
+        rec["evidence"]["pct_1m"] = 0.0
+    with pytest.raises(TypeError):
+        rec.update({"x": 1})
+
+    editable = dict(rec)
+    editable["severity"] = "low"
+    assert rec["severity"] == "high"
+    plain = rec.to_dict()
+    plain["evidence"]["pct_1m"] = 0.0
+    assert rec["evidence"]["pct_1m"] == 1.5
+
+
+def test_freeze_interns_and_shares_repeated_strings():
+    a, b = freeze_alert(_alert()), freeze_alert(_alert())
+
+    assert a["symbol"] is b["symbol"]
+    assert a["evidence"]["mood"] is b["evidence"]["mood"]
+    assert a["interpretation"]["supportingFactors"][0] is (
+        b["interpretation"]["supportingFactors"][0]
+    )
+    assert a["ts"] is a["event_ts"]
+    assert freeze_alert(a) is a
+
+
+def test_records_survive_copy_and_pickle():
+    rec = freeze_alert(_alert())
+
+    assert copy.copy(rec) is rec
+    clone = copy.deepcopy(rec)
+    assert isinstance(clone, AlertRecord) and clone == rec
+    assert pickle.loads(pickle.dumps(rec)) == rec
+
+
+def test_stream_stores_records_and_api_edge_returns_plain_dicts():
+    import app as backend_app
+
+    stream = deque(maxlen=10)
+    raw = _alert("ZZTOP-USD")
+    raw["id"] = "record-test"
+    assert backend_app._append_alerts_deduped(stream, [raw]) == 1
+
+    rec = stream[0]
+    assert isinstance(rec, AlertRecord)
+    assert rec["type_key"] == "whale_move"
+
+    norm = backend_app._normalize_alert(rec)
+    assert type(norm["evidence"]) is dict
+    norm["evidence"]["pct_1m"] = 0.0
+    assert rec["evidence"]["pct_1m"] == 1.5
@@ -0,0 +1,92 @@
+from pathlib import Path
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import alerts_engine
+from alert_replay import compare_to_baseline, iter_tape, replay
+
+START = 1_800_000_000
+STEP_S = 10
+
+
+def _write_tape(path, minutes=30):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE price_snapshots (ts INTEGER, product_id TEXT, price REAL,"
+        " PRIMARY KEY(ts, product_id))"
+    )
+    rows = []
+    for i in range(minutes * 60 // STEP_S):
+        ts = START + i * STEP_S
+        rows.append((ts, "BTC-USD", 50_000.0 + (i % 3)))
+        rows.append((ts, "ETH-USD", 3_000.0 - (i % 2)))
+        # PUMP rips 2% per 10s for two minutes mid-tape, then stalls.
+        pump = 1.0 * (1.02 ** min(max(i - 90, 0), 12))
+        rows.append((ts, "PUMP-USD", pump))
+    conn.executemany("INSERT INTO price_snapshots VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_iter_tape_groups_rows_by_timestamp(tmp_path):
+    db = tmp_path / "tape.db"
+    _write_tape(db, minutes=1)
+
+    cycles = list(iter_tape(db))
+
+    assert [ts for ts, _ in cycles] == [START + i * STEP_S for i in range(6)]
+    assert set(cycles[0][1]) == {"BTC", "ETH", "PUMP"}
+
+
+def test_replay_is_deterministic_and_uses_tape_clock(tmp_path):
+    db = tmp_path / "tape.db"
+    _write_tape(db)
+    real_time = alerts_engine.time
+
+    first = replay(db, None)
+    second = replay(db, None)
+
+    assert alerts_engine.time is real_time
+    assert first.cycles == 180
+    assert first.tape_span_s == 179 * STEP_S
+    assert first.symbols == 3
+    assert first.alerts_total > 0
+    assert first.alerts_per_hour_by_type == second.alerts_per_hour_by_type
+    assert first.alerts_total == second.alerts_total
+    # Cooldowns run on tape time, so a 30-minute tape cannot fire more than
+    # a handful of alerts per symbol even though it replays in well under 30m.
+    assert first.alerts_total < 40
+    assert first.cycles_per_s > 0
+    assert "compute_alerts" in first.stages
+    assert "impulse" in first.detectors
+
+
+def test_speed_paces_replay_against_tape_time(tmp_path):
+    db = tmp_path / "tape.db"
+    _write_tape(db, minutes=1)
+
+    started = time.perf_counter()
+    report = replay(db, None, speed=200.0)
+
+    # 50s of tape at 200x is ~0.25s of wall time.
+    assert time.perf_counter() - started >= 0.2
+    assert report.cycles == 6
+
+
+def test_compare_to_baseline_flags_rate_drift_and_throughput():
+    baseline = {"alerts_per_hour": 10.0, "alerts_per_hour_by_type": {"moonshot": 4.0}}
+    current = {
+        "alerts_per_hour": 10.5,
+        "alerts_per_hour_by_type": {"moonshot": 8.0, "whale_move": 1.0},
+        "cycles_per_s": 5.0,
+    }
+
+    failures = compare_to_baseline(current, baseline, max_drift=0.25, min_cycles_per_s=10)
+
+    assert any(f.startswith("type:moonshot") for f in failures)
+    assert any(f.startswith("type:whale_move") for f in failures)
+    assert any(f.startswith("cycles_per_s") for f in failures)
+    assert not any(f.startswith("alerts_per_hour") for f in failures)
@@ -0,0 +1,243 @@
+"""Rule index: candidate selection must match a brute-force evaluate_rule scan."""
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import watchlist
+import alert_rules
+from alert_evaluator import evaluate_rule
+from alert_rule_index import RuleIndex
+from alert_runner import run_indexed_evaluation
+
+NOW = 1_800_000_000.0
+
+
+def _random_rules(rng, n):
+    rules = []
+    for i in range(n):
+        symbol = rng.choice(["BTC", "ETH", "SOL"])
+        armed = rng.random() < 0.6
+        if rng.random() < 0.5:
+            params = {
+                "direction": rng.choice(["above", "below"]),
+                "threshold": round(rng.uniform(80, 120), 2),
+            }
+            ttype = "price_cross"
+        else:
+            params = {
+                "direction": rng.choice(["up", "down", "either"]),
+                "threshold": round(rng.uniform(0.5, 10), 2),
+                "window": rng.choice(["1h", "24h"]),
+            }
+            ttype = "percent_move"
+        rules.append(
+            {
+                "id": f"r{i}",
+                "symbol": symbol,
+                "trigger_type": ttype,
+                "params": params,
+                "status": rng.choice(["active", "active", "cooling_down"]),
+                "armed": armed,
+                "reset_pct": rng.choice([None, 0.5, 2.0]),
+                "percent_rearm_ratio": rng.choice([None, 0.5]),
+            }
+        )
+    return rules
+
+
+def test_candidates_match_brute_force_evaluation():
+    rng = random.Random(3)
+    rules = _random_rules(rng, 600)
+    index = RuleIndex()
+    index.load(rules)
+    past = {
+        ("BTC", "1h"): 100.0,
+        ("BTC", "24h"): 95.0,
+        ("ETH", "1h"): 104.0,
+        ("ETH", "24h"): 100.0,
+        ("SOL", "1h"): 99.0,
+        ("SOL", "24h"): 110.0,
+    }
+
+    for _ in range(50):
+        price = rng.uniform(75, 125)
+        for symbol in ("BTC", "ETH", "SOL"):
+            got = set(index.candidates(symbol, price, lambda w, s=symbol: past[(s, w)]))
+            expected = set()
+            for rule in rules:
+                if rule["symbol"] != symbol:
+                    continue
+                obs = {"price": price, "price_ts": NOW}
+                if rule["trigger_type"] == "percent_move":
+                    obs["past_price"] = past[(symbol, rule["params"]["window"])]
+                decision = evaluate_rule(rule, obs, now_ts=NOW)
+                if decision.should_fire or decision.armed_changed:
+                    expected.add(rule["id"])
+            assert got == expected
+
+
+def test_upsert_moves_rule_and_remove_drops_it():
+    index = RuleIndex()
+    rule = {
+        "id": "x",
+        "symbol": "BTC",
+        "trigger_type": "price_cross",
+        "params": {"direction": "above", "threshold": 110.0},
+        "status": "active",
+        "armed": True,
+    }
+    index.load([rule])
+    assert index.candidates("BTC", 111.0) == ["x"]
+    assert index.candidates("BTC", 109.0) == []
+
+    # Fired and disarmed: now only a retreat to the reset level matters.
+    index.upsert({**rule, "armed": False, "reset_pct": 1.0})
+    assert index.candidates("BTC", 111.0) == []
+    assert index.candidates("BTC", 108.0) == ["x"]
+
+    # A pending trigger is re-checked on every tick until it resolves.
+    index.upsert({**rule, "pending_since_ts": NOW})
+    assert index.candidates("BTC", 100.0) == ["x"]
+
+    index.upsert({**rule, "status": "paused"})
+    assert len(index) == 0 and not index.has_symbol("BTC")
+    index.upsert(rule)
+    index.remove("x")
+    assert index.stats() == {"rules": 0, "symbols": 0, "percent_groups": 0, "pending": 0}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(watchlist, "_WATCHLIST_DB_PATH", tmp_path / "wl.sqlite")
+    monkeypatch.setattr(alert_rules, "_schema_ready", False)
+    watchlist._ensure_watchlist_schema()
+    alert_rules.ensure_alert_schema()
+    yield tmp_path
+
+
+def _mk_user():
+    conn = watchlist._db_connect()
+    try:
+        now = watchlist._utc_now_iso()
+        cur = conn.execute(
+            """INSERT INTO users (email, password_hash, display_name, username,
+               plan, created_at, updated_at) VALUES (?,?,?,?,?,?,?)""",
+            ("a@example.com", "x", "A", "alice", "Free Account", now, now),
+        )
+        conn.commit()
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def test_indexed_pass_loads_only_crossed_rules_and_reindexes(db):
+    uid = _mk_user()
+    btc = alert_rules.create_rule(
+        uid,
+        symbol="BTC",
+        trigger_type="price_cross",
+        params={"direction": "above", "threshold": 110.0},
+        current_price=100.0,
+    )
+    for threshold in (150.0, 160.0, 170.0):
+        alert_rules.create_rule(
+            uid,
+            symbol="ETH",
+            trigger_type="price_cross",
+            params={"direction": "above", "threshold": threshold},
+            current_price=100.0,
+        )
+    index = RuleIndex()
+    index.load(alert_rules.list_evaluable_rules(limit=None))
+    assert len(index) == 4
+
+    now = time.time()
+    prices = {"BTC": 111.0, "ETH": 120.0}
+    first = run_indexed_evaluation(
+        index, prices, int(now), history_lookup=lambda *_: None, now_ts=now
+    )
+    assert first.rules_loaded == 1 and first.pending == 1
+
+    second = run_indexed_evaluation(
+        index, prices, int(now + 2), history_lookup=lambda *_: None, now_ts=now + 2
+    )
+    assert second.fired == 1
+    assert len(alert_rules.list_events(uid)) == 1
+
+    # A one-shot rule leaves the evaluable set once it fires.
+    assert alert_rules.get_rule(uid, btc["id"])["status"] == "triggered"
+    assert not index.has_symbol("BTC")
+    third = run_indexed_evaluation(
+        index, prices, int(now + 4), history_lookup=lambda *_: None, now_ts=now + 4
+    )
+    assert third.rules_loaded == 0
+
+
+class _StopLoop(BaseException):
+    pass
+
+
+def test_sweep_still_runs_when_ticks_never_stop(db, monkeypatch):
+    import app as backend_app
+    from alert_rule_index import RULE_INDEX
+
+    uid = _mk_user()
+    # BTC ticks every second but never crosses; XYZ has no WS feed at all.
+    alert_rules.create_rule(
+        uid,
+        symbol="BTC",
+        trigger_type="price_cross",
+        params={"direction": "above", "threshold": 1_000_000.0},
+        current_price=100.0,
+    )
+    xyz = alert_rules.create_rule(
+        uid,
+        symbol="XYZ",
+        trigger_type="price_cross",
+        params={"direction": "above", "threshold": 110.0},
+        current_price=100.0,
+    )
+
+    clock = {"now": NOW}
+
+    class TickingEvent:
+        def __init__(self):
+            self.waits = 0
+
+        def wait(self, timeout):
+            self.waits += 1
+            if self.waits > 30:
+                raise _StopLoop
+            clock["now"] += 1.0
+            backend_app._MW_ALERT_RULES_TICKS["BTC"] = 100.0
+            return True
+
+        def clear(self):
+            pass
+
+    monkeypatch.setenv("MW_ALERT_RULES_INDEXED", "1")
+    monkeypatch.setenv("MW_ALERT_RULES_SCAN_SECONDS", "5")
+    monkeypatch.setattr(time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(time, "time", lambda: clock["now"])
+    monkeypatch.setattr(backend_app, "coinbase_ws_get_feed", None)
+    monkeypatch.setattr(backend_app, "_MW_ALERT_RULES_TICK_EVENT", TickingEvent())
+    monkeypatch.setattr(
+        backend_app,
+        "_alert_rules_price_source",
+        lambda: ({"BTC-USD": 100.0, "XYZ-USD": 120.0}, int(clock["now"])),
+    )
+
+    try:
+        with pytest.raises(_StopLoop):
+            backend_app._alert_rules_evaluator_loop()
+    finally:
+        RULE_INDEX.load([])
+
+    assert alert_rules.get_rule(uid, xyz["id"])["status"] == "triggered"
+    assert len(alert_rules.list_events(uid)) == 1
@@ -503,6 +503,44 @@ def test_duplicate_event_suppressed_within_arm_cycle(db):
     assert len(alert_rules.list_events(uid)) == 1
 
 
+def test_batched_writes_match_single_writes_and_keep_dedupe(db):
+    uid = _mk_user()
+    rules = [
+        alert_rules.create_rule(
+            uid,
+            symbol=sym,
+            trigger_type="price_cross",
+            repeat_mode="recurring",
+            params={"direction": "above", "threshold": 110.0},
+            current_price=100.0,
+        )
+        for sym in ("BTC", "ETH", "SOL")
+    ]
+    btc, eth, sol = rules
+    # BTC fired earlier in this arm cycle through the single-write path.
+    d = evaluate_rule(btc, {"price": 115.0}, now_ts=NOW)
+    assert alert_rules.record_event(btc, d) is not None
+
+    batch = alert_rules.RuleStateBatch()
+    for rule in (btc, eth):
+        batch.apply(rule, evaluate_rule(rule, {"price": 115.0}, now_ts=NOW))
+    batch.set_pending(sol, NOW)
+    assert len(batch) == 5
+
+    results = batch.flush()
+
+    assert [(r["symbol"], e is not None) for r, e in results] == [
+        ("BTC", False),  # same arm cycle: the UNIQUE fingerprint still wins
+        ("ETH", True),
+    ]
+    assert len(batch) == 0
+    for rule in (btc, eth):
+        after = alert_rules.get_rule(uid, rule["id"])
+        assert after["status"] == "cooling_down" and after["armed"] is False
+    assert alert_rules.get_rule(uid, sol["id"])["pending_since_ts"] == int(NOW)
+    assert len(alert_rules.list_events(uid)) == 2
+
+
 def test_new_arm_cycle_allows_a_genuinely_new_event(db):
     uid = _mk_user()
     rule = alert_rules.create_rule(
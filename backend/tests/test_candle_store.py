@@ -0,0 +1,127 @@
+import threading
+import time
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import candle_store
+from candle_store import CandleStore, RateLimitError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = float(int(time.time()) // 3600 * 3600 + 100)
+
+    def time(self):
+        return self.now
+
+
+class _FakeCoinbase:
+    """Serves deterministic candles; every minute trades except minute % 7 == 3."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.fail = None
+
+    def __call__(self, product_id, granularity, start_ts, end_ts, priority):
+        self.calls.append((product_id, granularity, start_ts, end_ts))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise self.fail
+        rows = []
+        ts = start_ts - start_ts % granularity
+        while ts <= end_ts:
+            if granularity != 60 or (ts // 60) % 7 != 3:
+                price = 100.0 + (ts // granularity) % 10
+                rows.append([ts, price - 1, price + 1, price, price + 0.5, 2.0])
+            ts += granularity
+        return rows[::-1]
+
+
+def test_only_the_missing_tail_goes_upstream(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(candle_store, "time", clock)
+    fake = _FakeCoinbase()
+    store = CandleStore(tmp_path / "c.sqlite", fake, tail_ttl_s=0)
+
+    first = store.latest("BTC-USD", 60, 130)
+    assert first[0][0] > first[-1][0]  # newest first, like Coinbase
+    assert len(fake.calls) == 1
+
+    clock.now += 75
+    store.latest("BTC-USD", 60, 130)
+    _product, _gran, start_ts, end_ts = fake.calls[-1]
+    assert len(fake.calls) == 2
+    assert end_ts - start_ts <= 120  # just the last stored bar onwards
+
+    # A separate store on the same file keeps the coverage across restarts.
+    reopened = CandleStore(tmp_path / "c.sqlite", fake, tail_ttl_s=60)
+    assert reopened.latest("BTC-USD", 60, 130, fetch=False) == store.latest(
+        "BTC-USD", 60, 130, fetch=False
+    )
+    reopened.latest("BTC-USD", 60, 100)
+    assert len(fake.calls) == 2
+
+
+def test_coarse_bars_roll_up_from_stored_minutes(tmp_path):
+    fake = _FakeCoinbase()
+    store = CandleStore(tmp_path / "c.sqlite", fake, tail_ttl_s=60)
+    now = int(time.time())
+    store.range("ETH-USD", 60, now - 3 * 3600)
+    calls = len(fake.calls)
+
+    bars = store.range("ETH-USD", 300, now - 2 * 3600)
+    assert len(fake.calls) == calls
+    assert store.stats()["derived_from_1m"] == 1
+    minutes = store.range("ETH-USD", 60, bars[1][0], bars[1][0] + 240)
+    assert bars[1] == [
+        bars[1][0],
+        min(m[1] for m in minutes),
+        max(m[2] for m in minutes),
+        minutes[0][3],
+        minutes[-1][4],
+        sum(m[5] for m in minutes),
+    ]
+
+
+def test_concurrent_callers_share_one_upstream_call(tmp_path):
+    fake = _FakeCoinbase(delay=0.1)
+    store = CandleStore(tmp_path / "c.sqlite", fake, tail_ttl_s=60)
+    results = []
+
+    def popup():
+        results.append(store.latest("SOL-USD", 3600, 50))
+
+    threads = [threading.Thread(target=popup) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake.calls) == 1
+    assert len(results) == 6 and all(r == results[0] for r in results)
+    assert store.stats()["single_flight_waits"] >= 1
+
+
+def test_failures_serve_stored_rows_and_raise_only_when_empty(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(candle_store, "time", clock)
+    fake = _FakeCoinbase()
+    store = CandleStore(tmp_path / "c.sqlite", fake, tail_ttl_s=5)
+    stored = store.latest("ADA-USD", 3600, 24)
+
+    clock.now += 10
+    fake.fail = RateLimitError("429 for ADA-USD")
+    assert store.latest("ADA-USD", 3600, 24)[1:] == stored[1:]
+    with pytest.raises(RateLimitError):
+        store.latest("DOT-USD", 3600, 24)
+    calls = len(fake.calls)
+    clock.now += 2
+    store.latest("ADA-USD", 3600, 24)  # cooling down: no new upstream call
+    assert len(fake.calls) == calls
+    assert store.stats()["rate_limited"] == 2
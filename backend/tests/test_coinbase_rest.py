@@ -0,0 +1,85 @@
+import threading
+import time
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from coinbase_rest import CoinbaseRESTClient, RateBudgetExceeded
+
+
+class _Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Session:
+    def __init__(self, statuses=None):
+        self.urls = []
+        self.statuses = list(statuses or [])
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.urls.append(url)
+            status = self.statuses.pop(0) if self.statuses else 200
+        return _Response(status, {"Retry-After": "0.2"} if status == 429 else {})
+
+
+def test_burst_then_sustained_rate_with_relative_paths():
+    session = _Session()
+    client = CoinbaseRESTClient(rate_per_s=20, burst=5, session=session)
+    started = time.monotonic()
+    for _ in range(9):
+        client.get("/products/BTC-USD/ticker", priority="price")
+    elapsed = time.monotonic() - started
+
+    assert session.urls[0] == (
+        "https://api.exchange.coinbase.com/products/BTC-USD/ticker"
+    )
+    assert 0.15 <= elapsed < 1.0  # 5 from the burst, 4 more at 20/s
+    assert client.stats()["classes"]["price"]["requests"] == 9
+
+
+def test_lower_classes_keep_a_reserve_and_give_way_to_price():
+    session = _Session()
+    client = CoinbaseRESTClient(rate_per_s=5, burst=4, session=session)
+    for _ in range(2):
+        client.get("/a", priority="charts")
+    # Charts must leave 2 tokens for higher classes, so it can't take a third.
+    with pytest.raises(RateBudgetExceeded):
+        client.get("/b", priority="backfill", max_wait=0.05)
+    client.get("/p", priority="price", max_wait=0.05)
+    client.get("/p", priority="price", max_wait=0.05)
+
+    order = []
+
+    def call(name):
+        client.get(f"/{name}", priority=name, max_wait=3)
+        order.append(name)
+
+    backfill = threading.Thread(target=call, args=("backfill",))
+    backfill.start()
+    time.sleep(0.05)
+    price = threading.Thread(target=call, args=("price",))
+    price.start()
+    backfill.join()
+    price.join()
+    assert order == ["price", "backfill"]
+    assert client.stats()["classes"]["backfill"]["rejected"] == 1
+
+
+def test_rate_limit_pauses_every_class():
+    session = _Session(statuses=[429])
+    client = CoinbaseRESTClient(rate_per_s=100, burst=10, session=session)
+    assert client.get("/x", priority="volume").status_code == 429
+
+    started = time.monotonic()
+    client.get("/y", priority="price")
+    assert time.monotonic() - started >= 0.15
+    stats = client.stats()
+    assert stats["classes"]["volume"]["rate_limited"] == 1
+    assert stats["classes"]["price"]["max_wait_ms"] >= 150
@@ -38,6 +38,14 @@ def test_ticker_message_updates_store():
     assert feed.status()["messages"] == 1
 
 
+def test_price_ages_report_age_and_open_24h():
+    store = TickerStore()
+    store.update("BTC", 101.0, ts=100.0)
+    store.update_market("BTC", {"price": "101", "open_24h": "100"}, ts=100.0)
+    store.update("ETH", 10.0, ts=50.0)
+    assert store.price_ages(30, now=110.0) == {"BTC": (101.0, 10.0, 100.0)}
+
+
 def test_ticker_market_snapshot_exposes_spread_and_aggressive_side():
     store = TickerStore()
     now = time.monotonic()
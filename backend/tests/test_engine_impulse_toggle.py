@@ -75,3 +75,35 @@ def test_engine_impulse_toggle_on_can_produce_impulse_family():
 
     allowed = {"impulse_1m", "impulse_3m", "moonshot", "breakout", "dump", "crater"}
     assert bool(types_on.intersection(allowed))
+
+
+def test_engine_reports_per_detector_stats_on_pressure():
+    prices = {
+        "BTC-USD": {
+            "price": 50000.0,
+            "pct_1m": 10.0,
+            "pct_3m": 12.0,
+            "pct_1h": 15.0,
+        }
+    }
+
+    alerts, _, pressure = compute_alerts(
+        price_snapshot=prices,
+        volume_snapshot={},
+        minute_volumes={},
+        state=AlertEngineState(),
+        include_impulse=True,
+    )
+
+    stats = pressure.detectors
+    assert {"impulse", "whale", "coin_mood", "shape_alert_stream", "prune_alerts"} <= set(stats)
+    assert stats["impulse"].scanned == 1
+    assert stats["impulse"].candidates >= 1
+    assert all(st.elapsed_ms >= 0 for st in stats.values())
+    detector_survivors = sum(
+        st.survived
+        for name, st in stats.items()
+        if name not in {"shape_alert_stream", "prune_alerts"}
+    )
+    assert detector_survivors == len(alerts)
+    assert stats["prune_alerts"].candidates == len(alerts)
@@ -0,0 +1,106 @@
+import math
+import random
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from chart_reader import (
+    _calculate_trend,
+    _compare_volume,
+    _find_resistance_zone,
+    _find_support_zone,
+    _normalize_candles,
+    _read_indicators,
+)
+from indicator_engine import IndicatorCache, compute, normalize, stack
+from position_levels import compute_levels_batch
+from technical_analysis import TechnicalAnalysis
+
+
+def _walk(seed, n, start=100.0):
+    rng = random.Random(seed)
+    rows, price = [], start
+    for i in range(n):
+        close = max(0.5, price * (1 + rng.uniform(-0.03, 0.03)))
+        low = min(price, close) * (1 - rng.uniform(0, 0.01))
+        high = max(price, close) * (1 + rng.uniform(0, 0.01))
+        volume = rng.uniform(1, 50)
+        rows.append([1_700_000_000 + i * 3600, low, high, price, close, volume])
+        price = close
+    return rows[::-1]  # newest first, like Coinbase
+
+
+def test_batch_matches_the_per_symbol_formulas_across_ragged_lengths():
+    universe = [_walk(seed, n) for seed, n in enumerate((72, 50, 30, 16, 6))]
+    matrix, counts = stack([normalize(raw) for raw in universe])
+    result = compute(matrix, counts)
+
+    for i, raw in enumerate(universe):
+        closes = [c[4] for c in sorted(raw)]
+        rsi = result["rsi"][i]
+        expected_rsi = TechnicalAnalysis.calculate_rsi(closes)
+        assert (expected_rsi is None) == math.isnan(rsi)
+        if expected_rsi is not None:
+            assert round(rsi, 2) == expected_rsi
+
+        macd = TechnicalAnalysis.calculate_macd(closes)
+        if macd["macd"] is None:
+            assert math.isnan(result["macd"][i])
+        else:
+            assert round(result["macd"][i], 6) == macd["macd"]
+            assert round(result["macd_signal"][i], 6) == macd["signal"]
+
+        bands = TechnicalAnalysis.calculate_bollinger_bands(closes)
+        if bands["upper"] is None:
+            assert math.isnan(result["bb_upper"][i])
+        else:
+            assert round(result["bb_upper"][i], 4) == bands["upper"]
+            assert round(result["bb_lower"][i], 4) == bands["lower"]
+
+
+def test_chart_read_inputs_match_the_row_helpers():
+    cache = IndicatorCache()
+    for seed, n in ((1, 50), (2, 9), (3, 5)):
+        raw = _walk(seed, n)
+        rows = _normalize_candles(raw)
+        trend, lower, upper, volume, _pos = _read_indicators(cache.get(seed, raw))
+        expected_trend = _calculate_trend(rows)
+        assert trend["label"] == expected_trend["label"]
+        assert trend["slope_pct"] == pytest.approx(expected_trend["slope_pct"])
+        assert lower == _find_support_zone(rows)
+        assert upper == _find_resistance_zone(rows)
+        assert volume == _compare_volume(rows)
+
+
+def test_cache_recomputes_only_symbols_with_new_bars():
+    cache = IndicatorCache()
+    series = {sym: _walk(seed, 50) for seed, sym in enumerate(("BTC", "ETH", "SOL"))}
+    first = cache.compute_many(series)
+    assert cache.stats()["rows_computed"] == 3
+
+    again = cache.compute_many(series)
+    assert again == first
+    assert cache.stats()["rows_computed"] == 3
+
+    # A new bar on one symbol: only that symbol is recomputed.
+    newest = series["ETH"][0]
+    series["ETH"] = [[newest[0] + 3600, *newest[1:4], newest[4] * 1.1, 9.0]] + series[
+        "ETH"
+    ][:-1]
+    updated = cache.compute_many(series)
+    stats = cache.stats()
+    assert stats["rows_computed"] == 4 and stats["batches"] == 2
+    assert updated["ETH"]["last_close"] == pytest.approx(newest[4] * 1.1)
+    assert updated["BTC"] is first["BTC"]
+
+
+def test_levels_batch_skips_short_series():
+    levels = compute_levels_batch(
+        {"AAA": _walk(7, 50), "BBB": _walk(8, 2)},
+        {"AAA": 101.0},
+    )
+    assert set(levels) == {"AAA"}
+    assert levels["AAA"]["candle_count"] == 50
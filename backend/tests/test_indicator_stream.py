@@ -0,0 +1,157 @@
+import random
+import time
+from pathlib import Path
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import candle_store
+import indicator_stream
+from candle_store import CandleStore
+from indicator_stream import LEVELS_WINDOW, IndicatorState, IndicatorStreams
+
+HOUR = 3600
+
+
+def _bars(n, end_ts, seed=3):
+    rng = random.Random(seed)
+    rows, price = [], 100.0
+    for i in range(n):
+        close = price * (1 + rng.uniform(-0.02, 0.02))
+        low = min(price, close) * 0.995
+        high = max(price, close) * 1.005
+        ts = end_ts - (n - 1 - i) * HOUR
+        rows.append([ts, low, high, price, close, rng.uniform(1, 20)])
+        price = close
+    return rows
+
+
+class _FakeStore:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def range(self, product_id, granularity, start_ts, end_ts=None, **kwargs):
+        self.calls.append((product_id, start_ts, kwargs.get("fetch")))
+        return [r for r in self.rows if r[0] >= start_ts]
+
+    def covered_until(self, product_id, granularity, start_ts, **kwargs):
+        return time.time()  # every stored bar was fetched just now
+
+
+def test_state_matches_full_window_recomputation():
+    rows = _bars(120, 1_700_000_000 // HOUR * HOUR)
+    state = IndicatorState()
+    for row in rows:
+        assert state.advance(row)
+    assert not state.advance(rows[-1])  # already applied
+    out = state.row
+
+    closes = pd.Series([r[4] for r in rows])
+    deltas = closes.diff().dropna().tolist()
+    gain = sum(max(d, 0) for d in deltas[:14]) / 14
+    loss = sum(max(-d, 0) for d in deltas[:14]) / 14
+    for d in deltas[14:]:
+        gain = (gain * 13 + max(d, 0)) / 14
+        loss = (loss * 13 + max(-d, 0)) / 14
+    assert out["rsi"] == pytest.approx(100 - 100 / (1 + gain / loss))
+
+    macd = (
+        closes.ewm(span=12, adjust=False).mean()
+        - closes.ewm(span=26, adjust=False).mean()
+    )
+    assert out["macd"] == pytest.approx(macd.iloc[-1])
+    assert out["macd_signal"] == pytest.approx(
+        macd.ewm(span=9, adjust=False).mean().iloc[-1]
+    )
+    tail = closes.iloc[-20:]
+    assert out["bb_upper"] == pytest.approx(tail.mean() + 2 * tail.std(ddof=0))
+
+    window = rows[-LEVELS_WINDOW:]
+    assert out["support"] == min(r[1] for r in window)
+    assert out["resistance"] == max(r[2] for r in window)
+    assert out["count"] == LEVELS_WINDOW
+    trs = [
+        max(b[2] - b[1], abs(b[2] - a[4]), abs(b[1] - a[4]))
+        for a, b in zip(rows, rows[1:])
+    ]
+    assert out["atr"] == pytest.approx(sum(trs[-14:]) / 14)
+
+
+def test_refresh_applies_only_newly_closed_bars(tmp_path):
+    forming = int(time.time()) // HOUR * HOUR
+    rows = _bars(80, forming)
+    store = _FakeStore(rows[:-2])
+    streams = IndicatorStreams(tmp_path / "state.json", store, warmup_bars=100)
+
+    first = streams.refresh("btc-usd")
+    assert first["bars"] == 78 and first["last_ts"] == rows[-3][0]
+    assert streams.is_fresh("BTC", HOUR, 60)
+
+    store.rows = rows
+    second = streams.refresh("BTC")
+    _product, start_ts, _fetch = store.calls[-1]
+    assert start_ts == rows[-3][0] + HOUR  # only what came after the last bar
+    assert second["bars"] == 79  # the forming bar isn't applied...
+    assert second["price"] == rows[-1][4]  # ...but it is the reported price
+    assert streams.stats()["bars_applied"] == 79
+
+
+def test_checkpoint_restores_state_across_restarts(tmp_path):
+    forming = int(time.time()) // HOUR * HOUR
+    store = _FakeStore(_bars(60, forming))
+    path = tmp_path / "state.json"
+    streams = IndicatorStreams(path, store, checkpoint_interval_s=0)
+    before = streams.refresh("ETH")
+    assert path.exists() and streams.stats()["checkpoints"] == 1
+
+    restarted = IndicatorStreams(path, _FakeStore([]), checkpoint_interval_s=0)
+    restored = restarted.row("ETH", HOUR)
+    # The forming bar's price isn't checkpointed; running sums are re-summed
+    # exactly on restore, so allow float drift.
+    before.pop("price"), restored.pop("price")
+    assert restored == pytest.approx(before)
+    assert restarted.stats()["restored_series"] == 1
+    assert not restarted.is_fresh("ETH", HOUR, 60)
+
+
+def test_bar_stored_while_forming_is_applied_with_its_final_close(
+    tmp_path, monkeypatch
+):
+    hour = int(time.time()) // HOUR * HOUR - 10 * HOUR
+    history = _bars(60, hour - HOUR)
+    clock = {"now": hour + 20 * 60}
+
+    class Clock:
+        def time(self):
+            return clock["now"]
+
+        def monotonic(self):
+            return clock["now"]
+
+    def fetcher(product_id, granularity, start_ts, end_ts, priority):
+        # 20 minutes in, the hour's bar is at 103.3; it closes at 110.0.
+        close = 110.0 if clock["now"] >= hour + HOUR else 103.3
+        bar = [hour, 100.0, 111.0, 101.0, close, 5.0]
+        rows = [r for r in history if start_ts <= r[0] <= end_ts]
+        return (rows + [bar] if start_ts <= hour <= end_ts else rows)[::-1]
+
+    monkeypatch.setattr(candle_store, "time", Clock())
+    monkeypatch.setattr(indicator_stream, "time", Clock())
+    store = CandleStore(tmp_path / "c.sqlite", fetcher, tail_ttl_s=0)
+    streams = IndicatorStreams(tmp_path / "state.json", store, warmup_bars=100)
+
+    first = streams.refresh("BTC", max_age_s=300)
+    assert first["last_ts"] == hour - HOUR and first["price"] == 103.3
+
+    # The hour rolls over. A store-only read must not apply the snapshot...
+    clock["now"] = hour + HOUR + 60
+    pending = streams.refresh("BTC", fetch=False, max_age_s=300)
+    assert pending["last_ts"] == hour - HOUR
+
+    # ...and the next fetching refresh applies the bar as it closed.
+    final = streams.refresh("BTC", max_age_s=300)
+    assert final["last_ts"] == hour and final["last_close"] == 110.0
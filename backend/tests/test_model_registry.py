@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import model_registry
+import sentiment_analyzer
+from model_registry import ModelRegistry
+
+
+def test_each_model_loads_once_and_is_shared_across_threads():
+    registry = ModelRegistry()
+    calls = []
+    gate = threading.Event()
+
+    def load():
+        calls.append(1)
+        gate.wait(1)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(registry.get, "m", load) for _ in range(8)]
+        gate.set()
+        models = {id(f.result()) for f in futures}
+
+    assert len(calls) == 1 and len(models) == 1
+    stats = registry.stats()
+    assert stats["models"]["m"]["loaded"] is True
+    assert stats["models"]["m"]["load_ms"] >= 0
+
+
+def test_failed_loads_are_remembered_instead_of_retried():
+    registry = ModelRegistry()
+    calls = []
+
+    def load():
+        calls.append(1)
+        raise OSError("offline")
+
+    assert registry.get("broken", load) is None
+    assert registry.get("broken", load) is None
+    assert len(calls) == 1
+    assert registry.stats()["models"]["broken"]["error"] == "offline"
+
+
+def test_analyzers_load_lazily_and_share_models(monkeypatch):
+    registry = ModelRegistry()
+    monkeypatch.setattr(sentiment_analyzer, "MODELS", registry)
+    pipelines = []
+    monkeypatch.setattr(
+        sentiment_analyzer, "sentiment_pipeline", lambda: pipelines.append(1)
+    )
+
+    first = sentiment_analyzer.SentimentAnalyzer()
+    second = sentiment_analyzer.SentimentAnalyzer()
+    stats = first.get_analyzer_stats()
+    assert stats["model_registry"]["models"] == {}  # nothing loaded at startup
+    assert stats["init_ms"] >= 0
+    assert "transformer" in stats["available_models"]
+
+    if sentiment_analyzer.VADER_AVAILABLE:
+        assert first.vader_analyzer is second.vader_analyzer
+        assert first.vader_analyzer.lexicon["hodl"] == pytest.approx(2.4)
+        assert len(registry.stats()["models"]) == 1
+
+    # A transformer that fails to load drops out of the ensemble
+    assert first.transformer_analyzer is None
+    assert "transformer" not in first.get_analyzer_stats()["available_models"]
+
+
+def test_quantized_transformer_stays_close_with_smaller_weights():
+    transformers = pytest.importorskip("transformers")
+    torch = pytest.importorskip("torch")
+    config = transformers.BertConfig(
+        vocab_size=64,
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=128,
+        num_labels=3,
+    )
+    model = transformers.BertForSequenceClassification(config).eval()
+    fp32_bytes = model_registry.weight_bytes(model)
+
+    quantized = model_registry._quantize(model)
+    assert model_registry.weight_bytes(quantized) < fp32_bytes
+
+    inputs = {"input_ids": torch.tensor([[2, 10, 11, 12, 3]])}
+    with torch.inference_mode():
+        expected = model(**inputs).logits.softmax(-1)
+        actual = quantized(**inputs).logits.softmax(-1)
+    assert torch.allclose(expected, actual, atol=0.05)
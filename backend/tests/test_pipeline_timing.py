@@ -0,0 +1,141 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline_timing import CYCLE_STAGE, CycleTrace, PipelineTimer
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cycle(timer, clock, stage_seconds):
+    trace = CycleTrace(timer, clock=clock)
+    for stage, seconds in stage_seconds:
+        clock.now += seconds
+        trace.mark(stage)
+    return trace
+
+
+def test_marks_attribute_time_since_previous_mark():
+    timer = PipelineTimer(window=10, slow_traces=2)
+    clock = _FakeClock()
+    trace = _cycle(timer, clock, [("recompute_3m", 0.004), ("compute_alerts", 0.120)])
+    trace.finish(budget_s=8)
+
+    snap = timer.snapshot()
+    assert snap["cycles"] == 1
+    assert snap["overruns"] == 0
+    assert snap["stages"]["recompute_3m"]["last_ms"] == 4.0
+    assert snap["stages"]["compute_alerts"]["last_ms"] == 120.0
+    assert snap["stages"][CYCLE_STAGE]["last_ms"] == 124.0
+
+
+def test_span_times_block_and_finish_is_idempotent():
+    timer = PipelineTimer(window=10)
+    clock = _FakeClock()
+    trace = CycleTrace(timer, clock=clock)
+    clock.now += 1.0
+    with trace.span("delivery"):
+        clock.now += 0.25
+    trace.finish()
+    trace.finish()
+
+    assert trace.stages == [("delivery", 250.0)]
+    assert timer.cycles == 1
+
+
+def test_slowest_cycles_and_overruns_are_retained():
+    timer = PipelineTimer(window=10, slow_traces=2)
+    clock = _FakeClock()
+    for seconds in (0.5, 9.0, 2.0, 0.1):
+        _cycle(timer, clock, [("compute_alerts", seconds)]).finish(budget_s=8)
+
+    slow = timer.slowest()
+    assert [round(tr["total_ms"]) for tr in slow] == [9000, 2000]
+    assert slow[0]["stages"] == [{"stage": "compute_alerts", "ms": 9000.0}]
+    assert timer.snapshot()["overruns"] == 1
+
+
+def test_prometheus_histogram_is_cumulative_per_stage():
+    timer = PipelineTimer(window=10)
+    clock = _FakeClock()
+    for seconds in (0.003, 0.040, 20.0):
+        _cycle(timer, clock, [("live_rankings", seconds)]).finish()
+
+    lines = timer.prometheus_lines()
+    assert 'pipeline_stage_duration_seconds_bucket{stage="live_rankings",le="0.005"} 1' in lines
+    assert 'pipeline_stage_duration_seconds_bucket{stage="live_rankings",le="0.050"} 2' in lines
+    assert 'pipeline_stage_duration_seconds_bucket{stage="live_rankings",le="+Inf"} 3' in lines
+    assert 'pipeline_stage_duration_seconds_count{stage="live_rankings"} 3' in lines
+    assert "pipeline_cycles_total 3" in lines
+
+
+def test_snapshot_compute_records_a_cycle_and_metrics_expose_it(monkeypatch):
+    import app as backend_app
+
+    timer = PipelineTimer(window=10)
+    monkeypatch.setattr(backend_app, "PIPELINE_TIMER", timer)
+    monkeypatch.setattr(backend_app, "last_current_prices", {"data": {}})
+
+    backend_app._compute_snapshots_from_cache()
+
+    assert timer.cycles == 1
+    stages = timer.snapshot()["stages"]
+    assert "recompute_3m" in stages
+    assert "publish" in stages
+
+    # The first request may start the background updater, which records
+    # further cycles into the same timer; only assert lower bounds here.
+    client = backend_app.app.test_client()
+    body = client.get("/metrics.prom").get_data(as_text=True)
+    assert 'pipeline_stage_duration_seconds_count{stage="publish"}' in body
+    payload = client.get("/api/metrics").get_json()
+    assert payload["pipeline"]["cycles"] >= 1
+    assert payload["pipeline"]["slowest_cycles"]
+
+
+def test_detector_metrics_accumulate_counts_and_histograms():
+    from alerts_engine import DetectorStats
+    from pipeline_timing import DetectorMetrics
+
+    metrics = DetectorMetrics(window=10)
+    for _ in range(2):
+        metrics.observe(
+            {
+                "whale": DetectorStats(elapsed_ms=3.0, scanned=40, candidates=2, survived=1),
+                "coin_mood": DetectorStats(elapsed_ms=30.0, scanned=40, candidates=0),
+            }
+        )
+
+    snap = metrics.snapshot()
+    assert snap["calls"] == 2
+    assert snap["detectors"]["whale"]["candidates_total"] == 4
+    assert snap["detectors"]["whale"]["survived_total"] == 2
+    assert snap["detectors"]["coin_mood"]["p95_ms"] == 30.0
+
+    lines = metrics.prometheus_lines()
+    assert 'alert_detector_duration_seconds_count{detector="whale"} 2' in lines
+    assert 'alert_detector_symbols_scanned{detector="whale"} 40' in lines
+    assert 'alert_detector_survived_total{detector="whale"} 2' in lines
+
+
+def test_a_failing_metrics_section_does_not_hide_the_others(monkeypatch):
+    import app as backend_app
+
+    class _Broken:
+        def snapshot(self):
+            raise RuntimeError("detector metrics unavailable")
+
+    monkeypatch.setattr(backend_app, "DETECTOR_METRICS", _Broken())
+    payload = backend_app.app.test_client().get("/api/metrics").get_json()
+
+    assert payload["alert_detectors_error"] == "detector metrics unavailable"
+    assert "alert_detectors" not in payload
+    for name in ("pipeline", "member_db", "candles", "coinbase_rest", "indicators"):
+        assert name in payload, name
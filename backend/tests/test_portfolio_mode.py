@@ -1,4 +1,6 @@
+from dataclasses import replace
 from decimal import Decimal
+import threading
 
 import pytest
 from flask import Flask
@@ -12,6 +14,13 @@ from backend.portfolio_mode import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _no_live_prices(monkeypatch):
+    # app.py registers the board/tape source at import; keep these tests on
+    # the fake client's product prices unless a test installs its own.
+    monkeypatch.setattr(portfolio_module, "_LIVE_PRICE_SOURCE", None)
+
+
 def _fill(*, side="BUY", size="1", price="100", commission="0", product_id="BTC-USD"):
     return {
         "side": side,
@@ -173,3 +182,368 @@ def test_portfolio_route_is_owner_only(monkeypatch):
 
     assert response.status_code == 403
     assert response.get_json()["code"] == "portfolio_owner_only"
+
+
+class _PagedFillsClient(FakeCoinbaseClient):
+    """Fake exchange that serves fills by sequence timestamp, newest first."""
+
+    def __init__(self, fills, row_limit=None):
+        super().__init__()
+        self.fills = list(fills)
+        self.fill_calls = []
+        self.row_limit = row_limit  # rows per call before paging gives up
+
+    def list_fills(self):
+        raise AssertionError("incremental sync should page by time")
+
+    def list_fills_between(self, *, start=None, end=None, max_pages=5):
+        self.fill_calls.append((start, end))
+        rows = [
+            f
+            for f in self.fills
+            if (start is None or f["sequence_timestamp"] >= start)
+            and (end is None or f["sequence_timestamp"] <= end)
+        ]
+        rows.sort(key=lambda f: f["sequence_timestamp"], reverse=True)
+        if self.row_limit is not None and len(rows) > self.row_limit:
+            return PageResult(rows[: self.row_limit], complete=False)
+        return PageResult(rows)
+
+
+def _timed_fill(n, **kwargs):
+    fill = _fill(**kwargs)
+    ts = f"2026-07-18T00:{n:02d}:00Z"
+    fill.update(entry_id=f"e{n}", trade_time=ts, sequence_timestamp=ts)
+    return fill
+
+
+def test_fill_sync_fetches_only_new_fills_and_matches_full_rescan(tmp_path, monkeypatch):
+    from backend.sqlite_pool import SQLitePool
+
+    pool = SQLitePool(tmp_path / "fills.sqlite")
+    fills_module = portfolio_module.portfolio_fills
+    monkeypatch.setattr(fills_module, "_db_connect", pool.connect)
+    monkeypatch.setattr(fills_module, "_schema_ready", False)
+    monkeypatch.setattr(portfolio_module, "_LEDGERS", {})
+
+    client = _PagedFillsClient(
+        [
+            _timed_fill(1, size="1", price="100"),
+            _timed_fill(2, size="1", price="200"),
+            _timed_fill(3, side="SELL", size="0.5", price="300"),
+        ]
+    )
+    first = PortfolioService(client).snapshot()
+    assert client.fill_calls == [(None, None)]
+    assert first["data_quality"]["fill_sync"]["mode"] == "full"
+
+    client.fills.append(_timed_fill(4, size="0.5", price="400"))
+    second = PortfolioService(client).snapshot(force=True)
+    assert client.fill_calls[-1] == ("2026-07-18T00:03:00Z", None)
+    assert second["data_quality"]["fill_sync"]["new"] == 1
+
+    expected = reconstruct_cost_basis("BTC", Decimal("2"), client.fills)
+    assert second["holdings"][0]["cost_basis"] == expected
+
+    # A restart rebuilds the ledger from the local store, not from Coinbase.
+    monkeypatch.setattr(portfolio_module, "_LEDGERS", {})
+    third = PortfolioService(client).snapshot(force=True)
+    assert client.fill_calls[-1] == ("2026-07-18T00:04:00Z", None)
+    assert third["holdings"][0]["cost_basis"] == expected
+
+
+def test_fill_sync_too_far_behind_keeps_stored_fills_and_backfills_the_gap(
+    tmp_path, monkeypatch
+):
+    from backend.sqlite_pool import SQLitePool
+
+    pool = SQLitePool(tmp_path / "fills.sqlite")
+    fills_module = portfolio_module.portfolio_fills
+    monkeypatch.setattr(fills_module, "_db_connect", pool.connect)
+    monkeypatch.setattr(fills_module, "_schema_ready", False)
+    monkeypatch.setattr(portfolio_module, "_LEDGERS", {})
+    monkeypatch.setattr(portfolio_module, "_LEDGER_LOCKS", {})
+    sync = portfolio_module.sync_fill_ledger
+
+    client = _PagedFillsClient([_timed_fill(1, size="1", price="100"), _timed_fill(2)])
+    _ledger, complete, _info = sync(client, "acct")
+    assert complete is True
+
+    client.fills += [
+        _timed_fill(n, size="0.1", price=str(100 + n)) for n in range(3, 10)
+    ]
+    client.row_limit = 3
+    ledger, complete, info = sync(client, "acct")
+    assert client.fill_calls[1:] == [
+        ("2026-07-18T00:02:00Z", None),
+        ("2026-07-18T00:02:00Z", "2026-07-18T00:07:00Z"),
+    ]
+    assert complete is False and info["mode"] == "incremental+gap"
+    stored = {f["entry_id"] for f in fills_module.load_fills("acct")}
+    assert stored == {"e1", "e2", "e5", "e6", "e7", "e8", "e9"}
+    assert fills_module.sync_state("acct")["history_complete"] is True
+
+    while not complete:
+        ledger, complete, info = sync(client, "acct")
+    assert (None, None) not in client.fill_calls[1:]  # never a full resync
+    assert fills_module.sync_state("acct")["gap_end_ts"] is None
+    assert len(fills_module.load_fills("acct")) == len(ledger) == 9
+    held = Decimal("2.7")
+    assert ledger.cost_basis(
+        "BTC", held, history_complete=True
+    ) == reconstruct_cost_basis("BTC", held, client.fills)
+
+
+def test_slow_fill_sync_for_one_account_does_not_block_another(tmp_path, monkeypatch):
+    from backend.sqlite_pool import SQLitePool
+
+    pool = SQLitePool(tmp_path / "fills.sqlite")
+    fills_module = portfolio_module.portfolio_fills
+    monkeypatch.setattr(fills_module, "_db_connect", pool.connect)
+    monkeypatch.setattr(fills_module, "_schema_ready", False)
+    monkeypatch.setattr(portfolio_module, "_LEDGERS", {})
+    monkeypatch.setattr(portfolio_module, "_LEDGER_LOCKS", {})
+
+    paging = threading.Event()
+    release = threading.Event()
+
+    class _SlowClient(_PagedFillsClient):
+        def list_fills_between(self, **kwargs):
+            paging.set()
+            release.wait(5)
+            return super().list_fills_between(**kwargs)
+
+    slow = _SlowClient([_timed_fill(1)])
+    fast = _PagedFillsClient([_timed_fill(2)])
+    worker = threading.Thread(
+        target=portfolio_module.sync_fill_ledger, args=(slow, "slow-account")
+    )
+    worker.start()
+    try:
+        assert paging.wait(5)
+        _ledger, _complete, info = portfolio_module.sync_fill_ledger(
+            fast, "fast-account"
+        )
+        assert info["fetched"] == 1
+        assert worker.is_alive()  # still paging while the other account synced
+    finally:
+        release.set()
+        worker.join(5)
+
+
+def test_fill_ledger_rebuilds_a_currency_when_an_older_fill_arrives():
+    fills = [
+        _timed_fill(1, size="1", price="100"),
+        _timed_fill(3, side="SELL", size="1", price="150"),
+        _timed_fill(2, size="1", price="300"),
+        _timed_fill(4, size="1", price="10", product_id="ETH-USD"),
+    ]
+    ledger = portfolio_module.FillLedger()
+    ledger.add(fills[:2])
+    ledger.add(fills[2:])
+
+    for currency, qty in (("BTC", Decimal("1")), ("ETH", Decimal("1"))):
+        assert ledger.cost_basis(
+            currency, qty, history_complete=True
+        ) == reconstruct_cost_basis(currency, qty, fills)
+
+
+class _MultiCoinClient(FakeCoinbaseClient):
+    def __init__(self):
+        super().__init__()
+        self.product_requests = []
+
+    def list_accounts(self):
+        return PageResult(
+            [
+                {
+                    "uuid": f"{currency.lower()}-account",
+                    "currency": currency,
+                    "available_balance": {"value": "1"},
+                    "hold": {"value": "0"},
+                }
+                for currency in ("BTC", "ETH", "DOGE", "USDC")
+            ]
+        )
+
+    def get_product(self, product_id):
+        raise AssertionError("batched lookup expected")
+
+    def list_products(self, product_ids):
+        ids = list(product_ids)
+        self.product_requests.append(ids)
+        return [{"product_id": "DOGE-USDC", "price": "0.2"}]
+
+
+def test_holdings_priced_from_live_source_then_one_batched_lookup(monkeypatch):
+    monkeypatch.setattr(
+        portfolio_module,
+        "_LIVE_PRICE_SOURCE",
+        lambda: {
+            "BTC": {"price": 150.0, "age_seconds": 1.5, "source": "live_tape"},
+            "ETH": {"price": 90.0, "age_seconds": 4000, "source": "board"},
+        },
+    )
+    client = _MultiCoinClient()
+    snapshot = PortfolioService(client).snapshot()
+
+    # ETH's board price is too old, so it joins DOGE in a single request.
+    assert client.product_requests == [
+        ["ETH-USD", "ETH-USDC", "DOGE-USD", "DOGE-USDC"]
+    ]
+    rows = {row["symbol"]: row for row in snapshot["holdings"]}
+    assert rows["BTC"]["price_usd"] == 150.0
+    assert rows["BTC"]["price_source"] == "live_tape"
+    assert rows["BTC"]["price_age_seconds"] == 1.5
+    assert rows["DOGE"]["product_id"] == "DOGE-USDC"
+    assert rows["DOGE"]["price_source"] == "coinbase_product"
+    assert rows["ETH"]["price_usd"] is None
+    assert rows["USDC"]["price_usd"] == 1.0
+    assert snapshot["data_quality"]["price_sources"] == {
+        "live_tape": 1,
+        "coinbase_product": 1,
+        "missing": 1,
+    }
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class _ScriptedSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.timeouts = []
+
+    def get(self, url, *, params=None, headers=None, timeout=None):
+        self.timeouts.append(timeout)
+        return self.responses.pop(0)
+
+
+def test_client_honours_retry_after_and_reports_call_latency(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(portfolio_module.time, "sleep", sleeps.append)
+    session = _ScriptedSession(
+        [
+            _FakeResponse(429, headers={"Retry-After": "0.25"}),
+            _FakeResponse(200, {"can_view": True}),
+        ]
+    )
+    client = portfolio_module.CoinbaseAdvancedTradeClient(
+        oauth_access_token="token", http_session=session
+    )
+
+    assert client.get_key_permissions() == {"can_view": True}
+    assert len(session.timeouts) == 2 and sleeps and sleeps[0] <= 0.25
+    stats = client.call_stats(reset=True)
+    assert stats["requests"] == 2 and stats["rate_limited"] == 1
+    assert stats["endpoints"]["key_permissions"]["count"] == 2
+    assert client.call_stats()["requests"] == 0
+
+
+def test_client_fails_fast_once_the_shared_deadline_has_passed():
+    session = _ScriptedSession([])
+    client = portfolio_module.CoinbaseAdvancedTradeClient(
+        oauth_access_token="token", http_session=session
+    )
+    client.set_deadline(portfolio_module.time.monotonic() - 1)
+    with pytest.raises(portfolio_module.CoinbaseRequestError):
+        client.list_accounts()
+    assert session.timeouts == []
+
+
+def test_service_fetches_accounts_fills_and_orders_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    class _ConcurrentClient(FakeCoinbaseClient):
+        def list_accounts(self):
+            barrier.wait()
+            return super().list_accounts()
+
+        def list_fills(self):
+            barrier.wait()
+            return super().list_fills()
+
+        def list_orders(self):
+            barrier.wait()
+            return super().list_orders()
+
+    snapshot = PortfolioService(_ConcurrentClient()).snapshot()
+
+    assert snapshot["summary"]["total_value_usd"] == 400.0
+    assert set(snapshot["timing"]["phases_ms"]) == {
+        "permissions",
+        "accounts",
+        "fills",
+        "orders",
+        "prices",
+    }
+
+
+class _CountingClient(FakeCoinbaseClient):
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.fail = False
+
+    def get_key_permissions(self):
+        self.loads += 1
+        if self.fail:
+            raise portfolio_module.CoinbaseRequestError("down")
+        return super().get_key_permissions()
+
+
+def _age_cache(service, seconds):
+    service._cache = replace(
+        service._cache, loaded_at=service._cache.loaded_at - seconds
+    )
+
+
+def _wait_for_refresh(service):
+    for _ in range(200):
+        if not service._refreshing:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("background refresh did not finish")
+
+
+def test_cached_reads_share_the_published_snapshot():
+    service = PortfolioService(_CountingClient())
+    first = service.snapshot()
+    second = service.snapshot()
+
+    assert (first["cache"], second["cache"]) == ("refreshed", "fresh")
+    assert second["holdings"] is first["holdings"]
+    assert service.held_symbols() == frozenset({"BTC"})
+
+    private = service.snapshot(mutable=True)
+    private["holdings"][0]["symbol"] = "XXX"
+    assert service.snapshot()["holdings"][0]["symbol"] == "BTC"
+
+
+def test_expired_snapshot_is_served_while_a_background_refresh_runs():
+    client = _CountingClient()
+    service = PortfolioService(client, cache_ttl_seconds=30, stale_ttl_seconds=300)
+    service.snapshot()
+
+    _age_cache(service, 45)
+    stale = service.snapshot()
+    assert stale["cache"] == "revalidating" and stale["status"] == "live"
+    _wait_for_refresh(service)
+    assert client.loads == 2
+    assert service.snapshot()["cache"] == "fresh"
+
+    # A failed refresh keeps serving the last good snapshot, marked stale.
+    client.fail = True
+    _age_cache(service, 45)
+    service.snapshot()
+    _wait_for_refresh(service)
+    failed = service.snapshot()
+    assert failed["cache"] == "last_good" and failed["status"] == "stale"
+    assert failed["stale_seconds"] >= 45
@@ -72,11 +72,13 @@ def test_service_held_symbols_reads_cache_without_network():
     service = PortfolioService(_NoNetworkClient())
     assert service.held_symbols() == set()
 
-    service._cache = {
-        "holdings": [
-            {"currency": "BTC", "is_cash": False},
-            {"currency": "SOL", "is_cash": False},
-            {"currency": "USD", "is_cash": True},
-        ]
-    }
+    service._publish(
+        {
+            "holdings": [
+                {"symbol": "BTC", "is_cash": False},
+                {"currency": "SOL", "is_cash": False},
+                {"symbol": "USD", "is_cash": True},
+            ]
+        }
+    )
     assert service.held_symbols() == {"BTC", "SOL"}
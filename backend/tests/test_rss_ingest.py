@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+
+from backend import rss_ingest
+from backend.rss_handler import RSSHandler
+from backend.rss_ingest import RSSIngestor
+
+
+def _feed(title, body="<p>Bitcoin rallies as <b>ETF</b> inflows keep building.</p>"):
+    published = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+    return f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>{title}</title><link>https://example.com/{title}</link>
+<description><![CDATA[{body * 3}<script>x()</script>]]></description>
+<pubDate>{published}</pubDate></item>
+</channel></rss>"""
+
+
+async def _serve(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_feeds_are_fetched_concurrently_and_parsed_off_the_loop(monkeypatch):
+    parse_threads = set()
+    original = rss_ingest.parse_feed
+
+    def spy(body):
+        parse_threads.add(threading.get_ident())
+        return original(body)
+
+    monkeypatch.setattr(rss_ingest, "parse_feed", spy)
+
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return web.Response(text=_feed(request.match_info["name"]))
+
+    async def scenario():
+        runner, base = await _serve([web.get("/{name}", handler)])
+        ingest = RSSIngestor(parse_workers=2)
+        try:
+            started = time.perf_counter()
+            results = await ingest.fetch_all([f"{base}/f{i}" for i in range(8)])
+            return results, time.perf_counter() - started, threading.get_ident()
+        finally:
+            await runner.cleanup()
+
+    results, elapsed, loop_thread = asyncio.run(scenario())
+    assert elapsed < 1.0  # 8 feeds x 0.2s each, not serial
+    assert {r.status for r in results.values()} == {"ok"}
+    entry = next(iter(results.values())).entries[0]
+    assert "ETF" in entry["text"] and "<" not in entry["text"]
+    assert "x()" not in entry["text"]
+    assert parse_threads and loop_thread not in parse_threads
+
+
+def test_unchanged_feeds_cost_a_304_and_reuse_parsed_entries():
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text=_feed("first"), headers={"ETag": '"v1"'})
+
+    async def broken(_request):
+        return web.Response(status=503)
+
+    async def scenario():
+        runner, base = await _serve(
+            [web.get("/feed", handler), web.get("/down", broken)]
+        )
+        ingest = RSSIngestor()
+        try:
+            first = await ingest.fetch_all([f"{base}/feed", f"{base}/down"])
+            second = await ingest.fetch_all([f"{base}/feed"])
+            return base, first, second, ingest.stats()
+        finally:
+            await runner.cleanup()
+
+    base, first, second, stats = asyncio.run(scenario())
+    assert seen == [None, '"v1"']
+    assert first[f"{base}/down"].status == "error"
+    assert second[f"{base}/feed"].status == "not_modified"
+    assert second[f"{base}/feed"].entries == first[f"{base}/feed"].entries
+    assert stats["fetched"] == 1 and stats["not_modified"] == 1 and stats["errors"] == 1
+
+
+def test_rss_handler_builds_items_from_ingested_entries():
+    async def handler(request):
+        return web.Response(text=_feed(request.match_info["name"]))
+
+    async def scenario():
+        runner, base = await _serve([web.get("/{name}", handler)])
+        config = [
+            {"name": name, "url": f"{base}/{name}", "base_trust": 0.8}
+            for name in ("coindesk", "decrypt")
+        ]
+        try:
+            async with RSSHandler(config) as rss:
+                items = await rss.fetch_all_feeds()
+                again = await rss.fetch_all_feeds()  # inside the 5 minute window
+            return items, again
+        finally:
+            await runner.cleanup()
+
+    items, again = asyncio.run(scenario())
+    assert sorted(item["source"] for item in items) == ["coindesk", "decrypt"]
+    assert items[0]["content"].startswith("Bitcoin rallies")
+    assert again == []
@@ -0,0 +1,77 @@
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import score_cache
+import sentiment_analyzer
+from score_cache import ScoreCache
+
+
+def test_scores_are_memoized_by_normalized_content_and_model(tmp_path):
+    cache = ScoreCache(tmp_path / "scores.sqlite")
+    calls = []
+
+    def score(value):
+        calls.append(value)
+        return value
+
+    assert cache.get_or_compute("BTC breaks out", "vader:a", lambda: score(0.7)) == 0.7
+    spaced = " BTC  breaks\nout "
+    assert cache.get_or_compute(spaced, "vader:a", lambda: score(0.1)) == 0.7
+    # Case is part of the content (VADER reads capitals as emphasis), and a
+    # new model version never sees another version's scores.
+    assert cache.get_or_compute("btc breaks out", "vader:a", lambda: score(0.2)) == 0.2
+    assert cache.get_or_compute("BTC breaks out", "vader:b", lambda: score(0.3)) == 0.3
+    assert calls == [0.7, 0.2, 0.3]
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 3
+    assert stats["models"]["vader:a"]["hit_rate"] == round(1 / 3, 4)
+
+    restarted = ScoreCache(tmp_path / "scores.sqlite")
+    assert restarted.get("BTC breaks out", "vader:a") == 0.7
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_memory_and_disk_tiers_stay_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_cache, "TRIM_EVERY_WRITES", 1)
+    cache = ScoreCache(tmp_path / "scores.sqlite", memory_entries=2, disk_entries=3)
+    for i in range(6):
+        cache.put(f"headline {i}", "m", i)
+
+    assert cache.stats()["memory_entries"] == 2
+    conn = cache._conn()
+    assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 3
+    assert cache.get("headline 0", "m") is None  # least recently used went first
+    assert cache.get("headline 5", "m") == 5
+
+
+def test_analyzer_scores_only_unseen_items(tmp_path, monkeypatch):
+    analyzer_cls = sentiment_analyzer.SentimentAnalyzer
+    monkeypatch.setattr(analyzer_cls, "_initialize_models", lambda self: None)
+    monkeypatch.setattr(sentiment_analyzer, "TEXTBLOB_AVAILABLE", False)
+    cache = ScoreCache(tmp_path / "s.sqlite")
+    monkeypatch.setattr(sentiment_analyzer, "SCORE_CACHE", cache)
+    analyzer = sentiment_analyzer.SentimentAnalyzer()
+    scored = []
+    original = analyzer._score
+
+    async def counting(text):
+        scored.append(text)
+        return await original(text)
+
+    monkeypatch.setattr(analyzer, "_score", counting)
+
+    async def cycle():
+        return await asyncio.gather(
+            analyzer.analyze("Bitcoin pump incoming, bullish breakout"),
+            analyzer.analyze("Ethereum dump, bearish crash", language="en"),
+        )
+
+    first = asyncio.run(cycle())
+    second = asyncio.run(cycle())
+    assert len(scored) == 2
+    assert [r["score"] for r in second] == [r["score"] for r in first]
+    assert second[1]["language"] == "en" and "timestamp" in second[0]
@@ -0,0 +1,108 @@
+import importlib
+from pathlib import Path
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+SUBREDDITS = ["CryptoCurrency", "CryptoMarkets"]
+POSTS = {
+    "CryptoCurrency": ["BTC breaking out, great rally", "ETH gas fees are terrible"],
+    "CryptoMarkets": ["whether btc holds is anyone's guess", "SOL outage again, awful"],
+}
+
+
+class _FakeReddit:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def subreddit(self, name):
+        with self._lock:
+            self.calls.append(name)
+        time.sleep(0.05)  # slow enough for both Reddit queries to overlap
+        return types.SimpleNamespace(
+            hot=lambda limit: [types.SimpleNamespace(title=t, selftext="") for t in POSTS[name]]
+        )
+
+
+@pytest.fixture
+def sa(monkeypatch):
+    # The real enhanced module imports back from sentiment_aggregator; the
+    # batch path never touches it.
+    monkeypatch.setitem(
+        sys.modules, "sentiment_aggregator_enhanced", types.SimpleNamespace(aggregator=None)
+    )
+    monkeypatch.delitem(sys.modules, "sentiment_aggregator", raising=False)
+    module = importlib.import_module("sentiment_aggregator")
+    monkeypatch.setattr(module, "_RESULT_CACHE", module.TTLCache())
+    monkeypatch.setattr(module, "_SOURCE_CACHE", module.TTLCache())
+    monkeypatch.setattr(module, "_CONFIG", {
+        "sentiment": {"max_rss_items": 10, "max_reddit_posts": 5},
+        "sources": {
+            "fear_greed": {"enabled": True, "tier": "tier1", "weight": 0.9},
+            "coingecko": {"enabled": True, "tier": "tier1", "weight": 0.85},
+            "rss": {"enabled": True, "tier": "tier2", "weight": 0.75, "feeds": [{"url": "https://x/rss"}]},
+            "reddit_global": {"enabled": True, "tier": "tier2", "weight": 0.75, "subreddits": SUBREDDITS},
+            "reddit_symbol": {"enabled": True, "tier": "tier3", "weight": 0.6, "subreddits": SUBREDDITS},
+        },
+    })
+    return module
+
+
+def test_batch_fetches_shared_sources_once_and_scores_each_symbol(sa, monkeypatch):
+    calls = {"fear_greed": 0, "rss": 0, "coingecko": []}
+
+    async def fake_fear_greed():
+        calls["fear_greed"] += 1
+        return 60, "Greed", {}
+
+    async def fake_rss(feeds, max_items):
+        calls["rss"] += 1
+        return {"enabled": True, "score_0_1": 0.55, "feeds": [], "items": 3}
+
+    async def fake_coingecko(sym):
+        calls["coingecko"].append(sym)
+        return {"enabled": True, "score_0_1": 0.5, "metrics": {}}
+
+    reddit = _FakeReddit()
+    monkeypatch.setattr(sa, "fetch_fear_greed", fake_fear_greed)
+    monkeypatch.setattr(sa, "fetch_rss_sentiment_async", fake_rss)
+    monkeypatch.setattr(sa, "fetch_coingecko_metrics", fake_coingecko)
+    monkeypatch.setattr(sa, "_praw_client", lambda: reddit)
+
+    out = sa.get_sentiment_for_symbols(["btc", "ETH", "SOL", "BTC"])
+
+    assert list(out) == ["BTC", "ETH", "SOL"]
+    assert calls["fear_greed"] == 1
+    assert calls["rss"] == 1
+    assert sorted(reddit.calls) == sorted(SUBREDDITS)  # one post fetch per subreddit
+    assert sorted(calls["coingecko"]) == ["BTC", "ETH", "SOL"]
+
+    def mentions(result):
+        (rs,) = [
+            s["meta"]["reddit_symbol"] for s in result["sources"] if "reddit_symbol" in s["meta"]
+        ]
+        return rs["mentions"]
+
+    # Whole-token matching: "whether btc" counts for BTC, "whether" not for ETH
+    assert {sym: mentions(r) for sym, r in out.items()} == {"BTC": 2, "ETH": 1, "SOL": 1}
+    assert len({id(r) for r in out.values()}) == 3
+
+    # A second batch is served from the per-symbol result cache
+    again = sa.get_sentiment_for_symbols(["ETH"])
+    assert again["ETH"]["metadata"]["cache_hit"] is True
+    assert calls["fear_greed"] == 1 and len(reddit.calls) == len(SUBREDDITS)
+
+
+def test_public_mentions_alias_scores_one_symbol(sa, monkeypatch):
+    monkeypatch.setattr(sa, "_praw_client", lambda: _FakeReddit())
+
+    out = sa.fetch_reddit_public_mentions(SUBREDDITS, "sol", 5)
+
+    assert out["enabled"] is True
+    assert out["mentions"] == 1
@@ -0,0 +1,100 @@
+import asyncio
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sentiment_analyzer
+from score_cache import ScoreCache
+
+if not sentiment_analyzer.TRANSFORMERS_AVAILABLE:
+    pytest.skip("transformers not installed", allow_module_level=True)
+
+from transformers import (  # noqa: E402
+    BertConfig,
+    BertForSequenceClassification,
+    BertTokenizerFast,
+    pipeline,
+)
+
+TEXTS = [
+    "bitcoin pump incoming, bullish breakout to the moon",
+    "ethereum dump, bearish crash and panic selling everywhere today",
+    "steady consolidation",
+    "whales accumulate while retail is fearful and the market drifts sideways "
+    "for another long week of low volume",
+]
+
+
+def _tiny_pipeline(tmp_path):
+    words = sorted({w.strip(",.") for t in TEXTS for w in t.split()})
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]))
+    config = BertConfig(
+        vocab_size=5 + len(words),
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        num_labels=3,
+        id2label={0: "positive", 1: "negative", 2: "neutral"},
+        label2id={"positive": 0, "negative": 1, "neutral": 2},
+    )
+    model = BertForSequenceClassification(config).eval()
+    return pipeline(
+        "sentiment-analysis",
+        model=model,
+        tokenizer=BertTokenizerFast(str(vocab)),
+        device=-1,
+    )
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    cls = sentiment_analyzer.SentimentAnalyzer
+    monkeypatch.setattr(cls, "_initialize_models", lambda self: None)
+    monkeypatch.setattr(sentiment_analyzer, "TEXTBLOB_AVAILABLE", False)
+    monkeypatch.setattr(sentiment_analyzer, "SENTIMENT_BATCH_SIZE", 2)
+    cache = ScoreCache(tmp_path / "scores.sqlite")
+    monkeypatch.setattr(sentiment_analyzer, "SCORE_CACHE", cache)
+    out = cls()
+    out.transformer_analyzer = _tiny_pipeline(tmp_path)
+    if sentiment_analyzer.VADER_AVAILABLE:
+        out.vader_analyzer = sentiment_analyzer.SentimentIntensityAnalyzer()
+    return out
+
+
+def test_padded_batches_match_the_per_text_pipeline(analyzer):
+    batched = analyzer._analyze_with_transformer(TEXTS)
+    for text, result in zip(TEXTS, batched):
+        expected = analyzer.transformer_analyzer(text)[0]
+        assert result["raw_label"] == expected["label"].upper()
+        assert result["confidence"] == pytest.approx(expected["score"], abs=1e-5)
+
+
+def test_analyze_batch_scores_unseen_texts_once_in_one_batch(analyzer, monkeypatch):
+    batches = []
+    score_batch = analyzer._score_batch
+
+    async def counting(texts):
+        batches.append(list(texts))
+        return await score_batch(texts)
+
+    monkeypatch.setattr(analyzer, "_score_batch", counting)
+    texts = [TEXTS[0], "meh", TEXTS[1], TEXTS[0], TEXTS[3]]
+
+    first = asyncio.run(analyzer.analyze_batch(texts))
+    assert batches == [[TEXTS[0], TEXTS[1], TEXTS[3]]]
+    assert first[1]["model"] == "none"
+    assert first[0]["score"] == first[3]["score"]
+    models = {r["model"] for r in first[0]["individual_results"]}
+    assert {"transformer", "crypto_lexicon"} <= models
+    assert ("vader" in models) == sentiment_analyzer.VADER_AVAILABLE
+
+    single = asyncio.run(analyzer.analyze(TEXTS[2]))
+    again = asyncio.run(analyzer.analyze_batch(texts + [TEXTS[2]]))
+    assert len(batches) == 2  # the single text went through a batch of one
+    scores = [r["score"] for r in first] + [single["score"]]
+    assert [r["score"] for r in again] == scores
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import app as backend_app
+from backend import sentiment_api
+from backend.sentiment.handoff import HandoffReader, HandoffWriter
+
+
+def _payload(**overrides):
+    payload = sentiment_api.SentimentResponse(
+        overall_sentiment=0.6,
+        fear_greed_index=55,
+        social_metrics={"volume_change": 0, "engagement_rate": 0, "mentions_24h": 0},
+        social_breakdown={"reddit": 0.5, "twitter": 0.5, "telegram": 0.5, "chan": 0.5},
+        data_status="live",
+        sources=[{"name": "alternative.me"}],
+    )
+    return {**sentiment_api.jsonable_encoder(payload), **overrides}
+
+
+def test_generations_survive_writer_restart_and_reader_rereads_on_change(tmp_path):
+    path = tmp_path / "handoff.json"
+    reader = HandoffReader(path)
+    assert reader.latest() is None
+
+    assert HandoffWriter(path).publish({"n": 1}) == 1
+    assert reader.latest()["payload"] == {"n": 1}
+    # A restarted service continues the counter instead of reusing 1.
+    assert HandoffWriter(path).publish({"n": 22}) == 2
+    latest = reader.latest()
+    assert latest["generation"] == 2 and latest["payload"] == {"n": 22}
+
+    path.write_text("{not json", "utf-8")  # torn/foreign write keeps last good
+    assert reader.latest()["generation"] == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["handoff.json"]
+
+
+def test_service_publishes_each_new_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        sentiment_api, "_HANDOFF", HandoffWriter(tmp_path / "handoff.json")
+    )
+
+    async def build():
+        return sentiment_api.SentimentResponse(data_status="live")
+
+    monkeypatch.setattr(sentiment_api, "_build_sentiment_payload", build)
+    asyncio.run(sentiment_api._hydrate_sentiment_cache(force=True))
+    asyncio.run(sentiment_api._hydrate_sentiment_cache(force=False))  # cached
+    envelope = json.loads((tmp_path / "handoff.json").read_text("utf-8"))
+    assert envelope["generation"] == 1
+    assert envelope["payload"]["data_status"] == "live"
+
+
+def test_board_serves_handoff_without_calling_the_service(tmp_path, monkeypatch):
+    path = tmp_path / "handoff.json"
+    monkeypatch.setattr(backend_app, "_SENTIMENT_HANDOFF", HandoffReader(path))
+    monkeypatch.setenv("MW_ENABLE_EXTERNAL_SENTIMENT", "1")
+
+    def no_upstream(*_args, **_kwargs):
+        raise AssertionError("sentiment request path called upstream")
+
+    monkeypatch.setattr(backend_app, "_proxy_pipeline_request", no_upstream)
+    monkeypatch.setattr(backend_app.threading, "Thread", no_upstream)
+    HandoffWriter(path).publish(_payload())
+
+    with backend_app.app.test_request_context("/api/sentiment/latest?symbol=btc"):
+        body = backend_app.api_sentiment_latest().get_json()
+    assert body["proxy_meta"]["source"] == "handoff"
+    assert body["proxy_meta"]["generation"] == 1
+    assert body["data_status"] == "live" and body["requested_symbol"] == "BTC"
+    assert body["sentiment_meta"]["pipelineRunning"] is True
+
+    sentiment, meta = backend_app._get_sentiment_snapshot()
+    assert sentiment["fear_greed_index"] == 55
+    assert meta["ok"] is True and meta["generation"] == 1
+
+
+def test_stale_handoff_tries_the_service_first(tmp_path, monkeypatch):
+    path = tmp_path / "handoff.json"
+    monkeypatch.setattr(backend_app, "_SENTIMENT_HANDOFF", HandoffReader(path))
+    monkeypatch.setattr(backend_app, "_LATEST_PROXY_CACHE", None)
+    monkeypatch.setattr(backend_app, "_LATEST_PROXY_TS", None)
+    monkeypatch.setattr(
+        backend_app, "SENTIMENT_HANDOFF_MAX_AGE_S", -1.0
+    )  # service stopped publishing to the file
+    HandoffWriter(path).publish(_payload())
+    calls = []
+
+    def upstream_down(path, params=None, timeout=5.0):
+        calls.append(path)
+        return None, "http://pipeline" + path, {"error": "pipeline_unreachable"}
+
+    monkeypatch.setattr(backend_app, "_proxy_pipeline_request", upstream_down)
+    with backend_app.app.test_request_context("/api/sentiment/latest"):
+        body = backend_app.api_sentiment_latest().get_json()
+    assert calls == ["/sentiment/latest"]
+    assert body["proxy_meta"]["source"] == "handoff"
+    assert body["data_status"] == "stale" and body["proxy_meta"]["stale"] is True
+    assert body["sentiment_meta"]["pipelineRunning"] is False
+    assert time.time() - body["proxy_meta"]["proxy_ts"] < 5
+    with backend_app.app.test_request_context("/api/market-overview"):
+        overview = backend_app.get_market_overview().get_json()
+    assert overview["data_status"] == "stale"
+
+    def upstream_up(path, params=None, timeout=5.0):
+        return _payload(fear_greed_index=70), "http://pipeline" + path, None
+
+    monkeypatch.setattr(backend_app, "_proxy_pipeline_request", upstream_up)
+    with backend_app.app.test_request_context("/api/sentiment/latest"):
+        body = backend_app.api_sentiment_latest().get_json()
+    assert body["fear_greed_index"] == 70 and body["data_status"] == "live"
+    assert body["proxy_meta"]["stale"] is False
+    with backend_app.app.test_request_context("/api/market-overview"):
+        overview = backend_app.get_market_overview().get_json()
+    assert overview["data_status"] == "live"
+
+    # The in-process snapshot reaches the service through its poller.
+    monkeypatch.setenv("MW_ENABLE_EXTERNAL_SENTIMENT", "1")
+    monkeypatch.setattr(backend_app.threading, "Thread", upstream_down)
+    monkeypatch.setattr(backend_app, "_SENTIMENT_LAST_GOOD", None)
+    monkeypatch.setattr(backend_app, "_SENTIMENT_LAST_OK_TS", None)
+    sentiment, meta = backend_app._get_sentiment_snapshot()
+    assert sentiment["fear_greed_index"] == 55 and meta["generation"] == 1
+    assert meta["pipelineRunning"] is False
+
+    monkeypatch.setattr(
+        backend_app, "_SENTIMENT_LAST_GOOD", _payload(fear_greed_index=70)
+    )
+    monkeypatch.setattr(backend_app, "_SENTIMENT_LAST_OK_TS", time.time())
+    sentiment, meta = backend_app._get_sentiment_snapshot()
+    assert sentiment["fear_greed_index"] == 70 and "generation" not in meta
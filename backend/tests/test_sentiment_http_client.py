@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from backend import sentiment_api
+from backend.sentiment.http_client import SentimentHTTPClient, UpstreamHTTPError
+
+
+async def _serve(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_requests_reuse_keepalive_connections_and_respect_host_limit():
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.02)
+        state["active"] -= 1
+        return web.json_response({"symbol": request.query.get("symbol")})
+
+    async def scenario():
+        runner, base = await _serve([web.get("/x", handler)])
+        client = SentimentHTTPClient(per_host_limit=2)
+        try:
+            first = await client.get_json(
+                f"{base}/x", source="binance", params={"symbol": "BTC"}
+            )
+            rest = await asyncio.gather(
+                *(client.get_json(f"{base}/x", source="binance") for _ in range(6))
+            )
+            return first, rest, client.stats()
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    first, rest, stats = asyncio.run(scenario())
+    assert first == {"symbol": "BTC"} and len(rest) == 6
+    assert state["peak"] <= 2
+    assert stats["connections"]["created"] <= 2
+    assert stats["connections"]["reused"] >= 5
+    assert stats["sources"]["binance"]["requests"] == 7
+
+
+def test_status_errors_and_timeouts_are_counted_per_source():
+    async def forbidden(_request):
+        return web.json_response({}, status=403)
+
+    async def slow(_request):
+        await asyncio.sleep(0.5)
+        return web.json_response({})
+
+    async def scenario():
+        runner, base = await _serve(
+            [web.get("/forbidden", forbidden), web.get("/slow", slow)]
+        )
+        client = SentimentHTTPClient(timeouts={"okx": 0.05})
+        try:
+            with pytest.raises(UpstreamHTTPError) as blocked:
+                await client.get_json(f"{base}/forbidden", source="bybit")
+            with pytest.raises(asyncio.TimeoutError):
+                await client.get_json(f"{base}/slow", source="okx")
+            return blocked.value, client.stats()
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    error, stats = asyncio.run(scenario())
+    classified = sentiment_api._source_error("bybit", "BTCUSDT", error)
+    assert classified["status"] == "blocked"
+    assert stats["sources"]["bybit"]["errors"] == 1
+    assert stats["sources"]["okx"]["timeouts"] == 1
+
+
+def test_derivatives_legs_run_together_and_late_legs_land_next_cycle(monkeypatch):
+    monkeypatch.setattr(sentiment_api, "_DERIVATIVES_LEGS", {})
+    monkeypatch.setattr(sentiment_api, "_DERIVATIVES_VENUE_STATS", {})
+    gate = {"slow": 0.3}
+
+    def leg(venue, delay):
+        async def run():
+            await asyncio.sleep(delay())
+            return ({"exchange": venue, "symbol": venue.upper()}, None)
+
+        return run
+
+    legs = [
+        ("binance", "A", leg("binance", lambda: 0.05)),
+        ("okx", "B", leg("okx", lambda: 0.05)),
+        ("bybit", "C", leg("bybit", lambda: gate["slow"])),
+    ]
+
+    async def scenario():
+        started = asyncio.get_running_loop().time()
+        first = await sentiment_api._run_derivatives_legs(legs, deadline_s=0.15)
+        elapsed = asyncio.get_running_loop().time() - started
+        await asyncio.sleep(0.25)  # the slow leg finishes between cycles
+        gate["slow"] = 5.0
+        second = await sentiment_api._run_derivatives_legs(legs, deadline_s=0.15)
+        return first, elapsed, second
+
+    first, elapsed, second = asyncio.run(scenario())
+    assert elapsed < 0.25  # concurrent, and bounded by the deadline
+    assert [item["exchange"] for item, _ in first if item] == ["binance", "okx"]
+    assert [error["exchange"] for _, error in first if error] == ["bybit"]
+    # Next cycle: bybit times out again but its late result stands in.
+    assert sorted(item["exchange"] for item, _ in second if item) == [
+        "binance",
+        "bybit",
+        "okx",
+    ]
+    stats = sentiment_api._DERIVATIVES_VENUE_STATS["bybit"]
+    assert stats["timeouts"] == 2 and stats["late_results"] == 1
+    assert stats["legs"] == 2
+
+
+def test_session_from_a_previous_loop_is_closed_when_replaced():
+    async def ok(_request):
+        return web.json_response({"ok": True})
+
+    client = SentimentHTTPClient()
+
+    async def first_run():
+        runner, base = await _serve([web.get("/x", ok)])
+        try:
+            assert await client.get_json(f"{base}/x", source="okx") == {"ok": True}
+            return client._session
+        finally:
+            await runner.cleanup()
+
+    stale = asyncio.run(first_run())  # leaves the client open on a dead loop
+    assert not stale.closed
+
+    async def second_run():
+        await client.start()
+        try:
+            return client._session
+        finally:
+            await client.close()
+
+    fresh = asyncio.run(second_run())
+    assert fresh is not stale
+    assert stale.closed
+
+
+def test_session_on_a_loop_still_running_elsewhere_is_closed_there():
+    import threading
+
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    client = SentimentHTTPClient()
+    try:
+        asyncio.run_coroutine_threadsafe(client.start(), other).result(5)
+        stale = client._session
+
+        async def replace():
+            await client.start()
+            await client.close()
+
+        asyncio.run(replace())
+        # The close was handed to the loop that owns the session.
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result(5)
+        assert stale.closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(5)
+        other.close()
@@ -0,0 +1,87 @@
+from datetime import datetime
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sentiment_store import SentimentStore, decode_aggregate, encode_aggregate
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        if self.client.down:
+            raise ConnectionError("redis is down")
+        self.client.round_trips += 1
+        self.client.data.update({key: value for key, _, value in self.commands})
+
+
+class _Redis:
+    def __init__(self, down=False):
+        self.down = down
+        self.round_trips = 0
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return _Pipeline(self)
+
+    def get(self, key):
+        if self.down:
+            raise ConnectionError("redis is down")
+        return self.data.get(key)
+
+
+RAW = [
+    {"source": "coindesk", "content": "btc up", "timestamp": datetime(2024, 1, 1)},
+    {"source": "coindesk", "content": "eth down", "timestamp": datetime(2024, 1, 1)},
+    {"source": "reddit", "content": "sol flat", "timestamp": datetime(2024, 1, 1)},
+]
+AGGREGATE = {"timestamp": datetime(2024, 1, 1, 12), "overall_metrics": {"x": 0.5}}
+
+
+def test_a_cycle_is_one_pipelined_round_trip(tmp_path):
+    client = _Redis()
+    store = SentimentStore(client, tmp_path / "store.sqlite")
+
+    assert store.write_cycle("t1", raw=RAW, aggregate=AGGREGATE) == "redis"
+    assert client.round_trips == 1
+    # Items from the same source no longer overwrite each other
+    assert len([k for k in client.data if k.startswith("sentiment:raw:t1:")]) == 3
+    second = json.loads(client.data["sentiment:raw:t1:coindesk:1"])
+    assert second["content"] == "eth down"
+    aggregate = decode_aggregate(store.get("sentiment:aggregated:t1"))
+    assert aggregate["timestamp"] == "2024-01-01T12:00:00"
+    assert aggregate["overall_metrics"] == {"x": 0.5}
+    assert not (tmp_path / "store.sqlite").exists()
+    assert store.stats()["records"] == 4
+
+
+def test_falls_back_to_the_local_store_without_redis(tmp_path):
+    for client in (None, _Redis(down=True)):
+        store = SentimentStore(client, tmp_path / f"{client is None}.sqlite")
+        alerts = [{"type": "extreme_fear"}]
+        assert store.write_cycle("t1", raw=RAW, alerts=alerts) == "sqlite"
+        assert json.loads(store.get("sentiment:alerts:t1")) == alerts
+        raw = json.loads(store.get("sentiment:raw:t1:reddit:2"))
+        assert raw["content"] == "sol flat"
+        assert store.get("sentiment:aggregated:t1") is None
+
+
+def test_aggregate_encoding_is_compact_and_checked():
+    rows = [{"symbol": f"S{i}", "score": 0.5, "sources": ["rss"]} for i in range(200)]
+    result = {"rows": rows}
+    blob = encode_aggregate(result)
+    assert decode_aggregate(blob) == result
+    assert len(blob) < len(json.dumps(result, default=str)) / 5
+    with pytest.raises(ValueError):
+        decode_aggregate(b"{}")
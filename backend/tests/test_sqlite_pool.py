@@ -0,0 +1,91 @@
+from pathlib import Path
+import sys
+import threading
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlite_pool import SQL_METRICS, SQLitePool
+
+
+def test_close_returns_connection_and_rolls_back_open_work(tmp_path):
+    pool = SQLitePool(tmp_path / "nested" / "m.sqlite")
+    conn = pool.connect()
+    conn.execute("CREATE TABLE t (a INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")  # never committed
+    conn.close()
+
+    again = pool.connect()
+    try:
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        assert again.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert again.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        again.close()
+    assert pool.stats() == {"opened": 1, "reused": 1}
+
+
+def test_nested_checkouts_do_not_share_a_transaction(tmp_path):
+    pool = SQLitePool(tmp_path / "m.sqlite")
+    setup = pool.connect()
+    setup.execute("CREATE TABLE t (a INTEGER)")
+    setup.commit()
+    setup.close()
+
+    outer = pool.connect()
+    outer.execute("INSERT INTO t VALUES (1)")
+    inner = pool.connect()
+    assert inner is not outer
+    # WAL: the inner reader is not blocked and cannot see uncommitted rows.
+    assert inner.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    inner.close()
+    assert outer.in_transaction
+    outer.commit()
+    outer.close()
+
+    check = pool.connect()
+    assert [r[0] for r in check.execute("SELECT a FROM t")] == [1]
+    check.close()
+
+
+def test_threads_get_their_own_connections_and_path_swaps_reset(tmp_path):
+    target = {"path": tmp_path / "a.sqlite"}
+    pool = SQLitePool(lambda: target["path"])
+    main = pool.connect()
+    main.close()
+    seen = []
+
+    def worker():
+        conn = pool.connect()
+        seen.append(conn)
+        conn.close()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen[0] is not main
+
+    target["path"] = tmp_path / "b.sqlite"
+    fresh = pool.connect()
+    assert fresh is not main
+    fresh.close()
+    assert (tmp_path / "b.sqlite").exists()
+
+
+def test_statements_are_timed_by_verb(tmp_path):
+    SQL_METRICS.reset()
+    pool = SQLitePool(tmp_path / "m.sqlite")
+    conn = pool.connect()
+    conn.execute("CREATE TABLE t (a INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+    conn.execute("SELECT * FROM t").fetchall()
+    conn.close()
+
+    snap = SQL_METRICS.snapshot()
+    assert snap["by_verb"]["insert"]["count"] == 1
+    assert snap["by_verb"]["select"]["count"] == 1
+    assert any(
+        line.startswith('sqlite_statement_duration_seconds_count{verb="select"}')
+        for line in SQL_METRICS.prometheus_lines()
+    )
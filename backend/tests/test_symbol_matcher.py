@@ -0,0 +1,42 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from symbol_matcher import SymbolMatcher
+
+
+def test_matches_whole_tokens_case_insensitively():
+    matcher = SymbolMatcher(["btc", "ETH", "SOL"])
+
+    assert matcher.match("$ETH and sol ripping, BTC flat") == {"BTC", "ETH", "SOL"}
+    assert matcher.match("whether or not, solana") == set()
+    assert matcher.match("ETH/BTC ratio") == {"BTC", "ETH"}
+    assert SymbolMatcher([]).match("BTC") == set()
+
+
+def test_aliases_map_to_their_symbol_and_longest_term_wins():
+    matcher = SymbolMatcher(
+        ["BTC", "ETH"], aliases={"BTC": ["bitcoin"], "ETH": ["ether", "ethereum"]}
+    )
+
+    assert matcher.match("Bitcoin ETF flows") == {"BTC"}
+    assert matcher.match("ethereum gas") == {"ETH"}
+    assert matcher.match("etherscan down") == set()
+
+
+def test_attribute_groups_items_per_symbol_in_one_pass():
+    posts = [
+        {"text": "BTC to 100k"},
+        {"text": "eth and btc both green"},
+        {"text": "nothing to see"},
+    ]
+    by_symbol = SymbolMatcher(["BTC", "ETH", "DOGE"]).attribute(
+        posts, lambda p: p["text"]
+    )
+
+    assert by_symbol == {
+        "BTC": [posts[0], posts[1]],
+        "ETH": [posts[1]],
+        "DOGE": [],
+    }
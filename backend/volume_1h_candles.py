@@ -1,10 +1,7 @@
-import datetime
 import os
 import logging
 from typing import List, Dict
 
-import requests
-
 try:
     from .volume_1h_store import (
         floor_minute,
@@ -23,53 +20,29 @@ except ImportError:
         upsert_minute,
     )
 
-logger = logging.getLogger(__name__)
-
-COINBASE_CANDLES_URL = "https://api.exchange.coinbase.com/products/{product_id}/candles"
-
-
-class RateLimitError(Exception):
-    """Raised when Coinbase returns HTTP 429."""
-
+try:
+    from .candle_store import CANDLES, RateLimitError
+except ImportError:
+    # Absolute import fallback
+    from candle_store import CANDLES, RateLimitError
 
-def _iso(ts: int) -> str:
-    return datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).isoformat()
+logger = logging.getLogger(__name__)
 
 
 def fetch_candles_1m(product_id: str, start_ts: int, end_ts: int) -> List[Dict]:
-    params = {
-        "granularity": 60,
-        "start": _iso(start_ts),
-        "end": _iso(end_ts),
-    }
-    url = COINBASE_CANDLES_URL.format(product_id=product_id)
-    resp = requests.get(url, params=params, timeout=8)
-
-    if resp.status_code == 429:
-        raise RateLimitError(f"429 for {product_id}")
-    if not resp.ok:
-        raise RuntimeError(f"HTTP {resp.status_code} for {product_id}")
-
-    data = resp.json()
-    if not isinstance(data, list):
-        raise RuntimeError(f"Unexpected candle payload for {product_id}")
-
+    # Through the shared candle store: only the minutes not fetched yet go
+    # upstream, and chart popups reuse the same rows.
     rows = []
-    for entry in data:
-        try:
-            ts_raw, _low, _high, _open, close, vol = entry
-            minute_ts = floor_minute(int(ts_raw))
-            rows.append(
-                {
-                    "minute_ts": minute_ts,
-                    "close": float(close),
-                    "vol_base": float(vol),
-                }
-            )
-        except Exception:
-            continue
-
-    rows.sort(key=lambda r: r["minute_ts"])
+    for ts_raw, _low, _high, _open, close, vol in CANDLES.range(
+        product_id, 60, start_ts, end_ts, priority="volume"
+    ):
+        rows.append(
+            {
+                "minute_ts": floor_minute(int(ts_raw)),
+                "close": float(close),
+                "vol_base": float(vol),
+            }
+        )
     return rows
 
 
@@ -2,12 +2,16 @@ from flask import Blueprint, jsonify, request, session
 from werkzeug.security import check_password_hash, generate_password_hash
 import os
 import re
-import sqlite3
 import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    from sqlite_pool import SQLitePool
+except ImportError:  # package-style imports used by pytest from the repo root
+    from backend.sqlite_pool import SQLitePool
+
 try:
     from watchlist_insights import Memory, smart_watchlist_insights
 except ImportError:  # graceful fallback if module not present
@@ -72,12 +76,13 @@ def _slugify_username(value):
     return base or "watcher"
 
 
+# Shared by watchlist routes, alert_rules, portfolio cost basis and OAuth token
+# storage. close() hands the connection back to the calling thread's pool.
+_DB_POOL = SQLitePool(lambda: _WATCHLIST_DB_PATH)
+
+
 def _db_connect():
-    _WATCHLIST_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(_WATCHLIST_DB_PATH, timeout=5, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    return _DB_POOL.connect()
 
 
 def _ensure_watchlist_schema():